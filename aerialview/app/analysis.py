@@ -0,0 +1,148 @@
+import uuid
+
+import dash_bootstrap_components as dbc
+import plotly.graph_objects as go
+from dash import Input, Output, State, callback, ctx, dcc, html, no_update
+
+from aerialview.core import analyses
+from aerialview.core.jobs import ACTIVE, DONE, FAILED, get_manager
+from aerialview.core.visualize import placeholder_figure
+
+layout = html.Div([
+    html.H1("Analysis"),
+    html.P("Long analyses run in the background; changing the inputs cancels the previous run."),
+    dcc.Dropdown(
+        id='analysis-kind',
+        options=[
+            {'label': 'Correlation matrix', 'value': 'correlation'},
+            {'label': 'Monte Carlo simulation', 'value': 'monte_carlo'},
+            {'label': 'Portfolio optimization', 'value': 'portfolio'},
+        ],
+        value='correlation',
+        clearable=False,
+        style={'width': '400px', 'margin-bottom': '10px'}
+    ),
+    dcc.Input(
+        id='analysis-tickers',
+        value='AAPL, MSFT, TSLA, GOOGL, AMZN, NVDA',
+        debounce=True,
+        style={'width': '400px', 'margin-bottom': '10px'}
+    ),
+    dcc.Dropdown(
+        id='analysis-period',
+        options=[{'label': p, 'value': p} for p in ['6mo', '1y', '2y', '5y']],
+        value='1y',
+        clearable=False,
+        style={'width': '400px', 'margin-bottom': '10px'}
+    ),
+    html.Button('Run', id='analysis-run'),
+    html.Button('Cancel', id='analysis-cancel', style={'margin-left': '10px'}),
+    dbc.Progress(id='analysis-progress', value=0, label='', style={'margin': '20px 0'}),
+    html.Div(id='analysis-status'),
+    dcc.Graph(id='analysis-chart', figure=placeholder_figure("Choose an analysis and press Run")),
+    dcc.Store(id='analysis-session', storage_type='session'),
+    dcc.Store(id='analysis-job'),
+    dcc.Interval(id='analysis-poll', interval=500, disabled=True),
+])
+
+
+def _submit(kind, tickers, period, group):
+    manager = get_manager()
+    if kind == 'monte_carlo':
+        return manager.submit(analyses.monte_carlo, tickers[0], period=period, group=group, name="Monte Carlo")
+    if kind == 'portfolio':
+        return manager.submit(analyses.optimize_portfolio, tuple(tickers), period=period, group=group, name="Portfolio")
+    return manager.submit(analyses.correlation_matrix, tuple(tickers), period=period, group=group, name="Correlation")
+
+
+def _figure(kind, result):
+    if kind == 'monte_carlo':
+        fig = go.Figure()
+        for row, label in zip(result["quantiles"], ["5%", "25%", "50%", "75%", "95%"]):
+            fig.add_trace(go.Scatter(y=row, mode='lines', name=label))
+        fig.update_layout(title="Simulated price quantiles", xaxis_title="Trading days", yaxis_title="Price")
+        return fig
+    if kind == 'portfolio':
+        return _frontier_figure(result)
+    fig = go.Figure(go.Heatmap(z=result.values, x=result.columns, y=result.index, zmin=-1, zmax=1, colorscale='RdBu'))
+    fig.update_layout(title="Correlation of daily returns")
+    return fig
+
+
+def _frontier_figure(result):
+    frontier = result["frontier"]
+    fig = go.Figure(go.Scatter(
+        x=frontier["volatility"] * 100, y=frontier["return"] * 100, mode='lines+markers', name='Efficient frontier',
+        customdata=frontier["sharpe"], hovertemplate='Volatility %{x:.1f}%<br>Return %{y:.1f}%<br>Sharpe %{customdata:.2f}'
+    ))
+    for name, portfolio in result["portfolios"].items():
+        top = sorted(zip(result["tickers"], portfolio["weights"]), key=lambda item: -item[1])[:5]
+        fig.add_trace(go.Scatter(
+            x=[portfolio["volatility"] * 100], y=[portfolio["return"] * 100], mode='markers', name=name,
+            marker={'size': 12, 'symbol': 'diamond'},
+            hovertext=['<br>'.join(f"{ticker}: {weight:.1%}" for ticker, weight in top)]
+        ))
+    fig.update_layout(
+        title=f"Efficient frontier ({len(result['tickers'])} assets, shrinkage {result['shrinkage']:.2f})",
+        xaxis_title="Volatility (annual %)", yaxis_title="Expected return (annual %)"
+    )
+    return fig
+
+
+@callback(
+    Output('analysis-job', 'data'),
+    Output('analysis-session', 'data'),
+    Input('analysis-run', 'n_clicks'),
+    Input('analysis-cancel', 'n_clicks'),
+    Input('analysis-kind', 'value'),
+    Input('analysis-tickers', 'value'),
+    Input('analysis-period', 'value'),
+    State('analysis-job', 'data'),
+    State('analysis-session', 'data'),
+    prevent_initial_call=True
+)
+def control_analysis(_run, _cancel, kind, tickers, period, job, session):
+    session = session or uuid.uuid4().hex
+    manager = get_manager()
+    if ctx.triggered_id != 'analysis-run':
+        # Inputs changed or Cancel pressed: stop whatever this session had running.
+        if job:
+            # Another session may share this (deduplicated) job; only release ours.
+            manager.cancel(job['id'], group=f"analysis-{session}")
+        return None, session
+
+    tickers = [t.strip().upper() for t in (tickers or '').split(',') if t.strip()]
+    if not tickers:
+        return None, session
+    # Submitting under the session's group also releases its previous run.
+    job_id = _submit(kind, tickers, period, group=f"analysis-{session}")
+    return {'id': job_id, 'kind': kind}, session
+
+
+@callback(
+    Output('analysis-progress', 'value'),
+    Output('analysis-progress', 'label'),
+    Output('analysis-status', 'children'),
+    Output('analysis-chart', 'figure'),
+    Output('analysis-poll', 'disabled'),
+    Input('analysis-poll', 'n_intervals'),
+    Input('analysis-job', 'data'),
+    prevent_initial_call=True
+)
+def poll_analysis(_, job):
+    if not job:
+        return 0, '', '', no_update, True
+    manager = get_manager()
+    state = manager.status(job['id'])
+    if state is None:
+        return 0, '', 'Job not found', no_update, True
+
+    percent = round(state['progress'] * 100)
+    if state['status'] in ACTIVE:
+        figure = placeholder_figure("Running...") if ctx.triggered_id == 'analysis-job' else no_update
+        return percent, f"{percent}%", state['message'] or state['status'].title(), figure, False
+    if state['status'] == DONE:
+        return 100, '100%', 'Done', _figure(job['kind'], manager.result(job['id'])), True
+    if state['status'] == FAILED:
+        return percent, '', f"Failed: {state['error']}", no_update, True
+    return percent, '', 'Cancelled', no_update, True
@@ -1,5 +1,68 @@
+import os
+import re
+
 import dash
 import dash_bootstrap_components as dbc
+from flask import Response, request
+
+from aerialview.core.callback_cache import get_cache
+from aerialview.core.indicator_cache import get_indicator_cache
+from aerialview.core.jobs import get_manager
+from aerialview.core.metadata_cache import get_cache as get_metadata_cache
+from aerialview.core.metrics import instrument_server, register_cache
+from aerialview.core.sparkline import get_renderer
+from aerialview.core.warmup import get_warmup
 
 app = dash.Dash(__name__, suppress_callback_exceptions=True, external_stylesheets=[dbc.themes.BOOTSTRAP])
-server = app.server
\ No newline at end of file
+server = app.server
+instrument_server(server)
+register_cache("callback", lambda: get_cache().stats())
+register_cache("metadata", lambda: get_metadata_cache().stats())
+register_cache("indicator", lambda: {
+    "hits": get_indicator_cache().hits + get_indicator_cache().disk_hits, "misses": get_indicator_cache().misses
+})
+register_cache("sparkline", lambda: get_renderer().stats())
+register_cache("figure", lambda: {"hits": get_warmup().figures.hits, "misses": get_warmup().figures.misses})
+
+if os.environ.get("AERIALVIEW_WARMUP", "1") != "0":
+
+    @server.before_request
+    def _ensure_warmup():
+        # Starts on each worker's first request, never at import, so preloading
+        # the app (e.g. gunicorn --preload) does not fetch in the parent.
+        get_warmup().start()
+
+
+@server.route("/_cache/stats")
+def cache_stats():
+    return get_cache().stats()
+
+
+@server.route("/_warmup/status")
+def warmup_status():
+    return get_warmup().snapshot()
+
+
+@server.route("/_jobs/<job_id>")
+def job_status(job_id):
+    return get_manager().status(job_id) or ({"error": "unknown job"}, 404)
+
+
+SPARKLINE_PERIODS = {"1mo", "3mo", "6mo", "1y", "2y", "5y", "ytd", "max"}
+# Provider symbols: letters, digits and . - ^ = (e.g. BRK-B, ^GSPC, EURUSD=X).
+TICKER_PATTERN = re.compile(r"[A-Za-z0-9.\-^=]{1,16}")
+
+
+@server.route("/sparkline/<ticker>.png")
+def sparkline(ticker):
+    if not TICKER_PATTERN.fullmatch(ticker):
+        return {"error": "invalid ticker"}, 400
+    period = request.args.get("period", "6mo")
+    if period not in SPARKLINE_PERIODS:
+        return {"error": f"unsupported period {period}"}, 400
+    width = min(max(request.args.get("w", 120, type=int), 16), 600)
+    height = min(max(request.args.get("h", 32, type=int), 8), 200)
+    png, ok = get_renderer().render(ticker, period, width, height)
+    # A blank tile from a failed render must not be cached by browsers or proxies.
+    cache_control = f"max-age={get_renderer().ttl}" if ok else "no-store"
+    return Response(png, mimetype="image/png", headers={"Cache-Control": cache_control})
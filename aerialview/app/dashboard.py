@@ -1,14 +1,30 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
+import html
+import os
+import sys
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
+# `streamlit run aerialview/app/dashboard.py` only puts this file's directory on sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from aerialview.core import provider
+from aerialview.core.analyses import optimize_portfolio
+from aerialview.core.bars import as_frame
+from aerialview.core.figure_cache import FigureCache
+from aerialview.core.indicator_cache import get_indicator_cache
+from aerialview.core.news import get_pipeline
+from aerialview.core.profiling import profiled, span
+from aerialview.core.regression import BENCHMARK, RISK_FREE_RATE, benchmark_stats
+
+PLOTLY_TEMPLATES = {"Dark": "plotly_dark", "Light": "plotly_white"}
+
 # Page configuration
 st.set_page_config(
     page_title="AerialView - Advanced Finance Analytics",
@@ -116,8 +132,8 @@ class SimpleFinanceAnalyzer:
     def fetch_stock_data(_self, ticker, period="1y", interval="1d"):
         """Fetch stock data with caching and error handling"""
         try:
-            stock = yf.Ticker(ticker)
-            data = stock.history(period=period, interval=interval)
+            with span("fetch.dashboard", ticker=ticker):
+                data = provider.get_history(ticker, period=period, interval=interval)
             
             if data.empty:
                 st.error(f"No data found for ticker {ticker}")
@@ -130,6 +146,10 @@ class SimpleFinanceAnalyzer:
             st.error(f"Error fetching data for {ticker}: {str(e)}")
             return None
     
+    def calculate_sma(self, prices, window=20):
+        """Calculate a simple moving average using pandas"""
+        return prices.rolling(window=window).mean()
+    
     def calculate_rsi(self, prices, window=14):
         """Calculate RSI using pandas"""
         delta = prices.diff()
@@ -163,45 +183,56 @@ class SimpleFinanceAnalyzer:
         d_percent = k_percent.rolling(window=d_window).mean()
         return k_percent, d_percent
     
+    def calculate_obv(self, close, volume):
+        """Calculate On-Balance Volume: volume added on up days, subtracted on down days"""
+        change = close.diff().to_numpy()
+        direction = np.where(change > 0, 1.0, np.where(change < 0, -1.0, 0.0))
+        direction[0] = 1.0
+        return pd.Series(np.cumsum(direction * volume.to_numpy(dtype=float)), index=close.index)
+    
+    @profiled("indicators.dashboard")
     def add_technical_indicators(self, data):
-        """Add comprehensive technical indicators using pandas"""
+        """Add comprehensive technical indicators using pandas (accepts `Bars`)"""
+        data = as_frame(data)
+        # Indicators are memoized by the content of their inputs
+        indicators = get_indicator_cache()
+        close = data['Close']
+
         # Moving averages
-        data['MA_20'] = data['Close'].rolling(window=20).mean()
-        data['MA_50'] = data['Close'].rolling(window=50).mean()
-        data['MA_200'] = data['Close'].rolling(window=200).mean()
+        data['MA_20'] = indicators.compute("sma", self.calculate_sma, close, window=20)
+        data['MA_50'] = indicators.compute("sma", self.calculate_sma, close, window=50)
+        data['MA_200'] = indicators.compute("sma", self.calculate_sma, close, window=200)
         
         # Bollinger Bands
-        data['BB_Upper'], data['BB_Middle'], data['BB_Lower'] = self.calculate_bollinger_bands(data['Close'])
+        data['BB_Upper'], data['BB_Middle'], data['BB_Lower'] = indicators.compute(
+            "bollinger", self.calculate_bollinger_bands, close, window=20, std_dev=2
+        )
         
         # RSI
-        data['RSI'] = self.calculate_rsi(data['Close'])
+        data['RSI'] = indicators.compute("rsi", self.calculate_rsi, close, window=14)
         
         # MACD
-        data['MACD'], data['MACD_Signal'], data['MACD_Histogram'] = self.calculate_macd(data['Close'])
+        data['MACD'], data['MACD_Signal'], data['MACD_Histogram'] = indicators.compute(
+            "macd", self.calculate_macd, close, fast=12, slow=26, signal=9
+        )
         
         # Stochastic
-        data['Stoch_K'], data['Stoch_D'] = self.calculate_stochastic(data['High'], data['Low'], data['Close'])
+        data['Stoch_K'], data['Stoch_D'] = indicators.compute(
+            "stochastic", self.calculate_stochastic, data['High'], data['Low'], close, k_window=14, d_window=3
+        )
         
         # Volume indicators
-        data['Volume_MA'] = data['Volume'].rolling(window=20).mean()
-        
-        # Calculate OBV manually
-        data['OBV'] = 0.0
-        data.loc[data.index[0], 'OBV'] = data['Volume'].iloc[0]
-        for i in range(1, len(data)):
-            if data['Close'].iloc[i] > data['Close'].iloc[i-1]:
-                data.loc[data.index[i], 'OBV'] = data['OBV'].iloc[i-1] + data['Volume'].iloc[i]
-            elif data['Close'].iloc[i] < data['Close'].iloc[i-1]:
-                data.loc[data.index[i], 'OBV'] = data['OBV'].iloc[i-1] - data['Volume'].iloc[i]
-            else:
-                data.loc[data.index[i], 'OBV'] = data['OBV'].iloc[i-1]
+        data['Volume_MA'] = indicators.compute("sma", self.calculate_sma, data['Volume'], window=20)
+        data['OBV'] = indicators.compute("obv", self.calculate_obv, close, data['Volume'])
         
         data['Volume_OBV'] = data['OBV']
         
         return data
     
-    def calculate_risk_metrics(self, data, risk_free_rate=0.02):
-        """Calculate advanced risk metrics"""
+    @profiled("metrics.dashboard")
+    def calculate_risk_metrics(self, data, risk_free_rate=RISK_FREE_RATE, benchmark=None):
+        """Calculate advanced risk metrics, plus beta/alpha/R² when benchmark bars are given"""
+        data = as_frame(data)
         returns = data['Close'].pct_change().dropna()
         
         metrics = {
@@ -214,9 +245,14 @@ class SimpleFinanceAnalyzer:
             'Daily Change': (data['Close'].iloc[-1] / data['Close'].iloc[-2] - 1) * 100 if len(data) > 1 else 0
         }
         
+        if benchmark is not None and len(benchmark):
+            fit = benchmark_stats(data['Close'], as_frame(benchmark)['Close'], risk_free_rate)
+            metrics.update({'Beta': fit['beta'], 'Alpha': fit['alpha'] * 100, 'R²': fit['r2']})
+        
         return metrics
     
-    def create_advanced_candlestick_chart(self, data, ticker):
+    @profiled("chart.candlestick")
+    def create_advanced_candlestick_chart(self, data, ticker, theme="Dark"):
         """Create an advanced candlestick chart with multiple indicators"""
         fig = make_subplots(
             rows=4, cols=1,
@@ -308,7 +344,7 @@ class SimpleFinanceAnalyzer:
             xaxis_rangeslider_visible=False,
             height=900,
             showlegend=True,
-            template='plotly_dark',
+            template=PLOTLY_TEMPLATES[theme],
             paper_bgcolor='rgba(0,0,0,0)',
             plot_bgcolor='rgba(0,0,0,0)'
         )
@@ -321,7 +357,8 @@ class SimpleFinanceAnalyzer:
         
         return fig
     
-    def create_correlation_heatmap(self, tickers, period="6mo"):
+    @profiled("chart.correlation")
+    def create_correlation_heatmap(self, tickers, period="6mo", theme="Dark"):
         """Create correlation heatmap for multiple tickers"""
         data = {}
         for ticker in tickers:
@@ -344,20 +381,236 @@ class SimpleFinanceAnalyzer:
         )
         
         fig.update_layout(
-            template='plotly_dark',
+            template=PLOTLY_TEMPLATES[theme],
             paper_bgcolor='rgba(0,0,0,0)',
             plot_bgcolor='rgba(0,0,0,0)'
         )
         
         return fig
     
-    def get_market_news(self, ticker):
-        """Simulate getting market news"""
-        return [
-            {"title": f"Latest {ticker} earnings report shows strong growth", "sentiment": "Positive"},
-            {"title": f"{ticker} announces new strategic partnership", "sentiment": "Positive"},
-            {"title": f"Market volatility affects {ticker} trading", "sentiment": "Neutral"}
-        ]
+    def get_market_news(self, ticker, limit=10):
+        """Latest scored headlines for a ticker from the news pipeline"""
+        return get_news_headlines(ticker, limit)
+    
+    def create_sentiment_chart(self, data, sentiment, ticker, theme="Dark"):
+        """Overlay daily news sentiment on the closing price"""
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        fig.add_trace(go.Scatter(x=data.index, y=data['Close'], name=f'{ticker} Close',
+                                 line=dict(color='#2196F3')), secondary_y=False)
+        fig.add_trace(go.Bar(x=sentiment.index, y=sentiment['sentiment'], name='News Sentiment',
+                             marker_color=np.where(sentiment['sentiment'] >= 0, '#26a69a', '#ef5350'),
+                             opacity=0.6), secondary_y=True)
+        fig.update_yaxes(title_text="Price", secondary_y=False)
+        fig.update_yaxes(title_text="Sentiment", range=[-1, 1], secondary_y=True)
+        fig.update_layout(
+            height=350,
+            template=PLOTLY_TEMPLATES[theme],
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)'
+        )
+        return fig
+    
+    @profiled("chart.frontier")
+    def create_frontier_chart(self, result, theme="Dark"):
+        """Efficient frontier with the minimum-variance, maximum-Sharpe and risk-parity portfolios marked"""
+        frontier = result['frontier']
+        fig = go.Figure(go.Scatter(
+            x=frontier['volatility'] * 100, y=frontier['return'] * 100, mode='lines+markers',
+            name='Efficient Frontier', line=dict(color='#2196F3'), customdata=frontier['sharpe'],
+            hovertemplate='Volatility %{x:.1f}%<br>Return %{y:.1f}%<br>Sharpe %{customdata:.2f}<extra></extra>'
+        ))
+        for (name, portfolio), color in zip(result['portfolios'].items(), ['#26a69a', '#FF9800', '#ef5350']):
+            fig.add_trace(go.Scatter(x=[portfolio['volatility'] * 100], y=[portfolio['return'] * 100],
+                                     mode='markers', name=name, marker=dict(size=14, symbol='diamond', color=color)))
+        fig.update_layout(
+            title=f"Efficient Frontier ({len(result['tickers'])} assets)",
+            xaxis_title="Volatility (Annual %)",
+            yaxis_title="Expected Return (Annual %)",
+            template=PLOTLY_TEMPLATES[theme],
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)'
+        )
+        return fig
+
+@st.cache_data(ttl=300, max_entries=32)
+def get_portfolio(tickers, period, max_weight):
+    """Frontier and optimal portfolios cached per (tickers, period, cap)"""
+    return optimize_portfolio(tickers, period=period, max_weight=max_weight)
+
+@st.cache_data(ttl=300, max_entries=128)
+def get_news_headlines(ticker, limit=10):
+    """Refresh the ticker's news (cached for 5 minutes) and return scored headlines"""
+    pipeline = get_pipeline()
+    pipeline.refresh([ticker])
+    return pipeline.headlines(ticker, limit=limit)
+
+@st.cache_resource
+def get_figure_cache():
+    """Figure cache shared by every session in this process"""
+    return FigureCache(max_entries=32, max_bytes=256 * 2**20)
+
+@st.cache_data(ttl=300, max_entries=128)
+def get_risk_metrics(ticker, period, interval="1d"):
+    """Risk metrics cached per (ticker, period, interval)"""
+    analyzer = SimpleFinanceAnalyzer()
+    data = analyzer.fetch_stock_data(ticker, period=period, interval=interval)
+    if data is None:
+        return None
+    try:
+        benchmark = provider.get_history(BENCHMARK, period=period, interval=interval)
+    except Exception:
+        benchmark = None
+    return analyzer.calculate_risk_metrics(data, benchmark=benchmark)
+
+def cached_figure(analyzer, key, build):
+    """Build a figure once per data refresh window and reuse it across reruns"""
+    window = int(time.time() // analyzer.cache_duration)
+    return get_figure_cache().get_or_build((*key, window), build)
+
+@st.fragment
+def technical_panel(analyzer, ticker, period, interval, theme):
+    st.subheader(f"📊 Technical Analysis - {ticker}")
+    data = analyzer.fetch_stock_data(ticker, period=period, interval=interval)
+    if data is None:
+        return
+    
+    # Advanced candlestick chart
+    fig = cached_figure(
+        analyzer, ("candlestick", ticker, period, interval, theme),
+        lambda: analyzer.create_advanced_candlestick_chart(data, ticker, theme)
+    )
+    with span("render.plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Trading signals
+    st.subheader("🚨 Trading Signals")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        if not pd.isna(data['RSI'].iloc[-1]):
+            latest_rsi = data['RSI'].iloc[-1]
+            if latest_rsi > 70:
+                st.markdown('<div class="alert alert-warning">⚠️ RSI Overbought (Sell Signal)</div>', unsafe_allow_html=True)
+            elif latest_rsi < 30:
+                st.markdown('<div class="alert alert-success">✅ RSI Oversold (Buy Signal)</div>', unsafe_allow_html=True)
+            else:
+                st.markdown('<div class="alert">ℹ️ RSI Neutral</div>', unsafe_allow_html=True)
+    
+    with col2:
+        if not pd.isna(data['MACD'].iloc[-1]) and not pd.isna(data['MACD_Signal'].iloc[-1]):
+            if data['MACD'].iloc[-1] > data['MACD_Signal'].iloc[-1]:
+                st.markdown('<div class="alert alert-success">✅ MACD Bullish</div>', unsafe_allow_html=True)
+            else:
+                st.markdown('<div class="alert alert-error">❌ MACD Bearish</div>', unsafe_allow_html=True)
+    
+    with col3:
+        if not pd.isna(data['MA_20'].iloc[-1]):
+            if data['Close'].iloc[-1] > data['MA_20'].iloc[-1]:
+                st.markdown('<div class="alert alert-success">✅ Above MA20</div>', unsafe_allow_html=True)
+            else:
+                st.markdown('<div class="alert alert-error">❌ Below MA20</div>', unsafe_allow_html=True)
+
+@st.fragment
+def risk_panel(ticker, metrics):
+    st.subheader(f"⚠️ Risk Analysis - {ticker}")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.metric("Max Drawdown", f"{metrics['Max Drawdown']:.2f}%")
+        st.metric("Value at Risk (95%)", f"{metrics['VaR (95%)']:.2f}%")
+        st.metric("Sharpe Ratio", f"{metrics['Sharpe Ratio']:.3f}")
+        if not pd.isna(metrics.get('Beta', np.nan)):
+            st.metric(f"Beta vs {BENCHMARK}", f"{metrics['Beta']:.2f}",
+                      f"Alpha {metrics['Alpha']:+.1f}%/yr · R² {metrics['R²']:.2f}", delta_color="off")
+    
+    with col2:
+        risk_level = "Low" if metrics['Volatility'] < 20 else "Medium" if metrics['Volatility'] < 40 else "High"
+        risk_color = "green" if risk_level == "Low" else "orange" if risk_level == "Medium" else "red"
+        
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3>🎚️ Risk Level</h3>
+            <h2 style="color: {risk_color};">{risk_level}</h2>
+            <p>Based on volatility: {metrics['Volatility']:.1f}%</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+@st.fragment
+def correlation_panel(analyzer, ticker, period, theme):
+    st.subheader("🔄 Correlation Analysis")
+    
+    # Editing the list only reruns this panel
+    additional_tickers = st.text_area("Additional Tickers (comma-separated)", 
+                                    value="GOOGL,MSFT,TSLA,AMZN")
+    tickers_list = [ticker] + [t.strip().upper() for t in additional_tickers.split(',') if t.strip()]
+    
+    fig = cached_figure(
+        analyzer, ("correlation", tuple(tickers_list), period, theme),
+        lambda: analyzer.create_correlation_heatmap(tickers_list, period=period, theme=theme)
+    )
+    if fig:
+        with span("render.plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def portfolio_panel(analyzer, ticker, period, theme):
+    st.subheader("🧮 Portfolio Optimization")
+    
+    # Editing the universe or the cap only reruns this panel
+    universe = st.text_area("Portfolio Tickers (comma-separated)",
+                            value="GOOGL,MSFT,TSLA,AMZN,NVDA,JPM,XOM,JNJ")
+    max_weight = st.slider("Maximum weight per asset", 0.05, 1.0, 1.0, 0.05)
+    tickers_list = tuple(dict.fromkeys([ticker] + [t.strip().upper() for t in universe.split(',') if t.strip()]))
+    
+    try:
+        with st.spinner(f"Optimizing {len(tickers_list)} assets..."):
+            result = get_portfolio(tickers_list, period, max_weight)
+    except ValueError as e:
+        st.warning(str(e))
+        return
+    
+    fig = cached_figure(
+        analyzer, ("frontier", tickers_list, period, max_weight, theme),
+        lambda: analyzer.create_frontier_chart(result, theme)
+    )
+    with span("render.plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
+    
+    portfolios = result['portfolios']
+    columns = st.columns(len(portfolios))
+    for column, (name, portfolio) in zip(columns, portfolios.items()):
+        column.metric(name, f"{portfolio['return'] * 100:+.1f}%",
+                      f"σ {portfolio['volatility'] * 100:.1f}% · Sharpe {portfolio['sharpe']:.2f}", delta_color="off")
+    weights = pd.DataFrame({name: portfolio['weights'] for name, portfolio in portfolios.items()},
+                           index=result['tickers'])
+    weights = weights[(weights > 1e-4).any(axis=1)].sort_values("Maximum Sharpe", ascending=False)
+    st.dataframe((weights * 100).round(2), use_container_width=True)
+    st.caption(f"Covariance shrinkage intensity: {result['shrinkage']:.2f}")
+
+@st.fragment
+def news_panel(analyzer, ticker, period="1y", theme="Dark"):
+    st.subheader(f"📰 Market News - {ticker}")
+    news = analyzer.get_market_news(ticker)
+    if not news:
+        st.info("No recent news found")
+        return
+    
+    data = analyzer.fetch_stock_data(ticker, period=period)
+    if data is not None:
+        sentiment = get_pipeline().daily_sentiment(ticker, since=data.index[0])
+        if not sentiment.empty:
+            fig = analyzer.create_sentiment_chart(data, sentiment, ticker, theme)
+            st.plotly_chart(fig, use_container_width=True)
+    
+    for item in news:
+        sentiment_color = "green" if item['sentiment'] == 'Positive' else "orange" if item['sentiment'] == 'Neutral' else "red"
+        st.markdown(f"""
+        <div class="alert">
+            <strong>{html.escape(str(item['title']))}</strong><br>
+            <small style="color: {sentiment_color};">Sentiment: {html.escape(str(item['sentiment']))} ({item['score']:+.2f})</small>
+        </div>
+        """, unsafe_allow_html=True)
 
 def main():
     analyzer = SimpleFinanceAnalyzer()
@@ -388,12 +641,8 @@ def main():
         
         # Analysis type
         analysis_type = st.selectbox("📈 Analysis Type", 
-                                   ["Technical Analysis", "Risk Metrics", "Correlation Analysis"])
-        
-        # Additional tickers for correlation
-        if analysis_type == "Correlation Analysis":
-            additional_tickers = st.text_area("Additional Tickers (comma-separated)", 
-                                            value="GOOGL,MSFT,TSLA,AMZN")
+                                   ["Technical Analysis", "Risk Metrics", "Correlation Analysis",
+                                    "Portfolio Optimization"])
         
         # Fetch data button
         if st.button("🚀 Analyze", type="primary"):
@@ -402,16 +651,15 @@ def main():
     # Main content
     if hasattr(st.session_state, 'fetch_data') and st.session_state.fetch_data:
         ticker = ticker.upper()
+        interval = "1d"
         
         with st.spinner(f"Fetching data for {ticker}..."):
-            data = analyzer.fetch_stock_data(ticker, period=period)
+            metrics = get_risk_metrics(ticker, period, interval)
         
-        if data is not None:
+        if metrics is not None:
             # Display current metrics
             col1, col2, col3, col4 = st.columns(4)
             
-            metrics = analyzer.calculate_risk_metrics(data)
-            
             with col1:
                 change_color = "green" if metrics['Daily Change'] > 0 else "red"
                 st.markdown(f"""
@@ -451,85 +699,21 @@ def main():
                 </div>
                 """, unsafe_allow_html=True)
             
-            # Analysis based on selected type
+            # Analysis based on selected type; each panel is a fragment backed by cached results
             if analysis_type == "Technical Analysis":
-                st.subheader(f"📊 Technical Analysis - {ticker}")
-                
-                # Advanced candlestick chart
-                fig = analyzer.create_advanced_candlestick_chart(data, ticker)
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Trading signals
-                st.subheader("🚨 Trading Signals")
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    if not pd.isna(data['RSI'].iloc[-1]):
-                        latest_rsi = data['RSI'].iloc[-1]
-                        if latest_rsi > 70:
-                            st.markdown('<div class="alert alert-warning">⚠️ RSI Overbought (Sell Signal)</div>', unsafe_allow_html=True)
-                        elif latest_rsi < 30:
-                            st.markdown('<div class="alert alert-success">✅ RSI Oversold (Buy Signal)</div>', unsafe_allow_html=True)
-                        else:
-                            st.markdown('<div class="alert">ℹ️ RSI Neutral</div>', unsafe_allow_html=True)
-                
-                with col2:
-                    if not pd.isna(data['MACD'].iloc[-1]) and not pd.isna(data['MACD_Signal'].iloc[-1]):
-                        if data['MACD'].iloc[-1] > data['MACD_Signal'].iloc[-1]:
-                            st.markdown('<div class="alert alert-success">✅ MACD Bullish</div>', unsafe_allow_html=True)
-                        else:
-                            st.markdown('<div class="alert alert-error">❌ MACD Bearish</div>', unsafe_allow_html=True)
-                
-                with col3:
-                    if not pd.isna(data['MA_20'].iloc[-1]):
-                        if data['Close'].iloc[-1] > data['MA_20'].iloc[-1]:
-                            st.markdown('<div class="alert alert-success">✅ Above MA20</div>', unsafe_allow_html=True)
-                        else:
-                            st.markdown('<div class="alert alert-error">❌ Below MA20</div>', unsafe_allow_html=True)
+                technical_panel(analyzer, ticker, period, interval, theme)
             
             elif analysis_type == "Risk Metrics":
-                st.subheader(f"⚠️ Risk Analysis - {ticker}")
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.metric("Max Drawdown", f"{metrics['Max Drawdown']:.2f}%")
-                    st.metric("Value at Risk (95%)", f"{metrics['VaR (95%)']:.2f}%")
-                    st.metric("Sharpe Ratio", f"{metrics['Sharpe Ratio']:.3f}")
-                
-                with col2:
-                    risk_level = "Low" if metrics['Volatility'] < 20 else "Medium" if metrics['Volatility'] < 40 else "High"
-                    risk_color = "green" if risk_level == "Low" else "orange" if risk_level == "Medium" else "red"
-                    
-                    st.markdown(f"""
-                    <div class="metric-card">
-                        <h3>🎚️ Risk Level</h3>
-                        <h2 style="color: {risk_color};">{risk_level}</h2>
-                        <p>Based on volatility: {metrics['Volatility']:.1f}%</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                risk_panel(ticker, metrics)
             
             elif analysis_type == "Correlation Analysis":
-                if 'additional_tickers' in locals():
-                    tickers_list = [ticker] + [t.strip().upper() for t in additional_tickers.split(',')]
-                    st.subheader("🔄 Correlation Analysis")
-                    
-                    fig = analyzer.create_correlation_heatmap(tickers_list, period=period)
-                    if fig:
-                        st.plotly_chart(fig, use_container_width=True)
+                correlation_panel(analyzer, ticker, period, theme)
             
-            # Market news section
-            st.subheader(f"📰 Market News - {ticker}")
-            news = analyzer.get_market_news(ticker)
+            elif analysis_type == "Portfolio Optimization":
+                portfolio_panel(analyzer, ticker, period, theme)
             
-            for item in news:
-                sentiment_color = "green" if item['sentiment'] == 'Positive' else "orange" if item['sentiment'] == 'Neutral' else "red"
-                st.markdown(f"""
-                <div class="alert">
-                    <strong>{item['title']}</strong><br>
-                    <small style="color: {sentiment_color};">Sentiment: {item['sentiment']}</small>
-                </div>
-                """, unsafe_allow_html=True)
+            # Market news section
+            news_panel(analyzer, ticker, period, theme)
     
     else:
         # Welcome screen
@@ -556,6 +740,7 @@ def main():
         - **Technical Analysis**: Complete charting with indicators
         - **Risk Metrics**: Comprehensive risk assessment
         - **Correlation Analysis**: Multi-stock correlation studies
+        - **Portfolio Optimization**: Efficient frontier, minimum variance and risk parity
         """)
 
     # Footer
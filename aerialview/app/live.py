@@ -0,0 +1,85 @@
+import os
+
+from dash import html, dcc, Input, Output, State, callback, no_update
+import plotly.graph_objects as go
+
+from aerialview.core.live import WatchlistPoller, SimulatedFeed, YahooFeed, extend_data
+
+default_tickers = ["AAPL", "MSFT", "TSLA", "GOOGL"]
+watchlist = os.environ.get("AERIALVIEW_WATCHLIST", ",".join(default_tickers)).split(",")
+cadence = float(os.environ.get("AERIALVIEW_LIVE_CADENCE", "5"))
+max_points = 500
+
+feed = SimulatedFeed() if os.environ.get("AERIALVIEW_LIVE_FEED") == "simulated" else YahooFeed()
+poller = WatchlistPoller(watchlist, feed, cadence=cadence, history=max_points)
+
+
+def live_figure(ticker, points):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=[p["date"] for p in points], y=[p["close"] for p in points],
+        mode="lines", name=ticker,
+    ))
+    fig.add_trace(go.Scatter(
+        x=[p["date"] for p in points], y=[p["MA"] for p in points],
+        mode="lines", name="MA 20", line=dict(color="orange", width=1),
+    ))
+    fig.update_layout(
+        title=f"{ticker} Live",
+        xaxis_title="Time",
+        yaxis_title="Price",
+        template="plotly_white",
+        uirevision=ticker,
+    )
+    return fig
+
+
+layout = html.Div([
+    html.H1("Live Watchlist"),
+    html.P(f"Polling {len(poller.tickers)} tickers every {cadence:g}s."),
+    dcc.Dropdown(
+        id='live-ticker-dropdown',
+        options=[{'label': t, 'value': t} for t in poller.tickers],
+        value=poller.tickers[0],
+        clearable=False,
+        style={'width': '400px', 'margin-bottom': '20px'}
+    ),
+    dcc.Graph(id='live-chart'),
+    # This tab's cursor: the ticker shown and the time of its last plotted point.
+    dcc.Store(id='live-cursor'),
+    dcc.Interval(id='live-interval', interval=int(cadence * 1000)),
+])
+
+
+def cursor_for(ticker, points, previous=None):
+    last = points[-1]["date"].isoformat() if points else (previous or {}).get('last')
+    return {'ticker': ticker, 'last': last}
+
+
+@callback(
+    Output('live-chart', 'figure'),
+    Output('live-cursor', 'data'),
+    Input('live-ticker-dropdown', 'value')
+)
+def redraw_live_chart(ticker):
+    poller.start_in_thread()
+    points = poller.snapshot(ticker)
+    return live_figure(ticker, points), cursor_for(ticker, points)
+
+
+@callback(
+    Output('live-chart', 'extendData'),
+    Output('live-cursor', 'data', allow_duplicate=True),
+    Input('live-interval', 'n_intervals'),
+    State('live-cursor', 'data'),
+    prevent_initial_call=True
+)
+def extend_live_chart(_, cursor):
+    # Each tab reads past its own cursor; the poller's buffer is shared and never consumed.
+    if not cursor:
+        return no_update, no_update
+    points = poller.since(cursor['ticker'], cursor['last'])
+    payload = extend_data(points, max_points=max_points)
+    if payload is None:
+        return no_update, no_update
+    return payload, cursor_for(cursor['ticker'], points)
@@ -1,8 +1,6 @@
-from dash import html, dcc, Input, Output
-import plotly.graph_objs as go
-from aerialview.utils.data_fetch import fetch_stock_data
-from aerialview.core.visualize import multi_ticker_comparison
-from aerialview.app import app
+from dash import html, dcc, Input, Output, callback
+from aerialview.core.visualize import placeholder_figure
+from aerialview.core.warmup import get_warmup
 
 default_tickers = ["AAPL", "MSFT", "TSLA", "GOOGL"]
 
@@ -19,19 +17,24 @@ layout = html.Div([
         dcc.Loading(
             type="default",
             children=dcc.Graph(
-                id='comparison-chart'
+                id='comparison-chart',
+                figure=placeholder_figure()
             )
         )
-    ])
+    ]),
+    dcc.Interval(id='comparison-poll', interval=1000),
 ])
 
-@app.callback(
+@callback(
     Output('comparison-chart', 'figure'),
-    Input('ticker-dropdown', 'value')
+    Output('comparison-poll', 'disabled'),
+    Input('ticker-dropdown', 'value'),
+    Input('comparison-poll', 'n_intervals')
 )
-def update_comparison_chart(selected_tickers):
+def update_comparison_chart(selected_tickers, _):
     if not selected_tickers:
         selected_tickers = default_tickers
-    data = {ticker: fetch_stock_data(ticker) for ticker in selected_tickers}
-    fig = multi_ticker_comparison(data)
-    return fig
+    warmup = get_warmup()
+    if not warmup.request(selected_tickers):
+        return placeholder_figure(), False
+    return warmup.comparison_figure(selected_tickers), True
@@ -1,8 +1,8 @@
 from dash import html, dcc
-from aerialview.core.visualize import multi_ticker_comparison
+from aerialview.core.visualize import placeholder_figure
+from aerialview.core.warmup import get_warmup
 
 default_tickers = ["AAPL", "MSFT", "TSLA"]
-figure = multi_ticker_comparison(default_tickers)
 
 layout = html.Div([
     html.H1("Overview"),
@@ -24,18 +24,25 @@ layout = html.Div([
         type="default",
         children=dcc.Graph(
             id='multi-ticker-chart',
-            figure=figure
+            figure=placeholder_figure()
         )
-    )
+    ),
+    # Polls until the background warm-up has the selected tickers.
+    dcc.Interval(id='multi-ticker-poll', interval=1000),
 ])
 
 from dash import Input, Output, callback
 
 @callback(
     Output('multi-ticker-chart', 'figure'),
-    Input('tickers-dropdown', 'value')
+    Output('multi-ticker-poll', 'disabled'),
+    Input('tickers-dropdown', 'value'),
+    Input('multi-ticker-poll', 'n_intervals')
 )
-def update_multi_ticker_chart(selected_tickers):
+def update_multi_ticker_chart(selected_tickers, _):
     if not selected_tickers:
         selected_tickers = default_tickers
-    return multi_ticker_comparison(selected_tickers)
\ No newline at end of file
+    warmup = get_warmup()
+    if not warmup.request(selected_tickers):
+        return placeholder_figure(), False
+    return warmup.comparison_figure(selected_tickers), True
@@ -0,0 +1,51 @@
+from dash import Input, Output, callback, dcc, html
+
+from aerialview.core.history_store import get_store
+from aerialview.core.warmup import configured_tickers
+
+TILE_WIDTH, TILE_HEIGHT = 120, 32
+
+layout = html.Div([
+    html.H1("Watchlist"),
+    html.P("Price sparklines rendered on the server; leave the list empty to show every locally stored ticker."),
+    dcc.Textarea(
+        id='watchlist-tickers',
+        placeholder='AAPL, MSFT, TSLA, ...',
+        style={'width': '600px', 'height': '60px', 'margin-bottom': '10px'}
+    ),
+    dcc.Dropdown(
+        id='watchlist-period',
+        options=[{'label': p, 'value': p} for p in ['1mo', '3mo', '6mo', '1y', '2y', '5y']],
+        value='6mo',
+        clearable=False,
+        style={'width': '200px', 'margin-bottom': '20px'}
+    ),
+    html.Div(id='watchlist-grid', style={
+        'display': 'grid',
+        'gridTemplateColumns': f'repeat(auto-fill, minmax({TILE_WIDTH + 16}px, 1fr))',
+        'gap': '8px',
+    }),
+])
+
+
+def _tile(ticker, period):
+    # Plain <img> tags: the browser fetches cached PNG tiles, no figure objects on either side.
+    return html.Div([
+        html.Div(ticker, style={'fontSize': '12px', 'fontWeight': 600}),
+        html.Img(
+            src=f'/sparkline/{ticker}.png?period={period}&w={TILE_WIDTH}&h={TILE_HEIGHT}',
+            width=TILE_WIDTH, height=TILE_HEIGHT, alt=ticker, title=ticker,
+        ),
+    ], style={'padding': '4px 8px', 'border': '1px solid #eee', 'borderRadius': '4px'})
+
+
+@callback(
+    Output('watchlist-grid', 'children'),
+    Input('watchlist-tickers', 'value'),
+    Input('watchlist-period', 'value')
+)
+def update_watchlist(value, period):
+    tickers = [t.strip().upper() for t in (value or '').replace('\n', ',').split(',') if t.strip()]
+    if not tickers:
+        tickers = get_store().tickers() or configured_tickers()
+    return [_tile(ticker, period) for ticker in dict.fromkeys(tickers)]
@@ -11,23 +11,37 @@ from datetime import datetime, timedelta
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import yfinance as yf
 import ta
 
+from aerialview.core import provider
+from aerialview.core.bars import as_frame
+from aerialview.core.metadata_cache import get_cache
+from aerialview.core.indicator_cache import get_indicator_cache
+from aerialview.core.alerts import DEFAULT_RULES, AlertEngine, FileSink, WebhookSink, latest_panel, load_rules
+from aerialview.core.config import cache_path
+from aerialview.core.compact import compact_frame, memory_report
+from aerialview.core.ingest import ingest
+from aerialview.core.analyses import optimize_portfolio
+from aerialview.core.regression import BENCHMARK, RISK_FREE_RATE, ols, returns_panel
+from aerialview.core.streaming import stream_metrics
+from aerialview.core.export import TableWriter, metrics_path, metrics_table
+from aerialview.core import profiling
+from aerialview.core.profiling import profiled, span
+
 class AerialViewCLI:
-    def __init__(self):
+    def __init__(self, compact=False):
+        self.compact = compact
         self.supported_periods = ['1d', '5d', '1mo', '3mo', '6mo', '1y', '2y', '5y', '10y', 'ytd', 'max']
         self.supported_intervals = ['1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h', '1d', '5d', '1wk', '1mo', '3mo']
         
+    @profiled("fetch.cli")
     def fetch_data(self, ticker, start_date=None, end_date=None, period="1y", interval="1d"):
         """Fetch stock data using yfinance"""
         try:
-            stock = yf.Ticker(ticker)
-            
             if start_date and end_date:
-                data = stock.history(start=start_date, end=end_date, interval=interval)
+                data = provider.get_history(ticker, start=start_date, end=end_date, interval=interval)
             else:
-                data = stock.history(period=period, interval=interval)
+                data = provider.get_history(ticker, period=period, interval=interval)
             
             if data.empty:
                 raise ValueError(f"No data found for ticker {ticker}")
@@ -37,28 +51,37 @@ class AerialViewCLI:
             print(f"❌ Error fetching data for {ticker}: {str(e)}")
             return None
     
+    @profiled("indicators.cli")
     def add_technical_indicators(self, data):
-        """Add technical indicators to the data"""
+        """Add technical indicators to the data (a DataFrame or `Bars`)"""
+        data = as_frame(data)
+        # Indicators are memoized by the content of their inputs
+        indicators = get_indicator_cache()
+        close = data['Close']
+
         # Moving averages
-        data['MA_20'] = ta.trend.sma_indicator(data['Close'], window=20)
-        data['MA_50'] = ta.trend.sma_indicator(data['Close'], window=50)
+        data['MA_20'] = indicators.compute("ta.sma", ta.trend.sma_indicator, close, window=20)
+        data['MA_50'] = indicators.compute("ta.sma", ta.trend.sma_indicator, close, window=50)
         
         # RSI
-        data['RSI'] = ta.momentum.RSIIndicator(data['Close']).rsi()
+        data['RSI'] = indicators.compute("ta.rsi", ta.momentum.rsi, close, window=14)
         
         # MACD
-        macd = ta.trend.MACD(data['Close'])
-        data['MACD'] = macd.macd()
-        data['MACD_Signal'] = macd.macd_signal()
+        data['MACD'] = indicators.compute("ta.macd", ta.trend.macd, close, window_slow=26, window_fast=12)
+        data['MACD_Signal'] = indicators.compute(
+            "ta.macd_signal", ta.trend.macd_signal, close, window_slow=26, window_fast=12, window_sign=9
+        )
         
         # Bollinger Bands
-        data['BB_Upper'] = ta.volatility.bollinger_hband(data['Close'], window=20, window_dev=2)
-        data['BB_Lower'] = ta.volatility.bollinger_lband(data['Close'], window=20, window_dev=2)
+        data['BB_Upper'] = indicators.compute("ta.bb_high", ta.volatility.bollinger_hband, close, window=20, window_dev=2)
+        data['BB_Lower'] = indicators.compute("ta.bb_low", ta.volatility.bollinger_lband, close, window=20, window_dev=2)
         
         return data
     
+    @profiled("metrics.cli")
     def calculate_metrics(self, data):
         """Calculate performance metrics"""
+        data = as_frame(data)
         returns = data['Close'].pct_change().dropna()
         
         metrics = {
@@ -150,6 +173,7 @@ class AerialViewCLI:
             else:
                 print("⚠️  MA20: Below moving average - Downtrend")
     
+    @profiled("chart.cli")
     def save_chart(self, ticker, data, filename=None):
         """Save chart as HTML file"""
         if filename is None:
@@ -224,34 +248,226 @@ class AerialViewCLI:
             template='plotly_dark'
         )
         
-        fig.write_html(filename)
+        with span("render.write_html"):
+            fig.write_html(filename)
         print(f"📊 Chart saved as: {filename}")
     
-    def compare_stocks(self, tickers, period="6mo"):
+    def print_memory_report(self, frames):
+        """Print bytes per ticker before and after compaction"""
+        report = memory_report(frames)
+        print(f"\n💾 MEMORY FOOTPRINT")
+        print(f"{'Ticker':<8} {'Rows':>8} {'Before':>12} {'After':>12} {'Bytes/Row':>10} {'Saved':>7}")
+        print("-" * 62)
+        for row in report.itertuples():
+            print(f"{row.ticker:<8} {row.rows:>8,} {row.bytes_before:>12,} {row.bytes_after:>12,} "
+                  f"{row.bytes_per_row:>10.1f} {row.saved:>6.0%}")
+    
+    def export_metrics(self, path, metrics, fmt=None):
+        """Write the per-ticker metrics table next to an export file"""
+        with TableWriter(metrics_path(path), fmt) as writer:
+            writer.write(metrics_table(metrics))
+        print(f"💾 Exported {writer.rows} metrics rows to: {writer.path}")
+    
+    def export_results(self, path, frames, metrics, fmt=None):
+        """Export bars with indicators and metrics (Parquet, CSV or JSON Lines)"""
+        with TableWriter(path, fmt) as writer:
+            for ticker, data in frames.items():
+                writer.write_frame(ticker, data)
+        print(f"💾 Exported {writer.rows} rows to: {path}")
+        self.export_metrics(path, metrics, fmt)
+    
+    def compare_stocks(self, tickers, period="6mo", show_memory=False, export=None, export_format=None, alerts=None,
+                       benchmark=BENCHMARK):
         """Compare multiple stocks"""
         print(f"\n📊 COMPARING STOCKS: {', '.join(tickers)}")
         print("="*60)
         
         comparison_data = {}
+        frames = {}
+        latest = {}
+        closes = {}
+        # Each ticker is written as soon as it is processed, so exports never hold every history at once.
+        writer = TableWriter(export, export_format) if export else None
         
-        for ticker in tickers:
-            data = self.fetch_data(ticker, period=period)
-            if data is not None:
-                data = self.add_technical_indicators(data)
-                metrics = self.calculate_metrics(data)
-                comparison_data[ticker] = metrics
+        try:
+            for ticker in tickers:
+                data = self.fetch_data(ticker, period=period)
+                if data is not None:
+                    if show_memory:
+                        frames[ticker] = data
+                    # Compact before indicators are added, so the full-width frame is never built.
+                    if self.compact:
+                        data = compact_frame(data)
+                    data = self.add_technical_indicators(data)
+                    metrics = self.calculate_metrics(data)
+                    comparison_data[ticker] = metrics
+                    closes[ticker] = as_frame(data)['Close']
+                    if alerts is not None:
+                        latest[ticker] = data.iloc[-1:]
+                    if writer is not None:
+                        writer.write_frame(ticker, data)
+            if benchmark and closes:
+                self.add_benchmark_metrics(comparison_data, closes, benchmark, period)
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        if writer is not None:
+            print(f"💾 Exported {writer.rows} rows to: {export}")
+            if comparison_data:
+                self.export_metrics(export, comparison_data, export_format)
         
         if not comparison_data:
             print("❌ No data available for comparison")
             return
         
         # Print comparison table
-        print(f"\n{'Ticker':<8} {'Price':<10} {'Change %':<10} {'RSI':<8} {'Volatility':<12}")
-        print("-" * 60)
+        print(f"\n{'Ticker':<8} {'Price':<10} {'Change %':<10} {'RSI':<8} {'Volatility':<12} "
+              f"{'Beta':<7} {'Alpha %':<9} {'R²':<6}")
+        print("-" * 84)
         
         for ticker, metrics in comparison_data.items():
             rsi_val = f"{metrics['Current RSI']:.1f}" if metrics['Current RSI'] else "N/A"
-            print(f"{ticker:<8} ${metrics['Current Price']:<9.2f} {metrics['Price Change %']:<9.2f}% {rsi_val:<8} {metrics['Volatility (Annual)']:<11.1f}%")
+            beta, alpha, r2 = (metrics.get(key, float('nan')) for key in ('Beta', 'Alpha %', 'R²'))
+            beta_val, alpha_val, r2_val = ("N/A" if pd.isna(value) else f"{value:{fmt}}"
+                                           for value, fmt in ((beta, '.2f'), (alpha, '+.1f'), (r2, '.2f')))
+            print(f"{ticker:<8} ${metrics['Current Price']:<9.2f} {metrics['Price Change %']:<9.2f}% {rsi_val:<8} "
+                  f"{metrics['Volatility (Annual)']:<11.1f}% {beta_val:<7} {alpha_val:<9} {r2_val:<6}")
+        if benchmark:
+            print(f"(Beta, annualized alpha and R² vs {benchmark})")
+        
+        if frames:
+            self.print_memory_report(frames)
+        if alerts is not None:
+            self.check_alerts(alerts, latest)
+
+    def stream_compare(self, tickers, period="max", interval="1d", export=None, export_format=None, batch=256):
+        """Compare a universe of any size in flat memory: each ticker's history streams through single-pass metrics"""
+        print(f"\n🌊 STREAMING METRICS ({period}, {interval})")
+        print("="*60)
+        print(f"{'Ticker':<8} {'Price':<10} {'Return %':<10} {'RSI':<8} {'Volatility':<12} {'Max DD':<9} {'VaR 95%':<8} {'Rows':<8}")
+        print("-" * 84)
+        
+        writer = TableWriter(metrics_path(export), export_format) if export else None
+        pending = {}
+        count = failed = 0
+        try:
+            for ticker, metrics in stream_metrics(tickers, period=period, interval=interval):
+                if metrics is None:
+                    failed += 1
+                    print(f"{ticker:<8} ❌ no data")
+                    continue
+                count += 1
+                rsi_val = f"{metrics['Current RSI']:.1f}" if metrics['Current RSI'] is not None else "N/A"
+                print(f"{ticker:<8} ${metrics['Current Price']:<9.2f} {metrics['Total Return']:<9.1f}% {rsi_val:<8} "
+                      f"{metrics['Volatility (Annual)']:<11.1f}% {metrics['Max Drawdown %']:<8.1f}% "
+                      f"{metrics['VaR (95%)']:<7.2f}% {metrics['Rows']:<8,}")
+                if writer is not None:
+                    metrics['RSI Signal'] = self.get_rsi_signal(metrics['Current RSI']) if metrics['Current RSI'] is not None else None
+                    pending[ticker] = {key: float('nan') if value is None else value for key, value in metrics.items()}
+                    if len(pending) >= batch:
+                        writer.write(metrics_table(pending))
+                        pending = {}
+            if writer is not None and pending:
+                writer.write(metrics_table(pending))
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        print(f"\n✅ {count:,} tickers streamed" + (f", {failed:,} without data" if failed else ""))
+        if writer is not None:
+            print(f"💾 Exported {writer.rows} metrics rows to: {writer.path}")
+    
+    def add_benchmark_metrics(self, comparison_data, closes, benchmark, period, risk_free_rate=RISK_FREE_RATE):
+        """Add beta, alpha and R² against a benchmark, regressing every ticker in one batch (same risk-free rate as the dashboard)"""
+        reference = closes.get(benchmark)
+        if reference is None:
+            data = self.fetch_data(benchmark, period=period)
+            if data is None:
+                return
+            reference = as_frame(data)['Close']
+        panel = returns_panel({**closes, benchmark: reference})
+        fits = ols(panel[list(closes)], panel[benchmark], risk_free_rate=risk_free_rate)
+        for ticker, fit in fits.iterrows():
+            comparison_data[ticker].update({'Beta': fit['beta'], 'Alpha %': fit['alpha'] * 100, 'R²': fit['r2']})
+    
+    def build_alert_engine(self, rules_path=None, log_file=None, webhook=None):
+        """Alert engine with rules from a JSON file (or the default signal rules) and saved trigger state"""
+        rules = load_rules(rules_path) if rules_path else DEFAULT_RULES
+        sinks = []
+        if log_file:
+            sinks.append(FileSink(log_file))
+        if webhook:
+            sinks.append(WebhookSink(webhook))
+        engine = AlertEngine(rules, sinks, fire_on_start=True)
+        engine.load(cache_path("alerts_state.json"))
+        return engine
+    
+    def check_alerts(self, engine, frames):
+        """Evaluate alert rules on the latest bar of each ticker and print what fired"""
+        alerts = engine.evaluate(latest_panel(frames))
+        engine.save(cache_path("alerts_state.json"))
+        print(f"\n🔔 ALERTS ({len(engine.rules)} rules, {len(frames)} tickers)")
+        if not alerts:
+            print("ℹ️  No new alerts")
+        for alert in alerts:
+            icon = "⚠️ " if alert['severity'] in ('warning', 'critical') else "✅"
+            print(f"{icon} {alert['message']}")
+
+    def ingest_files(self, paths, merge=False, workers=None):
+        """Import vendor CSV dumps into the local history store"""
+        print(f"📥 Importing {', '.join(paths)}...")
+        totals = ingest(paths, merge=merge, max_workers=workers)
+        for path, error in totals['errors'].items():
+            print(f"⚠️  Skipped {path}: {error}")
+        print(f"✅ Imported {totals['rows']:,} rows for {totals['tickers']:,} tickers "
+              f"from {totals['files']:,} files in {totals['seconds']:.1f}s ({totals['rejected']:,} rows rejected)")
+
+    def optimize(self, tickers, period="1y", max_weight=1.0, points=50):
+        """Print the optimal portfolios and the efficient frontier for a set of tickers"""
+        print(f"\n🧮 OPTIMIZING PORTFOLIO: {len(tickers)} tickers, {period}")
+        print("="*60)
+        try:
+            result = optimize_portfolio(tickers, period=period, points=points, max_weight=max_weight)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return None
+        
+        dropped = sorted(set(tickers) - set(result['tickers']))
+        if dropped:
+            print(f"⚠️  Not enough data for: {', '.join(dropped)}")
+        print(f"Assets: {len(result['tickers'])}   Covariance shrinkage: {result['shrinkage']:.2f}")
+        
+        for name, portfolio in result['portfolios'].items():
+            print(f"\n{name}: return {portfolio['return'] * 100:+.1f}%, "
+                  f"volatility {portfolio['volatility'] * 100:.1f}%, Sharpe {portfolio['sharpe']:.2f}")
+            top = sorted(zip(result['tickers'], portfolio['weights']), key=lambda item: -item[1])[:10]
+            for ticker, weight in top:
+                if weight >= 0.001:
+                    print(f"  {ticker:<8} {weight * 100:6.2f}%")
+        
+        frontier = result['frontier']
+        print(f"\n{'Return %':<10} {'Volatility %':<14} {'Sharpe':<8} {'Assets':<8}")
+        print("-" * 40)
+        last = len(frontier['return']) - 1
+        for i in sorted({round(k * last / 9) for k in range(10)}):
+            held = int((frontier['weights'][i] >= 0.001).sum())
+            print(f"{frontier['return'][i] * 100:<10.2f} {frontier['volatility'][i] * 100:<14.2f} "
+                  f"{frontier['sharpe'][i]:<8.2f} {held:<8}")
+        return result
+
+def iter_tickers(spec):
+    """Tickers from a comma-separated list, or lazily from a file (one per line) given as @path"""
+    if spec.startswith('@'):
+        with open(spec[1:]) as f:
+            for line in f:
+                for ticker in line.split(','):
+                    if ticker.strip() and not ticker.strip().startswith('#'):
+                        yield ticker.strip().upper()
+        return
+    for ticker in spec.split(','):
+        if ticker.strip():
+            yield ticker.strip().upper()
 
 def main():
     parser = argparse.ArgumentParser(
@@ -263,11 +479,16 @@ Examples:
   python -m aerialview --ticker AAPL --period 6mo --save-chart
   python -m aerialview --compare AAPL,GOOGL,MSFT
   python -m aerialview --ticker AAPL --start 2023-01-01 --end 2023-12-31
+  python -m aerialview --compare AAPL,GOOGL,MSFT --period 5y --export prices.parquet
+  python -m aerialview --ingest vendor/eod/ --workers 8
+  python -m aerialview --compare AAPL,GOOGL,MSFT --alerts rules.json --alerts-log alerts.jsonl
+  python -m aerialview --compare @universe.txt --period max --stream --export metrics.parquet
+  python -m aerialview --optimize AAPL,GOOGL,MSFT,AMZN,JPM,XOM --period 2y --max-weight 0.3
         """
     )
     
     parser.add_argument('--ticker', '-t', type=str, help='Stock ticker symbol (e.g., AAPL)')
-    parser.add_argument('--compare', '-c', type=str, help='Compare multiple tickers (comma-separated)')
+    parser.add_argument('--compare', '-c', type=str, help='Compare multiple tickers (comma-separated, or @file with one per line)')
     parser.add_argument('--period', '-p', type=str, default='1y',
                        help='Time period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)')
     parser.add_argument('--start', type=str, help='Start date (YYYY-MM-DD)')
@@ -276,20 +497,104 @@ Examples:
                        help='Data interval (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)')
     parser.add_argument('--save-chart', action='store_true', help='Save chart as HTML file')
     parser.add_argument('--output', '-o', type=str, help='Output filename for chart')
+    parser.add_argument('--compact', action='store_true',
+                       help='Use compact dtypes (float32 OHLC prices, signed integer volume, no empty corporate actions)')
+    parser.add_argument('--memory-report', action='store_true',
+                       help='Print bytes per ticker before and after compaction')
+    parser.add_argument('--profile', action='store_true',
+                       help='Record per-stage timings/allocations and print a summary')
+    parser.add_argument('--profile-output', type=str,
+                       help='Chrome-trace JSON file for --profile (default: aerialview-trace-<time>.json)')
+    parser.add_argument('--export', type=str,
+                       help='Export bars + indicators to a .parquet, .csv or .jsonl file (metrics go to <name>_metrics.<ext>)')
+    parser.add_argument('--export-format', type=str, choices=['parquet', 'csv', 'jsonl'],
+                       help='Export format (default: from the --export file extension)')
+    parser.add_argument('--warm-metadata', type=str,
+                       help='Warm the ticker metadata cache (comma-separated tickers)')
+    parser.add_argument('--alerts', type=str, nargs='?', const='', metavar='RULES',
+                       help='Evaluate alert rules (JSON file; default: the built-in signal rules) and report new alerts')
+    parser.add_argument('--alerts-log', type=str, help='Append fired alerts to this JSON Lines file')
+    parser.add_argument('--alerts-webhook', type=str, help='POST fired alerts to this URL')
+    parser.add_argument('--ingest', type=str, nargs='+', metavar='PATH',
+                       help='Import vendor end-of-day CSV files, directories or globs into the local history store')
+    parser.add_argument('--ingest-merge', action='store_true',
+                       help='Merge imported bars with already stored ones instead of replacing them')
+    parser.add_argument('--benchmark', type=str,
+                       help=f'Benchmark for beta/alpha/R² in --compare (default: {BENCHMARK}; empty string to skip)')
+    parser.add_argument('--stream', action='store_true',
+                       help='With --compare: stream each history through single-pass metrics in flat memory '
+                            '(for --period max and large universes; --export writes only the metrics file)')
+    parser.add_argument('--optimize', type=str,
+                       help='Efficient frontier, minimum-variance, max-Sharpe and risk-parity portfolios (comma-separated tickers)')
+    parser.add_argument('--max-weight', type=float, default=1.0,
+                       help='Per-asset weight cap for --optimize (default: 1, uncapped)')
+    parser.add_argument('--workers', type=int,
+                       help='Worker processes for --ingest (default: CPU count)')
     
     args = parser.parse_args()
     
     # Validate arguments
-    if not args.ticker and not args.compare:
-        parser.error("Either --ticker or --compare must be specified")
+    if not args.ticker and not args.compare and not args.warm_metadata and not args.ingest and not args.optimize:
+        parser.error("Either --ticker, --compare, --optimize, --warm-metadata or --ingest must be specified")
+    if args.stream and not args.compare:
+        parser.error("--stream requires --compare")
+    # These modes return before anything is exported, so --export would be silently dropped.
+    exportless = [flag for flag, used in (('--ingest', args.ingest), ('--warm-metadata', args.warm_metadata),
+                                          ('--optimize', args.optimize)) if used]
+    if args.export and exportless:
+        parser.error(f"--export cannot be combined with {', '.join(exportless)}")
+    if args.stream:
+        # The streaming path computes single-pass metrics only; these options would be silently ignored.
+        given = {
+            '--alerts': args.alerts is not None,
+            '--benchmark': args.benchmark is not None,
+            '--compact': args.compact,
+            '--memory-report': args.memory_report,
+        }
+        conflicts = [flag for flag, used in given.items() if used]
+        if conflicts:
+            parser.error(f"--stream cannot be combined with {', '.join(conflicts)}")
+    if args.benchmark is None:
+        args.benchmark = BENCHMARK
     
-    cli = AerialViewCLI()
+    cli = AerialViewCLI(compact=args.compact)
+    if args.profile:
+        profiling.enable()
     
     try:
+        # Bulk import vendor data
+        if args.ingest:
+            cli.ingest_files(args.ingest, merge=args.ingest_merge, workers=args.workers)
+            return
+        
+        # Warm metadata cache
+        if args.warm_metadata:
+            tickers = [t.strip().upper() for t in args.warm_metadata.split(',')]
+            refreshed = get_cache().warm(tickers)
+            print(f"🔥 Refreshed {refreshed} metadata entries for {len(tickers)} tickers")
+            return
+        
+        # Portfolio optimization
+        if args.optimize:
+            tickers = [t.strip().upper() for t in args.optimize.split(',')]
+            cli.optimize(tickers, period=args.period, max_weight=args.max_weight)
+            return
+        
+        alerts = None
+        if args.alerts is not None:
+            alerts = cli.build_alert_engine(args.alerts or None, args.alerts_log, args.alerts_webhook)
+        
         # Compare multiple stocks
+        if args.compare and args.stream:
+            cli.stream_compare(iter_tickers(args.compare), period=args.period, interval=args.interval,
+                               export=args.export, export_format=args.export_format)
+            return
+        
         if args.compare:
-            tickers = [t.strip().upper() for t in args.compare.split(',')]
-            cli.compare_stocks(tickers, period=args.period)
+            tickers = list(iter_tickers(args.compare))
+            cli.compare_stocks(tickers, period=args.period, show_memory=args.memory_report,
+                               export=args.export, export_format=args.export_format, alerts=alerts,
+                               benchmark=args.benchmark.strip().upper())
             return
         
         # Single stock analysis
@@ -305,6 +610,11 @@ Examples:
         if data is None:
             sys.exit(1)
         
+        if args.memory_report:
+            cli.print_memory_report({ticker: data})
+        if cli.compact:
+            data = compact_frame(data)
+        
         # Add technical indicators
         data = cli.add_technical_indicators(data)
         
@@ -317,6 +627,13 @@ Examples:
         # Save chart if requested
         if args.save_chart:
             cli.save_chart(ticker, data, args.output)
+        
+        # Export machine-readable results if requested
+        if args.export:
+            cli.export_results(args.export, {ticker: data}, {ticker: metrics}, args.export_format)
+        
+        if alerts is not None:
+            cli.check_alerts(alerts, {ticker: data})
     
     except KeyboardInterrupt:
         print("\n\n⚠️  Analysis interrupted by user")
@@ -324,6 +641,20 @@ Examples:
     except Exception as e:
         print(f"\n❌ An error occurred: {str(e)}")
         sys.exit(1)
+    finally:
+        if args.profile:
+            print_profile(args.profile_output)
+
+def print_profile(filename=None):
+    """Print the stage summary and write the Chrome trace"""
+    if filename is None:
+        filename = f"aerialview-trace-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    print(f"\n⏱️  PROFILE")
+    print(profiling.format_summary())
+    stats = get_indicator_cache().stats()
+    print(f"🧮 Indicator cache: {stats['hits']} memory hits, {stats['disk_hits']} disk hits, {stats['misses']} misses")
+    profiling.export_chrome_trace(filename)
+    print(f"🧭 Trace saved as: {filename} (open in chrome://tracing or ui.perfetto.dev)")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
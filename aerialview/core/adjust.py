@@ -0,0 +1,185 @@
+"""
+Corporate-action adjustment for AerialView.
+
+The history store keeps bars as traded (raw) plus a small list of split and
+dividend events; adjusted prices are derived on read. A new split or
+dividend is then one appended event rather than a refetch of every past
+bar. Adjustment uses cumulative backward factors computed with a single
+reverse `cumprod`, the same convention as the provider's adjusted series:
+
+* a split of ratio r divides earlier prices by r and multiplies earlier volume by r;
+* a cash dividend D multiplies earlier prices by 1 - D / previous close.
+
+Events are stored in raw terms: split ratios, and dividends in cash per share
+as paid at the time.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from aerialview.core.history_store import COLUMNS, empty_events, to_history_frame
+
+
+def _event_arrays(events: List) -> Tuple[np.ndarray, np.ndarray]:
+    if not events:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    dates = pd.DatetimeIndex([date for date, _ in events]).as_unit("ns").asi8
+    return dates, np.array([value for _, value in events], dtype=np.float64)
+
+
+def cumulative_after(timestamps: np.ndarray, dates: np.ndarray, factors: np.ndarray) -> np.ndarray:
+    """
+    Product of the factors of all events dated after each bar.
+
+    An event applies to every bar strictly before its date (its ex-date).
+
+    Args:
+        timestamps (np.ndarray): Sorted bar times as int64 ns.
+        dates (np.ndarray): Event dates as int64 ns.
+        factors (np.ndarray): One factor per event.
+
+    Returns:
+        np.ndarray: Cumulative factor per bar.
+    """
+    positions = np.searchsorted(timestamps, dates, side="left")
+    steps = np.ones(len(timestamps) + 1)
+    np.multiply.at(steps, positions, factors)
+    # steps[p] applies to bars before p, so each bar takes the product of steps after it.
+    return np.cumprod(steps[::-1])[::-1][1:]
+
+
+def adjustment_factors(timestamps: np.ndarray, close: np.ndarray, events: dict) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute backward adjustment factors for raw bars.
+
+    Args:
+        timestamps (np.ndarray): Sorted bar times as int64 ns.
+        close (np.ndarray): Raw closes, used for dividend ratios.
+        events (dict): {"splits": [(date, ratio)], "dividends": [(date, cash)]}.
+
+    Returns:
+        tuple: (price factor, volume factor) arrays, one value per bar.
+    """
+    split_dates, ratios = _event_arrays(events.get("splits", []))
+    splits = cumulative_after(timestamps, split_dates, ratios)
+
+    div_dates, cash = _event_arrays(events.get("dividends", []))
+    previous = np.searchsorted(timestamps, div_dates, side="left") - 1
+    valid = previous >= 0
+    ratio = np.ones(len(cash))
+    ratio[valid] = 1 - cash[valid] / close[previous[valid]]
+    dividends = cumulative_after(timestamps, div_dates[valid], np.clip(ratio[valid], 1e-6, 1.0))
+
+    return dividends / splits, splits
+
+
+def adjust(raw: pd.DataFrame, events: dict, dividends: bool = True) -> pd.DataFrame:
+    """
+    Derive adjusted bars from raw bars and events.
+
+    Args:
+        raw (pd.DataFrame): Raw OHLCV bars in the store schema.
+        events (dict): Corporate-action events (see `adjustment_factors`).
+        dividends (bool, optional): Also adjust for dividends. Defaults to True;
+                                    False gives split-adjusted prices only.
+
+    Returns:
+        pd.DataFrame: New frame with adjusted OHLC and split-adjusted volume.
+    """
+    if not events.get("splits") and not (dividends and events.get("dividends")):
+        return raw.copy(deep=False)
+    if not dividends:
+        events = {"splits": events.get("splits", [])}
+    values = raw[COLUMNS].to_numpy(dtype=np.float64)
+    price, volume = adjustment_factors(raw.index.as_unit("ns").asi8, values[:, 3], events)
+    adjusted = values * np.column_stack([price, price, price, price, volume])
+    return pd.DataFrame(adjusted, index=raw.index, columns=COLUMNS)
+
+
+def extract_events(df: pd.DataFrame) -> dict:
+    """
+    Read split and dividend events from a provider frame with actions.
+
+    The provider reports dividends on today's share basis; they are
+    converted back to cash per share as paid.
+
+    Args:
+        df (pd.DataFrame): Frame with "Stock Splits" and/or "Dividends" columns.
+
+    Returns:
+        dict: Events in raw terms, dates as ISO strings.
+    """
+    events = empty_events()
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+
+    if "Stock Splits" in df.columns:
+        splits = df["Stock Splits"].to_numpy(dtype=np.float64)
+        for i in np.flatnonzero(splits > 0):
+            events["splits"].append((index[i].isoformat(), float(splits[i])))
+
+    if "Dividends" in df.columns:
+        cash = df["Dividends"].to_numpy(dtype=np.float64)
+        hits = np.flatnonzero(cash > 0)
+        if len(hits):
+            split_dates, ratios = _event_arrays(events["splits"])
+            # Splits dated after a dividend were applied to its reported amount.
+            later = cumulative_after(index.as_unit("ns").asi8[hits], split_dates, ratios)
+            for i, factor in zip(hits, later):
+                events["dividends"].append((index[i].isoformat(), float(cash[i] * factor)))
+    return events
+
+
+def provider_actions(index: pd.DatetimeIndex, events: dict) -> np.ndarray:
+    """
+    Rebuild the provider's "Dividends" and "Stock Splits" columns from events.
+
+    The inverse of `extract_events`: dividends are reported on today's share
+    basis, and days without an action are 0.
+
+    Args:
+        index (pd.DatetimeIndex): Bar dates (tz-naive, as stored).
+        events (dict): Events in raw terms.
+
+    Returns:
+        np.ndarray: (len(index), 2) array of dividends and split ratios.
+    """
+    timestamps = index.as_unit("ns").asi8
+    actions = np.zeros((len(timestamps), 2))
+    if not len(timestamps):
+        return actions
+    split_dates, ratios = _event_arrays(events.get("splits", []))
+    div_dates, cash = _event_arrays(events.get("dividends", []))
+    # Splits dated after a dividend are applied to the amount the provider reports.
+    reported = cash / cumulative_after(div_dates, split_dates, ratios) if len(cash) else cash
+    for column, (dates, values) in enumerate([(div_dates, reported), (split_dates, ratios)]):
+        positions = np.searchsorted(timestamps, dates)
+        on_bar = positions < len(timestamps)
+        on_bar[on_bar] = timestamps[positions[on_bar]] == dates[on_bar]
+        actions[positions[on_bar], column] = values[on_bar]
+    return actions
+
+
+def unadjust_splits(df: pd.DataFrame, events: dict) -> pd.DataFrame:
+    """
+    Turn split-adjusted provider bars back into bars as traded.
+
+    Args:
+        df (pd.DataFrame): Unadjusted-for-dividends provider history (`auto_adjust=False`).
+        events (dict): Events from `extract_events`.
+
+    Returns:
+        pd.DataFrame: Raw OHLCV bars in the store schema.
+    """
+    frame = to_history_frame(df)
+    split_dates, ratios = _event_arrays(events.get("splits", []))
+    if not len(ratios):
+        return frame
+    factor = cumulative_after(frame.index.as_unit("ns").asi8, split_dates, ratios)
+    values = frame.to_numpy()
+    raw = values * np.column_stack([factor, factor, factor, factor, 1 / factor])
+    return pd.DataFrame(raw, index=frame.index, columns=COLUMNS)
+
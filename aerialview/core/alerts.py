@@ -0,0 +1,366 @@
+"""
+Alert rule engine for AerialView.
+
+Rules are declared as small expressions over indicator columns, e.g.
+``"RSI > 70"``, ``"MACD > MACD_Signal and Close > MA_20"`` or
+``"Close < MA_50 * 0.95"``. Each rule is compiled once into a function over
+NumPy arrays and evaluated against a panel holding the latest indicator
+values of every watched ticker (one row per ticker), so a whole watchlist
+is checked with a handful of array operations per rule.
+
+Alerts are edge-triggered: a rule fires for a ticker when its condition
+turns true (a crossover is simply the edge of ``"MACD > MACD_Signal"``),
+then stays quiet for the rule's cooldown. Fired alerts go to pluggable
+sinks (log, JSON Lines file, webhook).
+"""
+
+import ast
+import json
+import logging
+import operator
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_COMPARE = {
+    ast.Gt: operator.gt, ast.GtE: operator.ge, ast.Lt: operator.lt,
+    ast.LtE: operator.le, ast.Eq: operator.eq, ast.NotEq: operator.ne,
+}
+_ARITHMETIC = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv}
+
+
+def compile_condition(expression: str) -> Callable:
+    """
+    Compile a rule expression into a function of {column: array} -> bool array.
+
+    Supported: column names, numbers, + - * /, comparisons (chains allowed),
+    and/or/not and parentheses. Comparisons involving NaN are false.
+
+    Raises:
+        ValueError: On unsupported syntax.
+    """
+
+    def build(node):
+        if isinstance(node, ast.Expression):
+            return build(node.body)
+        if isinstance(node, ast.BoolOp):
+            parts = [build(v) for v in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            return lambda cols: combine.reduce([p(cols) for p in parts])
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            inner = build(node.operand)
+            return lambda cols: ~inner(cols)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            inner = build(node.operand)
+            return lambda cols: -inner(cols)
+        if isinstance(node, ast.Compare):
+            terms = [build(node.left)] + [build(c) for c in node.comparators]
+            ops = [_COMPARE[type(op)] for op in node.ops if type(op) in _COMPARE]
+            if len(ops) != len(node.ops):
+                raise ValueError(f"Unsupported comparison in {expression!r}")
+
+            def compare(cols):
+                values = [t(cols) for t in terms]
+                with np.errstate(invalid="ignore"):
+                    result = ops[0](values[0], values[1])
+                    for op, left, right in zip(ops[1:], values[1:], values[2:]):
+                        result = result & op(left, right)
+                return result
+            return compare
+        if isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+            op, left, right = _ARITHMETIC[type(node.op)], build(node.left), build(node.right)
+            return lambda cols: op(left(cols), right(cols))
+        if isinstance(node, ast.Name):
+            return lambda cols: cols[node.id]
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return lambda cols: node.value
+        raise ValueError(f"Unsupported syntax in {expression!r}: {ast.dump(node)}")
+
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid rule expression {expression!r}: {e}") from e
+    return build(tree)
+
+
+def _columns(expression: str) -> List[str]:
+    return sorted({n.id for n in ast.walk(ast.parse(expression, mode="eval")) if isinstance(n, ast.Name)})
+
+
+class Rule:
+    """
+    A declarative alert condition.
+
+    Args:
+        name (str): Unique rule name.
+        when (str): Condition expression over panel columns.
+        cooldown (float, optional): Seconds before the rule may fire again for a ticker. Defaults to 1 hour.
+        severity (str, optional): "info", "warning" or "critical". Defaults to "info".
+        message (str, optional): Text for fired alerts; may use {ticker} and panel columns.
+    """
+
+    def __init__(self, name: str, when: str, cooldown: float = 3600.0, severity: str = "info",
+                 message: Optional[str] = None):
+        self.name = name
+        self.when = when
+        self.cooldown = cooldown
+        self.severity = severity
+        self.message = message or f"{name}: {when}"
+        self.columns = _columns(when)
+        self.condition = compile_condition(when)
+
+    @classmethod
+    def from_dict(cls, spec: dict) -> "Rule":
+        return cls(spec["name"], spec["when"], spec.get("cooldown", 3600.0), spec.get("severity", "info"),
+                   spec.get("message"))
+
+    def evaluate(self, columns: Dict[str, np.ndarray], size: int) -> np.ndarray:
+        """Boolean condition per ticker (false where any input column is missing)."""
+        if any(c not in columns for c in self.columns):
+            return np.zeros(size, dtype=bool)
+        return np.broadcast_to(np.asarray(self.condition(columns), dtype=bool), (size,))
+
+
+DEFAULT_RULES = [
+    Rule("rsi_overbought", "RSI > 70", severity="warning", message="{ticker}: RSI overbought ({RSI:.1f})"),
+    Rule("rsi_oversold", "RSI < 30", message="{ticker}: RSI oversold ({RSI:.1f})"),
+    Rule("macd_bullish_cross", "MACD > MACD_Signal", message="{ticker}: MACD crossed above signal"),
+    Rule("macd_bearish_cross", "MACD < MACD_Signal", severity="warning", message="{ticker}: MACD crossed below signal"),
+    Rule("above_ma20", "Close > MA_20", message="{ticker}: price crossed above MA20 ({Close:.2f})"),
+    Rule("below_ma20", "Close < MA_20", severity="warning", message="{ticker}: price crossed below MA20 ({Close:.2f})"),
+]
+
+
+def load_rules(path: str) -> List[Rule]:
+    """Read rules from a JSON file holding a list of {name, when, cooldown, severity, message}."""
+    with open(path) as f:
+        return [Rule.from_dict(spec) for spec in json.load(f)]
+
+
+def latest_panel(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    One row per ticker with the last indicator values, plus "asof" (the bar time).
+
+    Args:
+        frames (dict): {ticker: frame with indicator columns and a DatetimeIndex}.
+    """
+    rows = {t: df.iloc[-1] for t, df in frames.items() if df is not None and len(df)}
+    panel = pd.DataFrame.from_dict(rows, orient="index")
+    panel["asof"] = [frames[t].index[-1] for t in panel.index]
+    panel.index.name = "ticker"
+    return panel
+
+
+class LogSink:
+    """Log alerts (warning and critical alerts at WARNING level)."""
+
+    def __call__(self, alerts: List[dict]):
+        for alert in alerts:
+            level = logging.WARNING if alert["severity"] in ("warning", "critical") else logging.INFO
+            logger.log(level, alert["message"])
+
+
+class FileSink:
+    """Append alerts to a JSON Lines file."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __call__(self, alerts: List[dict]):
+        with open(self.path, "a") as f:
+            for alert in alerts:
+                f.write(json.dumps(alert, default=str) + "\n")
+
+
+class WebhookSink:
+    """
+    POST alerts as JSON to a webhook URL. Failures are logged, never raised.
+
+    Args:
+        url (str): Endpoint.
+        session (optional): Object with a `post(url, json=..., timeout=...)` method.
+                            Defaults to a `requests` session.
+        timeout (float, optional): Request timeout in seconds.
+    """
+
+    def __init__(self, url: str, session=None, timeout: float = 5.0):
+        self.url = url
+        self.session = session
+        self.timeout = timeout
+
+    def __call__(self, alerts: List[dict]):
+        if self.session is None:
+            import requests
+            self.session = requests.Session()
+        try:
+            self.session.post(self.url, json={"alerts": alerts}, timeout=self.timeout)
+        except Exception as e:
+            logger.warning(f"Webhook delivery to {self.url} failed: {e}")
+
+
+class AlertEngine:
+    """
+    Evaluate rules over ticker panels with edge triggering, cooldowns and dedup.
+
+    Args:
+        rules (Iterable[Rule], optional): Rules. Defaults to `DEFAULT_RULES`.
+        sinks (Iterable[Callable], optional): Called with each non-empty batch of alerts.
+        fire_on_start (bool, optional): Whether conditions already true the first
+                                        time a ticker is seen fire. Defaults to False.
+        dedup_size (int, optional): Recent (rule, ticker, asof) keys remembered.
+    """
+
+    def __init__(self, rules: Optional[Iterable[Rule]] = None, sinks: Optional[Iterable[Callable]] = None,
+                 fire_on_start: bool = False, dedup_size: int = 100_000):
+        self.rules = list(DEFAULT_RULES if rules is None else rules)
+        self.sinks = list(sinks or [])
+        self.fire_on_start = fire_on_start
+        self.dedup_size = dedup_size
+        self.evaluations = 0
+        self.fired = 0
+        self.seconds = 0.0
+        # Per rule: (last condition, last fired time), aligned with _tickers.
+        self._tickers = pd.Index([])
+        self._state: Dict[str, tuple] = {}
+        self._seen = OrderedDict()
+
+    def _previous(self, rule: Rule, positions: Optional[np.ndarray], condition: np.ndarray):
+        state = self._state.get(rule.name)
+        if state is None:
+            return self._previous_unknown(condition), np.full(len(condition), np.nan)
+        prev, last = state
+        if positions is None:
+            return prev, last
+        missing = positions < 0
+        safe = np.where(missing, 0, positions)
+        if len(prev):
+            prev, last = prev[safe], last[safe]
+        else:
+            prev, last = np.zeros(len(condition), dtype=bool), np.full(len(condition), np.nan)
+        return np.where(missing, self._previous_unknown(condition), prev), np.where(missing, np.nan, last)
+
+    def _previous_unknown(self, condition: np.ndarray) -> np.ndarray:
+        # Tickers seen for the first time only fire when fire_on_start is set.
+        return np.zeros(len(condition), dtype=bool) if self.fire_on_start else condition.copy()
+
+    def evaluate(self, panel: pd.DataFrame, now: Optional[float] = None) -> List[dict]:
+        """
+        Evaluate all rules against a panel and dispatch fired alerts.
+
+        Args:
+            panel (pd.DataFrame): One row per ticker (index), indicator columns,
+                                  optionally an "asof" bar-time column.
+            now (float, optional): Evaluation time (epoch seconds). Defaults to now.
+
+        Returns:
+            list: Fired alerts as dicts (rule, ticker, severity, message, time, asof).
+        """
+        started = time.perf_counter()
+        now = time.time() if now is None else now
+        panel = panel[~panel.index.duplicated(keep="last")]
+        tickers = pd.Index(panel.index)
+        size = len(tickers)
+        columns = {c: panel[c].to_numpy(dtype=float) for c in panel.columns if pd.api.types.is_numeric_dtype(panel[c])}
+        asof = panel["asof"].to_numpy() if "asof" in panel.columns else np.full(size, None)
+
+        # Realign state only when the watchlist changed; the usual case is a no-op.
+        positions = None if tickers.equals(self._tickers) else self._tickers.get_indexer(tickers)
+        state = {}
+        alerts = []
+        for rule in self.rules:
+            condition = rule.evaluate(columns, size)
+            prev, last = self._previous(rule, positions, condition)
+            with np.errstate(invalid="ignore"):
+                cooled = np.isnan(last) | (now - last >= rule.cooldown)
+            fire = condition & ~prev & cooled
+            last = np.where(fire, now, last)
+            state[rule.name] = (condition, last)
+            for i in np.flatnonzero(fire):
+                alert = self._alert(rule, columns, tickers[i], i, asof[i], now)
+                if alert is not None:
+                    alerts.append(alert)
+
+        if positions is not None:
+            # Tickers missing from this panel keep their edges and cooldowns for when they return.
+            kept = np.flatnonzero(~self._tickers.isin(tickers))
+            if len(kept):
+                tickers = tickers.append(self._tickers[kept])
+                for rule in self.rules:
+                    old = self._state.get(rule.name)
+                    if old is None:
+                        old = (np.full(len(self._tickers), not self.fire_on_start), np.full(len(self._tickers), np.nan))
+                    condition, last = state[rule.name]
+                    state[rule.name] = (np.concatenate([condition, old[0][kept]]), np.concatenate([last, old[1][kept]]))
+
+        self._tickers, self._state = tickers, state
+        self.evaluations += 1
+        self.fired += len(alerts)
+        self.seconds += time.perf_counter() - started
+        if alerts:
+            for sink in self.sinks:
+                try:
+                    sink(alerts)
+                except Exception as e:
+                    logger.warning(f"Alert sink {type(sink).__name__} failed: {e}")
+        return alerts
+
+    def _alert(self, rule: Rule, columns: Dict[str, np.ndarray], ticker: str, row: int, asof, now: float) -> Optional[dict]:
+        if asof is not None:
+            # The same rule never fires twice for one ticker's bar, e.g. when a bar is re-evaluated.
+            key = (rule.name, ticker, str(asof))
+            if key in self._seen:
+                return None
+            self._seen[key] = True
+            while len(self._seen) > self.dedup_size:
+                self._seen.popitem(last=False)
+        values = {c: values[row] for c, values in columns.items()}
+        try:
+            message = rule.message.format(ticker=ticker, **values)
+        except (KeyError, ValueError, TypeError):
+            message = f"{ticker}: {rule.message}"
+        return {"rule": rule.name, "ticker": ticker, "severity": rule.severity, "message": message,
+                "time": now, "asof": None if asof is None else str(asof)}
+
+    def stats(self) -> dict:
+        """Evaluation count, alerts fired and mean evaluation time."""
+        return {"evaluations": self.evaluations, "fired": self.fired,
+                "mean_seconds": self.seconds / self.evaluations if self.evaluations else 0.0}
+
+    def save(self, path: str):
+        """Persist trigger state as JSON so one-shot runs (e.g. cron) keep edges and cooldowns."""
+        data = {
+            "tickers": [str(t) for t in self._tickers],
+            "state": {
+                name: {"condition": condition.tolist(), "last": [None if np.isnan(t) else float(t) for t in last]}
+                for name, (condition, last) in self._state.items()
+            },
+            "seen": [list(key) for key in self._seen],
+        }
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def load(self, path: str) -> bool:
+        """Restore state saved by `save`; returns False if there is none or it is unreadable."""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            tickers = pd.Index(data["tickers"], dtype=object)
+            state = {
+                name: (np.array(saved["condition"], dtype=bool), np.array(saved["last"], dtype=float))
+                for name, saved in data["state"].items()
+            }
+            seen = OrderedDict((tuple(key), True) for key in data["seen"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        if any(len(condition) != len(tickers) or len(last) != len(tickers) for condition, last in state.values()):
+            return False
+        self._tickers, self._state, self._seen = tickers, state, seen
+        return True
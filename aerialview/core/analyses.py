@@ -0,0 +1,148 @@
+"""
+Long-running analyses for AerialView, written as background job functions.
+
+Each function takes a `progress` reporter (see `aerialview.core.jobs`) and
+returns a picklable result; called directly they run inline.
+"""
+
+import logging
+from typing import Callable, Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+from aerialview.core import portfolio
+from aerialview.core.jobs import no_progress
+from aerialview.core.provider import get_history
+from aerialview.core.regression import RISK_FREE_RATE
+from aerialview.core.streaming import QuantileSketch
+
+logger = logging.getLogger(__name__)
+
+
+def correlation_matrix(tickers: Iterable[str], period: str = "1y", progress: Callable = no_progress) -> pd.DataFrame:
+    """
+    Correlation of daily returns across many tickers.
+
+    Args:
+        tickers (Iterable[str]): Stock symbols.
+        period (str, optional): History period. Defaults to "1y".
+        progress (Callable, optional): Progress reporter.
+
+    Returns:
+        pd.DataFrame: Ticker-by-ticker correlation matrix (tickers without data are dropped).
+    """
+    tickers = [t.upper() for t in tickers]
+    returns = _load_returns(tickers, period, progress)
+    progress(len(tickers) / (len(tickers) + 1), "Correlating")
+    result = returns.corr()
+    progress(1.0, "Done")
+    return result
+
+
+def _load_returns(tickers, period, progress) -> pd.DataFrame:
+    """Daily returns with one column per ticker that has data."""
+    closes = {}
+    for i, ticker in enumerate(tickers):
+        progress(i / (len(tickers) + 1), f"Loading {ticker}")
+        data = get_history(ticker, period=period)
+        if not data.empty:
+            closes[ticker] = data["Close"]
+    return pd.DataFrame(closes).pct_change(fill_method=None)
+
+
+def optimize_portfolio(
+    tickers: Iterable[str],
+    period: str = "1y",
+    points: int = 50,
+    max_weight: float = 1.0,
+    risk_free_rate: float = RISK_FREE_RATE,
+    progress: Callable = no_progress,
+) -> Dict[str, object]:
+    """
+    Efficient frontier plus minimum-variance, maximum-Sharpe and risk-parity portfolios.
+
+    Tickers with returns on fewer than half of the days are dropped.
+
+    Args:
+        tickers (Iterable[str]): Stock symbols.
+        period (str, optional): History period. Defaults to "1y".
+        points (int, optional): Frontier points. Defaults to 50.
+        max_weight (float, optional): Per-asset weight cap, raised to 1 / assets if tighter. Defaults to 1.
+        risk_free_rate (float, optional): Annual rate for Sharpe ratios. Defaults to `RISK_FREE_RATE` (2%).
+        progress (Callable, optional): Progress reporter.
+
+    Returns:
+        dict: See `aerialview.core.portfolio.optimize`.
+    """
+    tickers = [t.upper() for t in tickers]
+    returns = _load_returns(tickers, period, progress).iloc[1:]
+    returns = returns.loc[:, returns.notna().mean() >= 0.5]
+    if returns.shape[1] < 2:
+        raise ValueError("Need data for at least two tickers")
+    progress(len(tickers) / (len(tickers) + 1), f"Optimizing {returns.shape[1]} assets")
+    result = portfolio.optimize(returns, points=points, max_weight=max(max_weight, 1 / returns.shape[1]),
+                                risk_free_rate=risk_free_rate)
+    progress(1.0, "Done")
+    return result
+
+
+def monte_carlo(
+    ticker: str,
+    period: str = "1y",
+    horizon: int = 252,
+    paths: int = 10_000,
+    seed: int = 0,
+    chunk: int = 1_000,
+    progress: Callable = no_progress,
+) -> Dict[str, np.ndarray]:
+    """
+    Simulate future prices by bootstrapping historical daily returns.
+
+    Paths are simulated `chunk` at a time so progress (and cancellation)
+    is checked regularly. Each batch is folded into one `QuantileSketch` per
+    trading day and then dropped, so memory grows with `chunk x horizon`
+    (plus one final price per path) rather than `paths x horizon`; the
+    quantile paths are within the sketch's 0.5% relative error.
+
+    Args:
+        ticker (str): Stock symbol.
+        period (str, optional): History period to resample. Defaults to "1y".
+        horizon (int, optional): Trading days simulated. Defaults to 252.
+        paths (int, optional): Number of simulated paths. Defaults to 10,000.
+        seed (int, optional): Random seed, so identical jobs give identical results.
+        chunk (int, optional): Paths per batch.
+        progress (Callable, optional): Progress reporter.
+
+    Returns:
+        dict: "quantiles" (5/25/50/75/95th percentile paths, shape (5, horizon + 1)),
+              "final" (final prices of every path) and "start" (last close).
+    """
+    data = get_history(ticker.upper(), period=period)
+    if data.empty:
+        raise ValueError(f"No data for {ticker}")
+    close = data["Close"].to_numpy(dtype=float)
+    returns = np.diff(np.log(close))
+    returns = returns[np.isfinite(returns)]
+    rng = np.random.default_rng(seed)
+
+    # Growth factors (price / start) per day; day 0 is exactly the start price.
+    sketches = [QuantileSketch() for _ in range(horizon)]
+    final = np.empty(paths)
+    for done in range(0, paths, chunk):
+        progress(done / paths, f"Simulated {done:,} of {paths:,} paths")
+        size = min(chunk, paths - done)
+        growth = np.exp(np.cumsum(rng.choice(returns, size=(size, horizon)), axis=1))
+        for day, sketch in enumerate(sketches):
+            sketch.update(growth[:, day])
+        final[done:done + size] = close[-1] * growth[:, -1]
+    progress(1.0, "Done")
+    levels = [0.05, 0.25, 0.5, 0.75, 0.95]
+    quantiles = np.ones((len(levels), horizon + 1))
+    for day, sketch in enumerate(sketches, start=1):
+        quantiles[:, day] = sketch.quantile(levels)
+    return {
+        "quantiles": close[-1] * quantiles,
+        "final": final,
+        "start": close[-1],
+    }
@@ -0,0 +1,135 @@
+"""
+Canonical OHLCV container for AerialView.
+
+`Bars` holds one contiguous NumPy array per field (timestamp, open, high,
+low, close, volume) and is the shape every layer can accept: the fetch layer
+produces it, indicator code and `core.visualize` consume it, and it converts
+to either DataFrame layout (capitalised/DatetimeIndex or lowercase/"date"
+column) without copying the price arrays.
+"""
+
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def _field_array(values) -> np.ndarray:
+    # Column reads from a single-dtype frame are already contiguous float64,
+    # so this is a no-op for store-backed and freshly fetched histories.
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+class Bars:
+    """
+    Array-backed OHLCV bars.
+
+    Args:
+        timestamp: Bar times, coerced to tz-naive `datetime64[ns]`.
+        open, high, low, close, volume: Per-bar values, coerced to contiguous float64.
+        ticker (str, optional): Stock symbol.
+        interval (str, optional): Bar interval. Defaults to "1d".
+    """
+
+    __slots__ = ("ticker", "interval", "timestamp", "open", "high", "low", "close", "volume")
+
+    def __init__(self, timestamp, open, high, low, close, volume, ticker: Optional[str] = None, interval: str = "1d"):
+        index = pd.DatetimeIndex(timestamp)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        self.timestamp = index.as_unit("ns").to_numpy()
+        self.open = _field_array(open)
+        self.high = _field_array(high)
+        self.low = _field_array(low)
+        self.close = _field_array(close)
+        self.volume = _field_array(volume)
+        self.ticker = ticker
+        self.interval = interval
+        n = len(self.timestamp)
+        if any(len(getattr(self, name)) != n for name in FIELDS):
+            raise ValueError("Bars fields must all have the same length")
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, ticker: Optional[str] = None, interval: str = "1d") -> "Bars":
+        """
+        Build bars from any of the repo's OHLCV frame shapes.
+
+        Accepts lowercase columns with a "date" column (`core.data_fetch`),
+        capitalised columns with a DatetimeIndex (`yf.Ticker.history`, the
+        history store) and single-ticker MultiIndex columns (`yf.download`).
+        """
+        if isinstance(df.columns, pd.MultiIndex):
+            df = df.droplevel(1, axis=1)
+        columns = {str(c).lower(): c for c in df.columns}
+        if "date" in columns:
+            timestamp = df[columns["date"]]
+        elif "datetime" in columns:
+            timestamp = df[columns["datetime"]]
+        else:
+            timestamp = df.index
+        missing = [name for name in FIELDS if name not in columns]
+        if missing and len(df) == 0:
+            return cls([], [], [], [], [], [], ticker=ticker, interval=interval)
+        if missing:
+            raise KeyError(f"OHLCV frame is missing columns: {missing}")
+        return cls(timestamp, *(df[columns[name]].to_numpy() for name in FIELDS), ticker=ticker, interval=interval)
+
+    def to_frame(self, lowercase: bool = False) -> pd.DataFrame:
+        """
+        Return a DataFrame over the bar arrays (no copy of the values).
+
+        Args:
+            lowercase (bool, optional): Lowercase columns plus a "date" column,
+                                        the `core.data_fetch` shape. Defaults to
+                                        capitalised columns on a DatetimeIndex.
+        """
+        index = pd.DatetimeIndex(self.timestamp, copy=False)
+        if lowercase:
+            data = {"date": index, **{name: getattr(self, name) for name in FIELDS}}
+            return pd.DataFrame(data, copy=False)
+        data = {name.title(): getattr(self, name) for name in FIELDS}
+        return pd.DataFrame(data, index=index.rename("Date"), copy=False)
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        """Timestamps as a DatetimeIndex view."""
+        return pd.DatetimeIndex(self.timestamp, copy=False)
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __getitem__(self, key: slice) -> "Bars":
+        """Slice by position; the result shares memory with these bars."""
+        if not isinstance(key, slice):
+            raise TypeError("Bars only support slicing; use the field arrays for single values")
+        bars = object.__new__(Bars)
+        bars.ticker = self.ticker
+        bars.interval = self.interval
+        bars.timestamp = self.timestamp[key]
+        for name in FIELDS:
+            setattr(bars, name, getattr(self, name)[key])
+        return bars
+
+    def tail(self, n: int) -> "Bars":
+        """Return the last `n` bars as a view."""
+        return self[max(len(self) - n, 0):]
+
+    def __repr__(self):
+        span = f"{self.timestamp[0]} .. {self.timestamp[-1]}" if len(self) else "empty"
+        return f"Bars({self.ticker or '?'}, {self.interval}, {len(self)} bars, {span})"
+
+
+def as_bars(data: Union[Bars, pd.DataFrame], ticker: Optional[str] = None) -> Bars:
+    """Return `data` as `Bars`, converting a DataFrame if needed."""
+    if isinstance(data, Bars):
+        return data
+    return Bars.from_frame(data, ticker=ticker)
+
+
+def as_frame(data: Union[Bars, pd.DataFrame]) -> pd.DataFrame:
+    """Return `data` as a capitalised DataFrame, converting `Bars` if needed."""
+    if isinstance(data, Bars):
+        return data.to_frame()
+    return data
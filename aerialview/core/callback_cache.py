@@ -0,0 +1,245 @@
+"""
+Callback result cache for AerialView's Dash server.
+
+Callback results are memoized by callback name and inputs in a SQLite file
+shared by every worker process on the host, so gunicorn workers reuse each
+other's figures instead of recomputing them. The store is bounded by size
+with least-recently-used eviction, and entries expire on a TTL that can
+depend on the inputs (historical ranges live longer than ranges ending today).
+"""
+
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from typing import Callable, Optional, Union
+
+from aerialview.core.config import cache_path
+
+logger = logging.getLogger(__name__)
+
+LIVE_TTL = 300
+HISTORICAL_TTL = 24 * 3600
+
+
+def ttl_for_range(end_date, live_ttl: float = LIVE_TTL, historical_ttl: float = HISTORICAL_TTL) -> float:
+    """
+    Pick a TTL from the end of the requested date range.
+
+    Ranges ending before today only change on corporate actions, so they can
+    be cached far longer than ranges that include the current session.
+
+    Args:
+        end_date: End of the range (date, datetime or "YYYY-MM-DD..." string), or None.
+
+    Returns:
+        float: TTL in seconds.
+    """
+    if end_date is None:
+        return live_ttl
+    if isinstance(end_date, str):
+        end_date = datetime.strptime(end_date[:10], "%Y-%m-%d").date()
+    elif isinstance(end_date, datetime):
+        end_date = end_date.date()
+    return historical_ttl if end_date < date.today() else live_ttl
+
+
+class CallbackCache:
+    """
+    Size-bounded, TTL-aware result store shared across processes.
+
+    Args:
+        path (str, optional): SQLite file. Defaults to "<cache dir>/callbacks.sqlite".
+        max_bytes (int, optional): Total payload budget. Defaults to 256 MB.
+        default_ttl (float, optional): TTL when a callback does not give one.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = 256 * 2**20, default_ttl: float = LIVE_TTL):
+        self.path = path or cache_path("callbacks.sqlite")
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.get_seconds = 0.0
+        self.put_seconds = 0.0
+        self._lock = threading.Lock()
+        self._pid = None
+        self._db = None
+
+    def _conn(self) -> sqlite3.Connection:
+        # Reconnect after fork so preloaded gunicorn workers don't share a handle.
+        if self._pid != os.getpid():
+            self._db = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB, size INTEGER, expires REAL, last_access REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access)")
+            self._db.commit()
+            self._pid = os.getpid()
+        return self._db
+
+    @staticmethod
+    def make_key(name: str, args, kwargs) -> str:
+        raw = pickle.dumps((name, args, sorted(kwargs.items())), protocol=pickle.HIGHEST_PROTOCOL)
+        return hashlib.sha256(raw).hexdigest()
+
+    def get(self, key: str):
+        """
+        Look up a key.
+
+        Returns:
+            tuple: (True, value) on a hit, (False, None) on a miss or expiry.
+        """
+        start = time.perf_counter()
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            row = db.execute("SELECT value, expires FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[1] > now:
+                db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+                db.commit()
+        self.get_seconds += time.perf_counter() - start
+        if row is None or row[1] <= now:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, pickle.loads(row[0])
+
+    def put(self, key: str, value, ttl: Optional[float] = None):
+        """Store a value and evict least-recently-used entries over budget."""
+        start = time.perf_counter()
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        now = time.time()
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            db = self._conn()
+            db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now + ttl, now),
+            )
+            db.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                victims = []
+                for victim, size in db.execute("SELECT key, size FROM entries ORDER BY last_access"):
+                    victims.append((victim,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                db.executemany("DELETE FROM entries WHERE key = ?", victims)
+            db.commit()
+        self.put_seconds += time.perf_counter() - start
+
+    def memoize(
+        self,
+        ttl: Union[float, Callable, None] = None,
+        name: Optional[str] = None,
+        cache_if: Optional[Callable] = None,
+    ):
+        """
+        Decorate a callback so results are shared through the cache.
+
+        Exceptions (including `PreventUpdate`) are never cached.
+
+        Args:
+            ttl (float or Callable, optional): Seconds to keep results, or a
+                callable receiving the callback's arguments and returning seconds.
+            name (str, optional): Cache namespace. Defaults to the function's
+                module and qualified name.
+            cache_if (Callable, optional): Predicate on the result; results it
+                rejects (e.g. placeholders for a failed fetch) are returned but
+                not cached. Defaults to caching every result.
+        """
+        def decorator(func):
+            namespace = name or f"{func.__module__}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                try:
+                    key = self.make_key(namespace, args, kwargs)
+                    hit, value = self.get(key)
+                except Exception as e:
+                    logger.warning(f"Callback cache unavailable for {namespace}: {e}")
+                    return func(*args, **kwargs)
+                if hit:
+                    return value
+                value = func(*args, **kwargs)
+                if cache_if is not None and not cache_if(value):
+                    return value
+                try:
+                    self.put(key, value, ttl(*args, **kwargs) if callable(ttl) else ttl)
+                except Exception as e:
+                    logger.warning(f"Could not cache result of {namespace}: {e}")
+                return value
+
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> dict:
+        """
+        Return hit rate and latency counters for this process plus store size.
+
+        Returns:
+            dict: Counters suitable for JSON serialization.
+        """
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries, size = self._conn().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "avg_get_ms": 1000 * self.get_seconds / lookups if lookups else 0.0,
+            "avg_put_ms": 1000 * self.put_seconds / self.misses if self.misses else 0.0,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+        }
+
+
+_default = None
+
+
+def get_cache() -> CallbackCache:
+    """Return the process-wide callback cache."""
+    global _default
+    if _default is None:
+        _default = CallbackCache(
+            max_bytes=int(os.environ.get("AERIALVIEW_CALLBACK_CACHE_MB", "256")) * 2**20
+        )
+    return _default
+
+
+def memoize(ttl: Union[float, Callable, None] = None, name: Optional[str] = None, cache_if: Optional[Callable] = None):
+    """
+    Memoize a Dash callback in the shared cache.
+
+    The cache is opened on first call, so decorating at import time does not
+    touch the filesystem.
+    """
+    def decorator(func):
+        cached = None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal cached
+            if cached is None:
+                cached = get_cache().memoize(ttl, name, cache_if)(func)
+            return cached(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,111 @@
+"""
+Compact in-memory representation of fetched frames.
+
+Provider frames keep float64 prices, float64/int64 volume and corporate-action
+columns that are almost always zero. `compact_frame` narrows them (float32
+OHLC prices where the round trip stays within half a cent, signed integer
+volume, sparse or dropped corporate actions) and `memory_report` shows what
+that saves per ticker. Volume stays signed so differences (OBV, volume
+deltas) cannot wrap around, and derived columns such as indicators are left
+at full precision.
+"""
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+CORPORATE_ACTION_COLUMNS = {"dividends", "stock splits", "capital gains"}
+VOLUME_COLUMNS = {"volume"}
+PRICE_COLUMNS = {"open", "high", "low", "close", "adj close"}
+
+
+def _fits_float32(values: np.ndarray, tolerance: float) -> bool:
+    narrowed = values.astype(np.float32).astype(np.float64)
+    finite = np.isfinite(values)
+    if not np.array_equal(finite, np.isfinite(narrowed)):
+        return False
+    return bool(np.all(np.abs(narrowed[finite] - values[finite]) <= tolerance))
+
+
+def _narrow_volume(values: pd.Series) -> pd.Series:
+    if values.isna().any():
+        return values
+    array = values.to_numpy()
+    if array.size and (np.any(array < 0) or np.any(array != np.floor(array))):
+        return values
+    top = array.max() if array.size else 0
+    for dtype in (np.int32, np.int64):
+        if top <= np.iinfo(dtype).max:
+            return values.astype(dtype)
+    return values
+
+
+def compact_frame(
+    df: pd.DataFrame, tolerance: float = 5e-3, drop_corporate_actions: bool = True
+) -> pd.DataFrame:
+    """
+    Return a narrower copy of an OHLCV(+indicators) frame.
+
+    Works with both the lowercase `core.data_fetch` shape and the capitalised
+    `yf.Ticker.history` shape.
+
+    Args:
+        df (pd.DataFrame): Frame to compact.
+        tolerance (float, optional): Maximum absolute error accepted when
+                                narrowing OHLC columns to float32. Defaults to
+                                half a cent.
+        drop_corporate_actions (bool, optional): Drop all-zero Dividends /
+                                Stock Splits / Capital Gains columns; otherwise
+                                they are stored sparse. Defaults to True.
+
+    Returns:
+        pd.DataFrame: Compacted frame with the same index and row order.
+    """
+    columns = {}
+    for name in df.columns:
+        series = df[name]
+        key = str(name).lower()
+        if key in CORPORATE_ACTION_COLUMNS and pd.api.types.is_numeric_dtype(series):
+            if drop_corporate_actions and not series.fillna(0).any():
+                continue
+            columns[name] = series.astype(pd.SparseDtype(np.float32, 0.0))
+        elif key in VOLUME_COLUMNS and pd.api.types.is_numeric_dtype(series):
+            columns[name] = _narrow_volume(series)
+        elif key in PRICE_COLUMNS and series.dtype == np.float64 and _fits_float32(series.to_numpy(), tolerance):
+            columns[name] = series.astype(np.float32)
+        else:
+            columns[name] = series
+    return pd.DataFrame(columns, index=df.index)
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    """Return the deep memory footprint of a frame in bytes, index included."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def memory_report(frames: Dict[str, pd.DataFrame], **kwargs) -> pd.DataFrame:
+    """
+    Report bytes per ticker before and after compaction.
+
+    Args:
+        frames (dict): {ticker: DataFrame}
+        **kwargs: Passed to `compact_frame`.
+
+    Returns:
+        pd.DataFrame: One row per ticker with rows, bytes_before, bytes_after,
+                      bytes_per_row and saved (fraction), plus a TOTAL row.
+    """
+    rows = []
+    for ticker, df in frames.items():
+        before = frame_bytes(df)
+        after = frame_bytes(compact_frame(df, **kwargs))
+        rows.append({"ticker": ticker, "rows": len(df), "bytes_before": before, "bytes_after": after})
+
+    report = pd.DataFrame(rows, columns=["ticker", "rows", "bytes_before", "bytes_after"])
+    if not report.empty:
+        total = report[["rows", "bytes_before", "bytes_after"]].sum()
+        report.loc[len(report)] = ["TOTAL", *total]
+    report["bytes_per_row"] = report["bytes_after"] / report["rows"].where(report["rows"] > 0)
+    report["saved"] = 1 - report["bytes_after"] / report["bytes_before"].where(report["bytes_before"] > 0)
+    return report
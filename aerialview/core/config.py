@@ -0,0 +1,27 @@
+"""
+Runtime configuration for AerialView.
+
+Settings are read from environment variables so the same values apply to
+the Dash server, the Streamlit dashboard and the CLI.
+"""
+
+import os
+
+CACHE_DIR = os.environ.get(
+    "AERIALVIEW_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "aerialview")
+)
+
+
+def cache_path(*parts: str) -> str:
+    """
+    Build a path inside the cache directory, creating parent folders.
+
+    Args:
+        *parts (str): Path components relative to `CACHE_DIR`.
+
+    Returns:
+        str: Absolute path.
+    """
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
@@ -7,25 +7,35 @@ extending the `fetch_stock_data` function.
 """
 
 import logging
-import yfinance as yf
 import pandas as pd
 from typing import List, Optional
 
+from aerialview.core import provider
+from aerialview.core.bars import Bars
+from aerialview.core.compact import compact_frame
+from aerialview.core.profiling import profiled
+
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
+@profiled("fetch")
 def fetch_stock_data(
-    ticker: str, start: str, end: str, interval: str = "1d"
+    ticker: str, start: str, end: str, interval: str = "1d", compact: bool = False
 ) -> Optional[pd.DataFrame]:
     """
-    Fetch historical stock data from Yahoo Finance.
+    Fetch historical stock data from Yahoo Finance through the shared provider.
+
+    Requests are guarded, retried and recorded in the provider metrics like
+    every other upstream call; while the provider is failing, the last good
+    response for the same request is served where one exists.
 
     Args:
         ticker (str): Stock symbol, e.g., "AAPL".
         start (str): Start date in "YYYY-MM-DD".
         end (str): End date in "YYYY-MM-DD".
         interval (str, optional): Data interval ("1d", "1wk", "1mo"). Defaults to "1d".
+        compact (bool, optional): Narrow dtypes with `compact_frame`. Defaults to False.
 
     Returns:
         pd.DataFrame: Historical OHLCV data with datetime index.
@@ -33,23 +43,58 @@ def fetch_stock_data(
     """
     try:
         logger.info(f"Fetching {ticker} from {start} to {end}...")
-        df = yf.download(ticker, start=start, end=end, interval=interval, progress=False)
+        df = provider.get_history(ticker, start=start, end=end, interval=interval)
+        df = df.drop(columns=[c for c in provider.ACTION_COLUMNS if c in df.columns])
 
         if df.empty:
             logger.warning(f"No data returned for {ticker}.")
             return None
 
+        if df.index.tz is not None and not interval.endswith(("m", "h")):
+            # Daily and longer bars are dated in exchange-local days, as yf.download returns them.
+            df.index = df.index.tz_localize(None)
         df.reset_index(inplace=True)
         df.rename(columns=str.lower, inplace=True)
-        return df
+        return compact_frame(df) if compact else df
+
+    except Exception as e:
+        logger.error(f"Error fetching {ticker}: {e}")
+        return None
+
+
+@profiled("fetch")
+def fetch_bars(
+    ticker: str, start: Optional[str] = None, end: Optional[str] = None, period: str = "1y", interval: str = "1d"
+) -> Optional[Bars]:
+    """
+    Fetch historical stock data as `Bars` through the shared provider.
 
+    Args:
+        ticker (str): Stock symbol, e.g., "AAPL".
+        start (str, optional): Start date in "YYYY-MM-DD".
+        end (str, optional): End date in "YYYY-MM-DD".
+        period (str, optional): Period used when no dates are given. Defaults to "1y".
+        interval (str, optional): Data interval. Defaults to "1d".
+
+    Returns:
+        Bars: Historical OHLCV bars. None if fetching fails.
+    """
+    try:
+        if start or end:
+            bars = provider.get_bars(ticker, start=start, end=end, interval=interval)
+        else:
+            bars = provider.get_bars(ticker, period=period, interval=interval)
+        if not len(bars):
+            logger.warning(f"No data returned for {ticker}.")
+            return None
+        return bars
     except Exception as e:
         logger.error(f"Error fetching {ticker}: {e}")
         return None
 
 
 def fetch_multiple_stocks(
-    tickers: List[str], start: str, end: str, interval: str = "1d"
+    tickers: List[str], start: str, end: str, interval: str = "1d", compact: bool = False
 ) -> dict:
     """
     Fetch data for multiple stock tickers.
@@ -59,13 +104,14 @@ def fetch_multiple_stocks(
         start (str): Start date.
         end (str): End date.
         interval (str, optional): Interval ("1d", "1wk", "1mo").
+        compact (bool, optional): Narrow dtypes with `compact_frame`. Defaults to False.
 
     Returns:
         dict: {ticker: DataFrame} mapping of ticker symbols to data.
     """
     data = {}
     for t in tickers:
-        df = fetch_stock_data(t, start, end, interval)
+        df = fetch_stock_data(t, start, end, interval, compact=compact)
         if df is not None:
             data[t] = df
     return data
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""
+Streaming export utilities for AerialView.
+
+Writes analysis results as Parquet, CSV or JSON Lines, one chunk at a time,
+so multi-ticker, long-history exports only ever hold a single chunk of rows
+in memory. Parquet needs the optional `pyarrow` package; CSV and JSON Lines
+work with pandas alone.
+"""
+
+import logging
+import os
+from typing import Dict, Optional
+
+import pandas as pd
+
+from aerialview.core.compact import CORPORATE_ACTION_COLUMNS, PRICE_COLUMNS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {".parquet": "parquet", ".pq": "parquet", ".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+DEFAULT_CHUNK_ROWS = 50_000
+# Written for every bar export, so tickers whose all-zero actions were compacted away still match.
+BAR_ACTIONS = ("Dividends", "Stock Splits", "Capital Gains")
+
+
+def format_for(path: str, fmt: Optional[str] = None) -> str:
+    """
+    Resolve the export format from an explicit name or the file extension.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    fmt = fmt or FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt not in ("parquet", "csv", "jsonl"):
+        raise ValueError(f"Unknown export format for {path}; use .parquet, .csv or .jsonl")
+    return fmt
+
+
+def metrics_path(path: str) -> str:
+    """Sibling file for the metrics table, e.g. "out.csv" -> "out_metrics.csv"."""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}_metrics{ext}"
+
+
+def metrics_table(metrics: Dict[str, dict]) -> pd.DataFrame:
+    """One row per ticker from {ticker: metrics dict}."""
+    table = pd.DataFrame.from_dict(metrics, orient="index")
+    table.index.name = "ticker"
+    return table.reset_index()
+
+
+def dense(df: pd.DataFrame) -> pd.DataFrame:
+    """Return `df` with sparse columns (e.g. compacted corporate actions) made dense."""
+    sparse = [name for name, dtype in df.dtypes.items() if isinstance(dtype, pd.SparseDtype)]
+    if not sparse:
+        return df
+    df = df.copy()
+    for name in sparse:
+        df[name] = df[name].sparse.to_dense()
+    return df
+
+
+def bar_columns(columns) -> list:
+    """Canonical bar-export columns: `columns` plus any corporate-action columns they lack."""
+    columns = list(columns)
+    if not any(str(name).lower() in PRICE_COLUMNS for name in columns):
+        return columns
+    lowercase = any(str(name) in PRICE_COLUMNS for name in columns)
+    present = {str(name).lower() for name in columns}
+    return columns + [name.lower() if lowercase else name for name in BAR_ACTIONS if name.lower() not in present]
+
+
+def canonical_schema(schema):
+    """Widen a Parquet schema's floats to float64 and signed/unsigned integers to int64."""
+    fields = []
+    for field in schema:
+        if pa.types.is_floating(field.type):
+            field = field.with_type(pa.float64())
+        elif pa.types.is_integer(field.type):
+            field = field.with_type(pa.int64())
+        fields.append(field)
+    return pa.schema(fields)
+
+
+class TableWriter:
+    """
+    Append-only chunked writer for one output file.
+
+    The first chunk fixes the column set and order (and, for Parquet, the
+    schema). Bar exports always include the corporate-action columns, which
+    chunks lacking them (compacted tickers without dividends or splits)
+    write as zero; any other column a chunk adds or lacks raises instead of
+    being dropped or filled. Sparse columns are written dense. The Parquet
+    schema widens numbers to float64 and int64 up front, so a compacted
+    chunk (float32 prices, int32 volume) and a full-width one write the same
+    types; a chunk that does not fit the schema raises instead of being
+    truncated.
+
+    Args:
+        path (str): Output file.
+        fmt (str, optional): "parquet", "csv" or "jsonl". Defaults to the extension.
+        chunk_rows (int, optional): Rows per written chunk for `write_frame`.
+    """
+
+    def __init__(self, path: str, fmt: Optional[str] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.path = path
+        self.fmt = format_for(path, fmt)
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self.columns = None
+        self._parquet = None
+        self._file = None
+        if self.fmt == "parquet":
+            if pq is None:
+                raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+        else:
+            self._file = open(path, "w", newline="")
+
+    def write(self, df: pd.DataFrame):
+        """
+        Append one chunk.
+
+        Raises:
+            ValueError: If the chunk's columns differ from the export's beyond
+                        missing corporate actions.
+        """
+        df = dense(df)
+        if self.columns is None:
+            self.columns = list(df.columns)
+        if list(df.columns) != self.columns:
+            extra = [name for name in df.columns if name not in self.columns]
+            missing = [name for name in self.columns if name not in df.columns]
+            unexpected = [name for name in missing if str(name).lower() not in CORPORATE_ACTION_COLUMNS]
+            if extra or unexpected:
+                raise ValueError(f"Chunk columns differ from the export's: extra {extra}, missing {unexpected}")
+            df = df.assign(**{str(name): 0.0 for name in missing})[self.columns]
+
+        if self.fmt == "parquet":
+            if self._parquet is None:
+                schema = canonical_schema(pa.Schema.from_pandas(df, preserve_index=False))
+                self._parquet = pq.ParquetWriter(self.path, schema)
+            self._parquet.write_table(pa.Table.from_pandas(df, schema=self._parquet.schema, preserve_index=False, safe=True))
+        elif self.fmt == "csv":
+            df.to_csv(self._file, header=self._file.tell() == 0, index=False)
+        else:
+            if len(df):
+                self._file.write(df.to_json(orient="records", lines=True, date_format="iso"))
+        self.rows += len(df)
+
+    def write_frame(self, ticker: str, data: pd.DataFrame):
+        """
+        Append a ticker's bars and indicators in `chunk_rows` slices.
+
+        The DatetimeIndex becomes a "Date" column and a leading "ticker"
+        column is added per slice, so only one slice is copied at a time.
+        """
+        for start in range(0, len(data), self.chunk_rows):
+            chunk = data.iloc[start:start + self.chunk_rows].reset_index()
+            chunk.insert(0, "ticker", ticker)
+            if self.columns is None:
+                self.columns = bar_columns(chunk.columns)
+            self.write(chunk)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+        if self._file is not None:
+            self._file.close()
+        logger.info(f"Exported {self.rows} rows to {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,106 @@
+"""
+Bounded figure cache for AerialView front ends.
+
+Plotly figures with thousands of points per trace are expensive to build and
+large to keep. `FigureCache` is an LRU keyed by whatever determines the
+figure (ticker, period, interval, theme, ...) and evicts on both an entry
+count and an estimated memory budget.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+import numpy as np
+
+
+def estimate_bytes(obj) -> int:
+    """
+    Roughly estimate the memory held by a figure or its JSON-like parts.
+
+    Args:
+        obj: A Plotly figure, dict, list, array, encoded image bytes or scalar.
+
+    Returns:
+        int: Estimated bytes.
+    """
+    if hasattr(obj, "to_plotly_json"):
+        obj = obj.to_plotly_json()
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes if obj.dtype != object else 64 * obj.size
+    if hasattr(obj, "to_numpy"):
+        return estimate_bytes(obj.to_numpy())
+    if isinstance(obj, dict):
+        return sum(estimate_bytes(k) + estimate_bytes(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return 56 + sum(estimate_bytes(v) for v in obj)
+    if isinstance(obj, str):
+        return 49 + len(obj)
+    if isinstance(obj, (bytes, bytearray)):
+        return 33 + len(obj)
+    return 32
+
+
+class FigureCache:
+    """
+    Thread-safe LRU of built figures with entry and byte limits.
+
+    Args:
+        max_entries (int, optional): Maximum figures kept. Defaults to 32.
+        max_bytes (int, optional): Estimated memory budget. Defaults to 256 MB.
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 256 * 2**20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get_or_build(self, key: Hashable, build: Callable):
+        """
+        Return the cached figure for `key`, building it on a miss.
+
+        Args:
+            key (Hashable): Everything the figure depends on.
+            build (Callable): Zero-argument function returning the figure, or None.
+
+        Returns:
+            The figure (None results are returned but not cached).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        figure = build()
+        if figure is None:
+            return None
+        size = estimate_bytes(figure)
+        if size > self.max_bytes:
+            return figure
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (figure, size)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+        return figure
+
+    def clear(self):
+        """Drop every cached figure."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,260 @@
+"""
+Memory-mapped history store for AerialView.
+
+OHLCV histories are kept on disk as NumPy files laid out column by column.
+Every process on the host (Dash workers, Streamlit sessions, CLI batches)
+maps the same files read-only, and the returned DataFrames are views over
+the mapped buffers, so memory no longer scales with workers x tickers and a
+cold start only pays for the pages it touches.
+
+Layout per ticker::
+
+    <root>/<interval>/<TICKER>/meta.json
+    <root>/<interval>/<TICKER>/index-<version>.npy    int64 wall-clock ns
+    <root>/<interval>/<TICKER>/values-<version>.npy   float64, one row per column
+
+    <root>/<interval>/<TICKER>/events.json            splits and dividends
+
+Histories written with `events` hold bars as traded; adjusted prices are
+derived from them by `core.adjust`, so a corporate action only appends an
+event. Writers publish a new version and then atomically replace
+`meta.json`, so readers never see a half-written history.
+"""
+
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from aerialview.core.config import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+EVENT_KINDS = ("splits", "dividends")
+
+
+def empty_events() -> Dict[str, List[Tuple[str, float]]]:
+    return {kind: [] for kind in EVENT_KINDS}
+
+
+def merge_events(current: Optional[dict], new: dict) -> dict:
+    """Combine two event lists, keeping one entry per kind and date (newest wins)."""
+    merged = empty_events()
+    for kind in EVENT_KINDS:
+        by_date = {date: value for date, value in (current or {}).get(kind, [])}
+        by_date.update({date: value for date, value in new.get(kind, [])})
+        merged[kind] = sorted(by_date.items())
+    return merged
+
+
+def _dump_atomic(path: str, data: dict):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def to_history_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize a fetched frame to the store's schema.
+
+    Accepts both the lowercase/"date"-column shape from `core.data_fetch`
+    and the capitalised/DatetimeIndex shape from `yf.Ticker.history`.
+
+    Returns:
+        pd.DataFrame: OHLCV columns with a tz-naive DatetimeIndex.
+    """
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.droplevel(1, axis=1)
+    if "date" in df.columns:
+        df = df.set_index("date")
+    df = df.rename(columns=lambda c: c if c in COLUMNS else str(c).title())
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return pd.DataFrame(
+        df[COLUMNS].to_numpy(dtype=np.float64), index=index.rename("Date"), columns=COLUMNS
+    )
+
+
+class HistoryStore:
+    """
+    Read-only memory-mapped access to stored histories.
+
+    Args:
+        root (str, optional): Store directory. Defaults to `AERIALVIEW_HISTORY_DIR`
+                              or "<cache dir>/history".
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.environ.get("AERIALVIEW_HISTORY_DIR", os.path.join(CACHE_DIR, "history"))
+        self._lock = threading.Lock()
+        self._frames: Dict[tuple, tuple] = {}
+
+    def _dir(self, ticker: str, interval: str) -> str:
+        return os.path.join(self.root, interval, ticker.upper())
+
+    def meta(self, ticker: str, interval: str = "1d") -> Optional[dict]:
+        """Return the metadata of a stored history, or None if absent."""
+        try:
+            with open(os.path.join(self._dir(ticker, interval), "meta.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def events(self, ticker: str, interval: str = "1d") -> Optional[dict]:
+        """Return the stored corporate-action events, or None if absent."""
+        try:
+            with open(os.path.join(self._dir(ticker, interval), "events.json")) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return {kind: [tuple(event) for event in data.get(kind, [])] for kind in EVENT_KINDS} | {
+            "updated": data.get("updated", 0)
+        }
+
+    def write_events(self, ticker: str, events: dict, interval: str = "1d") -> dict:
+        """Replace the stored events for a ticker."""
+        path = self._dir(ticker, interval)
+        os.makedirs(path, exist_ok=True)
+        data = {**merge_events(None, events), "updated": time.time_ns()}
+        _dump_atomic(os.path.join(path, "events.json"), data)
+        return data
+
+    def add_event(self, ticker: str, kind: str, date, value: float, interval: str = "1d") -> dict:
+        """
+        Record one split or dividend without touching the stored bars.
+
+        Args:
+            ticker (str): Stock symbol.
+            kind (str): "splits" or "dividends".
+            date: Ex-date.
+            value (float): Split ratio, or cash dividend per share as paid.
+
+        Returns:
+            dict: The updated events.
+        """
+        if kind not in EVENT_KINDS:
+            raise ValueError(f"Unknown event kind: {kind}")
+        event = (pd.Timestamp(date).isoformat(), float(value))
+        return self.write_events(ticker, merge_events(self.events(ticker, interval), {kind: [event]}), interval)
+
+    def write(self, ticker: str, df: pd.DataFrame, interval: str = "1d", events: Optional[dict] = None, **meta) -> dict:
+        """
+        Store a history, replacing any previous version.
+
+        Args:
+            ticker (str): Stock symbol.
+            df (pd.DataFrame): OHLCV data in either project shape.
+            interval (str, optional): Bar interval. Defaults to "1d".
+            events (dict, optional): Corporate actions; when given, `df` holds
+                                     bars as traded and the history is marked raw.
+            **meta: Extra metadata saved alongside (e.g. complete=True).
+
+        Returns:
+            dict: The published metadata.
+        """
+        frame = to_history_frame(df)
+        path = self._dir(ticker, interval)
+        os.makedirs(path, exist_ok=True)
+        version = f"{time.time_ns()}-{os.getpid()}"
+
+        np.save(os.path.join(path, f"index-{version}.npy"), frame.index.as_unit("ns").asi8)
+        # Column-major so each column is one contiguous run in the file.
+        np.save(os.path.join(path, f"values-{version}.npy"), np.ascontiguousarray(frame.to_numpy().T))
+
+        if events is not None:
+            self.write_events(ticker, events, interval)
+            meta["raw"] = True
+        info = {
+            "version": version,
+            "columns": COLUMNS,
+            "rows": len(frame),
+            "last": frame.index[-1].isoformat() if len(frame) else None,
+            "updated": time.time(),
+            **meta,
+        }
+        _dump_atomic(os.path.join(path, "meta.json"), info)
+
+        # Old versions can be unlinked; processes that mapped them keep their pages.
+        for old in glob.glob(os.path.join(path, "*-*.npy")):
+            if version not in old:
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
+        return info
+
+    def touch(self, ticker: str, interval: str = "1d", **meta) -> Optional[dict]:
+        """Mark a stored history as freshly checked without rewriting its bars; `**meta` updates its metadata."""
+        info = self.meta(ticker, interval)
+        if info is not None:
+            info.update(meta, updated=time.time())
+            _dump_atomic(os.path.join(self._dir(ticker, interval), "meta.json"), info)
+        return info
+
+    def read(self, ticker: str, interval: str = "1d", cache: bool = True) -> Optional[pd.DataFrame]:
+        """
+        Map a stored history.
+
+        Args:
+            ticker (str): Stock symbol.
+            interval (str, optional): Bar interval. Defaults to "1d".
+            cache (bool, optional): Keep the mapped frame for later reads. One-pass
+                                    scans pass False. Defaults to True.
+
+        Returns:
+            pd.DataFrame: Read-only view over the mapped files, or None if not stored.
+                          Add columns freely; overwrite values only on a `.copy()`.
+        """
+        key = (ticker.upper(), interval)
+        info = self.meta(ticker, interval)
+        if info is None:
+            return None
+
+        with self._lock:
+            cached = self._frames.get(key)
+            if cached is not None and cached[0] == info["version"]:
+                return cached[1].copy(deep=False)
+
+            path = self._dir(ticker, interval)
+            try:
+                index = np.load(os.path.join(path, f"index-{info['version']}.npy"), mmap_mode="r")
+                values = np.load(os.path.join(path, f"values-{info['version']}.npy"), mmap_mode="r")
+            except OSError as e:
+                logger.warning(f"Stored history for {ticker} unreadable: {e}")
+                return None
+
+            frame = pd.DataFrame(
+                values.T,
+                index=pd.DatetimeIndex(index.view("M8[ns]"), copy=False, name="Date"),
+                columns=info["columns"],
+                copy=False,
+            )
+            if not cache:
+                return frame
+            self._frames[key] = (info["version"], frame)
+        return frame.copy(deep=False)
+
+    def tickers(self, interval: str = "1d") -> List[str]:
+        """List tickers stored for an interval."""
+        pattern = os.path.join(self.root, interval, "*", "meta.json")
+        return sorted(os.path.basename(os.path.dirname(p)) for p in glob.glob(pattern))
+
+
+_default = None
+
+
+def get_store() -> HistoryStore:
+    """Return the process-wide history store."""
+    global _default
+    if _default is None:
+        _default = HistoryStore()
+    return _default
@@ -0,0 +1,336 @@
+"""
+Shared HTTP session for AerialView's provider traffic.
+
+yfinance builds a fresh HTTP session for every `yf.download` call and every
+`yf.Ticker` that is not handed one, so each call pays connection and TLS
+setup again and any response it already downloaded is fetched in full.
+`get_session` returns one process-wide, thread-safe session with pooled
+keep-alive connections that every provider call passes to yfinance.
+
+The session also keeps a private HTTP response cache that follows the
+server's caching headers: a response is reused without a request while
+`Cache-Control: max-age` or `Expires` says it is fresh. Once stale, it is
+revalidated with `If-None-Match` / `If-Modified-Since`, and a 304 reuses the
+stored body. Only the provider's chart and quote endpoints (`CACHEABLE_PATHS`)
+are cached at all, so cookie and crumb handshakes always reach the server;
+responses that set cookies, are marked `no-store` or vary on everything are
+never stored either.
+"""
+
+import copy
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.models import PreparedRequest
+
+from aerialview.core.metrics import register_cache
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = int(os.environ.get("AERIALVIEW_HTTP_POOL", "16"))
+CACHE_BYTES = int(float(os.environ.get("AERIALVIEW_HTTP_CACHE_MB", "64")) * 2**20)
+BACKEND = os.environ.get("AERIALVIEW_HTTP_BACKEND", "curl")
+
+# Provider endpoints whose responses may be cached: price charts and quotes.
+CACHEABLE_PATHS = ("/v8/finance/chart/", "/v7/finance/quote", "/v10/finance/quoteSummary/")
+# Headers a 304 may carry that replace the stored ones (RFC 9111 section 4.3.4).
+_REFRESHED = ("Cache-Control", "Date", "ETag", "Expires", "Last-Modified", "Vary")
+_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+)
+
+
+def cache_directives(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a `Cache-Control` header into {directive: argument or None}."""
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('" ') or None
+    return directives
+
+
+def _seconds(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(int(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def fresh_until(headers, now: float) -> float:
+    """
+    Time until which a response may be reused without revalidation.
+
+    Uses `max-age` if present, otherwise `Expires` relative to the response's
+    `Date`, less any `Age` the response already had upstream. Responses with
+    neither (or with `no-cache`) are stale immediately and always revalidated.
+    """
+    directives = cache_directives(headers.get("Cache-Control"))
+    if "no-cache" in directives:
+        return now
+    lifetime = _seconds(directives.get("max-age"))
+    if lifetime is None:
+        expires = _http_date(headers.get("Expires"))
+        if expires is None:
+            # Invalid Expires values such as "0" mean already expired.
+            return now
+        lifetime = expires - (_http_date(headers.get("Date")) or now)
+    return now + lifetime - (_seconds(headers.get("Age")) or 0.0)
+
+
+class _Entry:
+    """A stored response with its freshness and the request headers it varies on."""
+
+    def __init__(self, response, vary: Dict[str, Optional[str]], now: float):
+        self.response = response
+        self.vary = vary
+        self.fresh_until = fresh_until(response.headers, now)
+        self.size = len(response.content or b"")
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU store of HTTP responses, bounded by total body size.
+
+    Args:
+        max_bytes (int, optional): Body bytes kept. Defaults to `AERIALVIEW_HTTP_CACHE_MB` (64 MB).
+        paths (Iterable[str], optional): URL path prefixes that may be cached;
+                                         other requests bypass the cache. Defaults to `CACHEABLE_PATHS`.
+    """
+
+    def __init__(self, max_bytes: int = CACHE_BYTES, paths: Iterable[str] = CACHEABLE_PATHS):
+        self.max_bytes = max_bytes
+        self.paths = tuple(paths)
+        self.bytes = 0
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allows(self, url: str) -> bool:
+        """Whether requests to `url` may be served from or stored in the cache."""
+        return urlsplit(url).path.startswith(self.paths)
+
+    def get(self, key: str) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: _Entry):
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old.size
+            self._entries[key] = entry
+            self.bytes += entry.size
+            while self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted.size
+
+    def discard(self, key: str):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old.size
+
+    def record(self, outcome: str):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for the metrics endpoint; revalidated (304) responses count as hits."""
+        return {
+            "hits": self.hits + self.revalidated,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CachingSessionMixin:
+    """
+    Adds `ResponseCache` handling to a `requests` or `curl_cffi` session.
+
+    Only plain GET requests to the cache's allowed paths are cached;
+    everything else passes straight through. Reused responses are shallow
+    copies of the stored one with `from_cache` set to True. The cache lives in `response_cache` rather
+    than `cache`, which yfinance reserves for sessions it refuses.
+    """
+
+    response_cache: ResponseCache
+
+    def _request_header(self, headers, name: str) -> Optional[str]:
+        for source in (headers or {}, self.headers):
+            for key, value in source.items():
+                if key.lower() == name.lower():
+                    return value
+        return None
+
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        cache = getattr(self, "response_cache", None)
+        if cache is None or method.upper() != "GET" or kwargs.get("stream"):
+            return super().request(method, url, params=params, headers=headers, **kwargs)
+
+        prepared = PreparedRequest()
+        prepared.prepare_url(url, params)
+        key = prepared.url
+        request_directives = cache_directives(self._request_header(headers, "Cache-Control"))
+        if "no-store" in request_directives or not cache.allows(key):
+            return super().request(method, url, params=params, headers=headers, **kwargs)
+
+        entry = cache.get(key)
+        if entry is not None and any(self._request_header(headers, name) != value for name, value in entry.vary.items()):
+            entry = None
+        now = time.time()
+        if entry is not None and now < entry.fresh_until and "no-cache" not in request_directives:
+            cache.record("hits")
+            return self._reuse(entry.response)
+
+        if entry is not None:
+            etag = entry.response.headers.get("ETag")
+            modified = entry.response.headers.get("Last-Modified")
+            if etag or modified:
+                headers = dict(headers or {})
+                if etag:
+                    headers["If-None-Match"] = etag
+                if modified:
+                    headers["If-Modified-Since"] = modified
+
+        response = super().request(method, url, params=params, headers=headers, **kwargs)
+        now = time.time()
+        if response.status_code == 304 and entry is not None:
+            cache.record("revalidated")
+            stored = self._reuse(entry.response)
+            for name in _REFRESHED:
+                if name in response.headers:
+                    stored.headers[name] = response.headers[name]
+            cache.put(key, _Entry(stored, entry.vary, now))
+            return self._reuse(stored)
+
+        cache.record("misses")
+        if self._storable(response):
+            vary = [name.strip() for name in (response.headers.get("Vary") or "").split(",") if name.strip()]
+            cache.put(key, _Entry(response, {name: self._request_header(headers, name) for name in vary}, now))
+        else:
+            cache.discard(key)
+        return response
+
+    @staticmethod
+    def _storable(response) -> bool:
+        headers = response.headers
+        directives = cache_directives(headers.get("Cache-Control"))
+        if response.status_code != 200 or "no-store" in directives or "set-cookie" in {k.lower() for k in headers}:
+            return False
+        if (headers.get("Vary") or "").strip() == "*":
+            return False
+        return bool(headers.get("ETag") or headers.get("Last-Modified")) or fresh_until(headers, 0.0) > 0.0
+
+    @staticmethod
+    def _reuse(response):
+        reused = copy.copy(response)
+        reused.headers = copy.copy(response.headers)
+        reused.from_cache = True
+        return reused
+
+
+class RequestsSession(CachingSessionMixin, requests.Session):
+    """`requests.Session` with a sized keep-alive connection pool per host and a response cache."""
+
+    def __init__(self, pool_size: int = POOL_SIZE, cache: Optional[ResponseCache] = None):
+        super().__init__()
+        self.response_cache = cache
+        self.headers["User-Agent"] = _USER_AGENT
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+
+try:
+    from curl_cffi import CurlOpt
+    from curl_cffi.requests import Session as _CurlSession
+
+    class CurlSession(CachingSessionMixin, _CurlSession):
+        """
+        `curl_cffi` session, which yfinance prefers for its browser TLS fingerprint.
+
+        Each thread gets its own curl handle, and each handle keeps up to
+        `pool_size` connections alive between requests.
+        """
+
+        def __init__(self, pool_size: int = POOL_SIZE, cache: Optional[ResponseCache] = None):
+            super().__init__(impersonate="chrome", use_thread_local_curl=True,
+                             curl_options={CurlOpt.MAXCONNECTS: pool_size})
+            self.response_cache = cache
+
+except ImportError:
+    CurlSession = None
+
+
+def new_session(backend: str = BACKEND, pool_size: int = POOL_SIZE, cache: Optional[ResponseCache] = None):
+    """
+    Build a pooled, optionally caching session that yfinance accepts.
+
+    Args:
+        backend (str, optional): "curl" (falls back to "requests" if `curl_cffi`
+                                 is missing) or "requests". Defaults to `AERIALVIEW_HTTP_BACKEND`.
+        pool_size (int, optional): Keep-alive connections kept per host. Defaults to 16.
+        cache (ResponseCache, optional): Response cache; None disables caching.
+    """
+    if backend == "curl" and CurlSession is not None:
+        return CurlSession(pool_size=pool_size, cache=cache)
+    return RequestsSession(pool_size=pool_size, cache=cache)
+
+
+_default = None
+_default_pid = None
+_default_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Return the process-wide provider session, creating it on first use.
+
+    A forked worker gets its own session rather than sharing the parent's
+    sockets.
+    """
+    global _default, _default_pid
+    with _default_lock:
+        if _default is None or _default_pid != os.getpid():
+            _default = new_session(cache=ResponseCache())
+            _default_pid = os.getpid()
+            logger.info(f"Created shared {type(_default).__name__} for provider requests")
+        return _default
+
+
+# Reports nothing until the session exists (the collector skips stats that raise).
+register_cache("http", lambda: _default.response_cache.stats())
@@ -0,0 +1,239 @@
+"""
+Indicator memoization for AerialView.
+
+The dashboard, CLI and comparison paths compute the same indicators on the
+same histories over and over. `IndicatorCache` keys each result by a hash of
+the input arrays' bytes plus the indicator name and parameters, so RSI(14)
+on an unchanged AAPL history is computed once. Results are kept in a bounded
+in-memory LRU and written to `.npz` files in the cache directory, which
+other sessions and processes read instead of recomputing. Each output's
+dtype and name are stored with it, so a cached result is indistinguishable
+from a freshly computed one. The disk spill is
+bounded too; the least recently used files are deleted first.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Callable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from aerialview.core.config import cache_path
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(name: str, arrays: Sequence[np.ndarray], params: Optional[dict] = None) -> str:
+    """
+    Content hash of an indicator computation.
+
+    Args:
+        name (str): Indicator (and implementation) name, e.g. "rsi" or "ta.rsi".
+        arrays (Sequence[np.ndarray]): Input arrays; dtype, shape and bytes are hashed.
+        params (dict, optional): Indicator parameters.
+
+    Returns:
+        str: Hex digest.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"{name}|{sorted((params or {}).items())!r}".encode())
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        h.update(f"|{array.dtype.str}{array.shape}".encode())
+        h.update(memoryview(array).cast("B"))
+    return h.hexdigest()
+
+
+class IndicatorCache:
+    """
+    Two-level (memory LRU + disk) store of indicator results.
+
+    Values are 2-D float arrays, one row per output series, each stored with
+    its outputs' (name, dtype) pairs.
+
+    Args:
+        directory (str, optional): Spill directory. Defaults to "<cache dir>/indicators".
+        max_entries (int, optional): Results kept in memory. Defaults to 512.
+        max_bytes (int, optional): Memory budget. Defaults to 128 MB.
+        max_disk_bytes (int, optional): Disk budget. Defaults to 1 GB; 0 disables the spill.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_entries: int = 512,
+        max_bytes: int = 128 * 2**20,
+        max_disk_bytes: int = 2**30,
+    ):
+        self.directory = directory or os.path.dirname(cache_path("indicators", "x"))
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._written = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def _remember(self, key: str, entry: tuple):
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = entry
+            self.bytes += entry[0].nbytes
+            while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted[0].nbytes
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, tuple]]:
+        """Cached (values, ((name, dtype), ...)) for a key from memory or disk, else None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+        if self.max_disk_bytes:
+            path = self._file(key)
+            try:
+                with np.load(path) as data:
+                    entry = data["values"], tuple(tuple(output) for output in json.loads(str(data["outputs"])))
+                os.utime(path)
+            except (OSError, ValueError, KeyError):
+                entry = None
+            if entry is not None:
+                entry[0].flags.writeable = False
+                self._remember(key, entry)
+                with self._lock:
+                    self.disk_hits += 1
+                return entry
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: np.ndarray, outputs: Optional[Sequence[tuple]] = None):
+        """
+        Store a result in memory and spill it to disk.
+
+        Args:
+            key (str): Fingerprint of the computation.
+            value (np.ndarray): One row per output series.
+            outputs (Sequence[tuple], optional): (name, dtype string) per row;
+                                                 defaults to unnamed float64 rows.
+        """
+        value = np.array(value, dtype=float, ndmin=2)
+        value.flags.writeable = False
+        outputs = tuple(tuple(output) for output in outputs) if outputs else ((None, "<f8"),) * len(value)
+        self._remember(key, (value, outputs))
+        if not self.max_disk_bytes or value.nbytes > self.max_disk_bytes:
+            return
+        tmp = os.path.join(self.directory, f".{key}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                np.savez(f, values=value, outputs=np.array(json.dumps(outputs)))
+            os.replace(tmp, self._file(key))
+        except OSError as e:
+            logger.warning(f"Could not spill indicator {key}: {e}")
+            return
+        self._written += value.nbytes
+        if self._written > self.max_disk_bytes // 16:
+            self._written = 0
+            self.prune()
+
+    def prune(self):
+        """Delete the least recently used spill files until the disk budget holds."""
+        files = []
+        for entry in os.scandir(self.directory):
+            # .npy files are spills from before dtypes and names were stored.
+            if entry.name.endswith((".npz", ".npy")):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def compute(self, name: str, fn: Callable, *series: pd.Series, **params):
+        """
+        Memoized `fn(*series, **params)` for Series-in, Series-out indicators.
+
+        Args:
+            name (str): Indicator name; must change whenever `fn`'s formula does.
+            fn (Callable): Returns a Series or a tuple of Series aligned with the inputs.
+            *series (pd.Series): Inputs; only their values are hashed.
+            **params: Indicator parameters, passed through to `fn`.
+
+        Returns:
+            A Series or tuple of Series on the first input's index, with the
+            dtype and name `fn` gave them, whether computed or cached.
+        """
+        key = fingerprint(name, [s.to_numpy() for s in series], params)
+        entry = self.get(key)
+        if entry is None:
+            result = fn(*series, **params)
+            outputs = result if isinstance(result, tuple) else (result,)
+            self.put(
+                key,
+                np.vstack([np.asarray(output, dtype=float) for output in outputs]),
+                [(_name(output), np.asarray(output).dtype.str) for output in outputs],
+            )
+            return result
+        values, meta = entry
+        index = series[0].index
+        outputs = tuple(
+            pd.Series(row.astype(dtype, copy=False), index=index, name=label)
+            for row, (label, dtype) in zip(values, meta)
+        )
+        return outputs if len(outputs) > 1 else outputs[0]
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process plus memory usage."""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+        }
+
+    def clear(self):
+        """Drop the in-memory entries (the disk spill is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+def _name(output):
+    """Series name in a JSON-storable form (names are normally strings or None)."""
+    label = getattr(output, "name", None)
+    return label if label is None or isinstance(label, (str, int, float)) else str(label)
+
+
+_default = None
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """Return the process-wide indicator cache."""
+    global _default
+    if _default is None:
+        _default = IndicatorCache(max_disk_bytes=int(os.environ.get("AERIALVIEW_INDICATOR_DISK_BYTES", 2**30)))
+    return _default
@@ -0,0 +1,366 @@
+"""
+Bulk CSV ingestion for AerialView.
+
+Loads vendor end-of-day dumps, either one CSV per ticker or multi-ticker
+files with a ticker/symbol column, into the local history store. Files are
+parsed in parallel worker processes with vectorized parsing (pyarrow's
+multithreaded CSV reader when installed), validated and normalized to the
+store's OHLCV schema.
+
+Tickers are hash-partitioned: each parse worker spills its tickers to
+per-partition files next to the store, then each partition is owned by one
+worker, which combines every file's rows for its tickers, writes each ticker
+once and releases it. No process ever holds more than one file or one
+partition, and no two writers race on the same stored history. Imported
+histories are marked with source "import" and are served locally without
+provider refreshes.
+"""
+
+import glob
+import logging
+import os
+import tempfile
+import time
+import warnings
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from aerialview.core.history_store import COLUMNS, HistoryStore
+
+logger = logging.getLogger(__name__)
+
+ALIASES = {
+    "date": "date", "datetime": "date", "timestamp": "date", "day": "date", "time": "date",
+    "ticker": "ticker", "symbol": "ticker",
+    "open": "Open", "o": "Open",
+    "high": "High", "h": "High",
+    "low": "Low", "l": "Low",
+    "close": "Close", "c": "Close",
+    "adjclose": "Adj Close", "adjustedclose": "Adj Close",
+    "volume": "Volume", "vol": "Volume", "v": "Volume",
+}
+SOURCE = "import"
+
+
+def _canonical(column: str) -> str:
+    key = "".join(ch for ch in str(column).lower() if ch.isalnum())
+    return ALIASES.get(key, column)
+
+
+def ticker_from_path(path: str) -> str:
+    """Ticker implied by a per-ticker file name, e.g. "data/aapl.us.csv.gz" -> "AAPL"."""
+    name = os.path.basename(path)
+    for suffix in (".gz", ".zip", ".bz2", ".csv", ".txt"):
+        if name.lower().endswith(suffix):
+            name = name[: -len(suffix)]
+    return name.split(".")[0].upper()
+
+
+def expand_paths(paths: Iterable[str]) -> List[str]:
+    """Resolve files, directories (their *.csv / *.csv.gz files) and glob patterns."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += glob.glob(os.path.join(path, "*.csv")) + glob.glob(os.path.join(path, "*.csv.gz"))
+        else:
+            files += glob.glob(path) or [path]
+    return sorted(dict.fromkeys(files))
+
+
+def read_csv(path: str) -> pd.DataFrame:
+    """Read a CSV with canonical column names, using the pyarrow engine when available."""
+    try:
+        df = pd.read_csv(path, engine="pyarrow")
+    except (ImportError, ValueError):
+        df = pd.read_csv(path)
+    return df.rename(columns=_canonical)
+
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """
+    Vectorized date parsing: ISO 8601 first, then pandas' format inference
+    for vendors using other layouts. Unparseable values become NaT.
+    """
+    dates = pd.to_datetime(values, format="ISO8601", errors="coerce")
+    if dates.isna().sum() > values.isna().sum() + len(values) // 2:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            dates = pd.to_datetime(values, errors="coerce")
+    if getattr(dates.dt, "tz", None) is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates
+
+
+def normalize(df: pd.DataFrame, ticker: Optional[str] = None) -> Dict[str, object]:
+    """
+    Validate vendor rows and split them into per-ticker histories.
+
+    Rows without a parseable date or a positive close, or with high below
+    low, are rejected. Duplicate dates keep the last row. When an
+    "Adj Close" column is present, OHLC are scaled by Adj Close / Close so
+    the history is adjusted like provider data.
+
+    Args:
+        df (pd.DataFrame): Rows with canonical column names (see `read_csv`).
+        ticker (str, optional): Ticker for files without a ticker column.
+
+    Returns:
+        dict: "frames" ({ticker: OHLCV frame with a DatetimeIndex}), "rows" and "rejected".
+
+    Raises:
+        ValueError: If required columns are missing.
+    """
+    missing = [c for c in ["date", "Close"] if c not in df.columns]
+    if "ticker" not in df.columns and ticker is None:
+        missing.append("ticker")
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    dates = parse_dates(df["date"])
+    close = pd.to_numeric(df["Close"], errors="coerce").to_numpy(dtype=np.float64)
+    # Missing open/high/low fall back to the close, missing volume to NaN.
+    values = {
+        c: pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=np.float64) if c in df.columns else close.copy()
+        for c in ["Open", "High", "Low"]
+    }
+    values["Close"] = close
+    values["Volume"] = (
+        pd.to_numeric(df["Volume"], errors="coerce").to_numpy(dtype=np.float64)
+        if "Volume" in df.columns else np.full(len(df), np.nan)
+    )
+    if "Adj Close" in df.columns:
+        ratio = pd.to_numeric(df["Adj Close"], errors="coerce").to_numpy(dtype=np.float64) / close
+        ratio = np.where(np.isfinite(ratio) & (ratio > 0), ratio, 1.0)
+        for c in ["Open", "High", "Low", "Close"]:
+            values[c] = values[c] * ratio
+
+    valid = dates.notna().to_numpy() & (values["Close"] > 0) & ~(values["High"] < values["Low"])
+    tickers = (
+        df["ticker"].astype(str).str.strip().str.upper().to_numpy()
+        if "ticker" in df.columns else np.full(len(df), ticker.upper(), dtype=object)
+    )
+    frame = pd.DataFrame({c: values[c][valid] for c in COLUMNS}, index=pd.DatetimeIndex(dates[valid], name="Date"))
+    frame["ticker"] = tickers[valid]
+
+    frame = frame.sort_values(["ticker", "Date"], kind="stable")
+    keys = frame["ticker"].to_numpy()
+    stamps = frame.index.to_numpy()
+    # After a stable sort, duplicates are adjacent and the vendor's last row comes last.
+    keep = np.ones(len(frame), dtype=bool)
+    keep[:-1] = (keys[1:] != keys[:-1]) | (stamps[1:] != stamps[:-1])
+    frame, keys = frame[keep], keys[keep]
+    bounds = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    starts, ends = np.r_[0, bounds], np.r_[bounds, len(frame)]
+    frames = {keys[s]: frame.iloc[s:e][COLUMNS] for s, e in zip(starts, ends) if e > s}
+    return {"frames": frames, "rows": int(valid.sum()), "rejected": int(len(df) - valid.sum())}
+
+
+def combine(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Join one ticker's histories from several files; on shared dates the later file wins."""
+    if len(frames) == 1:
+        return frames[0]
+    frame = pd.concat(frames)
+    return frame[~frame.index.duplicated(keep="last")].sort_index(kind="stable")
+
+
+def write_history(store: HistoryStore, ticker: str, frame: pd.DataFrame, merge: bool = False) -> int:
+    """
+    Write one imported history, optionally merged over previously stored bars (new rows win).
+
+    Raises:
+        ValueError: When merging into a provider history, which stores bars as
+                    traded plus events and cannot be combined with vendor bars.
+    """
+    if merge:
+        meta = store.meta(ticker)
+        if meta is not None and meta.get("raw"):
+            raise ValueError(f"{ticker} holds provider bars as traded; import without merge to replace it")
+        current = store.read(ticker)
+        if current is not None and len(current):
+            frame = combine([current[COLUMNS], frame])
+    store.write(ticker, frame, source=SOURCE, complete=True)
+    return len(frame)
+
+
+def write_histories(
+    store: HistoryStore, frames: Dict[str, pd.DataFrame], merge: bool = False, write_threads: int = 8
+) -> Dict[str, str]:
+    """
+    Write per-ticker histories, each ticker once, fanned out to threads (np.save releases the GIL).
+
+    Returns:
+        dict: {ticker: error} for histories that could not be written.
+    """
+    def write(item):
+        try:
+            write_history(store, item[0], item[1], merge)
+        except Exception as e:
+            return item[0], f"{type(e).__name__}: {e}"
+        return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(write_threads, len(frames)))) as executor:
+        return dict(error for error in executor.map(write, frames.items()) if error is not None)
+
+
+def parse_file(path: str) -> dict:
+    """
+    Parse and validate one CSV file (runs in a worker process).
+
+    Returns:
+        dict: "path", "frames" ({ticker: frame}), "tickers", "rows", "rejected" and "error" (None on success).
+    """
+    report = {"path": path, "frames": {}, "tickers": 0, "rows": 0, "rejected": 0, "error": None}
+    try:
+        df = read_csv(path)
+        result = normalize(df, None if "ticker" in df.columns else ticker_from_path(path))
+    except Exception as e:
+        report["error"] = f"{type(e).__name__}: {e}"
+        return report
+    report.update(frames=result["frames"], tickers=len(result["frames"]), rows=result["rows"],
+                  rejected=result["rejected"])
+    return report
+
+
+def partition_of(ticker: str, partitions: int) -> int:
+    """Partition owning a ticker; stable across processes, unlike `hash`."""
+    return zlib.crc32(ticker.encode()) % partitions
+
+
+def spill_file(path: str, index: int, spill_dir: str, partitions: int) -> dict:
+    """
+    Parse one CSV file and spill its tickers to per-partition files (runs in a worker process).
+
+    Returns:
+        dict: `parse_file`'s report without "frames", plus "spills" ({partition: spill file}).
+    """
+    report = parse_file(path)
+    groups: Dict[int, Dict[str, pd.DataFrame]] = {}
+    for ticker, frame in report.pop("frames").items():
+        groups.setdefault(partition_of(ticker, partitions), {})[ticker] = frame
+    report["spills"] = {}
+    for partition, frames in groups.items():
+        spill = os.path.join(spill_dir, f"{partition}-{index}.pkl")
+        pd.to_pickle(frames, spill)
+        report["spills"][partition] = spill
+    return report
+
+
+def write_partition(spills: List[str], root: Optional[str] = None, merge: bool = False) -> dict:
+    """
+    Combine and store every ticker of one partition (runs in a worker process).
+
+    Args:
+        spills (List[str]): The partition's spill files in file order; later files win on shared dates.
+
+    Returns:
+        dict: "tickers" written and "errors" ({ticker: error}).
+    """
+    by_ticker: Dict[str, List[pd.DataFrame]] = {}
+    for spill in spills:
+        for ticker, frame in pd.read_pickle(spill).items():
+            by_ticker.setdefault(ticker, []).append(frame)
+        os.remove(spill)
+    store = HistoryStore(root)
+    result = {"tickers": 0, "errors": {}}
+    for ticker in list(by_ticker):
+        try:
+            write_history(store, ticker, combine(by_ticker.pop(ticker)), merge)
+        except Exception as e:
+            result["errors"][ticker] = f"{type(e).__name__}: {e}"
+        else:
+            result["tickers"] += 1
+    return result
+
+
+def ingest_file(path: str, root: Optional[str] = None, merge: bool = False, write_threads: int = 8) -> dict:
+    """
+    Parse, validate and store one CSV file.
+
+    Returns:
+        dict: "path", "tickers", "rows", "rejected" and "error" (None on success).
+    """
+    report = parse_file(path)
+    frames = report.pop("frames")
+    if frames:
+        errors = write_histories(HistoryStore(root), frames, merge, write_threads)
+        if errors:
+            report["error"] = "; ".join(f"{ticker}: {error}" for ticker, error in errors.items())
+    return report
+
+
+def ingest(
+    paths: Iterable[str],
+    root: Optional[str] = None,
+    merge: bool = False,
+    max_workers: Optional[int] = None,
+    progress=None,
+) -> dict:
+    """
+    Import vendor CSV dumps into the history store in parallel.
+
+    Args:
+        paths (Iterable[str]): Files, directories or glob patterns.
+        root (str, optional): Store directory. Defaults to the shared store.
+        merge (bool, optional): Merge with stored bars instead of replacing them.
+        max_workers (int, optional): Worker processes. Defaults to the CPU count.
+        progress (Callable, optional): Called with each file's report (without
+                                       its frames) as it is parsed.
+
+    Returns:
+        dict: Totals ("files", "tickers", "rows", "rejected", "seconds") and "errors"
+              per unreadable file or unwritable ticker.
+    """
+    files = expand_paths(paths)
+    started = time.perf_counter()
+    totals = {"files": len(files), "tickers": 0, "rows": 0, "rejected": 0, "errors": {}}
+    workers = max_workers or os.cpu_count() or 1
+    # About one file's worth of rows per partition, and at least one partition per worker.
+    partitions = max(workers, len(files))
+    spills: Dict[int, List[tuple]] = {}
+
+    def collect(report: dict):
+        for partition, spill in report.pop("spills").items():
+            spills.setdefault(partition, []).append((report["index"], spill))
+        if report["error"]:
+            totals["errors"][report["path"]] = report["error"]
+            logger.warning(f"Skipped {report['path']}: {report['error']}")
+        for key in ("rows", "rejected"):
+            totals[key] += report[key]
+        if progress is not None:
+            progress(report)
+
+    def written(result: dict):
+        totals["tickers"] += result["tickers"]
+        for ticker, error in result["errors"].items():
+            totals["errors"][ticker] = error
+            logger.warning(f"Not stored {ticker}: {error}")
+
+    store = HistoryStore(root)
+    os.makedirs(store.root, exist_ok=True)
+    # Spills stay next to the store rather than in a possibly memory-backed /tmp.
+    with tempfile.TemporaryDirectory(prefix=".ingest-", dir=store.root) as spill_dir:
+        tasks = [(path, index, spill_dir, partitions) for index, path in enumerate(files)]
+        if len(files) == 1 or workers == 1:
+            for task in tasks:
+                collect({**spill_file(*task), "index": task[1]})
+            for partition in sorted(spills):
+                written(write_partition([spill for _, spill in sorted(spills[partition])], store.root, merge))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(spill_file, *task): task[1] for task in tasks}
+                for future in as_completed(futures):
+                    collect({**future.result(), "index": futures[future]})
+                # Each partition, and so each ticker, is written by exactly one worker.
+                for future in as_completed([
+                    executor.submit(write_partition, [spill for _, spill in sorted(parts)], store.root, merge)
+                    for parts in spills.values()
+                ]):
+                    written(future.result())
+
+    totals["seconds"] = time.perf_counter() - started
+    logger.info(f"Ingested {totals['rows']} rows for {totals['tickers']} tickers in {totals['seconds']:.1f}s")
+    return totals
@@ -0,0 +1,406 @@
+"""
+Background jobs for AerialView's Dash server.
+
+Long analyses (large correlation matrices, simulations, universe scans) run
+on a local process pool instead of inside a callback, so request workers
+stay free for quick interactions. Job state lives in a SQLite store shared
+by every worker process on the host:
+
+* identical jobs (same function and arguments) are deduplicated, including
+  recently finished ones whose result is still fresh;
+* job functions receive a `Progress` reporter that records progress and
+  raises `JobCancelled` once cancellation has been requested;
+* submitting a job under a `group` (e.g. one page of one browser session)
+  releases that group's earlier jobs whose inputs differ; a deduplicated job
+  is shared by every group that submitted it and is only cancelled once no
+  group still waits on it;
+* a running job's `Progress` reports double as a heartbeat: a job silent
+  for longer than `heartbeat_timeout`, or still active after the process
+  that submitted it has exited, is marked failed instead of being reused.
+"""
+
+import hashlib
+import logging
+import multiprocessing
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from aerialview.core.config import cache_path
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+ACTIVE = (QUEUED, RUNNING)
+FIELDS = ("id", "key", "name", "job_group", "status", "progress", "message", "error", "created", "updated")
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when its cancellation has been requested."""
+
+
+class JobStore:
+    """
+    Disk-backed job table shared by processes.
+
+    Args:
+        path (str, optional): SQLite file. Defaults to "<cache dir>/jobs.sqlite".
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or cache_path("jobs.sqlite")
+        self._lock = threading.Lock()
+        self._pid = None
+        self._db = None
+
+    def _conn(self) -> sqlite3.Connection:
+        # Reconnect after fork so preloaded gunicorn workers don't share a handle.
+        if self._pid != os.getpid():
+            self._db = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, key TEXT, name TEXT, job_group TEXT, status TEXT, "
+                "progress REAL, message TEXT, error TEXT, created REAL, updated REAL, "
+                "cancel INTEGER DEFAULT 0, result BLOB, owner INTEGER)"
+            )
+            try:
+                # Stores created before jobs recorded the submitting process.
+                self._db.execute("ALTER TABLE jobs ADD COLUMN owner INTEGER")
+            except sqlite3.OperationalError:
+                pass
+            self._db.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key)")
+            # Groups waiting on each job; deduplication can give one job several.
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS job_groups ("
+                "job_id TEXT, job_group TEXT, PRIMARY KEY (job_id, job_group))"
+            )
+            self._db.commit()
+            self._pid = os.getpid()
+        return self._db
+
+    def _execute(self, sql: str, params=()):
+        with self._lock:
+            db = self._conn()
+            rows = db.execute(sql, params).fetchall()
+            db.commit()
+        return rows
+
+    def create(self, job_id: str, key: str, name: str, group: Optional[str]):
+        now = time.time()
+        self._execute(
+            "INSERT INTO jobs (id, key, name, job_group, status, progress, message, created, updated, owner) "
+            "VALUES (?, ?, ?, ?, ?, 0, '', ?, ?, ?)",
+            (job_id, key, name, group, QUEUED, now, now, os.getpid()),
+        )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Return a job's state (without its result), or None."""
+        rows = self._execute(f"SELECT {', '.join(FIELDS)} FROM jobs WHERE id = ?", (job_id,))
+        return dict(zip(FIELDS, rows[0])) if rows else None
+
+    def update(self, job_id: str, **fields):
+        fields["updated"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        self._execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def find(self, key: str, done_after: float) -> Optional[str]:
+        """Id of an active job with this key, or of one finished after `done_after`."""
+        rows = self._execute(
+            "SELECT id FROM jobs WHERE key = ? AND cancel = 0 AND "
+            "(status IN (?, ?) OR (status = ? AND updated > ?)) ORDER BY created DESC LIMIT 1",
+            (key, QUEUED, RUNNING, DONE, done_after),
+        )
+        return rows[0][0] if rows else None
+
+    def expire(self, stale_before: float) -> int:
+        """Mark running jobs whose last heartbeat is older than `stale_before` as failed."""
+        with self._lock:
+            db = self._conn()
+            expired = db.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated = ? WHERE status = ? AND updated < ?",
+                (FAILED, "Lost: no progress heartbeat", time.time(), RUNNING, stale_before),
+            ).rowcount
+            db.commit()
+        return expired
+
+    def fail_orphans(self) -> int:
+        """Mark active jobs submitted by processes that no longer exist as failed."""
+        owners = [row[0] for row in self._execute(
+            "SELECT DISTINCT owner FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+        )]
+        orphaned = 0
+        for owner in owners:
+            if owner is not None and _alive(owner):
+                continue
+            with self._lock:
+                db = self._conn()
+                orphaned += db.execute(
+                    "UPDATE jobs SET status = ?, error = ?, updated = ? WHERE status IN (?, ?) AND owner IS ?",
+                    (FAILED, "Lost: submitting process exited", time.time(), QUEUED, RUNNING, owner),
+                ).rowcount
+                db.commit()
+        return orphaned
+
+    def subscribe(self, job_id: str, group: str):
+        """Record that `group` waits on a job."""
+        self._execute("INSERT OR IGNORE INTO job_groups (job_id, job_group) VALUES (?, ?)", (job_id, group))
+
+    def unsubscribe(self, job_id: str, group: str) -> int:
+        """Stop `group` waiting on a job; returns how many groups still wait on it."""
+        with self._lock:
+            db = self._conn()
+            db.execute("DELETE FROM job_groups WHERE job_id = ? AND job_group = ?", (job_id, group))
+            remaining = db.execute("SELECT COUNT(*) FROM job_groups WHERE job_id = ?", (job_id,)).fetchone()[0]
+            db.commit()
+        return remaining
+
+    def active_in_group(self, group: str):
+        """Ids of active jobs `group` waits on."""
+        return [row[0] for row in self._execute(
+            "SELECT id FROM jobs JOIN job_groups ON job_groups.job_id = jobs.id "
+            "WHERE job_groups.job_group = ? AND status IN (?, ?) AND cancel = 0", (group, QUEUED, RUNNING)
+        )]
+
+    def request_cancel(self, job_id: str):
+        self._execute("UPDATE jobs SET cancel = 1, updated = ? WHERE id = ?", (time.time(), job_id))
+
+    def cancel_requested(self, job_id: str) -> bool:
+        rows = self._execute("SELECT cancel FROM jobs WHERE id = ?", (job_id,))
+        return bool(rows and rows[0][0])
+
+    def set_result(self, job_id: str, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._execute(
+            "UPDATE jobs SET result = ?, status = ?, progress = 1, updated = ? WHERE id = ?",
+            (blob, DONE, time.time(), job_id),
+        )
+
+    def result(self, job_id: str):
+        rows = self._execute("SELECT result FROM jobs WHERE id = ? AND status = ?", (job_id, DONE))
+        return pickle.loads(rows[0][0]) if rows and rows[0][0] is not None else None
+
+    def purge(self, older_than: float) -> int:
+        """Delete finished jobs last updated before a timestamp; returns the number deleted."""
+        with self._lock:
+            db = self._conn()
+            deleted = db.execute(
+                "DELETE FROM jobs WHERE status NOT IN (?, ?) AND updated < ?", (QUEUED, RUNNING, older_than)
+            ).rowcount
+            db.execute("DELETE FROM job_groups WHERE job_id NOT IN (SELECT id FROM jobs)")
+            db.commit()
+        return deleted
+
+
+def _alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows; rely on the heartbeat timeout there.
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Progress:
+    """
+    Progress reporter passed to job functions as `progress=`.
+
+    Call it with a fraction in [0, 1] and an optional message. Writes are
+    throttled; every call also checks for cancellation and raises
+    `JobCancelled` when requested, so jobs stop at their next report. Each
+    write refreshes the job's heartbeat, so long jobs should report at least
+    once per `JobManager.heartbeat_timeout`.
+    """
+
+    def __init__(self, store: JobStore, job_id: str, min_interval: float = 0.25):
+        self.store = store
+        self.job_id = job_id
+        self.min_interval = min_interval
+        self._last = 0.0
+
+    def __call__(self, fraction: float, message: str = ""):
+        now = time.monotonic()
+        if now - self._last < self.min_interval and fraction < 1:
+            return
+        self._last = now
+        if self.store.cancel_requested(self.job_id):
+            raise JobCancelled(self.job_id)
+        self.store.update(self.job_id, progress=min(max(fraction, 0.0), 1.0), message=message)
+
+
+def no_progress(fraction: float, message: str = ""):
+    """Stand-in reporter for running job functions inline."""
+
+
+def _execute(path: str, job_id: str, fn: Callable, args: tuple, kwargs: dict):
+    # Runs in a pool process.
+    store = JobStore(path)
+    if store.cancel_requested(job_id):
+        store.update(job_id, status=CANCELLED)
+        return
+    store.update(job_id, status=RUNNING, message="Started")
+    try:
+        result = fn(*args, progress=Progress(store, job_id), **kwargs)
+    except JobCancelled:
+        store.update(job_id, status=CANCELLED, message="Cancelled")
+    except Exception as e:
+        logger.exception(f"Job {job_id} failed")
+        store.update(job_id, status=FAILED, error=f"{type(e).__name__}: {e}")
+    else:
+        store.set_result(job_id, result)
+
+
+class JobManager:
+    """
+    Submit, deduplicate, observe and cancel background jobs.
+
+    Job functions must be importable module-level callables accepting a
+    `progress` keyword argument, since they run in spawned worker processes.
+
+    Args:
+        path (str, optional): Job store file.
+        max_workers (int, optional): Pool processes. Defaults to 2.
+        result_ttl (float, optional): Seconds a finished result is reused. Defaults to 1 hour.
+        heartbeat_timeout (float, optional): Seconds a running job may go without
+                                             a progress report before it is failed. Defaults to 10 minutes.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_workers: int = 2,
+        result_ttl: float = 3600.0,
+        heartbeat_timeout: float = 600.0,
+    ):
+        self.store = JobStore(path)
+        self.max_workers = max_workers
+        self.result_ttl = result_ttl
+        self.heartbeat_timeout = heartbeat_timeout
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pid = None
+        self._futures = {}
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pid != os.getpid():
+                # Spawned workers do not inherit the server's threads or sockets.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                self._futures = {}
+                self._pid = os.getpid()
+                orphaned = self.store.fail_orphans()
+                if orphaned:
+                    logger.warning(f"Marked {orphaned} jobs left active by exited processes as failed")
+            return self._pool
+
+    @staticmethod
+    def make_key(fn: Callable, args, kwargs) -> str:
+        name = f"{fn.__module__}.{fn.__qualname__}"
+        raw = pickle.dumps((name, args, sorted(kwargs.items())), protocol=pickle.HIGHEST_PROTOCOL)
+        return hashlib.sha256(raw).hexdigest()
+
+    def submit(self, fn: Callable, *args, group: Optional[str] = None, name: Optional[str] = None, **kwargs) -> str:
+        """
+        Run `fn(*args, progress=..., **kwargs)` in the background.
+
+        Args:
+            fn (Callable): Module-level job function.
+            group (str, optional): Subscribe this group to the job and release
+                                   its other active jobs, cancelling those no other group waits on.
+            name (str, optional): Display name. Defaults to the function name.
+
+        Returns:
+            str: Job id (an existing one when an identical job is active or fresh).
+        """
+        key = self.make_key(fn, args, kwargs)
+        pool = self._executor()
+        self.store.expire(time.time() - self.heartbeat_timeout)
+        existing = self.store.find(key, done_after=time.time() - self.result_ttl)
+        if group is not None:
+            for job_id in self.store.active_in_group(group):
+                if job_id != existing:
+                    self.cancel(job_id, group=group)
+        if existing is not None:
+            if group is not None:
+                self.store.subscribe(existing, group)
+            return existing
+
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id, key, name or fn.__name__, group)
+        if group is not None:
+            self.store.subscribe(job_id, group)
+        future = pool.submit(_execute, self.store.path, job_id, fn, args, kwargs)
+        self._futures[job_id] = future
+        future.add_done_callback(lambda done: self._finished(job_id, done))
+        return job_id
+
+    def _finished(self, job_id: str, future):
+        self._futures.pop(job_id, None)
+        error = None if future.cancelled() else future.exception()
+        if error is not None:
+            # The worker died (e.g. BrokenProcessPool) before the job could record its outcome.
+            state = self.store.get(job_id)
+            if state is not None and state["status"] in ACTIVE:
+                self.store.update(job_id, status=FAILED, error=f"{type(error).__name__}: {error}")
+
+    def status(self, job_id: str) -> Optional[dict]:
+        """Job state: status, progress (0-1), message and error."""
+        self.store.expire(time.time() - self.heartbeat_timeout)
+        return self.store.get(job_id)
+
+    def result(self, job_id: str):
+        """The job's return value once done, else None."""
+        return self.store.result(job_id)
+
+    def cancel(self, job_id: str, group: Optional[str] = None):
+        """
+        Request cancellation; queued jobs never start, running ones stop at their next progress report.
+
+        Args:
+            job_id (str): Job to cancel.
+            group (str, optional): Only release this group's interest; the job
+                                   is cancelled once no other group waits on it.
+        """
+        if group is not None and self.store.unsubscribe(job_id, group):
+            return
+        self.store.request_cancel(job_id)
+        future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            self.store.update(job_id, status=CANCELLED, message="Cancelled")
+
+    def wait(self, job_id: str, timeout: float = 60.0) -> Optional[dict]:
+        """Block until a job finishes or the timeout passes; returns its state."""
+        deadline = time.monotonic() + timeout
+        while True:
+            state = self.status(job_id)
+            if state is None or state["status"] not in ACTIVE or time.monotonic() > deadline:
+                return state
+            time.sleep(0.05)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_default = None
+
+
+def get_manager() -> JobManager:
+    """Return the process-wide job manager."""
+    global _default
+    if _default is None:
+        _default = JobManager(max_workers=int(os.environ.get("AERIALVIEW_JOB_WORKERS", "2")))
+    return _default
@@ -0,0 +1,374 @@
+"""
+Live watchlist streaming for AerialView.
+
+This module polls the latest bars for a watchlist on a fixed cadence using
+asyncio, keeps indicator state up to date incrementally (no recomputation
+over the full history) and keeps a bounded ring buffer of recent points per
+ticker. Readers pass their own cursor (the last point time they have seen)
+and get only the points after it, so charts can be extended instead of
+redrawn and any number of clients can follow the same ticker.
+
+A `SimulatedFeed` stands in for the data provider in tests and demos.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from aerialview.core import provider
+
+logger = logging.getLogger(__name__)
+
+INTERVAL_SECONDS = {
+    "1m": 60, "2m": 120, "5m": 300, "15m": 900, "30m": 1800,
+    "60m": 3600, "90m": 5400, "1h": 3600, "1d": 86400,
+}
+
+
+class IndicatorState:
+    """
+    Incrementally updated indicator state for a single ticker.
+
+    The formulas match `SimpleFinanceAnalyzer.add_technical_indicators`
+    (rolling-mean RSI, adjusted EWM for MACD) so a live series lines up
+    with a batch recomputation over the same closes.
+
+    Args:
+        ma_window (int, optional): Moving average window. Defaults to 20.
+        rsi_window (int, optional): RSI window. Defaults to 14.
+        fast (int, optional): MACD fast span. Defaults to 12.
+        slow (int, optional): MACD slow span. Defaults to 26.
+        signal (int, optional): MACD signal span. Defaults to 9.
+        resync (int, optional): Updates between exact recomputations of the
+                                running window sums, which bounds the rounding
+                                error add/subtract accumulates. Defaults to 1000.
+    """
+
+    def __init__(self, ma_window=20, rsi_window=14, fast=12, slow=26, signal=9, resync=1000):
+        self.ma_window = ma_window
+        self.rsi_window = rsi_window
+        self.resync = resync
+        self._updates = 0
+        self._closes = deque(maxlen=ma_window)
+        self._close_sum = 0.0
+        self._gains = deque(maxlen=rsi_window)
+        self._losses = deque(maxlen=rsi_window)
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+        self._last_close = None
+        # Adjusted EWM is num / den with both decayed by (1 - alpha).
+        self._ewm = {
+            name: [2.0 / (span + 1.0), 0.0, 0.0]
+            for name, span in (("fast", fast), ("slow", slow), ("signal", signal))
+        }
+
+    def _ewm_update(self, name: str, value: float) -> float:
+        state = self._ewm[name]
+        decay = 1.0 - state[0]
+        state[1] = value + decay * state[1]
+        state[2] = 1.0 + decay * state[2]
+        return state[1] / state[2]
+
+    def update(self, close: float) -> Dict[str, float]:
+        """
+        Fold one new close into the state.
+
+        Args:
+            close (float): Latest closing price.
+
+        Returns:
+            dict: Current values for "MA", "RSI", "MACD" and "MACD_Signal".
+                  Values are NaN until enough bars have been seen.
+        """
+        if len(self._closes) == self.ma_window:
+            self._close_sum -= self._closes[0]
+        self._closes.append(close)
+        self._close_sum += close
+        ma = self._close_sum / self.ma_window if len(self._closes) == self.ma_window else np.nan
+
+        rsi = np.nan
+        if self._last_close is not None:
+            delta = close - self._last_close
+            if len(self._gains) == self.rsi_window:
+                self._gain_sum -= self._gains[0]
+                self._loss_sum -= self._losses[0]
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            self._gains.append(gain)
+            self._losses.append(loss)
+            self._gain_sum += gain
+            self._loss_sum += loss
+            if len(self._gains) == self.rsi_window:
+                if self._loss_sum > 0:
+                    rsi = 100 - 100 / (1 + self._gain_sum / self._loss_sum)
+                elif self._gain_sum > 0:
+                    rsi = 100.0
+        self._last_close = close
+
+        self._updates += 1
+        if self._updates % self.resync == 0:
+            self._close_sum = float(sum(self._closes))
+            self._gain_sum = float(sum(self._gains))
+            self._loss_sum = float(sum(self._losses))
+
+        macd = self._ewm_update("fast", close) - self._ewm_update("slow", close)
+        macd_signal = self._ewm_update("signal", macd)
+
+        return {"MA": ma, "RSI": rsi, "MACD": macd, "MACD_Signal": macd_signal}
+
+
+class SimulatedFeed:
+    """
+    Local random-walk bar feed that mimics a provider.
+
+    Each call to `fetch_latest` produces `bars_per_poll` new bars per ticker.
+    Prices are deterministic for a given seed and ticker.
+
+    Args:
+        interval (str, optional): Bar interval. Defaults to "1m".
+        bars_per_poll (int, optional): Bars produced per fetch. Defaults to 1.
+        seed (int, optional): Random seed. Defaults to 0.
+        latency (float, optional): Simulated network latency in seconds.
+    """
+
+    def __init__(self, interval="1m", bars_per_poll=1, seed=0, latency=0.0):
+        self.step = pd.Timedelta(seconds=INTERVAL_SECONDS[interval])
+        self.bars_per_poll = bars_per_poll
+        self.seed = seed
+        self.latency = latency
+        self.calls = 0
+        self._start = pd.Timestamp("2024-01-02 09:30")
+        self._last: Dict[str, Tuple[pd.Timestamp, float]] = {}
+
+    async def fetch_latest(
+        self, ticker: str, since: Optional[pd.Timestamp] = None
+    ) -> pd.DataFrame:
+        """
+        Return bars newer than `since`.
+
+        Args:
+            ticker (str): Stock symbol.
+            since (pd.Timestamp, optional): Only bars after this time are returned.
+
+        Returns:
+            pd.DataFrame: Bars with "date", "open", "high", "low", "close", "volume".
+        """
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        last_time, last_close = self._last.get(
+            ticker, (self._start - self.step, 100.0 + sum(map(ord, ticker)) % 100)
+        )
+        rng = np.random.default_rng([self.seed, sum(map(ord, ticker)), self.calls])
+        steps = rng.normal(0, 0.002, self.bars_per_poll)
+        closes = last_close * np.exp(np.cumsum(steps))
+        opens = np.concatenate(([last_close], closes[:-1]))
+        spread = np.abs(rng.normal(0, 0.001, self.bars_per_poll)) * closes
+        dates = pd.date_range(last_time + self.step, periods=self.bars_per_poll, freq=self.step)
+        self._last[ticker] = (dates[-1], float(closes[-1]))
+
+        df = pd.DataFrame({
+            "date": dates,
+            "open": opens,
+            "high": np.maximum(opens, closes) + spread,
+            "low": np.minimum(opens, closes) - spread,
+            "close": closes,
+            "volume": rng.integers(1_000, 10_000, self.bars_per_poll),
+        })
+        if since is not None:
+            df = df[df["date"] > since]
+        return df
+
+
+class YahooFeed:
+    """
+    Bar feed backed by Yahoo Finance intraday history.
+
+    Requests go through `provider.get_latest_bars`, so they share the ticker
+    pool, HTTP session and `resilience.guard` with every other upstream call.
+    The first poll for a ticker loads the current session; later polls only
+    request bars from the last one already seen onward.
+
+    Args:
+        interval (str, optional): Bar interval. Defaults to "1m".
+    """
+
+    def __init__(self, interval="1m"):
+        self.interval = interval
+
+    def _fetch(self, ticker: str, since: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        df = provider.get_latest_bars(ticker, interval=self.interval, since=since)
+        df = df.reset_index().rename(columns=str.lower)
+        return df.rename(columns={"datetime": "date"})
+
+    async def fetch_latest(
+        self, ticker: str, since: Optional[pd.Timestamp] = None
+    ) -> pd.DataFrame:
+        df = await asyncio.to_thread(self._fetch, ticker, since)
+        if since is not None and not df.empty:
+            df = df[df["date"] > since]
+        return df
+
+
+class WatchlistPoller:
+    """
+    Poll a watchlist on a fixed cadence and keep live indicator state.
+
+    Identical in-flight requests (same ticker) are merged into a single
+    feed call. Points are kept per ticker in a ring buffer of `history`
+    points; readers are never consumed from, so each client follows its own
+    cursor with `since` and consumers only ever receive appended data.
+
+    Args:
+        tickers (List[str]): Watchlist symbols.
+        feed: Object with an async `fetch_latest(ticker, since)` method.
+        cadence (float, optional): Seconds between polls. Defaults to 5.
+        history (int, optional): Points kept per ticker. Defaults to 500.
+    """
+
+    def __init__(self, tickers: List[str], feed, cadence: float = 5.0, history: int = 500):
+        self.tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        self.feed = feed
+        self.cadence = cadence
+        self.states = {t: IndicatorState() for t in self.tickers}
+        self.last_seen: Dict[str, pd.Timestamp] = {}
+        self._history = {t: deque(maxlen=history) for t in self.tickers}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = None
+
+    async def fetch(self, ticker: str) -> pd.DataFrame:
+        """Fetch new bars for a ticker, sharing any identical in-flight request."""
+        task = self._inflight.get(ticker)
+        if task is None:
+            task = asyncio.ensure_future(
+                self.feed.fetch_latest(ticker, since=self.last_seen.get(ticker))
+            )
+            self._inflight[ticker] = task
+            task.add_done_callback(lambda _: self._inflight.pop(ticker, None))
+        return await asyncio.shield(task)
+
+    def _apply(self, ticker: str, bars: pd.DataFrame) -> int:
+        last = self.last_seen.get(ticker)
+        if last is not None:
+            bars = bars[bars["date"] > last]
+        if bars.empty:
+            return 0
+
+        state = self.states[ticker]
+        points = []
+        for date, close in zip(bars["date"], bars["close"].to_numpy(dtype=float)):
+            values = state.update(close)
+            points.append({"date": date, "close": close, **values})
+
+        with self._lock:
+            self._history[ticker].extend(points)
+        self.last_seen[ticker] = bars["date"].iloc[-1]
+        return len(points)
+
+    async def poll_once(self) -> int:
+        """
+        Poll every ticker once.
+
+        Returns:
+            int: Number of new points appended across the watchlist.
+        """
+        results = await asyncio.gather(
+            *(self.fetch(t) for t in self.tickers), return_exceptions=True
+        )
+        appended = 0
+        for ticker, result in zip(self.tickers, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Live poll failed for {ticker}: {result}")
+                continue
+            if result is not None:
+                appended += self._apply(ticker, result)
+        return appended
+
+    async def run(self, stop: Optional[asyncio.Event] = None):
+        """Poll on the configured cadence until `stop` is set."""
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            await self.poll_once()
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.cadence)
+            except asyncio.TimeoutError:
+                pass
+
+    def start_in_thread(self):
+        """Run the poller on its own event loop in a daemon thread."""
+        if self._thread is not None:
+            return
+        loop = asyncio.new_event_loop()
+
+        def target():
+            asyncio.set_event_loop(loop)
+            self._stop = asyncio.Event()
+            loop.run_until_complete(self.run(self._stop))
+
+        self._loop = loop
+        self._thread = threading.Thread(target=target, name="aerialview-live", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop a poller started with `start_in_thread`."""
+        if self._thread is None:
+            return
+        if self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(timeout=self.cadence + 1)
+        self._thread = None
+
+    def since(self, ticker: str, cursor=None) -> List[dict]:
+        """
+        Return retained points newer than a reader's cursor, without consuming them.
+
+        Args:
+            ticker (str): Stock symbol.
+            cursor (optional): Time of the last point the reader has seen
+                               (e.g. the "date" of the last point it got);
+                               None returns every retained point.
+
+        Returns:
+            List[dict]: Points with "date", "close" and indicator values, oldest first.
+        """
+        cursor = None if cursor is None else pd.Timestamp(cursor)
+        points = []
+        with self._lock:
+            for point in reversed(self._history.get(ticker.upper(), ())):
+                if cursor is not None and point["date"] <= cursor:
+                    break
+                points.append(point)
+        return points[::-1]
+
+    def snapshot(self, ticker: str) -> List[dict]:
+        """Return the retained history for a ticker (used for full redraws)."""
+        return self.since(ticker)
+
+
+def extend_data(points: List[dict], fields=("close", "MA"), max_points: int = 500):
+    """
+    Build a `dcc.Graph.extendData` payload from new points.
+
+    Args:
+        points (List[dict]): Points returned by `WatchlistPoller.since`.
+        fields (tuple, optional): Point keys mapped to traces 0..n-1.
+        max_points (int, optional): Points kept per trace in the browser.
+
+    Returns:
+        tuple: (update dict, trace indices, max points), or None if no points.
+    """
+    if not points:
+        return None
+    x = [p["date"] for p in points]
+    update = {
+        "x": [x for _ in fields],
+        "y": [[None if pd.isna(p[f]) else p[f] for p in points] for f in fields],
+    }
+    return update, list(range(len(fields))), max_points
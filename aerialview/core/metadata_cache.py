@@ -0,0 +1,261 @@
+"""
+Ticker metadata cache for AerialView.
+
+Ticker info and analyst recommendations change rarely but are among the
+slowest provider calls. This module keeps them in a persistent SQLite cache
+with per-field TTLs. Stale entries are served immediately while a background
+refresh runs (stale-while-revalidate), and the cache can be warmed in bulk.
+"""
+
+import copy
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from typing import Callable, Dict, Iterable, Optional
+
+import pandas as pd
+
+from aerialview.core import provider
+from aerialview.core.config import cache_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTLS = {
+    "info": 24 * 3600,
+    "recommendations": 6 * 3600,
+}
+
+
+def _dump(value) -> str:
+    if isinstance(value, pd.DataFrame):
+        return json.dumps({"frame": value.to_json(orient="split", date_format="iso")})
+    return json.dumps({"value": value}, default=str)
+
+
+def _load(payload: str):
+    data = json.loads(payload)
+    if "frame" in data:
+        return pd.read_json(StringIO(data["frame"]), orient="split")
+    return data["value"]
+
+
+def _copy(value):
+    """Independent copy of a cached value, so callers cannot mutate the shared entry."""
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    return copy.deepcopy(value)
+
+
+class MetadataCache:
+    """
+    Persistent stale-while-revalidate cache for ticker metadata.
+
+    The SQLite connection and the refresh threads are created on first use
+    and again in a forked child, so preloaded gunicorn workers neither share
+    a handle nor submit to a pool whose threads did not survive the fork.
+
+    Args:
+        path (str, optional): SQLite file. Defaults to "<cache dir>/metadata.sqlite".
+        ttls (dict, optional): Seconds each field stays fresh.
+        fetchers (dict, optional): {field: callable(ticker)} used to refresh entries.
+        max_workers (int, optional): Background refresh threads. Defaults to 4.
+        max_memory (int, optional): Entries kept decoded in memory (LRU). Defaults to 1024.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        fetchers: Optional[Dict[str, Callable]] = None,
+        max_workers: int = 4,
+        max_memory: int = 1024,
+    ):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.fetchers = fetchers or {
+            "info": provider.get_info,
+            "recommendations": provider.get_recommendations,
+        }
+        self.path = path or cache_path("metadata.sqlite")
+        self.max_workers = max_workers
+        self._pid = None
+        self._db = None
+        self._pool_pid = None
+        self._pool = None
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._lock = threading.Lock()
+        self.max_memory = max_memory
+        self._memory = OrderedDict()
+        # Refreshes in flight, each with an event set once its result is stored.
+        self._refreshing: Dict[tuple, threading.Event] = {}
+
+    def _conn(self) -> sqlite3.Connection:
+        # Reconnect after fork so preloaded gunicorn workers don't share a handle.
+        if self._pid != os.getpid():
+            self._db = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS metadata ("
+                "ticker TEXT, field TEXT, fetched_at REAL, payload TEXT, "
+                "PRIMARY KEY (ticker, field))"
+            )
+            self._db.commit()
+            self._pid = os.getpid()
+        return self._db
+
+    def _adopt(self):
+        # Caller holds the lock. A forked child inherits neither the parent's
+        # refresh threads nor their claims, whose events would never be set.
+        if self._pool_pid != os.getpid():
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="metadata")
+            self._refreshing = {}
+            self._pool_pid = os.getpid()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            self._adopt()
+            return self._pool
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory:
+                self._memory.popitem(last=False)
+        return entry
+
+    def _read(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+            row = self._conn().execute(
+                "SELECT fetched_at, payload FROM metadata WHERE ticker = ? AND field = ?", key
+            ).fetchone()
+        if row is None:
+            return None
+        return self._remember(key, (row[0], _load(row[1])))
+
+    def _claim(self, key) -> Optional[threading.Event]:
+        """Mark `key` as refreshing; returns None if a refresh is already in flight."""
+        with self._lock:
+            self._adopt()
+            if key in self._refreshing:
+                return None
+            event = self._refreshing[key] = threading.Event()
+            return event
+
+    def _refresh(self, key):
+        ticker, field = key
+        try:
+            try:
+                value = self.fetchers[field](ticker)
+            except Exception as e:
+                logger.error(f"Error refreshing {field} for {ticker}: {e}")
+                return None
+            if value is None or (isinstance(value, (dict, pd.DataFrame)) and len(value) == 0):
+                # Keep serving the previous value rather than caching an empty response.
+                return None
+            entry = self._remember(key, (time.time(), value))
+            with self._lock:
+                db = self._conn()
+                db.execute(
+                    "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?)",
+                    (ticker, field, entry[0], _dump(value)),
+                )
+                db.commit()
+            return entry
+        finally:
+            with self._lock:
+                event = self._refreshing.pop(key, None)
+            if event is not None:
+                event.set()
+
+    def _schedule(self, key):
+        if self._claim(key) is not None:
+            self._executor().submit(self._refresh, key)
+
+    def get(self, ticker: str, field: str):
+        """
+        Return a cached field, refreshing in the background when stale.
+
+        Only a cold miss blocks on the provider; if a refresh of the same
+        entry is already in flight, it waits for that one instead of fetching
+        again. Callers get their own copy of the value.
+
+        Args:
+            ticker (str): Stock symbol.
+            field (str): "info" or "recommendations".
+
+        Returns:
+            The cached value, or None if the provider has nothing.
+        """
+        key = (ticker.upper(), field)
+        entry = self._read(key)
+        if entry is None:
+            self.misses += 1
+            if self._claim(key) is not None:
+                entry = self._refresh(key)
+            else:
+                with self._lock:
+                    event = self._refreshing.get(key)
+                if event is not None:
+                    event.wait()
+                entry = self._read(key)
+            return None if entry is None else _copy(entry[1])
+        self.hits += 1
+        if time.time() - entry[0] > self.ttls[field]:
+            self.stale += 1
+            self._schedule(key)
+        return _copy(entry[1])
+
+    def stats(self) -> dict:
+        """Return hit, miss and stale-served counters."""
+        return {"hits": self.hits, "misses": self.misses, "stale": self.stale, "refreshing": len(self._refreshing)}
+
+    def get_info(self, ticker: str) -> dict:
+        """Return cached `yf.Ticker.info` for a ticker ({} if unavailable)."""
+        return self.get(ticker, "info") or {}
+
+    def get_recommendations(self, ticker: str) -> Optional[pd.DataFrame]:
+        """Return cached analyst recommendations for a ticker."""
+        return self.get(ticker, "recommendations")
+
+    def warm(self, tickers: Iterable[str], fields: Iterable[str] = ("info", "recommendations")) -> int:
+        """
+        Refresh missing or stale entries for a whole universe in parallel.
+
+        Args:
+            tickers (Iterable[str]): Stock symbols.
+            fields (Iterable[str], optional): Fields to warm.
+
+        Returns:
+            int: Number of entries refreshed.
+        """
+        now = time.time()
+        keys = []
+        for ticker in tickers:
+            for field in fields:
+                key = (ticker.upper(), field)
+                entry = self._read(key)
+                if (entry is None or now - entry[0] > self.ttls[field]) and self._claim(key) is not None:
+                    keys.append(key)
+        return sum(entry is not None for entry in self._executor().map(self._refresh, keys))
+
+
+_default = None
+
+
+def get_cache() -> MetadataCache:
+    """Return the process-wide metadata cache."""
+    global _default
+    if _default is None:
+        _default = MetadataCache()
+    return _default
@@ -0,0 +1,281 @@
+"""
+Operational metrics for AerialView.
+
+A small, dependency-free Prometheus client: counters, gauges and histograms
+with labels, rendered in the Prometheus text exposition format. Updates take
+one lock acquisition and a dict lookup, so instrumentation is safe to leave
+on under load. `instrument_server` wires callback latency, in-flight
+requests and a `/metrics` route into the Dash/Flask server.
+"""
+
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value) -> str:
+    """Escape a label value as the text exposition format requires."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, k)} {v}" for k, v in items
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    render = Counter.render
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observations in fixed buckets.
+
+    Args:
+        buckets (Sequence[float], optional): Upper bounds in seconds.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def time(self, **labels):
+        """Context manager observing the duration of a block."""
+        return _Timer(self, labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(k, (list(v[0]), v[1], v[2])) for k, v in self._values.items()]
+        lines = self.header()
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+
+class Registry:
+    """Collection of metrics plus collectors evaluated at scrape time."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def register_collector(self, collector: Callable[[], Iterable[str]]):
+        """Add a callable returning exposition lines, run on every scrape."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            try:
+                lines.extend(collector())
+            except Exception as e:
+                lines.append(f"# collector error: {e}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+callback_latency = registry.histogram(
+    "aerialview_callback_duration_seconds", "Dash callback latency.", ["callback"]
+)
+callback_errors = registry.counter(
+    "aerialview_callback_errors_total", "Dash callbacks that returned an error status.", ["callback"]
+)
+inflight_requests = registry.gauge(
+    "aerialview_inflight_requests", "HTTP requests currently being served.", ["kind"]
+)
+provider_latency = registry.histogram(
+    "aerialview_provider_request_duration_seconds", "Upstream data provider call latency.", ["call"]
+)
+provider_errors = registry.counter(
+    "aerialview_provider_errors_total", "Upstream data provider call failures.", ["call"]
+)
+
+
+_caches: Dict[str, Callable[[], dict]] = {}
+
+
+def register_cache(name: str, stats: Callable[[], dict]):
+    """
+    Expose a cache's hit/miss counters and hit ratio.
+
+    Args:
+        name (str): Value of the `cache` label.
+        stats (Callable): Returns a dict with at least "hits" and "misses".
+    """
+    _caches[name] = stats
+
+
+def _cache_collector() -> List[str]:
+    samples = []
+    for name, stats in list(_caches.items()):
+        try:
+            values = stats()
+        except Exception:
+            continue
+        lookups = values["hits"] + values["misses"]
+        samples.append((name, values["hits"], values["misses"], values["hits"] / lookups if lookups else 0.0))
+    if not samples:
+        return []
+    lines = []
+    for index, (metric, kind, doc) in enumerate((
+        ("aerialview_cache_hits_total", "counter", "Cache hits."),
+        ("aerialview_cache_misses_total", "counter", "Cache misses."),
+        ("aerialview_cache_hit_ratio", "gauge", "Cache hits / lookups."),
+    ), start=1):
+        lines += [f"# HELP {metric} {doc}", f"# TYPE {metric} {kind}"]
+        lines += [f'{metric}{_format_labels(["cache"], [sample[0]])} {sample[index]}' for sample in samples]
+    return lines
+
+
+registry.register_collector(_cache_collector)
+
+
+def instrument_server(server, path: str = "/metrics"):
+    """
+    Record callback latency and in-flight requests on a Flask server and expose `/metrics`.
+
+    Args:
+        server: The Flask app (`dash_app.server`).
+        path (str, optional): Route for the exposition endpoint. Defaults to "/metrics".
+    """
+    from flask import Response, g, request
+
+    @server.before_request
+    def _start_timer():
+        g._aerialview_start = time.perf_counter()
+        g._aerialview_kind = "callback" if request.path.endswith("_dash-update-component") else "other"
+        inflight_requests.inc(kind=g._aerialview_kind)
+
+    @server.after_request
+    def _observe(response):
+        start = g.pop("_aerialview_start", None)
+        if start is not None and g._aerialview_kind == "callback":
+            body = request.get_json(silent=True) or {}
+            callback = body.get("output", "unknown")
+            callback_latency.observe(time.perf_counter() - start, callback=callback)
+            if response.status_code >= 500:
+                callback_errors.inc(callback=callback)
+        return response
+
+    @server.teardown_request
+    def _done(_exc):
+        kind = g.pop("_aerialview_kind", None)
+        if kind is not None:
+            inflight_requests.dec(kind=kind)
+
+    @server.route(path)
+    def metrics():
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
+    return server
@@ -0,0 +1,317 @@
+"""
+News ingestion and sentiment utilities for AerialView.
+
+Headlines come from a pluggable source: the provider's news feed by
+default, or a local JSON Lines/CSV file (`ReplaySource`) for testing and
+offline replays. A lexicon-based scorer rates whole batches at once with
+vectorized pandas/NumPy operations, scores are cached per article hash in a
+SQLite store, and daily sentiment per ticker can be overlaid on price charts.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from aerialview.core import provider
+from aerialview.core.config import cache_path
+
+logger = logging.getLogger(__name__)
+
+# Finance-oriented word polarities in [-1, 1] (after Loughran-McDonald style word lists).
+LEXICON = {
+    # positive
+    "beat": 0.8, "beats": 0.8, "surge": 0.8, "surges": 0.8, "soar": 0.9, "soars": 0.9, "rally": 0.7,
+    "rallies": 0.7, "gain": 0.6, "gains": 0.6, "growth": 0.6, "strong": 0.6, "stronger": 0.6, "record": 0.5,
+    "profit": 0.6, "profits": 0.6, "profitable": 0.6, "upgrade": 0.8, "upgrades": 0.8, "upgraded": 0.8,
+    "outperform": 0.7, "bullish": 0.8, "boost": 0.6, "boosts": 0.6, "rise": 0.5, "rises": 0.5, "jump": 0.6,
+    "jumps": 0.6, "higher": 0.4, "partnership": 0.4, "expands": 0.4, "expansion": 0.4, "innovative": 0.5,
+    "approval": 0.6, "approved": 0.6, "win": 0.6, "wins": 0.6, "optimistic": 0.7, "positive": 0.5,
+    "exceeds": 0.7, "exceeded": 0.7, "dividend": 0.3, "buyback": 0.4, "recovery": 0.5, "rebound": 0.5,
+    # negative
+    "miss": -0.8, "misses": -0.8, "missed": -0.8, "plunge": -0.9, "plunges": -0.9, "slump": -0.8,
+    "slumps": -0.8, "fall": -0.5, "falls": -0.5, "drop": -0.6, "drops": -0.6, "decline": -0.6,
+    "declines": -0.6, "loss": -0.7, "losses": -0.7, "weak": -0.6, "weaker": -0.6, "downgrade": -0.8,
+    "downgrades": -0.8, "downgraded": -0.8, "underperform": -0.7, "bearish": -0.8, "lawsuit": -0.7,
+    "probe": -0.6, "investigation": -0.6, "recall": -0.6, "fraud": -1.0, "bankruptcy": -1.0, "layoffs": -0.6,
+    "cuts": -0.4, "lower": -0.4, "warning": -0.6, "warns": -0.6, "volatility": -0.3, "risk": -0.3,
+    "risks": -0.3, "fine": -0.4, "fined": -0.6, "delay": -0.5, "delays": -0.5, "halt": -0.6, "crash": -1.0,
+    "selloff": -0.8, "concern": -0.5, "concerns": -0.5, "pessimistic": -0.7, "negative": -0.5, "tumbles": -0.8,
+}
+NEGATIONS = frozenset({"not", "no", "never", "without", "isn't", "wasn't", "don't", "doesn't", "fails"})
+TOKEN_PATTERN = r"[a-z]+(?:'[a-z]+)?"
+POSITIVE, NEUTRAL, NEGATIVE = "Positive", "Neutral", "Negative"
+
+
+def article_hash(title: str, summary: str = "") -> str:
+    """Content hash of an article's text, used as its score cache key."""
+    text = re.sub(r"\s+", " ", f"{title} {summary}".strip().lower())
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def label(score: float, threshold: float = 0.05) -> str:
+    """"Positive", "Neutral" or "Negative" for a compound score."""
+    return POSITIVE if score > threshold else NEGATIVE if score < -threshold else NEUTRAL
+
+
+class LexiconScorer:
+    """
+    Vectorized lexicon sentiment scorer.
+
+    All texts in a batch are tokenized together; word polarities are looked
+    up in one pass, flipped when the previous word is a negation, summed
+    per text with `np.bincount` and squashed to [-1, 1].
+
+    Args:
+        lexicon (dict, optional): Word polarities. Defaults to `LEXICON`.
+        negations (Iterable[str], optional): Words that flip the next word.
+        alpha (float, optional): Normalization constant; larger is more conservative.
+    """
+
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None, negations: Iterable[str] = NEGATIONS,
+                 alpha: float = 2.0):
+        self.lexicon = pd.Series(lexicon or LEXICON, dtype=np.float64)
+        self.negations = pd.Index(list(negations))
+        self.alpha = alpha
+
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Score a batch of texts.
+
+        Returns:
+            np.ndarray: Compound scores in [-1, 1], one per text.
+        """
+        if len(texts) == 0:
+            return np.zeros(0)
+        tokens = pd.Series(list(texts), dtype=object).fillna("").str.lower().str.findall(TOKEN_PATTERN).explode()
+        tokens = tokens.dropna()
+        doc = tokens.index.to_numpy()
+        words = pd.Index(tokens.to_numpy())
+        polarity = self.lexicon.reindex(words).fillna(0.0).to_numpy()
+        negated = np.zeros(len(words), dtype=bool)
+        negated[1:] = words.isin(self.negations)[:-1] & (doc[1:] == doc[:-1])
+        polarity = np.where(negated, -polarity, polarity)
+        total = np.bincount(doc, weights=polarity, minlength=len(texts))
+        return total / np.sqrt(total * total + self.alpha)
+
+
+class ReplaySource:
+    """
+    News from a local JSON Lines or CSV file with ticker, title, published
+    and optional summary/source/url fields; for tests and offline replays.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def fetch(self, tickers: Iterable[str]) -> List[dict]:
+        if self.path.endswith((".jsonl", ".ndjson", ".json")):
+            frame = pd.read_json(self.path, lines=not self.path.endswith(".json"))
+        else:
+            frame = pd.read_csv(self.path)
+        wanted = {t.upper() for t in tickers}
+        frame = frame[frame["ticker"].str.upper().isin(wanted)]
+        return frame.to_dict("records")
+
+
+class ProviderSource:
+    """News from the market data provider (`provider.get_news`)."""
+
+    def __init__(self, count: int = 20):
+        self.count = count
+
+    @staticmethod
+    def parse(ticker: str, item: dict) -> Optional[dict]:
+        # Newer feeds nest fields under "content"; older ones are flat.
+        content = item.get("content") or item
+        title = content.get("title")
+        if not title:
+            return None
+        published = content.get("pubDate") or content.get("providerPublishTime")
+        if isinstance(published, (int, float)):
+            published = pd.Timestamp(published, unit="s")
+        url = (content.get("canonicalUrl") or {}).get("url") or content.get("link")
+        source = (content.get("provider") or {}).get("displayName") or content.get("publisher")
+        return {"ticker": ticker, "title": title, "summary": content.get("summary") or "",
+                "published": published, "source": source, "url": url}
+
+    def fetch(self, tickers: Iterable[str]) -> List[dict]:
+        articles = []
+        for ticker in tickers:
+            for item in provider.get_news(ticker, count=self.count):
+                article = self.parse(ticker.upper(), item)
+                if article is not None:
+                    articles.append(article)
+        return articles
+
+
+class NewsStore:
+    """
+    SQLite store of articles per ticker and sentiment scores per article hash.
+
+    Args:
+        path (str, optional): SQLite file. Defaults to "<cache dir>/news.sqlite".
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or cache_path("news.sqlite")
+        self._lock = threading.Lock()
+        self._pid = None
+        self._db = None
+
+    def _conn(self) -> sqlite3.Connection:
+        # Reconnect after fork so preloaded gunicorn workers don't share a handle.
+        if self._pid != os.getpid():
+            self._db = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS scores (hash TEXT PRIMARY KEY, score REAL)")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS articles (hash TEXT, ticker TEXT, published TEXT, title TEXT, "
+                "source TEXT, url TEXT, PRIMARY KEY (hash, ticker))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS articles_ticker ON articles (ticker, published)")
+            self._db.commit()
+            self._pid = os.getpid()
+        return self._db
+
+    def scores(self, hashes: Sequence[str]) -> Dict[str, float]:
+        """Cached scores for the given article hashes."""
+        found = {}
+        with self._lock:
+            db = self._conn()
+            for start in range(0, len(hashes), 500):
+                chunk = list(hashes[start:start + 500])
+                marks = ",".join("?" * len(chunk))
+                found.update(db.execute(f"SELECT hash, score FROM scores WHERE hash IN ({marks})", chunk))
+        return found
+
+    def add(self, articles: pd.DataFrame, scores: Dict[str, float]):
+        """Insert articles (hash, ticker, published, title, source, url) and new scores."""
+        rows = articles[["hash", "ticker", "published", "title", "source", "url"]].itertuples(index=False, name=None)
+        with self._lock:
+            db = self._conn()
+            db.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?)", scores.items())
+            db.executemany("INSERT OR IGNORE INTO articles VALUES (?, ?, ?, ?, ?, ?)", rows)
+            db.commit()
+
+    def articles(self, ticker: str, since: Optional[str] = None, limit: Optional[int] = None) -> pd.DataFrame:
+        """Articles for a ticker with their scores, newest first."""
+        sql = (
+            "SELECT a.published, a.title, a.source, a.url, s.score FROM articles a "
+            "JOIN scores s ON s.hash = a.hash WHERE a.ticker = ?"
+        )
+        params = [ticker.upper()]
+        if since is not None:
+            sql += " AND a.published >= ?"
+            params.append(since)
+        sql += " ORDER BY a.published DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._conn().execute(sql, params).fetchall()
+        frame = pd.DataFrame(rows, columns=["published", "title", "source", "url", "score"])
+        frame["published"] = pd.to_datetime(frame["published"], errors="coerce")
+        return frame
+
+
+class NewsPipeline:
+    """
+    Fetch, deduplicate, score and store headlines; aggregate daily sentiment.
+
+    Args:
+        source: Object with `fetch(tickers) -> list of article dicts`.
+        scorer (LexiconScorer, optional): Batch scorer.
+        store (NewsStore, optional): Article and score store.
+    """
+
+    def __init__(self, source=None, scorer: Optional[LexiconScorer] = None, store: Optional[NewsStore] = None):
+        self.source = source or ProviderSource()
+        self.scorer = scorer or LexiconScorer()
+        self.store = store or NewsStore()
+        self.scored = 0
+        self.cached = 0
+
+    def process(self, articles: Iterable[dict]) -> pd.DataFrame:
+        """
+        Score and store a batch of articles, reusing cached scores by article hash.
+
+        Returns:
+            pd.DataFrame: The batch with "hash" and "score" columns.
+        """
+        frame = pd.DataFrame(list(articles))
+        if frame.empty:
+            return frame
+        for column in ("summary", "source", "url", "published"):
+            if column not in frame.columns:
+                frame[column] = None
+        frame["ticker"] = frame["ticker"].str.upper()
+        frame["summary"] = frame["summary"].fillna("")
+        text = frame["title"].fillna("") + " " + frame["summary"]
+        frame["hash"] = [article_hash(t) for t in text]
+        published = pd.to_datetime(frame["published"], errors="coerce", utc=True).dt.tz_localize(None)
+        frame["published"] = published.fillna(pd.Timestamp.now().floor("s")).dt.strftime("%Y-%m-%dT%H:%M:%S")
+
+        unique = frame.drop_duplicates("hash")
+        cached = self.store.scores(unique["hash"].tolist())
+        todo = unique[~unique["hash"].isin(list(cached))]
+        new = dict(zip(todo["hash"], self.scorer.score(text.loc[todo.index].tolist()).tolist()))
+        self.store.add(frame, new)
+        self.scored += len(new)
+        self.cached += len(unique) - len(new)
+
+        frame["score"] = frame["hash"].map({**cached, **new})
+        return frame
+
+    def refresh(self, tickers: Iterable[str]) -> int:
+        """Fetch news for tickers from the source and process it; returns articles fetched."""
+        started = time.perf_counter()
+        articles = self.source.fetch(list(tickers))
+        self.process(articles)
+        logger.info(f"Processed {len(articles)} articles in {time.perf_counter() - started:.2f}s")
+        return len(articles)
+
+    def headlines(self, ticker: str, limit: int = 10) -> List[dict]:
+        """Latest headlines with their score and sentiment label."""
+        frame = self.store.articles(ticker, limit=limit)
+        frame["sentiment"] = [label(s) for s in frame["score"]]
+        return frame.to_dict("records")
+
+    def daily_sentiment(self, ticker: str, since=None) -> pd.DataFrame:
+        """
+        Daily sentiment for a ticker.
+
+        Returns:
+            pd.DataFrame: "sentiment" (mean score) and "articles" (count),
+                          indexed by calendar day.
+        """
+        since = None if since is None else pd.Timestamp(since).strftime("%Y-%m-%dT%H:%M:%S")
+        frame = self.store.articles(ticker, since=since)
+        if frame.empty:
+            return pd.DataFrame(columns=["sentiment", "articles"], index=pd.DatetimeIndex([], name="Date"))
+        daily = frame.groupby(frame["published"].dt.floor("D"))["score"].agg(["mean", "count"])
+        daily.columns = ["sentiment", "articles"]
+        daily.index.name = "Date"
+        return daily.sort_index()
+
+    def stats(self) -> dict:
+        """Articles scored versus served from the score cache."""
+        return {"scored": self.scored, "cached": self.cached}
+
+
+_default = None
+
+
+def get_pipeline() -> NewsPipeline:
+    """Return the process-wide news pipeline (a replay feed if `AERIALVIEW_NEWS_FEED` is set)."""
+    global _default
+    if _default is None:
+        feed = os.environ.get("AERIALVIEW_NEWS_FEED")
+        _default = NewsPipeline(ReplaySource(feed) if feed else ProviderSource())
+    return _default
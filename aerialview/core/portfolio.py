@@ -0,0 +1,405 @@
+"""
+Portfolio optimization utilities for AerialView.
+
+Long-only optimizers for hundreds of assets built on NumPy linear algebra:
+
+- `ledoit_wolf` shrinks the sample covariance towards a scaled identity, which
+  keeps the estimate well conditioned when there are nearly as many assets as
+  return observations.
+- `efficient_frontier` sweeps the mean-variance trade-off with an accelerated
+  projected-gradient solver that finishes with an exact active-set (KKT)
+  solve. Each point starts from the previous point's weights, so it takes a
+  few dozen iterations instead of hundreds.
+- `min_variance` is the first point of that sweep.
+- `risk_parity` solves the equal-risk-contribution portfolio with Newton's
+  method on its convex formulation, holding assets that exceed the cap at it.
+
+Weights are constrained to 0 <= w <= max_weight and sum(w) = 1.
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from aerialview.core.regression import RISK_FREE_RATE
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS = 252
+
+
+def ledoit_wolf(returns: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Ledoit-Wolf shrinkage covariance towards a scaled identity.
+
+    Missing returns (NaN) are handled pairwise: each covariance entry (and
+    its noise estimate) is averaged over the days both assets were observed,
+    so assets with shorter histories are not pulled towards zero covariance.
+    The pairwise estimate is repaired to positive semidefinite if needed.
+
+    Args:
+        returns (np.ndarray): (observations, assets) matrix of periodic returns.
+
+    Returns:
+        tuple: (covariance, shrinkage intensity in [0, 1]).
+    """
+    x = np.asarray(returns, dtype=np.float64)
+    observed = np.isfinite(x)
+    x = np.where(observed, x - np.nanmean(x, axis=0), 0.0)
+    t, n = x.shape
+    if observed.all():
+        counts = np.full((n, n), float(t))
+    else:
+        counts = observed.T.astype(np.float64) @ observed
+    pairs = np.maximum(counts, 1.0)
+    sample = x.T @ x / pairs
+    target = np.trace(sample) / n
+    dispersion = np.sum((sample - target * np.eye(n)) ** 2)
+    # Squared distance of each observation's outer product from the sample covariance, per observed pair.
+    squares = x**2
+    noise = np.sum(np.where(counts > 0, (squares.T @ squares / pairs - sample**2) / pairs, 0.0))
+    shrinkage = float(np.clip(noise / dispersion, 0.0, 1.0)) if dispersion > 0 else 1.0
+    covariance = (1 - shrinkage) * sample
+    covariance[np.diag_indices(n)] += shrinkage * target
+    if not observed.all():
+        values, vectors = np.linalg.eigh(covariance)
+        if values[0] < 0:
+            covariance = (vectors * np.maximum(values, 1e-12 * max(target, 1e-300))) @ vectors.T
+    return covariance, shrinkage
+
+
+def project_simplex(v: np.ndarray, upper: float = 1.0) -> np.ndarray:
+    """
+    Euclidean projection onto {w : 0 <= w <= upper, sum(w) = 1}.
+
+    The projection is clip(v - tau, 0, upper) for the threshold tau where the
+    weights sum to one. That sum is piecewise linear in tau with breakpoints at
+    v and v - upper, so tau is found exactly by sorting and interpolating.
+
+    Raises:
+        ValueError: If the caps cannot sum to one.
+    """
+    v = np.asarray(v, dtype=np.float64)
+    n = len(v)
+    if upper * n < 1 - 1e-12:
+        raise ValueError(f"max_weight {upper} is infeasible for {n} assets")
+    if upper >= 1:
+        # The cap cannot bind: plain simplex projection (Duchi et al., 2008).
+        a = np.sort(v)[::-1]
+        excess = np.cumsum(a) - 1
+        rho = np.flatnonzero(a * np.arange(1, n + 1) > excess)[-1]
+        return np.maximum(v - excess[rho] / (rho + 1), 0.0)
+
+    a = np.sort(v)
+    tail = np.r_[np.cumsum(a[::-1])[::-1], 0.0]
+    breaks = np.sort(np.r_[a, a - upper])
+    # sum(max(a - t, 0)) at t = breaks and t = breaks + upper in one pass.
+    t = np.r_[breaks, breaks + upper]
+    k = np.searchsorted(a, t, side="right")
+    above = tail[k] - (n - k) * t
+    total = above[: 2 * n] - above[2 * n:]
+    # `total` falls from n * upper to 0 as tau rises through the breakpoints.
+    tau = np.interp(1.0, total[::-1], breaks[::-1])
+    return np.clip(v - tau, 0.0, upper)
+
+
+def _polish(covariance, expected, risk_tolerance, w, upper, tol=1e-10):
+    """
+    Exact optimum for the active set `w` suggests, or None if that set is wrong.
+
+    With the zero and capped weights fixed, the remaining weights solve one
+    equality-constrained linear (KKT) system; the result is accepted only if
+    it is feasible and the fixed weights' gradients confirm their bounds.
+    """
+    capped = w >= upper - 1e-9
+    free = (w > 1e-9) & ~capped
+    k = int(free.sum())
+    if k == 0:
+        return None
+    target = risk_tolerance * expected[free] - upper * covariance[np.ix_(free, capped)].sum(axis=1)
+    system = np.empty((k + 1, k + 1))
+    system[:k, :k] = covariance[np.ix_(free, free)]
+    system[:k, k] = system[k, :k] = 1.0
+    system[k, k] = 0.0
+    try:
+        solution = np.linalg.solve(system, np.r_[target, 1.0 - upper * capped.sum()])
+    except np.linalg.LinAlgError:
+        return None
+    candidate = np.where(capped, upper, 0.0)
+    candidate[free] = solution[:k]
+    if candidate[free].min() < -tol or candidate[free].max() > upper + tol:
+        return None
+    # Free weights share the gradient level -solution[k]; zero weights may not
+    # sit below it and capped weights may not sit above it.
+    gradient = covariance @ candidate - risk_tolerance * expected
+    level = -solution[k]
+    scale = tol * max(1.0, np.abs(gradient).max())
+    if np.any(gradient[~free & ~capped] < level - scale) or np.any(gradient[capped] > level + scale):
+        return None
+    return np.clip(candidate, 0.0, upper)
+
+
+def solve_mean_variance(
+    covariance: np.ndarray,
+    expected: np.ndarray,
+    risk_tolerance: float,
+    start: Optional[np.ndarray] = None,
+    max_weight: float = 1.0,
+    step: Optional[float] = None,
+    tol: float = 1e-9,
+    max_iter: int = 20_000,
+    polish_every: int = 10,
+) -> Tuple[np.ndarray, int]:
+    """
+    Minimize 0.5 * w'Cw - risk_tolerance * mu'w over the capped simplex.
+
+    Uses FISTA (accelerated projected gradient) with adaptive restarts. Every
+    `polish_every` iterations the current active set (which weights are zero
+    or capped) is tried in an exact KKT solve, which usually finishes the job
+    long before the gradient steps alone would converge.
+
+    Args:
+        covariance (np.ndarray): (assets, assets) covariance C.
+        expected (np.ndarray): Expected returns mu.
+        risk_tolerance (float): Weight on expected return; 0 gives minimum variance.
+        start (np.ndarray, optional): Warm start weights. Defaults to equal weights.
+        max_weight (float, optional): Per-asset cap. Defaults to 1 (uncapped).
+        step (float, optional): Gradient step; defaults to 1 / largest eigenvalue of C.
+        tol (float, optional): Stop when no weight moves by more than this.
+        max_iter (int, optional): Iteration limit.
+        polish_every (int, optional): Iterations between active-set solves; 0 disables them.
+
+    Returns:
+        tuple: (weights, iterations used).
+    """
+    n = len(expected)
+    if step is None:
+        step = 1.0 / np.linalg.eigvalsh(covariance)[-1]
+    w = project_simplex(np.full(n, 1.0 / n) if start is None else start, max_weight)
+    y, momentum = w, 1.0
+    shift = step * risk_tolerance * expected
+    for iteration in range(1, max_iter + 1):
+        w_next = project_simplex(y - step * (covariance @ y) + shift, max_weight)
+        delta = w_next - w
+        if np.abs(delta).max() < tol:
+            return w_next, iteration
+        if polish_every and iteration % polish_every == 0:
+            exact = _polish(covariance, expected, risk_tolerance, w_next, max_weight)
+            if exact is not None:
+                return exact, iteration
+        if np.dot(y - w_next, delta) > 0:
+            # Momentum is pointing uphill: restart from plain gradient steps.
+            momentum = 1.0
+        momentum_next = (1 + np.sqrt(1 + 4 * momentum**2)) / 2
+        y = w_next + (momentum - 1) / momentum_next * delta
+        w, momentum = w_next, momentum_next
+    logger.warning(f"Mean-variance solve stopped after {max_iter} iterations")
+    return w, max_iter
+
+
+def portfolio_stats(weights: np.ndarray, covariance: np.ndarray, expected: np.ndarray,
+                    risk_free_rate: float = 0.0) -> Dict[str, np.ndarray]:
+    """
+    Return, volatility and Sharpe ratio of one portfolio or a stack of them.
+
+    Args:
+        weights (np.ndarray): (assets,) or (portfolios, assets) weights.
+
+    Returns:
+        dict: "return", "volatility" and "sharpe" (scalars or arrays).
+    """
+    w = np.atleast_2d(weights)
+    returns = w @ expected
+    volatility = np.sqrt(np.maximum(np.einsum("ij,ij->i", w @ covariance, w), 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(volatility > 0, (returns - risk_free_rate) / volatility, np.nan)
+    if np.ndim(weights) == 1:
+        return {"return": float(returns[0]), "volatility": float(volatility[0]), "sharpe": float(sharpe[0])}
+    return {"return": returns, "volatility": volatility, "sharpe": sharpe}
+
+
+def efficient_frontier(
+    covariance: np.ndarray,
+    expected: np.ndarray,
+    points: int = 50,
+    max_weight: float = 1.0,
+    tol: float = 1e-9,
+) -> Dict[str, np.ndarray]:
+    """
+    Long-only efficient frontier from minimum variance to maximum return.
+
+    A coarse geometric sweep of the risk tolerance maps out how the optimal
+    return grows with it; the frontier is then solved at the tolerances
+    interpolated for evenly spaced returns. Each solve is warm-started from
+    the previous point's weights, which sit close to the new optimum.
+
+    Args:
+        covariance (np.ndarray): (assets, assets) covariance.
+        expected (np.ndarray): Expected returns.
+        points (int, optional): Frontier points. Defaults to 50.
+        max_weight (float, optional): Per-asset cap. Defaults to 1 (uncapped).
+        tol (float, optional): Solver tolerance.
+
+    Returns:
+        dict: "weights" (points, assets), "return", "volatility", "risk_tolerance" and "iterations".
+    """
+    expected = np.asarray(expected, dtype=np.float64)
+    step = 1.0 / np.linalg.eigvalsh(covariance)[-1]
+
+    def sweep(tolerances, solve_tol):
+        weights = np.empty((len(tolerances), len(expected)))
+        iterations = np.empty(len(tolerances), dtype=np.int64)
+        w = None
+        for i, risk_tolerance in enumerate(tolerances):
+            w, iterations[i] = solve_mean_variance(covariance, expected, risk_tolerance, w, max_weight, step, solve_tol)
+            weights[i] = w
+        return weights, iterations
+
+    spread = np.ptp(expected)
+    # Risk tolerance has units of variance per unit return; beyond about
+    # 1e3 x this scale the solution is the maximum-return portfolio.
+    scale = np.trace(covariance) / len(expected) / spread if spread > 0 else 1.0
+    coarse = scale * np.geomspace(1e-3, 1e3, 13)
+    coarse_weights, _ = sweep(coarse, 1e-6)
+    coarse_returns = coarse_weights @ expected
+    # Interpolate log(tolerance) against return over the strictly increasing part.
+    rising = np.r_[True, np.diff(coarse_returns) > 1e-12 * max(spread, 1e-300)]
+    lowest = min_variance(covariance, max_weight, tol) @ expected
+    targets = np.linspace(lowest, coarse_returns[rising][-1], points)
+    tolerances = np.exp(np.interp(targets[1:], coarse_returns[rising], np.log(coarse[rising])))
+    tolerances = np.r_[0.0, tolerances][:points]
+
+    weights, iterations = sweep(tolerances, tol)
+    stats = portfolio_stats(weights, covariance, expected)
+    return {
+        "weights": weights,
+        "return": stats["return"],
+        "volatility": stats["volatility"],
+        "risk_tolerance": tolerances,
+        "iterations": iterations,
+    }
+
+
+def min_variance(covariance: np.ndarray, max_weight: float = 1.0, tol: float = 1e-10) -> np.ndarray:
+    """Long-only minimum-variance weights."""
+    n = len(covariance)
+    return solve_mean_variance(covariance, np.zeros(n), 0.0, max_weight=max_weight, tol=tol)[0]
+
+
+def _equal_risk(covariance: np.ndarray, b: np.ndarray, tol: float, max_iter: int) -> np.ndarray:
+    y = 1.0 / np.sqrt(np.diag(covariance))
+    # Scale so the start satisfies y'Cy = sum(b), the optimum's value.
+    y *= np.sqrt(b.sum() / (y @ covariance @ y))
+    for _ in range(max_iter):
+        gradient = covariance @ y - b / y
+        if np.linalg.norm(gradient) < tol:
+            break
+        hessian = covariance + np.diag(b / y**2)
+        direction = -np.linalg.solve(hessian, gradient)
+        # Stay inside y > 0.
+        shrinking = direction < 0
+        limit = np.min(-y[shrinking] / direction[shrinking]) if shrinking.any() else np.inf
+        y = y + min(1.0, 0.95 * limit) * direction
+    return y / y.sum()
+
+
+def risk_parity(covariance: np.ndarray, budget: Optional[np.ndarray] = None, max_weight: float = 1.0,
+                tol: float = 1e-10, max_iter: int = 100) -> np.ndarray:
+    """
+    Risk-parity weights: each asset's share of portfolio variance equals its budget.
+
+    Minimizes the convex function 0.5 * y'Cy - budget' log(y) with damped
+    Newton steps; the normalized minimizer y / sum(y) is the risk-parity
+    portfolio (Spinu, 2013). Assets whose weight would exceed `max_weight`
+    are held at the cap and the rest of the weight is split by risk parity
+    among the others, so capped assets carry less than their budget.
+
+    Args:
+        covariance (np.ndarray): (assets, assets) covariance.
+        budget (np.ndarray, optional): Risk budgets. Defaults to equal budgets.
+        max_weight (float, optional): Per-asset cap. Defaults to 1 (uncapped).
+        tol (float, optional): Gradient norm at which to stop.
+        max_iter (int, optional): Newton iteration limit.
+
+    Returns:
+        np.ndarray: Weights summing to one.
+
+    Raises:
+        ValueError: If the cap is infeasible for the number of assets.
+    """
+    n = len(covariance)
+    if max_weight * n < 1 - 1e-12:
+        raise ValueError(f"max_weight {max_weight} is infeasible for {n} assets")
+    b = np.full(n, 1.0 / n) if budget is None else np.asarray(budget, dtype=np.float64) / np.sum(budget)
+    weights = _equal_risk(covariance, b, tol, max_iter)
+    capped = np.zeros(n, dtype=bool)
+    # Each pass caps at least one more asset, so this ends within n passes.
+    while np.any(weights[~capped] > max_weight + 1e-12):
+        capped |= weights > max_weight
+        free = ~capped
+        weights = np.where(capped, max_weight, 0.0)
+        if free.any():
+            weights[free] = (1 - max_weight * capped.sum()) * _equal_risk(
+                covariance[np.ix_(free, free)], b[free], tol, max_iter
+            )
+    return weights
+
+
+def risk_contributions(weights: np.ndarray, covariance: np.ndarray) -> np.ndarray:
+    """Each asset's share of portfolio variance (sums to one)."""
+    marginal = covariance @ weights
+    return weights * marginal / (weights @ marginal)
+
+
+def estimate(returns: pd.DataFrame, periods_per_year: int = TRADING_DAYS) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Annualized expected returns and shrunk covariance of a returns table.
+
+    Args:
+        returns (pd.DataFrame): Periodic returns, one column per asset.
+        periods_per_year (int, optional): Defaults to 252 trading days.
+
+    Returns:
+        tuple: (expected returns, covariance, shrinkage intensity).
+    """
+    values = returns.to_numpy(dtype=np.float64)
+    expected = np.nanmean(values, axis=0) * periods_per_year
+    covariance, shrinkage = ledoit_wolf(values)
+    return expected, covariance * periods_per_year, shrinkage
+
+
+def optimize(
+    returns: pd.DataFrame,
+    points: int = 50,
+    max_weight: float = 1.0,
+    risk_free_rate: float = RISK_FREE_RATE,
+) -> Dict[str, object]:
+    """
+    Frontier, minimum-variance, maximum-Sharpe and risk-parity portfolios for a returns table.
+
+    Args:
+        returns (pd.DataFrame): Periodic returns, one column per asset.
+        points (int, optional): Frontier points. Defaults to 50.
+        max_weight (float, optional): Per-asset cap. Defaults to 1 (uncapped).
+        risk_free_rate (float, optional): Annual rate for Sharpe ratios. Defaults to `RISK_FREE_RATE` (2%).
+
+    Returns:
+        dict: "tickers", "shrinkage", "frontier" (see `efficient_frontier`, plus "sharpe")
+              and "portfolios" ({name: {"weights", "return", "volatility", "sharpe"}}).
+    """
+    expected, covariance, shrinkage = estimate(returns)
+    frontier = efficient_frontier(covariance, expected, points, max_weight)
+    frontier["sharpe"] = portfolio_stats(frontier["weights"], covariance, expected, risk_free_rate)["sharpe"]
+
+    candidates = {
+        "Minimum variance": frontier["weights"][0],
+        "Maximum Sharpe": frontier["weights"][np.nanargmax(frontier["sharpe"])],
+        "Risk parity": risk_parity(covariance, max_weight=max_weight),
+    }
+    portfolios = {
+        name: {"weights": weights, **portfolio_stats(weights, covariance, expected, risk_free_rate)}
+        for name, weights in candidates.items()
+    }
+    return {"tickers": list(returns.columns), "shrinkage": shrinkage, "frontier": frontier, "portfolios": portfolios}
@@ -0,0 +1,233 @@
+"""
+Stage profiling for AerialView.
+
+Timing and allocation spans around the fetch, indicator, metric and chart
+stages. Profiling is off by default and costs a flag check per span; turn
+it on with the CLI `--profile` flag or `AERIALVIEW_PROFILE=1`. Recorded spans
+can be exported as Chrome-trace JSON (chrome://tracing, Perfetto) or
+summarized per stage against latency budgets.
+
+Allocation sizes (`alloc_bytes`) are per span, but tracemalloc keeps a
+single process-wide peak counter. Peaks are therefore measured by one
+thread at a time: the first thread to open a span owns the counter until
+its outermost span closes, and spans opened meanwhile on other threads
+report `peak_bytes` as None. The owner's peaks still include whatever other
+threads allocate concurrently, so they are exact only for single-threaded
+runs such as the CLI.
+"""
+
+import atexit
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_enabled = False
+_events: List[dict] = []
+_lock = threading.Lock()
+_local = threading.local()
+_origin = time.perf_counter_ns()
+# Thread currently allowed to reset tracemalloc's shared peak counter.
+_peak_owner = None
+
+
+def enable():
+    """Start recording spans (and tracemalloc allocation tracking)."""
+    global _enabled
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _enabled = True
+
+
+def disable():
+    """Stop recording spans."""
+    global _enabled
+    _enabled = False
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    """Discard recorded spans."""
+    with _lock:
+        _events.clear()
+
+
+def events() -> List[dict]:
+    """Return a copy of the recorded spans."""
+    with _lock:
+        return list(_events)
+
+
+@contextmanager
+def span(name: str, **args):
+    """
+    Record the duration and allocations of a block.
+
+    Args:
+        name (str): Stage name, e.g. "fetch" or "indicators.cli".
+        **args: Extra values stored with the span (ticker, rows, ...).
+    """
+    global _peak_owner
+    if not _enabled:
+        yield
+        return
+
+    stack = getattr(_local, "peaks", None)
+    if stack is None:
+        stack = _local.peaks = []
+    thread = threading.get_ident()
+    with _lock:
+        if _peak_owner is None:
+            _peak_owner = thread
+        owner = _peak_owner == thread
+    current, peak = tracemalloc.get_traced_memory()
+    if owner:
+        # Before resetting the peak counter, fold the enclosing span's peak
+        # so far into that span's stack slot.
+        if stack:
+            stack[-1] = max(stack[-1], peak)
+        stack.append(0)
+        tracemalloc.reset_peak()
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter_ns() - start
+        end_current, span_peak = tracemalloc.get_traced_memory()
+        peak_bytes = None
+        if owner:
+            peak_bytes = max(stack.pop(), span_peak) - current
+            if not stack:
+                with _lock:
+                    _peak_owner = None
+        event = {
+            "name": name,
+            "ts": (start - _origin) / 1000,
+            "dur": duration / 1000,
+            "pid": os.getpid(),
+            "tid": thread,
+            "alloc_bytes": end_current - current,
+            "peak_bytes": peak_bytes,
+            **args,
+        }
+        with _lock:
+            _events.append(event)
+
+
+def profiled(name: Optional[str] = None):
+    """
+    Decorate a function so every call is recorded as a span.
+
+    Args:
+        name (str, optional): Span name. Defaults to the function's qualified name.
+    """
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with span(label):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def export_chrome_trace(path: str) -> str:
+    """
+    Write recorded spans as Chrome-trace JSON.
+
+    Args:
+        path (str): Output file.
+
+    Returns:
+        str: The path written.
+    """
+    trace = []
+    for event in events():
+        extra = {k: v for k, v in event.items() if k not in ("name", "ts", "dur", "pid", "tid")}
+        trace.append({
+            "name": event["name"], "ph": "X", "ts": event["ts"], "dur": event["dur"],
+            "pid": event["pid"], "tid": event["tid"], "args": extra,
+        })
+    with open(path, "w") as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f, default=str)
+    return path
+
+
+def summary(budgets: Optional[Dict[str, float]] = None) -> List[dict]:
+    """
+    Aggregate recorded spans per stage.
+
+    Args:
+        budgets (dict, optional): {stage name: p95 latency budget in ms}.
+
+    Returns:
+        List[dict]: One row per stage with count, total/mean/p95/max ms,
+                    peak KiB (NaN if no span of the stage measured one) and, when budgeted, whether p95 is over budget.
+    """
+    by_name: Dict[str, list] = {}
+    for event in events():
+        by_name.setdefault(event["name"], []).append(event)
+
+    rows = []
+    for name, group in by_name.items():
+        durations = np.array([e["dur"] for e in group]) / 1000
+        row = {
+            "stage": name,
+            "count": len(group),
+            "total_ms": durations.sum(),
+            "mean_ms": durations.mean(),
+            "p95_ms": np.percentile(durations, 95),
+            "max_ms": durations.max(),
+            "peak_kib": max((e["peak_bytes"] for e in group if e["peak_bytes"] is not None), default=np.nan) / 1024,
+        }
+        if budgets and name in budgets:
+            row["budget_ms"] = budgets[name]
+            row["over_budget"] = row["p95_ms"] > budgets[name]
+        rows.append(row)
+    return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+
+
+def format_summary(budgets: Optional[Dict[str, float]] = None) -> str:
+    """Render `summary()` as a fixed-width table."""
+    lines = [
+        f"{'Stage':<36} {'Count':>6} {'Total ms':>10} {'Mean ms':>9} {'P95 ms':>9} {'Max ms':>9} {'Peak KiB':>10}",
+        "-" * 95,
+    ]
+    for row in summary(budgets):
+        flag = "  OVER BUDGET" if row.get("over_budget") else ""
+        lines.append(
+            f"{row['stage']:<36} {row['count']:>6} {row['total_ms']:>10.1f} {row['mean_ms']:>9.1f} "
+            f"{row['p95_ms']:>9.1f} {row['max_ms']:>9.1f} {row['peak_kib']:>10.1f}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def _export_at_exit():
+    path = os.environ.get("AERIALVIEW_PROFILE_OUTPUT", f"aerialview-trace-{os.getpid()}.json")
+    if events():
+        export_chrome_trace(path)
+        logger.info(f"Profile trace written to {path}\n{format_summary()}")
+
+
+if os.environ.get("AERIALVIEW_PROFILE", "") not in ("", "0"):
+    enable()
+    atexit.register(_export_at_exit)
@@ -0,0 +1,527 @@
+"""
+Shared data-access layer for AerialView.
+
+All front ends (Dash pages, Streamlit dashboard, CLI) go through these
+functions instead of constructing their own `yf.Ticker`. Ticker handles are
+pooled, share one keep-alive, response-caching HTTP session, and identical requests are coalesced with `SingleFlight`, so one
+provider request per refresh window serves every concurrent caller. Upstream
+calls are rate limited, retried and circuit-broken by `resilience.guard`;
+while the provider is failing, the last good response is served instead.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from yfinance.exceptions import YFPricesMissingError, YFTzMissingError
+
+from aerialview.core.bars import Bars
+from aerialview.core import adjust
+from aerialview.core.history_store import COLUMNS, get_store, merge_events
+from aerialview.core.http_session import get_session
+from aerialview.core.metrics import provider_errors, provider_latency, register_cache
+from aerialview.core.resilience import guard
+from aerialview.core.singleflight import SingleFlight
+from aerialview.core.trading_calendar import TIMEZONE, get_calendar
+
+logger = logging.getLogger(__name__)
+
+REFRESH_WINDOW = float(os.environ.get("AERIALVIEW_REFRESH_WINDOW", "60"))
+USE_HISTORY_STORE = os.environ.get("AERIALVIEW_HISTORY_STORE", "1") != "0"
+STORE_TTL = float(os.environ.get("AERIALVIEW_HISTORY_STORE_TTL", str(6 * 3600)))
+
+PERIOD_OFFSETS = {
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+PERIOD_SESSIONS = {"1d": 1, "5d": 5}
+ACTION_COLUMNS = ["Dividends", "Stock Splits"]
+LAST_GOOD_SIZE = 256
+ADJUSTED_SIZE = 256
+
+
+class TickerPool:
+    """
+    Bounded LRU pool of reusable `yf.Ticker` handles.
+
+    Handles are tied to the process that created them: in a forked worker the
+    pool starts empty, and the first new handle points yfinance at the
+    worker's own session, so no parent sockets or cookies are reused.
+
+    Args:
+        max_size (int, optional): Maximum number of handles kept. Defaults to 256.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._handles = OrderedDict()
+        self._pid = None
+
+    def _reset(self):
+        # A fork copies the lock in whatever state the parent's threads left it.
+        self._lock = threading.Lock()
+        self._handles = OrderedDict()
+        self._pid = os.getpid()
+        _forget_credentials()
+
+    def get(self, ticker: str) -> yf.Ticker:
+        """Return the pooled handle for a ticker, creating it if needed."""
+        ticker = ticker.upper()
+        if self._pid != os.getpid():
+            self._reset()
+        with self._lock:
+            handle = self._handles.get(ticker)
+            if handle is None:
+                handle = self._handles[ticker] = yf.Ticker(ticker, session=get_session())
+                while len(self._handles) > self.max_size:
+                    self._handles.popitem(last=False)
+            else:
+                self._handles.move_to_end(ticker)
+            return handle
+
+    def discard(self, ticker: str):
+        """Drop a handle, e.g. one whose lazily loaded state failed to load."""
+        with self._lock:
+            self._handles.pop(ticker.upper(), None)
+
+    def __len__(self):
+        return len(self._handles)
+
+
+def _forget_credentials():
+    """
+    Drop the crumb yfinance minted with the parent's cookies.
+
+    yfinance has no public reset for it, so this looks for its shared data
+    client defensively and only logs if a yfinance upgrade moved it.
+    """
+    data_client = getattr(getattr(yf, "data", None), "YfData", None)
+    try:
+        data = data_client(session=get_session()) if data_client is not None else None
+    except Exception as e:
+        data = None
+        logger.debug(f"yfinance data client unavailable: {e}")
+    if data is None or not all(hasattr(data, name) for name in ("_cookie_lock", "_cookie", "_crumb")):
+        logger.warning("Could not reset yfinance's crumb after fork; the worker may reuse its parent's")
+        return
+    with data._cookie_lock:
+        data._cookie = None
+        data._crumb = None
+
+
+pool = TickerPool()
+flight = SingleFlight(window=REFRESH_WINDOW)
+register_cache("singleflight", lambda: {"hits": flight.shared, "misses": flight.calls})
+_last_good = OrderedDict()
+_last_good_lock = threading.Lock()
+_adjusted = OrderedDict()
+_adjusted_lock = threading.Lock()
+
+
+def ticker_history(ticker: str, **kwargs) -> pd.DataFrame:
+    """
+    `yf.Ticker.history` through the pool, raising network and HTTP failures.
+
+    Under `_upstream`, yfinance's `hide_exceptions` is off, so network and
+    HTTP failures reach `resilience.guard` instead of becoming an empty
+    frame. A ticker that simply has no data still gives an empty frame.
+    """
+    try:
+        return pool.get(ticker).history(**kwargs)
+    except (YFPricesMissingError, YFTzMissingError) as e:
+        logger.warning(f"No data for {ticker}: {e}")
+        return pd.DataFrame()
+    except Exception:
+        # A handle whose first load failed keeps half-initialised state; retry with a fresh one.
+        pool.discard(ticker)
+        raise
+
+
+_raising_lock = threading.Lock()
+_raising_calls = 0
+_hidden = None
+
+
+@contextmanager
+def raising_provider_errors():
+    """
+    Make yfinance raise network and HTTP failures while provider calls run.
+
+    yfinance otherwise logs them (including the timezone lookup that precedes
+    every history request) and returns empty data, hiding them from `guard`.
+    The setting is global to yfinance, so it is only switched off while at
+    least one provider call is in flight, and restored after the last one.
+    """
+    global _raising_calls, _hidden
+    with _raising_lock:
+        if _raising_calls == 0:
+            _hidden = yf.config.debug.hide_exceptions
+            yf.config.debug.hide_exceptions = False
+        _raising_calls += 1
+    try:
+        yield
+    finally:
+        with _raising_lock:
+            _raising_calls -= 1
+            if _raising_calls == 0:
+                yf.config.debug.hide_exceptions = _hidden
+
+
+def _upstream(call: str, fn):
+    """Run a provider call under the shared guard, recording its latency and failures."""
+    with provider_latency.time(call=call), raising_provider_errors():
+        try:
+            return guard.call(fn)
+        except Exception:
+            provider_errors.inc(call=call)
+            raise
+
+
+def _remember(key, value):
+    with _last_good_lock:
+        _last_good[key] = value
+        _last_good.move_to_end(key)
+        while len(_last_good) > LAST_GOOD_SIZE:
+            _last_good.popitem(last=False)
+    return value
+
+
+def _fallback(key, error: Exception):
+    """Return the last good response for `key`, or re-raise `error`."""
+    with _last_good_lock:
+        value = _last_good.get(key)
+    if value is None:
+        raise error
+    logger.warning(f"Provider unavailable ({error}); serving cached {key[0]} for {key[1]}")
+    return value
+
+
+def slice_period(data: pd.DataFrame, period: Optional[str] = None, start=None, end=None) -> pd.DataFrame:
+    """
+    Select the rows a `yf.Ticker.history` call with the same arguments would return.
+
+    Args:
+        data (pd.DataFrame): Full history with a DatetimeIndex.
+        period (str, optional): Period such as "6mo", "ytd" or "max".
+        start, end (optional): Date range; `end` is exclusive like yfinance.
+
+    Returns:
+        pd.DataFrame: A slice (view) of `data`.
+    """
+    if data.empty:
+        return data
+    # Positional slices keep the result a view over the stored arrays.
+    index = data.index
+
+    def stamp(value):
+        # Naive dates are exchange-local, as in yfinance.
+        value = pd.Timestamp(value)
+        return value.tz_localize(index.tz) if index.tz is not None and value.tz is None else value
+
+    if start is not None or end is not None:
+        lo = index.searchsorted(stamp(start)) if start is not None else 0
+        hi = index.searchsorted(stamp(end)) if end is not None else len(index)
+        return data.iloc[lo:hi]
+    period = period or "1y"
+    if period in PERIOD_SESSIONS:
+        return data.iloc[-PERIOD_SESSIONS[period]:]
+    last = index[-1]
+    if period == "ytd":
+        return data.iloc[index.searchsorted(pd.Timestamp(year=last.year, month=1, day=1, tz=index.tz)):]
+    if period in PERIOD_OFFSETS:
+        return data.iloc[index.searchsorted(last - PERIOD_OFFSETS[period], side="right"):]
+    return data
+
+
+def _timezone(data: pd.DataFrame) -> Optional[str]:
+    tz = getattr(data.index, "tz", None)
+    return str(tz) if tz is not None else None
+
+
+def _refresh_store(ticker: str, meta: Optional[dict]):
+    """Bring the raw stored history up to date, fetching only new bars when possible."""
+    store = get_store()
+    if meta is not None and meta.get("raw") and meta.get("rows"):
+        raw = store.read(ticker)
+        last = raw.index[-1]
+        data = _upstream("history", lambda: ticker_history(
+            ticker, start=last, interval="1d", auto_adjust=False, actions=True
+        ))
+        if data.empty:
+            store.touch(ticker, unchanged=True)
+            return
+        events = adjust.extract_events(data)
+        merged = merge_events(store.events(ticker), events)
+        tail = adjust.unadjust_splits(data, events)
+        start = raw.index.searchsorted(tail.index[0])
+        # `start=last` always returns the last stored bar again; only rewrite when it changed or new bars arrived.
+        if (len(raw) - start == len(tail) and raw.index[start:].equals(tail.index)
+                and np.array_equal(raw.iloc[start:].to_numpy(), tail.to_numpy())
+                and merged == merge_events(None, store.events(ticker) or {})):
+            store.touch(ticker, unchanged=True)
+            return
+        # The last stored bar may have been partial, so the fetched tail replaces it.
+        raw = pd.concat([raw.iloc[:start], tail])
+        store.write(ticker, raw, events=merged, complete=True, tz=meta.get("tz") or _timezone(data))
+        return
+
+    data = _upstream("history", lambda: ticker_history(
+        ticker, period="max", interval="1d", auto_adjust=False, actions=True
+    ))
+    if not data.empty:
+        events = adjust.extract_events(data)
+        store.write(ticker, adjust.unadjust_splits(data, events), events=events, complete=True, tz=_timezone(data))
+
+
+def _store_is_current(meta: dict) -> bool:
+    """
+    Decide, without a provider call, whether stored bars are up to date.
+
+    New York-listed histories follow the NYSE calendar. Other exchanges
+    (and crypto, which trades every day) fall back to `STORE_TTL`, as does
+    a history whose last refresh brought no new bars, so a session the
+    provider has not published yet is not re-requested on every call.
+    """
+    if meta.get("source") == "import":
+        # Bulk-imported vendor data is authoritative; it is updated by re-importing.
+        return True
+    age = time.time() - meta["updated"]
+    if not meta.get("last") or meta.get("unchanged") or meta.get("tz") not in (None, str(TIMEZONE)):
+        return age <= STORE_TTL
+    calendar = get_calendar()
+    if not calendar.is_complete(meta["last"], meta["updated"]):
+        return False
+    # While a session is open, today's partial bar is refreshed at most every STORE_TTL.
+    return not calendar.is_open() or age <= STORE_TTL
+
+
+def _provider_frame(bars: pd.DataFrame, events: Optional[dict], tz: Optional[str]) -> pd.DataFrame:
+    """Give stored bars the shape `yf.Ticker.history` returns: action columns and the exchange timezone."""
+    frame = bars.copy(deep=False)
+    actions = adjust.provider_actions(frame.index, events or {})
+    for i, column in enumerate(ACTION_COLUMNS):
+        frame[column] = actions[:, i]
+    if tz:
+        frame.index = frame.index.tz_localize(tz)
+    return frame
+
+
+def stored_history(ticker: str, cache: bool = True) -> pd.DataFrame:
+    """
+    Return the full adjusted daily history from the shared memory-mapped store.
+
+    The store keeps bars as traded plus split/dividend events. The full
+    history is downloaded once (period "max"); the trading calendar decides
+    locally when sessions are missing, refreshes only fetch bars since the
+    last stored one, and a new corporate action just adds an event. Adjusted prices are derived locally and cached per store version.
+
+    Like `yf.Ticker.history`, the result has "Dividends" and "Stock Splits"
+    columns (rebuilt from the stored events) and an index in the exchange
+    timezone. Bulk-imported histories carry no timezone and stay tz-naive.
+
+    Args:
+        ticker (str): Stock symbol.
+        cache (bool, optional): Keep the mapped and adjusted history in the
+                                in-process caches. One-pass scans pass False so
+                                they do not evict the working set. Defaults to True.
+
+    Returns:
+        pd.DataFrame: Adjusted history (may be empty). Treat as read-only.
+    """
+    ticker = ticker.upper()
+    store = get_store()
+    meta = store.meta(ticker)
+    if meta is None or not _store_is_current(meta):
+        try:
+            flight.do(("history", ticker, "store"), _refresh_store, ticker, meta)
+        except Exception as e:
+            if meta is None:
+                raise
+            logger.warning(f"Provider unavailable ({e}); serving stored history for {ticker}")
+        meta = store.meta(ticker)
+
+    raw = store.read(ticker, cache=cache) if meta is not None else None
+    if raw is None:
+        return pd.DataFrame(columns=COLUMNS + ACTION_COLUMNS, index=pd.DatetimeIndex([], name="Date"), dtype=float)
+    if not meta.get("raw"):
+        # Histories stored before events were tracked are already adjusted.
+        return _provider_frame(raw, None, meta.get("tz"))
+
+    events = store.events(ticker) or {}
+    token = (meta["version"], events.get("updated"))
+    with _adjusted_lock:
+        cached = _adjusted.get(ticker)
+    if cached is None or cached[0] != token:
+        cached = (token, _provider_frame(adjust.adjust(raw, events), events, meta.get("tz")))
+        if not cache:
+            return cached[1]
+    # Bounded so scanning a large universe does not keep every adjusted history alive.
+    with _adjusted_lock:
+        _adjusted[ticker] = cached
+        _adjusted.move_to_end(ticker)
+        while len(_adjusted) > ADJUSTED_SIZE:
+            _adjusted.popitem(last=False)
+    return cached[1].copy(deep=False)
+
+
+def get_history(
+    ticker: str,
+    period: Optional[str] = None,
+    start=None,
+    end=None,
+    interval: str = "1d",
+    auto_adjust: bool = True,
+    cache: bool = True,
+) -> pd.DataFrame:
+    """
+    Fetch price history through the shared pool.
+
+    Args:
+        ticker (str): Stock symbol.
+        period (str, optional): Period such as "1y". Ignored when start/end are given.
+        start, end (optional): Date range.
+        interval (str, optional): Bar interval. Defaults to "1d".
+        auto_adjust (bool, optional): Adjust OHLC for splits/dividends. Defaults to True.
+        cache (bool, optional): Keep stored daily histories in the adjusted-history
+                                cache (see `stored_history`). Defaults to True.
+
+    Returns:
+        pd.DataFrame: The history (capitalised columns, DatetimeIndex); empty
+                      if the provider returned nothing. Daily adjusted requests
+                      are views over the shared (locally adjusted) history;
+                      adding columns is safe, overwrite values only on a copy.
+    """
+    ticker = ticker.upper()
+    if USE_HISTORY_STORE and interval == "1d" and auto_adjust:
+        try:
+            return slice_period(stored_history(ticker, cache), period, start, end).copy(deep=False)
+        except Exception as e:
+            logger.warning(f"History store unavailable for {ticker}, fetching directly: {e}")
+
+    if start is not None or end is not None:
+        kwargs = {"start": start, "end": end}
+    else:
+        kwargs = {"period": period or "1y"}
+    key = ("history", ticker, str(kwargs), interval, auto_adjust)
+    try:
+        data = flight.do(key, _upstream, "history", lambda: ticker_history(
+            ticker, interval=interval, auto_adjust=auto_adjust, **kwargs
+        ))
+    except Exception as e:
+        data = _fallback(key, e)
+    else:
+        if not data.empty:
+            _remember(key, data)
+    return data.copy()
+
+
+def get_latest_bars(ticker: str, interval: str = "1m", since=None) -> pd.DataFrame:
+    """
+    Fetch the newest intraday bars for live polling, under the shared guard.
+
+    Unlike `get_history`, polls are neither coalesced over the refresh window
+    nor answered with the last good response, since either would hold back
+    new bars; a failed poll raises and the poller shows nothing new.
+
+    Args:
+        ticker (str): Stock symbol.
+        interval (str, optional): Bar interval. Defaults to "1m".
+        since (optional): Only request bars from this time on; the current
+                          session is loaded when None.
+
+    Returns:
+        pd.DataFrame: The bars (capitalised columns, DatetimeIndex).
+    """
+    kwargs = {"period": "1d"} if since is None else {"start": since}
+    return _upstream("live", lambda: ticker_history(ticker.upper(), interval=interval, **kwargs))
+
+
+def get_bars(
+    ticker: str,
+    period: Optional[str] = None,
+    start=None,
+    end=None,
+    interval: str = "1d",
+) -> Bars:
+    """
+    Fetch adjusted price history as `Bars`.
+
+    Same arguments as `get_history`; store-backed daily bars are views over
+    the shared adjusted history, with no copy or column renaming.
+    """
+    data = get_history(ticker, period=period, start=start, end=end, interval=interval)
+    return Bars.from_frame(data, ticker=ticker.upper(), interval=interval)
+
+
+def get_info(ticker: str) -> dict:
+    """
+    Fetch ticker metadata (`yf.Ticker.info`) through the shared pool.
+
+    Returns:
+        dict: Metadata, or {} if the provider call fails.
+    """
+    ticker = ticker.upper()
+    key = ("info", ticker)
+    try:
+        info = flight.do(key, _upstream, "info", lambda: pool.get(ticker).info)
+        if info:
+            _remember(key, info)
+        return dict(info or {})
+    except Exception as e:
+        if key in _last_good:
+            return dict(_fallback(key, e))
+        logger.error(f"Error fetching info for {ticker}: {e}")
+        return {}
+
+
+def get_recommendations(ticker: str) -> Optional[pd.DataFrame]:
+    """
+    Fetch analyst recommendations through the shared pool.
+
+    Returns:
+        pd.DataFrame: Recommendations, or None if unavailable.
+    """
+    ticker = ticker.upper()
+    key = ("recommendations", ticker)
+    try:
+        data = flight.do(key, _upstream, "recommendations", lambda: pool.get(ticker).recommendations)
+    except Exception as e:
+        data = _fallback(key, e)
+    else:
+        if data is not None and not data.empty:
+            _remember(key, data)
+    return None if data is None else data.copy()
+
+
+def get_news(ticker: str, count: int = 20) -> list:
+    """
+    Fetch recent news items (`yf.Ticker.get_news`) through the shared pool.
+
+    Returns:
+        list: Raw provider items, or [] if the provider call fails.
+    """
+    ticker = ticker.upper()
+    key = ("news", ticker, count)
+    try:
+        items = flight.do(key, _upstream, "news", lambda: pool.get(ticker).get_news(count=count))
+        if items:
+            _remember(key, items)
+        return list(items or [])
+    except Exception as e:
+        if key in _last_good:
+            return list(_fallback(key, e))
+        logger.error(f"Error fetching news for {ticker}: {e}")
+        return []
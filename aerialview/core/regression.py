@@ -0,0 +1,233 @@
+"""
+Factor regression utilities for AerialView.
+
+Regresses every ticker's returns on a benchmark (and optionally more factor
+series such as sector ETFs) in one pass. All tickers' OLS problems share
+the same factor design, so their normal equations are built for the whole
+returns panel with a few matrix products and solved as one stacked batch.
+Each ticker keeps its own NaN mask, so tickers with missing days or shorter
+histories fit only the days they have. `rolling_ols` carries the
+normal-equation sums forward one row at a time, adding the new row and
+dropping the one leaving the window, instead of refitting every window.
+"""
+
+import logging
+import os
+from typing import Dict, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK = os.environ.get("AERIALVIEW_BENCHMARK", "SPY")
+# Annual rate used for alpha and Sharpe ratios across the dashboard and CLI.
+RISK_FREE_RATE = float(os.environ.get("AERIALVIEW_RISK_FREE_RATE", "0.02"))
+TRADING_DAYS = 252
+
+
+def returns_panel(closes: Dict[str, pd.Series]) -> pd.DataFrame:
+    """Daily returns with one column per ticker, outer-joined on dates (missing days stay NaN)."""
+    return pd.DataFrame(closes).sort_index().pct_change(fill_method=None).iloc[1:]
+
+
+def _prepare(returns: pd.DataFrame, factors: Union[pd.Series, pd.DataFrame], intercept: bool, risk_free_rate: float):
+    single = isinstance(factors, pd.Series)
+    factors = factors.to_frame(factors.name or "benchmark") if single else factors
+    factors = factors.reindex(returns.index)
+    daily_rf = risk_free_rate / TRADING_DAYS
+    y = returns.to_numpy(dtype=np.float64) - daily_rf
+    x = factors.to_numpy(dtype=np.float64) - daily_rf
+    if intercept:
+        x = np.hstack([np.ones((len(x), 1)), x])
+    row_ok = np.isfinite(x).all(axis=1)
+    mask = np.isfinite(y) & row_ok[:, None]
+    y = np.where(mask, y, 0.0)
+    x = np.where(row_ok[:, None], x, 0.0)
+    names = ["beta"] if single else [f"beta_{c}" for c in factors.columns]
+    return y, x, mask, names
+
+
+def _solve(xx: np.ndarray, xy: np.ndarray) -> np.ndarray:
+    """
+    Solve a stack of small symmetric positive-definite systems xx @ b = xy.
+
+    The matrix axes come first, (k, k, *batch) and (k, *batch), so every
+    matrix element is one contiguous array over the batch. Gaussian
+    elimination then loops over the few factor columns with whole-batch
+    array operations, which is far faster than LAPACK's per-system calls for
+    millions of 2x2 or 4x4 systems. Singular systems give NaN.
+    """
+    a, b = xx.copy(), xy.copy()
+    k = len(a)
+    scale = np.abs(np.stack([a[i, i] for i in range(k)])).max(axis=0)
+    for i in range(k):
+        a[i, i] = np.where(a[i, i] > 1e-12 * scale, a[i, i], np.nan)
+        for j in range(i + 1, k):
+            factor = a[j, i] / a[i, i]
+            a[j, i:] -= factor * a[i, i:]
+            b[j] -= factor * b[i]
+    coef = np.empty_like(b)
+    for i in reversed(range(k)):
+        residual = b[i].copy()
+        for j in range(i + 1, k):
+            residual -= a[i, j] * coef[j]
+        coef[i] = residual / a[i, i]
+    return coef
+
+
+def _fit(xx, xy, yy, ysum, count, intercept, min_obs, periods_per_year):
+    """Coefficients (k, *batch) and fit statistics from normal-equation sums laid out as for `_solve`."""
+    k = len(xx)
+    enough = count >= max(min_obs, k + 1)
+    # Fill unusable systems with the identity so the batched solve stays well posed.
+    identity = np.eye(k).reshape(k, k, *[1] * enough.ndim)
+    coef = _solve(np.where(enough, xx, identity), np.where(enough, xy, 0.0))
+    ssr = np.maximum(yy - (coef * xy).sum(axis=0), 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sst = yy - ysum**2 / count if intercept else yy
+        r2 = np.where(sst > 0, 1 - ssr / sst, np.nan)
+        resid_vol = np.sqrt(ssr / (count - k) * periods_per_year)
+    return {
+        "coef": np.where(enough, coef, np.nan),
+        "r2": np.where(enough, r2, np.nan),
+        "resid_vol": np.where(enough, resid_vol, np.nan),
+    }
+
+
+def ols(
+    returns: pd.DataFrame,
+    factors: Union[pd.Series, pd.DataFrame],
+    intercept: bool = True,
+    min_obs: int = 20,
+    risk_free_rate: float = 0.0,
+    periods_per_year: int = TRADING_DAYS,
+) -> pd.DataFrame:
+    """
+    Regress every column of a returns panel on the same factors at once.
+
+    Args:
+        returns (pd.DataFrame): Periodic returns, one column per ticker; NaN marks missing days.
+        factors (pd.Series | pd.DataFrame): Benchmark returns, or one column per factor.
+        intercept (bool, optional): Fit an intercept (alpha). Defaults to True.
+        min_obs (int, optional): Tickers with fewer usable days get NaN. Defaults to 20.
+        risk_free_rate (float, optional): Annual rate subtracted from returns and factors.
+        periods_per_year (int, optional): For annualizing alpha and residual volatility.
+
+    Returns:
+        pd.DataFrame: One row per ticker with "alpha" (annualized), "beta" (or
+        "beta_<factor>" per factor column), "r2", "resid_vol" (annualized) and "nobs".
+    """
+    y, x, mask, names = _prepare(returns, factors, intercept, risk_free_rate)
+    k = x.shape[1]
+    # Row-wise outer products x_t x_t', so every ticker's X'X is one matrix product with its mask.
+    outer = (x[:, :, None] * x[:, None, :]).reshape(len(x), k * k)
+    maskf = mask.astype(np.float64)
+    xx = (outer.T @ maskf).reshape(k, k, -1)
+    fit = _fit(xx, x.T @ y, np.einsum("tn,tn->n", y, y), y.sum(axis=0), maskf.sum(axis=0),
+               intercept, min_obs, periods_per_year)
+
+    coef = fit["coef"]
+    table = pd.DataFrame(index=returns.columns)
+    if intercept:
+        table["alpha"] = coef[0] * periods_per_year
+        coef = coef[1:]
+    for i, name in enumerate(names):
+        table[name] = coef[i]
+    table["r2"] = fit["r2"]
+    table["resid_vol"] = fit["resid_vol"]
+    table["nobs"] = mask.sum(axis=0)
+    return table
+
+
+def rolling_ols(
+    returns: pd.DataFrame,
+    factors: Union[pd.Series, pd.DataFrame],
+    window: int = 63,
+    intercept: bool = True,
+    min_obs: int = None,
+    risk_free_rate: float = 0.0,
+    periods_per_year: int = TRADING_DAYS,
+    block: int = 64,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Rolling-window regression of every ticker on the same factors.
+
+    The normal-equation sums are updated incrementally: each step adds the
+    newest row and subtracts the row leaving the window, for all tickers at
+    once. Windows are solved `block` dates at a time as one stacked batch.
+
+    Args:
+        returns (pd.DataFrame): Periodic returns, one column per ticker.
+        factors (pd.Series | pd.DataFrame): Benchmark returns, or one column per factor.
+        window (int, optional): Rows per window. Defaults to 63 (about a quarter).
+        intercept (bool, optional): Fit an intercept (alpha). Defaults to True.
+        min_obs (int, optional): Usable days a window needs. Defaults to half the window.
+        risk_free_rate (float, optional): Annual rate subtracted from returns and factors.
+        periods_per_year (int, optional): For annualizing alpha.
+        block (int, optional): Dates solved per batch.
+
+    Returns:
+        dict: DataFrames shaped like `returns` for "alpha" (if fitted), "beta" (or
+        "beta_<factor>" per factor column) and "r2".
+    """
+    y, x, mask, names = _prepare(returns, factors, intercept, risk_free_rate)
+    min_obs = window // 2 if min_obs is None else min_obs
+    t, n = y.shape
+    k = x.shape[1]
+    maskf = mask.astype(np.float64)
+    outer = (x[:, :, None] * x[:, None, :]).reshape(t, k * k)
+
+    # Running window sums, one row per normal-equation term: X'X, X'y, y'y, sum(y), count.
+    state = np.zeros((k * k + k + 3, n))
+    buffer = np.empty((len(state), block, n))
+    coef = np.full((k, t, n), np.nan)
+    r2 = np.full((t, n), np.nan)
+
+    def add(r, sign):
+        state[:k * k] += (sign * outer[r])[:, None] * maskf[r]
+        state[k * k:k * k + k] += (sign * x[r])[:, None] * y[r]
+        state[-3] += sign * y[r] ** 2
+        state[-2] += sign * y[r]
+        state[-1] += sign * maskf[r]
+
+    def flush(end, size):
+        # Solve the buffered windows ending at rows end-size .. end-1.
+        sums = buffer[:, :size]
+        fit = _fit(sums[:k * k].reshape(k, k, size, n), sums[k * k:k * k + k], sums[-3], sums[-2], sums[-1],
+                   intercept, min_obs, periods_per_year)
+        coef[:, end - size:end] = fit["coef"]
+        r2[end - size:end] = fit["r2"]
+
+    filled = 0
+    for row in range(t):
+        add(row, 1.0)
+        if row >= window:
+            add(row - window, -1.0)
+        buffer[:, filled] = state
+        filled += 1
+        if filled == block or row == t - 1:
+            flush(row + 1, filled)
+            filled = 0
+
+    frame = lambda values: pd.DataFrame(values, index=returns.index, columns=returns.columns)
+    result = {}
+    if intercept:
+        result["alpha"] = frame(coef[0] * periods_per_year)
+        coef = coef[1:]
+    for i, name in enumerate(names):
+        result[name] = frame(coef[i])
+    result["r2"] = frame(r2)
+    return result
+
+
+def benchmark_stats(close: pd.Series, benchmark_close: pd.Series, risk_free_rate: float = 0.0) -> Dict[str, float]:
+    """
+    Beta, annualized alpha and R² of one price series against a benchmark's prices.
+
+    Returns:
+        dict: "alpha", "beta", "r2" and "nobs" (NaN when there is too little overlap).
+    """
+    panel = returns_panel({"asset": close, "benchmark": benchmark_close})
+    row = ols(panel[["asset"]], panel["benchmark"], risk_free_rate=risk_free_rate).iloc[0]
+    return {"alpha": row["alpha"], "beta": row["beta"], "r2": row["r2"], "nobs": int(row["nobs"])}
@@ -0,0 +1,259 @@
+"""
+Provider protection for AerialView.
+
+Every upstream call goes through a `ProviderGuard`: a shared token-bucket
+rate limiter and concurrency budget keep bursts under the provider's limit,
+transient failures are retried with jittered exponential backoff, and a
+circuit breaker fails fast while the provider is unhealthy so callers can
+serve cached data instead of piling up timeouts.
+"""
+
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from typing import Callable, Optional
+
+import requests
+
+from aerialview.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+provider_retries = registry.counter(
+    "aerialview_provider_retries_total", "Provider calls retried after a transient failure."
+)
+provider_rejected = registry.counter(
+    "aerialview_provider_rejected_total", "Provider calls rejected by the open circuit breaker."
+)
+circuit_state = registry.gauge(
+    "aerialview_provider_circuit_open", "1 while the provider circuit breaker is open."
+)
+
+TRANSIENT_STATUS = {408, 425, 429, 500, 502, 503, 504}
+TRANSIENT_TYPES = [
+    TimeoutError, ConnectionError, socket.gaierror,
+    requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+]
+try:
+    from curl_cffi.requests import exceptions as _curl_exceptions
+
+    # DNS, TLS and proxy failures are ConnectionError subclasses.
+    TRANSIENT_TYPES += [_curl_exceptions.ConnectionError, _curl_exceptions.Timeout]
+except ImportError:
+    pass
+try:
+    from yfinance.exceptions import YFRateLimitError
+
+    TRANSIENT_TYPES.append(YFRateLimitError)
+except ImportError:
+    pass
+TRANSIENT_TYPES = tuple(TRANSIENT_TYPES)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the provider while the breaker is open."""
+
+
+def _status(exc: BaseException) -> Optional[int]:
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None) or getattr(exc, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_transient(exc: BaseException) -> bool:
+    """
+    Decide whether a provider failure is worth retrying.
+
+    Network errors and timeouts (by exception type), throttling and 5xx
+    responses (by HTTP status) are transient, including when they are the
+    cause of a wrapping exception; anything else (bad ticker, parse errors)
+    is not.
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, TRANSIENT_TYPES) or _status(exc) in TRANSIENT_STATUS:
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Args:
+        rate (float): Tokens added per second.
+        burst (float): Bucket capacity.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take one token, waiting for a refill if needed.
+
+        Args:
+            timeout (float, optional): Give up after this many seconds.
+
+        Returns:
+            bool: True once a token was taken, False on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after consecutive failures; half-open trial after a cool-down.
+
+    Args:
+        failure_threshold (int, optional): Consecutive failures that open the circuit.
+        reset_timeout (float, optional): Seconds to stay open before a trial call.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return True if a call may go upstream now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial = False
+            if self.state == self.HALF_OPEN and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial = False
+        circuit_state.set(0)
+
+    def release(self):
+        """End a half-open trial that neither proved nor disproved provider health."""
+        with self._lock:
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Provider circuit opened after {self.failures} failures")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial = False
+        if self.state == self.OPEN:
+            circuit_state.set(1)
+
+
+class ProviderGuard:
+    """
+    Rate limit, bound concurrency, retry and circuit-break provider calls.
+
+    Args:
+        rate (float, optional): Sustained requests per second.
+        burst (int, optional): Requests allowed back to back.
+        concurrency (int, optional): Maximum simultaneous upstream calls.
+        attempts (int, optional): Tries per call for transient failures.
+        base_delay (float, optional): First backoff ceiling in seconds.
+        max_delay (float, optional): Backoff ceiling cap in seconds.
+        breaker (CircuitBreaker, optional): Shared breaker.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        burst: int = 10,
+        concurrency: int = 4,
+        attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.bucket = TokenBucket(rate, burst)
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry number."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """
+        Run `fn(*args, **kwargs)` under the guard.
+
+        A call counts as one breaker failure only once its retries are
+        exhausted. A half-open trial call is not retried.
+
+        Raises:
+            CircuitOpenError: The provider is considered unhealthy.
+            Exception: The last failure once retries are exhausted, or any
+                       non-transient failure immediately.
+        """
+        for attempt in range(self.attempts):
+            if not self.breaker.allow():
+                provider_rejected.inc()
+                raise CircuitOpenError("provider circuit is open")
+            self.bucket.acquire()
+            with self.slots:
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as e:
+                    if not is_transient(e):
+                        self.breaker.release()
+                        raise
+                    if attempt == self.attempts - 1 or self.breaker.state != CircuitBreaker.CLOSED:
+                        self.breaker.record_failure()
+                        raise
+                    error = e
+                else:
+                    self.breaker.record_success()
+                    return result
+            delay = self.backoff(attempt)
+            provider_retries.inc()
+            logger.info(f"Transient provider error ({error}); retrying in {delay:.2f}s")
+            time.sleep(delay)
+
+
+guard = ProviderGuard(
+    rate=float(os.environ.get("AERIALVIEW_PROVIDER_RATE", "5")),
+    burst=int(os.environ.get("AERIALVIEW_PROVIDER_BURST", "10")),
+    concurrency=int(os.environ.get("AERIALVIEW_PROVIDER_CONCURRENCY", "4")),
+)
@@ -0,0 +1,95 @@
+"""
+Request coalescing utilities for AerialView.
+
+`SingleFlight` merges identical in-flight calls made from different threads
+(Dash callbacks, Streamlit sessions, CLI workers) into one upstream call and
+optionally keeps the result for a short refresh window, so a popular ticker
+costs one provider request per window no matter how many callers ask.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class _Call:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls sharing the same key.
+
+    Args:
+        window (float, optional): Seconds a completed result is reused. Defaults to 0
+                                  (only in-flight calls are shared).
+        max_entries (int, optional): Completed results kept. Defaults to 1024.
+    """
+
+    def __init__(self, window: float = 0.0, max_entries: int = 1024):
+        self.window = window
+        self.max_entries = max_entries
+        self.calls = 0
+        self.shared = 0
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._results = OrderedDict()
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run `fn(*args, **kwargs)` unless an identical call is in flight or fresh.
+
+        Args:
+            key (Hashable): Identity of the call.
+            fn (Callable): Function performing the upstream request.
+
+        Returns:
+            Any: The (possibly shared) result. Exceptions raised by the leader
+                 are re-raised in every waiting caller.
+        """
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._results.move_to_end(key)
+                self.shared += 1
+                return cached[1]
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                if call.error is None and self.window > 0:
+                    self._results[key] = (time.monotonic() + self.window, call.value)
+                    self._results.move_to_end(key)
+                    while len(self._results) > self.max_entries:
+                        self._results.popitem(last=False)
+            call.event.set()
+        return call.value
+
+    def forget(self, key: Hashable):
+        """Drop a completed result so the next call goes upstream."""
+        with self._lock:
+            self._results.pop(key, None)
@@ -0,0 +1,176 @@
+"""
+Server-side sparkline tiles for AerialView.
+
+A watchlist of hundreds of tickers cannot afford one Plotly figure each.
+Instead, each close series is downsampled to one min/max pair per pixel
+column, rasterized into an RGBA array with NumPy and encoded as a PNG with
+the standard library (zlib), so a tile costs well under a millisecond to
+draw and a few hundred bytes to send. Tiles are cached per ticker, period
+and size and refreshed on a time window, like the dashboard's figures.
+"""
+
+import logging
+import struct
+import time
+import zlib
+from typing import Tuple
+
+import numpy as np
+
+from aerialview.core import provider
+from aerialview.core.figure_cache import FigureCache
+
+logger = logging.getLogger(__name__)
+
+UP = (38, 166, 154)
+DOWN = (239, 83, 80)
+FLAT = (158, 158, 158)
+TILE_TTL = 300
+
+
+def downsample_minmax(values: np.ndarray, width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a series to `width` columns, keeping each column's min and max so spikes survive.
+
+    NaNs are dropped first. Series shorter than `width` are stretched instead.
+
+    Returns:
+        tuple: (low, high) arrays of length `width`.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return np.zeros(width), np.zeros(width)
+    edges = np.linspace(0, len(values), width + 1)
+    starts = np.minimum(edges[:-1].astype(np.int64), len(values) - 1)
+    if len(values) >= width:
+        return np.minimum.reduceat(values, starts), np.maximum.reduceat(values, starts)
+    # Fewer points than pixels: sample the nearest point per column.
+    picked = values[starts]
+    return picked, picked
+
+
+def rasterize(values: np.ndarray, width: int = 120, height: int = 32, color=None,
+              fill_alpha: int = 48, pad: int = 2) -> np.ndarray:
+    """
+    Draw a sparkline into an RGBA image.
+
+    Consecutive columns are joined by vertical spans so the line stays
+    continuous; the area under it is filled with a translucent tint.
+
+    Args:
+        values (np.ndarray): Close series.
+        width, height (int, optional): Tile size in pixels.
+        color (tuple, optional): RGB line color. Defaults to green/red by overall direction.
+        fill_alpha (int, optional): Opacity of the area fill (0 disables it).
+        pad (int, optional): Vertical padding in pixels.
+
+    Returns:
+        np.ndarray: uint8 array of shape (height, width, 4).
+    """
+    low, high = downsample_minmax(values, width)
+    finite = np.asarray(values, dtype=np.float64)
+    finite = finite[np.isfinite(finite)]
+    if color is None:
+        color = FLAT if len(finite) < 2 or finite[-1] == finite[0] else UP if finite[-1] > finite[0] else DOWN
+
+    lo, hi = low.min(), high.max()
+    scale = (height - 1 - 2 * pad) / (hi - lo) if hi > lo else 0.0
+    # Row 0 is the top of the image.
+    top = np.rint(height - 1 - pad - (high - lo) * scale).astype(np.int64)
+    bottom = np.rint(height - 1 - pad - (low - lo) * scale).astype(np.int64)
+    if hi == lo:
+        top[:] = bottom[:] = height // 2
+    # Join each column to its neighbour so steep moves don't leave gaps.
+    top[1:] = np.minimum(top[1:], bottom[:-1])
+    bottom[1:] = np.maximum(bottom[1:], top[:-1])
+
+    rows = np.arange(height)[:, None]
+    line = (rows >= top[None, :]) & (rows <= bottom[None, :])
+    image = np.zeros((height, width, 4), dtype=np.uint8)
+    image[..., :3] = color
+    if fill_alpha:
+        image[..., 3] = np.where(rows > bottom[None, :], fill_alpha, 0)
+    image[..., 3][line] = 255
+    if len(finite) == 0:
+        image[..., 3] = 0
+    return image
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+
+def encode_png(image: np.ndarray, level: int = 6) -> bytes:
+    """Encode an RGBA uint8 array (height, width, 4) as PNG bytes."""
+    height, width = image.shape[:2]
+    # Filter type 0 ("None") byte in front of every scanline.
+    raw = np.concatenate([np.zeros((height, 1), dtype=np.uint8), image.reshape(height, -1)], axis=1)
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        _chunk(b"IHDR", header),
+        _chunk(b"IDAT", zlib.compress(raw.tobytes(), level)),
+        _chunk(b"IEND", b""),
+    ])
+
+
+def render_sparkline(values, width: int = 120, height: int = 32, **kwargs) -> bytes:
+    """Rasterize a series and return it as PNG bytes."""
+    return encode_png(rasterize(values, width, height, **kwargs))
+
+
+class SparklineRenderer:
+    """
+    Cached PNG sparkline tiles for tickers.
+
+    Args:
+        ttl (float, optional): Seconds a tile is reused. Defaults to 5 minutes.
+        max_tiles (int, optional): Tiles kept in memory. Defaults to 4096.
+    """
+
+    def __init__(self, ttl: float = TILE_TTL, max_tiles: int = 4096):
+        self.ttl = ttl
+        self.tiles = FigureCache(max_entries=max_tiles, max_bytes=64 * 2**20)
+
+    def _build(self, ticker: str, period: str, width: int, height: int):
+        try:
+            close = provider.get_history(ticker, period=period)["Close"].to_numpy()
+        except Exception as e:
+            logger.warning(f"No sparkline data for {ticker}: {e}")
+            return None
+        # Nothing to draw is treated as a failure too, so it is retried rather than cached.
+        return render_sparkline(close, width, height) if np.isfinite(close).any() else None
+
+    def render(self, ticker: str, period: str = "6mo", width: int = 120, height: int = 32) -> Tuple[bytes, bool]:
+        """
+        PNG tile for a ticker's closes over a period, and whether it has data.
+
+        Tiles without data (provider failure or empty history) are blank and
+        not cached, so the next request tries again.
+        """
+        ticker = ticker.upper()
+        window = int(time.time() // self.ttl)
+        key = (ticker, period, width, height, window)
+        png = self.tiles.get_or_build(key, lambda: self._build(ticker, period, width, height))
+        if png is None:
+            return render_sparkline(np.zeros(0), width, height), False
+        return png, True
+
+    def tile(self, ticker: str, period: str = "6mo", width: int = 120, height: int = 32) -> bytes:
+        """PNG tile for a ticker's closes over a period."""
+        return self.render(ticker, period, width, height)[0]
+
+    def stats(self) -> dict:
+        return {"hits": self.tiles.hits, "misses": self.tiles.misses, "tiles": len(self.tiles)}
+
+
+_default = None
+
+
+def get_renderer() -> SparklineRenderer:
+    """Return the process-wide sparkline renderer."""
+    global _default
+    if _default is None:
+        _default = SparklineRenderer()
+    return _default
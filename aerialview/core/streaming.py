@@ -0,0 +1,350 @@
+"""
+Streaming metrics utilities for AerialView.
+
+Computes per-ticker performance and risk metrics for arbitrarily large
+universes and long histories without holding them in memory. Tickers flow
+one at a time through a generator pipeline (fetch -> indicators ->
+metrics), and each history is consumed in chunks: row slices of the
+memory-mapped daily store, or date windows of provider requests for
+intraday bars. Every statistic is single pass and constant size:
+
+- `Welford` keeps mean and variance, merging whole chunks at a time (Chan et al.).
+- `RunningDrawdown` keeps the running peak and the deepest drawdown.
+- `QuantileSketch` is a relative-error log-bucket sketch (DDSketch) for VaR.
+- `StreamingRSI` continues Wilder's RSI exactly across chunk boundaries.
+
+Peak memory is one chunk plus a few kilobytes of state per live ticker,
+whatever the universe size.
+"""
+
+import logging
+import math
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from aerialview.core import provider
+
+logger = logging.getLogger(__name__)
+
+CHUNK_ROWS = 65_536
+# Days per provider request for intraday bars, and how far back the provider serves them.
+INTRADAY_CHUNK_DAYS = {"1m": 7, "2m": 30, "5m": 30, "15m": 30, "30m": 30, "90m": 30, "60m": 180, "1h": 180}
+INTRADAY_LOOKBACK_DAYS = {"1m": 30, "2m": 60, "5m": 60, "15m": 60, "30m": 60, "90m": 60, "60m": 730, "1h": 730}
+
+
+class Welford:
+    """Running count, mean and variance, updated with whole arrays at a time."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        n = len(values)
+        if n == 0:
+            return
+        mean = values.mean()
+        m2 = np.square(values - mean).sum()
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += float(delta * n / total)
+        self.m2 += float(m2 + delta**2 * self.count * n / total)
+        self.count = total
+
+    def variance(self, ddof: int = 1) -> float:
+        return self.m2 / (self.count - ddof) if self.count > ddof else math.nan
+
+    def std(self, ddof: int = 1) -> float:
+        return math.sqrt(self.variance(ddof))
+
+
+class RunningDrawdown:
+    """Running peak and maximum drawdown (a fraction <= 0) of a price series."""
+
+    def __init__(self):
+        self.peak = -math.inf
+        self.max_drawdown = 0.0
+
+    def update(self, prices: np.ndarray):
+        prices = np.asarray(prices, dtype=np.float64)
+        prices = prices[np.isfinite(prices)]
+        if len(prices) == 0:
+            return
+        peaks = np.maximum(np.maximum.accumulate(prices), self.peak)
+        self.max_drawdown = min(self.max_drawdown, float((prices / peaks - 1).min()))
+        self.peak = float(peaks[-1])
+
+
+class _Buckets:
+    """Dense bucket counts over a growing range of integer keys."""
+
+    def __init__(self):
+        self.offset = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def add(self, keys: np.ndarray):
+        if len(keys) == 0:
+            return
+        lo, hi = int(keys.min()), int(keys.max())
+        if len(self.counts) == 0:
+            self.offset, self.counts = lo, np.zeros(hi - lo + 1, dtype=np.int64)
+        elif lo < self.offset or hi >= self.offset + len(self.counts):
+            start = min(lo, self.offset)
+            grown = np.zeros(max(hi, self.offset + len(self.counts) - 1) - start + 1, dtype=np.int64)
+            grown[self.offset - start:self.offset - start + len(self.counts)] = self.counts
+            self.offset, self.counts = start, grown
+        self.counts += np.bincount(keys - self.offset, minlength=len(self.counts))
+
+    def keys(self) -> np.ndarray:
+        return np.arange(self.offset, self.offset + len(self.counts))
+
+
+class QuantileSketch:
+    """
+    Mergeable streaming quantiles with bounded relative error (DDSketch).
+
+    Values fall into logarithmic buckets, so any quantile is returned within
+    `relative_accuracy` of the true value using a few thousand counters,
+    however many values were added.
+
+    Args:
+        relative_accuracy (float, optional): Relative error bound. Defaults to 0.5%.
+        min_value (float, optional): Magnitudes below this count as zero.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.005, min_value: float = 1e-12):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.count = 0
+        self.zeros = 0
+        self._positive = _Buckets()
+        self._negative = _Buckets()
+
+    def _keys(self, magnitudes: np.ndarray) -> np.ndarray:
+        return np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+
+    def update(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        self.count += len(values)
+        small = np.abs(values) < self.min_value
+        self.zeros += int(small.sum())
+        self._positive.add(self._keys(values[(values > 0) & ~small]))
+        self._negative.add(self._keys(-values[(values < 0) & ~small]))
+
+    def merge(self, other: "QuantileSketch"):
+        """Add another sketch's values (both must use the same accuracy)."""
+        for mine, theirs in ((self._positive, other._positive), (self._negative, other._negative)):
+            mine.add(np.repeat(theirs.keys(), theirs.counts))
+        self.count += other.count
+        self.zeros += other.zeros
+
+    def quantile(self, q):
+        """Value at quantile(s) `q` in [0, 1] (NaN while empty)."""
+        q = np.asarray(q, dtype=np.float64)
+        if self.count == 0:
+            return np.full(q.shape, np.nan) if q.ndim else math.nan
+        value = lambda keys: 2 * self.gamma ** keys.astype(np.float64) / (self.gamma + 1)
+        # Buckets in ascending value order: most negative first.
+        values = np.r_[-value(self._negative.keys())[::-1], 0.0, value(self._positive.keys())]
+        counts = np.r_[self._negative.counts[::-1], self.zeros, self._positive.counts]
+        rank = q * (self.count - 1)
+        result = values[np.minimum(np.searchsorted(np.cumsum(counts), rank, side="right"), len(values) - 1)]
+        return result if q.ndim else float(result)
+
+
+class StreamingRSI:
+    """
+    Wilder's RSI fed chunk by chunk, identical to `ta.momentum.rsi` on the whole series.
+
+    Args:
+        window (int, optional): RSI window. Defaults to 14.
+    """
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.seen = 0
+        self.last_close = None
+        self.avg_up = None
+        self.avg_down = None
+
+    def _smooth(self, previous, values):
+        alpha = 1 / self.window
+        if previous is None:
+            return pd.Series(values).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+        # Seeding the recursion with the previous average continues it exactly.
+        return pd.Series(np.r_[previous, values]).ewm(alpha=alpha, adjust=False).mean().to_numpy()[1:]
+
+    def update(self, close: np.ndarray) -> np.ndarray:
+        """RSI for each value of the chunk (NaN until `window` values have been seen)."""
+        close = np.asarray(close, dtype=np.float64)
+        if len(close) == 0:
+            return close
+        previous = close[0] if self.last_close is None else self.last_close
+        diff = np.diff(np.r_[previous, close])
+        up = self._smooth(self.avg_up, np.where(diff > 0, diff, 0.0))
+        down = self._smooth(self.avg_down, np.where(diff < 0, -diff, 0.0))
+        self.avg_up, self.avg_down, self.last_close = up[-1], down[-1], close[-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = np.where(down == 0, 100.0, 100 - 100 / (1 + up / down))
+        seen = self.seen + np.arange(1, len(close) + 1)
+        self.seen += len(close)
+        return np.where(seen >= self.window, rsi, np.nan)
+
+
+class TickerMetrics:
+    """
+    Single-pass metrics for one ticker's history, fed chunk by chunk.
+
+    `result()` has the keys of the CLI's `calculate_metrics` (except the RSI
+    signal) plus "Max Drawdown %", VaR per level and "Rows".
+
+    Args:
+        var_levels (Sequence[float], optional): VaR confidence levels. Defaults to 95% and 99%.
+        periods_per_year (int, optional): For annualizing volatility. Defaults to 252.
+        rsi_window (int, optional): RSI window. Defaults to 14.
+        relative_accuracy (float, optional): VaR sketch accuracy.
+    """
+
+    def __init__(self, var_levels: Sequence[float] = (0.95, 0.99), periods_per_year: int = 252,
+                 rsi_window: int = 14, relative_accuracy: float = 0.005):
+        self.var_levels = tuple(var_levels)
+        self.periods_per_year = periods_per_year
+        self.returns = Welford()
+        self.volume = Welford()
+        self.drawdown = RunningDrawdown()
+        self.sketch = QuantileSketch(relative_accuracy)
+        self.rsi = StreamingRSI(rsi_window)
+        self.rows = 0
+        self.first_close = None
+        self.last_close = None
+        self.last_rsi = math.nan
+        self.high = -math.inf
+        self.low = math.inf
+
+    def update(self, chunk: pd.DataFrame):
+        """Consume the next chunk of bars (oldest first)."""
+        close = chunk["Close"].to_numpy(dtype=np.float64)
+        close = close[np.isfinite(close)]
+        if len(close) == 0:
+            return
+        previous = np.r_[close[0] if self.last_close is None else self.last_close, close[:-1]]
+        returns = close / previous - 1
+        if self.last_close is None:
+            returns = returns[1:]
+            self.first_close = close[0]
+        self.returns.update(returns)
+        self.sketch.update(returns)
+        self.drawdown.update(close)
+        rsi = self.rsi.update(close)
+        self.last_rsi = float(rsi[-1])
+        self.last_close = float(close[-1])
+        self.rows += len(chunk)
+        if "Volume" in chunk:
+            self.volume.update(chunk["Volume"].to_numpy(dtype=np.float64))
+        self.high = max(self.high, float(np.nanmax(chunk["High"].to_numpy(dtype=np.float64), initial=-math.inf)))
+        self.low = min(self.low, float(np.nanmin(chunk["Low"].to_numpy(dtype=np.float64), initial=math.inf)))
+
+    def result(self) -> Optional[dict]:
+        """Metrics so far, or None before any bars."""
+        if self.last_close is None:
+            return None
+        change = self.last_close - float(self.first_close)
+        metrics = {
+            "Current Price": self.last_close,
+            "Price Change": change,
+            "Price Change %": change / self.first_close * 100,
+            "Total Return": change / self.first_close * 100,
+            "Volatility (Annual)": self.returns.std() * math.sqrt(self.periods_per_year) * 100,
+            "Average Volume": float(self.volume.mean) if self.volume.count else math.nan,
+            "Max Price": self.high,
+            "Min Price": self.low,
+            "Current RSI": None if math.isnan(self.last_rsi) else self.last_rsi,
+            "Max Drawdown %": self.drawdown.max_drawdown * 100,
+        }
+        for level, value in zip(self.var_levels, self.sketch.quantile([1 - level for level in self.var_levels])):
+            metrics[f"VaR ({level:.0%})"] = float(value) * 100
+        metrics["Rows"] = self.rows
+        return metrics
+
+
+def _intraday_windows(interval: str, period: Optional[str], start, end) -> Iterator[Tuple[pd.Timestamp, pd.Timestamp]]:
+    end = pd.Timestamp(end) if end is not None else pd.Timestamp.now().normalize() + pd.Timedelta(days=1)
+    if start is not None:
+        start = pd.Timestamp(start)
+    elif period in provider.PERIOD_OFFSETS:
+        start = end - provider.PERIOD_OFFSETS[period]
+    else:
+        start = end - pd.Timedelta(days=INTRADAY_LOOKBACK_DAYS.get(interval, 3650))
+    step = pd.Timedelta(days=INTRADAY_CHUNK_DAYS.get(interval, 365))
+    while start < end:
+        yield start, min(start + step, end)
+        start += step
+
+
+def iter_chunks(
+    ticker: str,
+    period: Optional[str] = "max",
+    start=None,
+    end=None,
+    interval: str = "1d",
+    chunk_rows: int = CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield a ticker's history oldest first, in chunks.
+
+    Daily bars are sliced from the (memory-mapped) history as row views of
+    at most `chunk_rows`, without entering the provider's adjusted-history
+    cache, so one pass over a universe does not evict it. Intraday bars are requested one date window at a
+    time, so a long intraday history is never downloaded in one piece.
+    """
+    if interval not in INTRADAY_CHUNK_DAYS:
+        data = provider.get_history(ticker, period=period, start=start, end=end, interval=interval, cache=False)
+        for lo in range(0, len(data), chunk_rows):
+            yield data.iloc[lo:lo + chunk_rows]
+        return
+    for lo, hi in _intraday_windows(interval, period, start, end):
+        data = provider.get_history(ticker, start=lo, end=hi, interval=interval)
+        for offset in range(0, len(data), chunk_rows):
+            yield data.iloc[offset:offset + chunk_rows]
+
+
+def stream_metrics(
+    tickers: Iterable[str],
+    period: Optional[str] = "max",
+    start=None,
+    end=None,
+    interval: str = "1d",
+    chunk_rows: int = CHUNK_ROWS,
+    **options,
+) -> Iterator[Tuple[str, Optional[dict]]]:
+    """
+    Yield (ticker, metrics) for each ticker as soon as its history has streamed through.
+
+    Tickers are consumed lazily, so `tickers` may itself be a generator over
+    a universe that never fits in memory. Tickers without data, or whose
+    fetch fails, yield None.
+
+    Args:
+        tickers (Iterable[str]): Stock symbols.
+        period, start, end, interval: As for `provider.get_history`. Defaults to the full daily history.
+        chunk_rows (int, optional): Rows per chunk.
+        **options: Passed to `TickerMetrics` (var_levels, periods_per_year, ...).
+    """
+    for ticker in tickers:
+        ticker = ticker.strip().upper()
+        metrics = TickerMetrics(**options)
+        try:
+            for chunk in iter_chunks(ticker, period, start, end, interval, chunk_rows):
+                metrics.update(chunk)
+        except Exception as e:
+            logger.warning(f"Streaming metrics failed for {ticker}: {e}")
+            yield ticker, None
+            continue
+        yield ticker, metrics.result()
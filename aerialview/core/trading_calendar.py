@@ -0,0 +1,261 @@
+"""
+Exchange trading calendar for AerialView.
+
+A precomputed NYSE calendar: regular sessions, holidays, early closes and
+intraday bar grids, built from the exchange's holiday rules so questions
+like "which bars should this history have?" are answered locally instead of
+by asking the provider. Lookups are vectorized `searchsorted` calls over
+sorted int64 arrays.
+
+Daily bars are identified by their session date at midnight; intraday bars
+by their start time as tz-naive exchange (New York) wall-clock time, the
+same conventions the history store uses.
+"""
+
+import datetime as dt
+import re
+from typing import List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+TIMEZONE = ZoneInfo("America/New_York")
+OPEN = pd.Timedelta(hours=9, minutes=30)
+CLOSE = pd.Timedelta(hours=16)
+EARLY_CLOSE = pd.Timedelta(hours=13)
+
+# One-off closures not covered by the holiday rules.
+SPECIAL_CLOSURES = [
+    "1994-04-27", "2001-09-11", "2001-09-12", "2001-09-13", "2001-09-14", "2004-06-11",
+    "2007-01-02", "2012-10-29", "2012-10-30", "2018-12-05", "2025-01-09",
+]
+
+_MINUTES = {"m": 1, "h": 60}
+
+
+def _easter(year: int) -> dt.date:
+    # Anonymous Gregorian algorithm.
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month = (h + l - 7 * m + 114) // 31
+    day = (h + l - 7 * m + 114) % 31 + 1
+    return dt.date(year, month, day)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> dt.date:
+    """n-th `weekday` (Mon=0) of a month; n=-1 for the last one."""
+    if n > 0:
+        first = dt.date(year, month, 1)
+        return first + dt.timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = dt.date(year + month // 12, month % 12 + 1, 1) - dt.timedelta(days=1)
+    return last - dt.timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day: dt.date) -> dt.date:
+    """Saturday holidays move to Friday, Sunday holidays to Monday."""
+    if day.weekday() == 5:
+        return day - dt.timedelta(days=1)
+    if day.weekday() == 6:
+        return day + dt.timedelta(days=1)
+    return day
+
+
+def nyse_holidays(year: int) -> List[dt.date]:
+    """Full-day NYSE holidays for a year (rule based)."""
+    new_year = dt.date(year, 1, 1)
+    days = [
+        # A Saturday New Year's Day is not observed on the previous Friday.
+        new_year + dt.timedelta(days=1) if new_year.weekday() == 6 else new_year,
+        _nth_weekday(year, 2, 0, 3),
+        _easter(year) - dt.timedelta(days=2),
+        _nth_weekday(year, 5, 0, -1),
+        _observed(dt.date(year, 7, 4)),
+        _nth_weekday(year, 9, 0, 1),
+        _nth_weekday(year, 11, 3, 4),
+        _observed(dt.date(year, 12, 25)),
+    ]
+    if year >= 1998:
+        days.append(_nth_weekday(year, 1, 0, 3))
+    if year >= 2022:
+        days.append(_observed(dt.date(year, 6, 19)))
+    return sorted(d for d in days if d.weekday() < 5)
+
+
+def nyse_early_closes(year: int) -> List[dt.date]:
+    """13:00 closes: July 3, the day after Thanksgiving and Christmas Eve."""
+    days = [_nth_weekday(year, 11, 3, 4) + dt.timedelta(days=1)]
+    for month, day in ((7, 3), (12, 24)):
+        candidate = dt.date(year, month, day)
+        # Friday July 3 / December 24 is the observed holiday instead.
+        if candidate.weekday() < 4:
+            days.append(candidate)
+    return sorted(days)
+
+
+def interval_minutes(interval: str) -> Optional[int]:
+    """Minutes per bar for an intraday interval ("5m", "1h"), None otherwise."""
+    match = re.fullmatch(r"(\d+)([mh])", interval)
+    return int(match.group(1)) * _MINUTES[match.group(2)] if match else None
+
+
+def _naive(values) -> pd.DatetimeIndex:
+    index = pd.DatetimeIndex(values)
+    if index.tz is not None:
+        index = index.tz_convert(TIMEZONE).tz_localize(None)
+    return index.as_unit("ns")
+
+
+class TradingCalendar:
+    """
+    Precomputed NYSE sessions between two years.
+
+    Args:
+        start_year (int, optional): First year covered. Defaults to 1990.
+        end_year (int, optional): Last year covered. Defaults to 2040.
+    """
+
+    def __init__(self, start_year: int = 1990, end_year: int = 2040):
+        holidays, early = [], []
+        for year in range(start_year, end_year + 1):
+            holidays += nyse_holidays(year)
+            early += nyse_early_closes(year)
+        holidays = pd.DatetimeIndex(holidays).union(pd.DatetimeIndex(SPECIAL_CLOSURES)).as_unit("ns")
+        weekdays = pd.bdate_range(f"{start_year}-01-01", f"{end_year}-12-31").as_unit("ns")
+
+        self.holidays = holidays
+        self.sessions = weekdays.difference(holidays)
+        self.early_closes = pd.DatetimeIndex(early).as_unit("ns").intersection(self.sessions)
+        self._days = self.sessions.asi8
+        closes = np.full(len(self._days), CLOSE.value, dtype=np.int64)
+        closes[np.searchsorted(self._days, self.early_closes.asi8)] = EARLY_CLOSE.value
+        self._opens = self._days + OPEN.value
+        self._closes = self._days + closes
+
+    def _range(self, start, end) -> slice:
+        lo = 0 if start is None else np.searchsorted(self._days, pd.Timestamp(start).normalize().value, side="left")
+        hi = len(self._days) if end is None else np.searchsorted(self._days, pd.Timestamp(end).normalize().value, side="right")
+        return slice(lo, hi)
+
+    def is_session(self, dates) -> np.ndarray:
+        """Vectorized check whether each date is a trading session."""
+        days = _naive(dates).normalize().asi8
+        pos = np.clip(np.searchsorted(self._days, days), 0, len(self._days) - 1)
+        return self._days[pos] == days
+
+    def sessions_in_range(self, start=None, end=None) -> pd.DatetimeIndex:
+        """Sessions between two dates, inclusive."""
+        return self.sessions[self._range(start, end)]
+
+    def session_grid(self, start=None, end=None, interval: str = "1d") -> pd.DatetimeIndex:
+        """
+        Every bar that should exist between two dates.
+
+        Args:
+            start, end (optional): Date range, inclusive.
+            interval (str, optional): "1d", "1wk", "1mo" or an intraday interval
+                                      such as "5m" or "1h". Defaults to "1d".
+
+        Returns:
+            pd.DatetimeIndex: Expected bar labels (session dates, week/month
+                              starts, or intraday bar start times).
+        """
+        span = self._range(start, end)
+        if interval == "1d":
+            return self.sessions[span]
+        if interval in ("1wk", "1mo"):
+            periods = self.sessions[span].to_period("W" if interval == "1wk" else "M").unique()
+            return periods.to_timestamp(how="start").as_unit("ns")
+        minutes = interval_minutes(interval)
+        if minutes is None:
+            raise ValueError(f"Unsupported interval: {interval}")
+        step = minutes * 60 * 10**9
+        opens, closes = self._opens[span], self._closes[span]
+        counts = -(-(closes - opens) // step)
+        first = np.repeat(np.cumsum(counts) - counts, counts)
+        grid = np.repeat(opens, counts) + (np.arange(counts.sum()) - first) * step
+        return pd.DatetimeIndex(grid.view("M8[ns]"))
+
+    def expected_bars(self, start=None, end=None, interval: str = "1d") -> int:
+        """Number of bars a complete history between two dates should have."""
+        if interval == "1d":
+            span = self._range(start, end)
+            return span.stop - span.start
+        return len(self.session_grid(start, end, interval))
+
+    def _compare(self, index, start, end, interval: str) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        held = _naive(index)
+        if start is None and len(held):
+            start = held[0]
+        if end is None and len(held):
+            end = held[-1]
+        expected = self.session_grid(start, end, interval)
+        if interval == "1d":
+            held = held.normalize()
+        return expected, ~np.isin(expected.asi8, held.asi8)
+
+    def missing(self, index, start=None, end=None, interval: str = "1d") -> pd.DatetimeIndex:
+        """
+        Expected bars absent from a held series.
+
+        Args:
+            index: The held series' timestamps (tz-aware or exchange wall clock).
+            start, end (optional): Range to check. Defaults to the series' span.
+            interval (str, optional): Bar interval. Defaults to "1d".
+        """
+        expected, lacking = self._compare(index, start, end, interval)
+        return expected[lacking]
+
+    def gaps(self, index, start=None, end=None, interval: str = "1d") -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Missing bars grouped into (first, last) runs of consecutive expected bars."""
+        expected, lacking = self._compare(index, start, end, interval)
+        edges = np.flatnonzero(np.diff(np.concatenate([[0], lacking.astype(np.int8), [0]])))
+        return [(expected[a], expected[b - 1]) for a, b in zip(edges[::2], edges[1::2])]
+
+    def last_closed_session(self, now: Optional[pd.Timestamp] = None) -> Optional[pd.Timestamp]:
+        """The most recent session whose close has passed."""
+        wall = _naive([now if now is not None else pd.Timestamp.now(tz=TIMEZONE)])[0].value
+        pos = np.searchsorted(self._closes, wall, side="right") - 1
+        return self.sessions[pos] if pos >= 0 else None
+
+    def is_open(self, now: Optional[pd.Timestamp] = None) -> bool:
+        """Whether the market is in session at `now` (default: the current time)."""
+        wall = _naive([now if now is not None else pd.Timestamp.now(tz=TIMEZONE)])[0].value
+        pos = np.searchsorted(self._opens, wall, side="right") - 1
+        return pos >= 0 and wall < self._closes[pos]
+
+    def is_complete(self, last_bar, fetched_at: float, now: Optional[pd.Timestamp] = None) -> bool:
+        """
+        Whether a daily history ending at `last_bar` has every closed session.
+
+        Args:
+            last_bar: Date of the last stored bar.
+            fetched_at (float): Unix time the history was fetched, to detect a
+                                last bar captured before its session closed.
+            now (optional): Current time. Defaults to now.
+        """
+        expected = self.last_closed_session(now)
+        last = pd.Timestamp(last_bar).normalize()
+        if expected is None or last > expected:
+            return True
+        if last < expected:
+            return False
+        fetched = _naive([pd.Timestamp(fetched_at, unit="s", tz="UTC")])[0].value
+        return fetched >= self._closes[np.searchsorted(self._days, last.value)]
+
+
+_default = None
+
+
+def get_calendar() -> TradingCalendar:
+    """Return the process-wide trading calendar."""
+    global _default
+    if _default is None:
+        _default = TradingCalendar()
+    return _default
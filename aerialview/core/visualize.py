@@ -4,31 +4,38 @@ Visualization utilities for AerialView.
 This module provides stock charting functions using Plotly.
 """
 
+from typing import Union
+
 import plotly.graph_objects as go
 import pandas as pd
 
+from aerialview.core.bars import Bars, as_bars
+from aerialview.core.profiling import profiled
+
 
-def candlestick_chart(df: pd.DataFrame, ticker: str) -> go.Figure:
+@profiled("chart.candlestick_chart")
+def candlestick_chart(df: Union[Bars, pd.DataFrame], ticker: str) -> go.Figure:
     """
     Generate a candlestick chart with volume overlay.
 
     Args:
-        df (pd.DataFrame): DataFrame with "date", "open", "high", "low", "close", "volume".
+        df (Bars | pd.DataFrame): Bars, or any OHLCV frame accepted by `Bars.from_frame`.
         ticker (str): Stock symbol for labeling.
 
     Returns:
         go.Figure: Interactive candlestick chart.
     """
+    bars = as_bars(df, ticker)
     fig = go.Figure()
 
     # Candlestick
     fig.add_trace(
         go.Candlestick(
-            x=df["date"],
-            open=df["open"],
-            high=df["high"],
-            low=df["low"],
-            close=df["close"],
+            x=bars.timestamp,
+            open=bars.open,
+            high=bars.high,
+            low=bars.low,
+            close=bars.close,
             name="Price",
         )
     )
@@ -36,8 +43,8 @@ def candlestick_chart(df: pd.DataFrame, ticker: str) -> go.Figure:
     # Volume bar chart
     fig.add_trace(
         go.Bar(
-            x=df["date"],
-            y=df["volume"],
+            x=bars.timestamp,
+            y=bars.volume,
             name="Volume",
             marker_opacity=0.3,
             yaxis="y2",
@@ -57,12 +64,13 @@ def candlestick_chart(df: pd.DataFrame, ticker: str) -> go.Figure:
     return fig
 
 
+@profiled("chart.multi_ticker_comparison")
 def multi_ticker_comparison(data: dict) -> go.Figure:
     """
     Plot closing prices of multiple tickers for comparison.
 
     Args:
-        data (dict): {ticker: DataFrame}
+        data (dict): {ticker: Bars or OHLCV DataFrame}
 
     Returns:
         go.Figure: Line chart with multiple tickers.
@@ -70,10 +78,13 @@ def multi_ticker_comparison(data: dict) -> go.Figure:
     fig = go.Figure()
 
     for ticker, df in data.items():
+        if df is None:
+            continue
+        bars = as_bars(df, ticker)
         fig.add_trace(
             go.Scatter(
-                x=df["date"],
-                y=df["close"],
+                x=bars.timestamp,
+                y=bars.close,
                 mode="lines",
                 name=ticker,
             )
@@ -86,4 +97,24 @@ def multi_ticker_comparison(data: dict) -> go.Figure:
         template="plotly_white",
     )
 
-    return fig
\ No newline at end of file
+    return fig
+
+
+def placeholder_figure(message: str = "Loading market data…") -> go.Figure:
+    """
+    Empty chart with a centered message, shown while data is loading.
+
+    Args:
+        message (str, optional): Text to display.
+
+    Returns:
+        go.Figure: Figure without traces.
+    """
+    fig = go.Figure()
+    fig.update_layout(
+        xaxis=dict(visible=False),
+        yaxis=dict(visible=False),
+        annotations=[dict(text=message, showarrow=False, font=dict(size=16), xref="paper", yref="paper")],
+        template="plotly_white",
+    )
+    return fig
@@ -0,0 +1,181 @@
+"""
+Background cache warm-up for AerialView's Dash server.
+
+Pages used to fetch market data while being imported, which blocked server
+start and every worker spawn. Instead, `Warmup` loads the default and
+configured tickers on a background thread once the worker serves its first
+request, filling the history store, metadata cache and a figure cache. Pages render a
+placeholder and poll until the data they need is ready; tickers nobody
+warmed are queued on demand the same way. Loaded data older than `max_age`
+keeps being served while it is refreshed in the background. At most
+`max_tickers` histories are kept, least recently requested first out.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from aerialview.core.bars import Bars
+from aerialview.core.data_fetch import fetch_bars
+from aerialview.core.figure_cache import FigureCache
+from aerialview.core.metadata_cache import get_cache
+from aerialview.core.visualize import multi_ticker_comparison
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TICKERS = ["AAPL", "MSFT", "TSLA", "GOOGL"]
+PENDING, READY, FAILED = "pending", "ready", "failed"
+
+
+def configured_tickers() -> List[str]:
+    """Default tickers plus any listed in `AERIALVIEW_WARMUP_TICKERS`."""
+    extra = [t.strip().upper() for t in os.environ.get("AERIALVIEW_WARMUP_TICKERS", "").split(",") if t.strip()]
+    return list(dict.fromkeys(DEFAULT_TICKERS + extra))
+
+
+class Warmup:
+    """
+    Per-process background loader for price data and comparison figures.
+
+    Args:
+        tickers (Iterable[str], optional): Tickers loaded at start. Defaults to `configured_tickers()`.
+        period (str, optional): History period loaded. Defaults to "6mo".
+        max_age (float, optional): Seconds before loaded data is refreshed. Defaults to 900.
+        retry_after (float, optional): Seconds before a failed ticker is retried. Defaults to 60.
+        max_workers (int, optional): Parallel fetches. Defaults to 4.
+        max_tickers (int, optional): Histories kept in memory. Defaults to 256.
+    """
+
+    def __init__(
+        self,
+        tickers: Optional[Iterable[str]] = None,
+        period: str = "6mo",
+        max_age: float = 900.0,
+        retry_after: float = 60.0,
+        max_workers: int = 4,
+        max_tickers: int = 256,
+    ):
+        self.tickers = [t.upper() for t in (tickers or configured_tickers())]
+        self.period = period
+        self.max_age = max_age
+        self.retry_after = retry_after
+        self.max_workers = max_workers
+        self.max_tickers = max_tickers
+        self.figures = FigureCache(max_entries=64)
+        self.status: Dict[str, str] = {}
+        self._bars: Dict[str, Bars] = OrderedDict()
+        self._loaded: Dict[str, float] = {}
+        self._checked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._pid = None
+        self._executor = None
+
+    def start(self):
+        """
+        Start warming in the background (once per process; safe to call repeatedly).
+
+        Call it from the server's `before_request` hook rather than at import,
+        so fetching begins once the worker is actually serving and a forked
+        worker starts its own thread.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # A forked worker inherits the parent's state but not its threads.
+            self._pid = os.getpid()
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="warmup")
+            self.status = {t: s for t, s in self.status.items() if s == READY}
+        threading.Thread(target=self._run, name="warmup", daemon=True).start()
+
+    def _run(self):
+        started = time.perf_counter()
+        self.request(self.tickers)
+        try:
+            get_cache().warm(self.tickers, fields=("info",))
+        except Exception as e:
+            logger.warning(f"Metadata warm-up failed: {e}")
+        if self.wait(self.tickers, timeout=120):
+            self.comparison_figure(self.tickers)
+        logger.info(f"Warm-up of {len(self.tickers)} tickers finished in {time.perf_counter() - started:.1f}s")
+
+    def _load(self, ticker: str):
+        bars = fetch_bars(ticker, period=self.period)
+        with self._lock:
+            self._checked[ticker] = time.time()
+            if bars is not None:
+                self._bars[ticker] = bars
+                self._bars.move_to_end(ticker)
+                self._loaded[ticker] = self._checked[ticker]
+                while len(self._bars) > self.max_tickers:
+                    evicted, _ = self._bars.popitem(last=False)
+                    for state in (self.status, self._loaded, self._checked):
+                        state.pop(evicted, None)
+            # After a failed refresh the previous data keeps being served.
+            self.status[ticker] = READY if ticker in self._bars else FAILED
+
+    def request(self, tickers: Iterable[str]) -> bool:
+        """
+        Queue loads for tickers never loaded, failed longer than `retry_after`
+        ago, or loaded longer than `max_age` ago.
+
+        Returns:
+            bool: True if every ticker can be shown now (see `ready`).
+        """
+        self.start()
+        tickers = [t.upper() for t in tickers]
+        now = time.time()
+        with self._lock:
+            for ticker in tickers:
+                if ticker in self._bars:
+                    self._bars.move_to_end(ticker)
+                state = self.status.get(ticker)
+                age = now - self._checked.get(ticker, 0)
+                if state is None or (state == READY and age > self.max_age) or (state == FAILED and age > self.retry_after):
+                    self.status[ticker] = PENDING
+                    self._executor.submit(self._load, ticker)
+        return self.ready(tickers)
+
+    def ready(self, tickers: Iterable[str]) -> bool:
+        """True once every ticker has data to show or has failed to load."""
+        return all(t.upper() in self._bars or self.status.get(t.upper()) == FAILED for t in tickers)
+
+    def wait(self, tickers: Iterable[str], timeout: float = 30.0) -> bool:
+        """Block until `ready(tickers)` or the timeout; mainly for tests and scripts."""
+        tickers = list(tickers)
+        deadline = time.monotonic() + timeout
+        while not self.ready(tickers):
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def bars(self, ticker: str) -> Optional[Bars]:
+        """Loaded bars for a ticker, or None."""
+        return self._bars.get(ticker.upper())
+
+    def comparison_figure(self, tickers: Iterable[str]):
+        """Multi-ticker comparison built from loaded data, cached until any input reloads."""
+        tickers = [t.upper() for t in tickers]
+        key = ("comparison", self.period, tuple(tickers), tuple(self._loaded.get(t) for t in tickers))
+        return self.figures.get_or_build(key, lambda: multi_ticker_comparison({t: self.bars(t) for t in tickers}))
+
+    def snapshot(self) -> dict:
+        """Per-ticker load status, for the status endpoint."""
+        return {"pid": self._pid, "period": self.period, "status": dict(self.status)}
+
+
+_default = None
+
+
+def get_warmup() -> Warmup:
+    """Return the process-wide warm-up job."""
+    global _default
+    if _default is None:
+        _default = Warmup()
+    return _default
@@ -4,6 +4,10 @@ import yfinance as yf
 
 from pages import stock_overview, overview
 from aerialview.app.app import app, server
+from aerialview.app import live
+from aerialview.app import stock_overview as comparison
+from aerialview.app import analysis
+from aerialview.app import watchlist
 
 app.layout = html.Div([
     dcc.Location(id='url', refresh=False),
@@ -16,6 +20,14 @@ app.layout = html.Div([
 def display_page(pathname):
     if pathname == '/stock-overview':
         return stock_overview.layout
+    elif pathname == '/live':
+        return live.layout
+    elif pathname == '/comparison':
+        return comparison.layout
+    elif pathname == '/watchlist':
+        return watchlist.layout
+    elif pathname == '/analysis':
+        return analysis.layout
     elif pathname == '/overview':
         return overview.layout
     else:
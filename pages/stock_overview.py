@@ -1,13 +1,13 @@
 import requests
 import flask
 import yfinance as yf
-from pandas_datareader import data as pdr
 import dash_table
 import pandas as pd
 import dash_core_components as dcc
 import dash_html_components as html
 import dash_bootstrap_components as dbc
 from dash.dependencies import Input, Output
+from dash.exceptions import PreventUpdate
 from datetime import datetime as dt
 from datetime import date
 import re
@@ -16,6 +16,9 @@ import dash_table
 
 from app import app
 from utils import Header
+from aerialview.core import provider
+from aerialview.core.metadata_cache import get_cache
+from aerialview.core.callback_cache import memoize, ttl_for_range
 
 layout = dbc.Container([
     Header(app),
@@ -98,21 +101,19 @@ layout = dbc.Container([
 ])
 
 
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+
 def get_period_data(ticker_name, start_date, end_date):
     # download dataframe
-    df = pdr.get_data_yahoo(ticker_name, start=start_date, end=end_date)
-    for col in df.columns:
-        df[col] = df[col].map(lambda x: '{0:.2f}'.format(x))
+    df = provider.get_history(ticker_name, start=start_date, end=end_date, auto_adjust=False)
+    # Keep prices numeric so the chart gets real values; round once for the table.
+    df = df[[col for col in PRICE_COLUMNS if col in df.columns]].round(2)
     df.reset_index(inplace=True)
     fig = px.line(df, x='Date', y = [col for col in df.columns if (col != 'Date' and col != 'Volume')], title= f"Stock Price for {ticker_name.upper()}")
     return fig, df.to_dict('records')
 
 def get_ticker_info(ticker_name):
-    try:
-        data = yf.Ticker(ticker_name)
-        return data.info
-    except:
-        return {}
+    return get_cache().get_info(ticker_name)
     
 
 @app.callback(
@@ -122,6 +123,10 @@ def get_ticker_info(ticker_name):
     [Input('my-date-picker-range', 'start_date'),
      Input('my-date-picker-range', 'end_date'),
      Input('ticker_name', 'value')])
+# Only complete results are cached; an empty chart or missing ticker info (e.g. a
+# provider error) is shown once and fetched again on the next request.
+@memoize(ttl=lambda start_date, end_date, ticker_name: ttl_for_range(end_date),
+         cache_if=lambda result: bool(result[1]) and bool(result[2]))
 def update_output(start_date, end_date, ticker_name):
     fig = px.line()
     ticker_info = {}
@@ -159,12 +164,16 @@ def update_summary(data):
     Output("polar-graph-2", 'figure')],
     [Input('ticker_name', 'value')]
 )
+@memoize(ttl=6 * 3600)
 def update_recommendations(ticker_name):
+    if not ticker_name:
+        raise PreventUpdate
+    ticker_name = ticker_name.upper()
+    recommends = get_cache().get_recommendations(ticker_name)
+    if recommends is None or recommends.empty:
+        # Nothing to show (or the provider failed); raising keeps it out of the callback cache.
+        raise PreventUpdate
     try:
-        ticker_name = ticker_name.upper()
-        data = yf.Ticker(ticker_name)
-        recommends = data.recommendations
-
         one_month_recommends = recommends[recommends.index >= date.today() - pd.DateOffset(months=1)]
         three_month_recommends = recommends[recommends.index >= date.today() - pd.DateOffset(months=3)]
 
@@ -192,8 +201,10 @@ def update_recommendations(ticker_name):
 
 
         return one_month_fig, three_month_fig
-    except:
-        return px.line_polar(), px.line_polar()
+    except (KeyError, TypeError, ValueError) as e:
+        # Recommendations without the expected grade history.
+        print(f"Cannot chart recommendations for {ticker_name}: {e}")
+        raise PreventUpdate
 
 @app.callback(
     Output("datatable-row-ids", 'data'),
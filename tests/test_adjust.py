@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+
+from aerialview.core import adjust, provider
+from aerialview.core.history_store import HistoryStore
+
+
+def raw_bars(n=30):
+    index = pd.date_range("2024-01-01", periods=n, freq="D", name="Date")
+    # Trades around 200 before a 2:1 split on day 10, around 100 after.
+    close = np.where(np.arange(n) < 10, 200.0, 100.0) + np.arange(n) * 0.1
+    return pd.DataFrame(
+        {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": np.full(n, 1000.0)},
+        index=index,
+    )
+
+
+EVENTS = {
+    "splits": [("2024-01-11T00:00:00", 2.0)],
+    "dividends": [("2024-01-21T00:00:00", 1.0)],
+}
+
+
+def test_adjust_applies_split_and_dividend_backwards():
+    raw = raw_bars()
+    adjusted = adjust.adjust(raw, EVENTS)
+
+    dividend_factor = 1 - 1.0 / raw["Close"].iloc[19]
+    np.testing.assert_allclose(adjusted["Close"].iloc[20:], raw["Close"].iloc[20:])
+    np.testing.assert_allclose(adjusted["Close"].iloc[10:20], raw["Close"].iloc[10:20] * dividend_factor)
+    np.testing.assert_allclose(adjusted["Close"].iloc[:10], raw["Close"].iloc[:10] / 2 * dividend_factor)
+    np.testing.assert_allclose(adjusted["Volume"].iloc[:10], 2000.0)
+    assert adjust.adjust(raw, EVENTS, dividends=False)["Close"].iloc[15] == raw["Close"].iloc[15]
+
+
+def test_provider_frames_round_trip_to_raw_bars_and_events():
+    raw = raw_bars()
+    split_adjusted = adjust.adjust(raw, EVENTS, dividends=False)
+    split_adjusted["Dividends"] = 0.0
+    split_adjusted["Stock Splits"] = 0.0
+    split_adjusted.loc["2024-01-11", "Stock Splits"] = 2.0
+    split_adjusted.loc["2024-01-21", "Dividends"] = 1.0
+
+    events = adjust.extract_events(split_adjusted)
+    assert events == EVENTS
+    pd.testing.assert_frame_equal(adjust.unadjust_splits(split_adjusted, events), raw, check_freq=False)
+
+
+def test_new_event_changes_adjusted_history_without_rewriting_bars(tmp_path, monkeypatch):
+    store = HistoryStore(str(tmp_path))
+    store.write("AAPL", raw_bars(), events={"splits": [], "dividends": []})
+    version = store.meta("AAPL")["version"]
+    monkeypatch.setattr(provider, "get_store", lambda: store)
+    monkeypatch.setattr(provider, "_store_is_current", lambda meta: True)
+
+    before = provider.stored_history("AAPL")
+    store.add_event("AAPL", "splits", "2024-01-11", 2.0)
+    after = provider.stored_history("AAPL")
+
+    assert store.meta("AAPL")["version"] == version
+    assert after["Close"].iloc[0] == before["Close"].iloc[0] / 2
+    assert after["Close"].iloc[-1] == before["Close"].iloc[-1]
+
+
+def test_refresh_fetches_only_new_bars(tmp_path, monkeypatch):
+    store = HistoryStore(str(tmp_path))
+    store.write("AAPL", raw_bars().iloc[:25], events={"splits": [], "dividends": []})
+    store_meta = store.meta("AAPL")
+    calls = []
+
+    class Handle:
+        def history(self, **kwargs):
+            calls.append(kwargs)
+            tail = raw_bars().iloc[24:].copy()
+            tail["Dividends"] = 0.0
+            tail["Stock Splits"] = 0.0
+            return tail
+
+    monkeypatch.setattr(provider, "get_store", lambda: store)
+    monkeypatch.setattr(provider.pool, "get", lambda ticker: Handle())
+    provider._refresh_store("AAPL", store_meta)
+
+    assert "period" not in calls[0] and calls[0]["start"] == pd.Timestamp("2024-01-25")
+    assert store.meta("AAPL")["rows"] == 30
+    np.testing.assert_allclose(store.read("AAPL")["Close"], raw_bars()["Close"])
+
+
+def test_stored_history_keeps_the_provider_shape(tmp_path, monkeypatch):
+    raw = raw_bars()
+    provider_frame = adjust.adjust(raw, EVENTS, dividends=False)
+    provider_frame.index = provider_frame.index.tz_localize("America/New_York")
+    provider_frame["Dividends"] = 0.0
+    provider_frame["Stock Splits"] = 0.0
+    provider_frame.loc["2024-01-11", "Stock Splits"] = 2.0
+    provider_frame.loc["2024-01-21", "Dividends"] = 1.0
+
+    class Handle:
+        def history(self, **kwargs):
+            return provider_frame
+
+    store = HistoryStore(str(tmp_path))
+    monkeypatch.setattr(provider, "get_store", lambda: store)
+    monkeypatch.setattr(provider.pool, "get", lambda ticker: Handle())
+    provider._refresh_store("AAPL", None)
+    monkeypatch.setattr(provider, "_store_is_current", lambda meta: True)
+
+    history = provider.stored_history("AAPL")
+    assert list(history.columns) == ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]
+    assert str(history.index.tz) == "America/New_York"
+    pd.testing.assert_frame_equal(history[["Dividends", "Stock Splits"]], provider_frame[["Dividends", "Stock Splits"]],
+                                  check_freq=False, check_index_type=False)
+    np.testing.assert_allclose(history["Close"], adjust.adjust(raw, EVENTS)["Close"])
+    assert len(provider.slice_period(history, start="2024-01-05", end="2024-01-10")) == 5
+
+
+def test_refresh_without_new_bars_keeps_the_stored_version(tmp_path, monkeypatch):
+    store = HistoryStore(str(tmp_path))
+    store.write("AAPL", raw_bars(), events={"splits": [], "dividends": []}, tz="America/New_York")
+    version = store.meta("AAPL")["version"]
+
+    class Handle:
+        def history(self, **kwargs):
+            # The provider repeats the last stored bar for `start=last`.
+            tail = raw_bars().iloc[-1:].copy()
+            tail["Dividends"] = 0.0
+            tail["Stock Splits"] = 0.0
+            return tail
+
+    monkeypatch.setattr(provider, "get_store", lambda: store)
+    monkeypatch.setattr(provider.pool, "get", lambda ticker: Handle())
+    provider._refresh_store("AAPL", store.meta("AAPL"))
+
+    meta = store.meta("AAPL")
+    assert meta["version"] == version and meta["unchanged"]
+    # The calendar would call a 2024 history stale; the unchanged refresh defers to STORE_TTL.
+    assert provider._store_is_current(meta)
+    assert not provider._store_is_current({**meta, "unchanged": False})
+
+
+def test_non_new_york_histories_use_the_store_ttl(monkeypatch):
+    meta = {"last": "2024-01-30T00:00:00", "updated": 0.0, "tz": "Europe/London"}
+    assert not provider._store_is_current(meta)
+    monkeypatch.setattr(provider.time, "time", lambda: 60.0)
+    assert provider._store_is_current(meta)
+    assert not provider._store_is_current({**meta, "tz": "America/New_York"})
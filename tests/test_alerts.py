@@ -0,0 +1,103 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from aerialview.core.alerts import AlertEngine, FileSink, Rule, WebhookSink, compile_condition, latest_panel
+
+
+def panel(rsi, close=None, asof=None):
+    tickers = [f"T{i}" for i in range(len(rsi))]
+    data = {"RSI": rsi, "Close": close if close is not None else np.full(len(rsi), 10.0), "MA_20": 10.0}
+    frame = pd.DataFrame(data, index=tickers)
+    if asof is not None:
+        frame["asof"] = pd.Timestamp(asof)
+    return frame
+
+
+def test_compiled_conditions_are_vectorized():
+    cols = {"RSI": np.array([80.0, 50.0, np.nan]), "Close": np.array([11.0, 9.0, 10.0]), "MA_20": np.full(3, 10.0)}
+
+    assert compile_condition("RSI > 70")(cols).tolist() == [True, False, False]
+    assert compile_condition("not RSI > 70 and Close > MA_20 * 0.95")(cols).tolist() == [False, False, True]
+    assert compile_condition("30 < RSI < 70 or Close - MA_20 >= 1")(cols).tolist() == [True, True, False]
+    with pytest.raises(ValueError):
+        compile_condition("__import__('os')")
+    with pytest.raises(ValueError):
+        compile_condition("RSI >")
+
+
+def test_edge_trigger_and_cooldown():
+    engine = AlertEngine([Rule("hot", "RSI > 70", cooldown=100)], fire_on_start=True)
+
+    first = engine.evaluate(panel([80, 50, 90]), now=0)
+    assert [a["ticker"] for a in first] == ["T0", "T2"]
+    # Still true: no new edge.
+    assert engine.evaluate(panel([85, 50, 90]), now=10) == []
+    # T1 crosses; T0 drops out and comes back inside its cooldown.
+    assert engine.evaluate(panel([60, 75, 90]), now=20)[0]["ticker"] == "T1"
+    assert engine.evaluate(panel([80, 75, 90]), now=30) == []
+    engine.evaluate(panel([60, 75, 90]), now=150)
+    assert [a["ticker"] for a in engine.evaluate(panel([80, 75, 90]), now=160)] == ["T0"]
+
+
+def test_first_sight_does_not_fire_by_default_and_watchlist_can_change():
+    engine = AlertEngine([Rule("hot", "RSI > 70", cooldown=0)])
+    assert engine.evaluate(panel([80, 50]), now=0) == []
+
+    grown = pd.concat([panel([50, 80]), panel([90, 90, 90]).iloc[2:]])
+    assert [a["ticker"] for a in engine.evaluate(grown, now=1)] == ["T1"]
+    assert engine.evaluate(grown.iloc[::-1], now=2) == []
+
+
+def test_dedup_by_bar_and_sinks(tmp_path):
+    posted = []
+
+    class Session:
+        def post(self, url, json=None, timeout=None):
+            posted.append((url, json))
+
+    path = tmp_path / "alerts.jsonl"
+    engine = AlertEngine([Rule("hot", "RSI > 70", cooldown=0, message="{ticker} RSI {RSI:.0f}")],
+                         [FileSink(str(path)), WebhookSink("http://hooks.local/alerts", Session())], fire_on_start=True)
+    engine.evaluate(panel([80], asof="2024-01-02"), now=0)
+    engine.evaluate(panel([60], asof="2024-01-02"), now=1)
+    assert engine.evaluate(panel([80], asof="2024-01-02"), now=2) == []
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["message"] for line in lines] == ["T0 RSI 80"]
+    assert posted[0][0] == "http://hooks.local/alerts" and posted[0][1]["alerts"][0]["rule"] == "hot"
+
+
+def test_state_survives_save_and_load(tmp_path):
+    engine = AlertEngine([Rule("hot", "RSI > 70")], fire_on_start=True)
+    engine.evaluate(panel([80]), now=0)
+    engine.save(str(tmp_path / "state.json"))
+
+    restored = AlertEngine([Rule("hot", "RSI > 70")], fire_on_start=True)
+    assert restored.load(str(tmp_path / "state.json"))
+    assert restored.evaluate(panel([80]), now=10) == []
+    assert json.loads((tmp_path / "state.json").read_text())["tickers"] == ["T0"]
+    (tmp_path / "state.json").write_text("not json")
+    assert not AlertEngine().load(str(tmp_path / "state.json"))
+
+
+def test_tickers_missing_from_a_panel_keep_their_state():
+    engine = AlertEngine([Rule("hot", "RSI > 70", cooldown=100)], fire_on_start=True)
+    assert len(engine.evaluate(panel([80, 80]), now=0)) == 2
+
+    # T1 is absent from this run (e.g. its fetch failed) and must not re-fire when it returns.
+    assert engine.evaluate(panel([80]), now=10) == []
+    assert engine.evaluate(panel([80, 80]), now=20) == []
+    assert [a["ticker"] for a in engine.evaluate(panel([80, 80, 80]), now=30)] == ["T2"]
+
+
+def test_latest_panel_takes_last_rows():
+    index = pd.date_range("2024-01-01", periods=3, name="Date")
+    frames = {"AAPL": pd.DataFrame({"RSI": [1.0, 2.0, 3.0]}, index=index), "MSFT": None}
+    result = latest_panel(frames)
+
+    assert result.loc["AAPL", "RSI"] == 3.0
+    assert result.loc["AAPL", "asof"] == index[-1]
+    assert list(result.index) == ["AAPL"]
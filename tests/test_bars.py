@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from aerialview.core.bars import Bars, as_frame
+from aerialview.core.visualize import candlestick_chart, multi_ticker_comparison
+
+
+def make_history(n=30):
+    index = pd.date_range("2024-01-01", periods=n, freq="D", name="Date")
+    close = 100 + np.arange(n, dtype=float)
+    return pd.DataFrame(
+        {"Open": close - 1, "High": close + 1, "Low": close - 2, "Close": close, "Volume": np.full(n, 1e6)},
+        index=index,
+    )
+
+
+def test_from_frame_is_zero_copy_for_history_frames():
+    history = make_history()
+    bars = Bars.from_frame(history, ticker="AAPL")
+
+    assert len(bars) == 30
+    assert np.shares_memory(bars.close, history["Close"].to_numpy())
+    assert bars.close.flags["C_CONTIGUOUS"]
+    frame = bars.to_frame()
+    assert np.shares_memory(frame["Close"].to_numpy(), bars.close)
+    pd.testing.assert_frame_equal(frame, history, check_freq=False, check_index_type=False)
+
+
+def test_accepts_lowercase_date_column_shape():
+    lower = make_history().reset_index().rename(columns=str.lower)
+    bars = Bars.from_frame(lower)
+
+    np.testing.assert_array_equal(bars.close, lower["close"].to_numpy())
+    assert bars.timestamp.dtype == np.dtype("datetime64[ns]")
+    assert list(bars.to_frame(lowercase=True).columns) == ["date", "open", "high", "low", "close", "volume"]
+
+
+def test_slices_are_views_and_slots_block_attributes():
+    bars = Bars.from_frame(make_history())
+    last = bars.tail(5)
+
+    assert len(last) == 5
+    assert np.shares_memory(last.close, bars.close)
+    with pytest.raises(AttributeError):
+        bars.extra = 1
+
+
+def test_consumers_accept_bars():
+    bars = Bars.from_frame(make_history(), ticker="AAPL")
+
+    assert isinstance(as_frame(bars), pd.DataFrame)
+    fig = candlestick_chart(bars, "AAPL")
+    assert len(fig.data) == 2
+    comparison = multi_ticker_comparison({"AAPL": bars, "MSFT": make_history(), "BAD": None})
+    assert [trace.name for trace in comparison.data] == ["AAPL", "MSFT"]
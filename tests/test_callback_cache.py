@@ -0,0 +1,56 @@
+from datetime import date, timedelta
+
+import pytest
+
+from aerialview.core.callback_cache import CallbackCache, ttl_for_range
+
+
+def test_results_are_shared_between_workers(tmp_path):
+    path = str(tmp_path / "callbacks.sqlite")
+    calls = []
+
+    def build_figure(ticker, start, end):
+        calls.append(ticker)
+        return {"data": [{"y": [1, 2, 3]}], "layout": {"title": ticker}}
+
+    worker_a = CallbackCache(path=path).memoize(name="fig")(build_figure)
+    worker_b_cache = CallbackCache(path=path)
+    worker_b = worker_b_cache.memoize(name="fig")(build_figure)
+
+    assert worker_a("AAPL", "2023-01-01", "2023-02-01") == worker_b("AAPL", "2023-01-01", "2023-02-01")
+    assert calls == ["AAPL"]
+    assert worker_b_cache.stats()["hit_rate"] == 1.0
+
+
+def test_lru_eviction_and_expiry(tmp_path):
+    cache = CallbackCache(path=str(tmp_path / "callbacks.sqlite"), max_bytes=3000)
+    for i in range(5):
+        cache.put(f"k{i}", b"x" * 1000, ttl=60)
+    assert cache.get("k0") == (False, None)
+    assert cache.get("k4") == (True, b"x" * 1000)
+
+    cache.put("expired", 1, ttl=-1)
+    assert cache.get("expired") == (False, None)
+
+
+def test_ttl_for_range():
+    assert ttl_for_range(date.today() - timedelta(days=30)) > ttl_for_range(date.today())
+    assert ttl_for_range("2020-01-01T00:00:00") == ttl_for_range(date(2020, 1, 1))
+
+
+def test_rejected_and_failed_results_are_not_cached(tmp_path):
+    cache = CallbackCache(path=str(tmp_path / "callbacks.sqlite"))
+    results = iter([{}, RuntimeError("provider down"), {"name": "Apple"}, {"name": "Other"}])
+
+    def info(ticker):
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    cached = cache.memoize(name="info", cache_if=bool)(info)
+    assert cached("AAPL") == {}
+    with pytest.raises(RuntimeError):
+        cached("AAPL")
+    assert cached("AAPL") == {"name": "Apple"}
+    assert cached("AAPL") == {"name": "Apple"}
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from aerialview.core.compact import compact_frame, memory_report
+
+
+def make_history(n=250):
+    index = pd.date_range("2023-01-02", periods=n, freq="B", name="Date")
+    close = np.linspace(100, 130, n)
+    return pd.DataFrame({
+        "Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+        "Volume": np.arange(n, dtype=np.int64) * 1000,
+        "Dividends": 0.0, "Stock Splits": np.where(np.arange(n) == 10, 4.0, 0.0),
+    }, index=index)
+
+
+def test_compact_frame_narrows_dtypes():
+    df = make_history()
+    df["RSI"] = np.linspace(30, 70, len(df))
+    compact = compact_frame(df)
+
+    assert compact["Close"].dtype == np.float32
+    assert compact["RSI"].dtype == np.float64
+    assert compact["Volume"].dtype == np.int32
+    # Signed volume: differences cannot wrap around.
+    assert compact["Volume"].diff().min() > 0 and compact["Volume"].iloc[::-1].diff().max() < 0
+    assert "Dividends" not in compact.columns
+    assert isinstance(compact["Stock Splits"].dtype, pd.SparseDtype)
+    assert compact["Stock Splits"].iloc[10] == 4.0
+    np.testing.assert_allclose(compact["Close"], df["Close"], rtol=1e-6)
+
+
+def test_float32_rejected_when_precision_lost():
+    df = pd.DataFrame({"close": [123456789.123]})
+    assert compact_frame(df)["close"].dtype == np.float64
+
+
+def test_memory_report():
+    report = memory_report({"AAPL": make_history(), "MSFT": make_history(100)})
+    assert list(report["ticker"]) == ["AAPL", "MSFT", "TOTAL"]
+    assert (report["bytes_after"] < report["bytes_before"]).all()
+    assert report.loc[2, "rows"] == 350
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from aerialview.core.export import TableWriter, format_for, metrics_path, metrics_table
+
+
+def make_frame(n=120):
+    index = pd.date_range("2024-01-01", periods=n, freq="D", name="Date")
+    close = np.linspace(100, 110, n)
+    return pd.DataFrame({"Close": close, "Volume": np.arange(n), "RSI": np.nan}, index=index)
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl", ".parquet"])
+def test_chunked_export_round_trips(tmp_path, suffix):
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"bars{suffix}")
+    with TableWriter(path, chunk_rows=50) as writer:
+        writer.write_frame("AAPL", make_frame())
+        writer.write_frame("MSFT", make_frame(30))
+
+    assert writer.rows == 150
+    if suffix == ".csv":
+        result = pd.read_csv(path)
+    elif suffix == ".jsonl":
+        result = pd.read_json(path, lines=True)
+    else:
+        result = pd.read_parquet(path)
+    assert list(result.columns) == ["ticker", "Date", "Close", "Volume", "RSI", "Dividends", "Stock Splits", "Capital Gains"]
+    assert (result["Dividends"] == 0).all()
+    assert result["ticker"].value_counts().to_dict() == {"AAPL": 120, "MSFT": 30}
+    np.testing.assert_allclose(result["Close"].iloc[:120], make_frame()["Close"])
+
+
+def test_write_frame_copies_one_chunk_at_a_time(tmp_path, monkeypatch):
+    sizes = []
+    writer = TableWriter(str(tmp_path / "bars.csv"), chunk_rows=40)
+    monkeypatch.setattr(writer, "write", lambda df: sizes.append(len(df)))
+    writer.write_frame("AAPL", make_frame(100))
+    writer.close()
+
+    assert sizes == [40, 40, 20]
+
+
+def test_formats_and_metrics_table():
+    assert format_for("out.PARQUET") == "parquet"
+    assert format_for("out.txt", "csv") == "csv"
+    with pytest.raises(ValueError):
+        format_for("out.txt")
+    assert metrics_path("exports/out.jsonl") == "exports/out_metrics.jsonl"
+
+    table = metrics_table({"AAPL": {"Total Return": 1.5}, "MSFT": {"Total Return": -0.5}})
+    assert list(table.columns) == ["ticker", "Total Return"]
+    assert table["ticker"].tolist() == ["AAPL", "MSFT"]
+
+
+def test_parquet_schema_is_canonical_across_compact_and_wide_chunks(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    path = str(tmp_path / "bars.parquet")
+    compact = make_frame(10).astype({"Close": np.float32, "Volume": np.int32})
+    wide = make_frame(10)
+    wide["Volume"] = wide["Volume"] + 2**40
+    with TableWriter(path) as writer:
+        writer.write_frame("AAPL", compact)
+        writer.write_frame("MSFT", wide)
+
+    result = pd.read_parquet(path)
+    assert result["Close"].dtype == np.float64 and result["Volume"].dtype == np.int64
+    assert result["Volume"].iloc[-1] == 9 + 2**40
+
+    with pytest.raises(pa.ArrowInvalid):
+        with TableWriter(str(tmp_path / "bad.parquet")) as writer:
+            writer.write_frame("AAPL", make_frame(10))
+            writer.write_frame("MSFT", make_frame(10).assign(Volume=0.5))
+
+
+def test_compact_frames_with_and_without_dividends_export_one_column_set(tmp_path):
+    pytest.importorskip("pyarrow")
+    from aerialview.core.compact import compact_frame
+
+    paid = make_frame(10).assign(Dividends=0.0, **{"Stock Splits": 0.0})
+    paid.loc[paid.index[3], "Dividends"] = 0.24
+    plain = make_frame(10).assign(Dividends=0.0, **{"Stock Splits": 0.0})
+    path = str(tmp_path / "bars.parquet")
+    with TableWriter(path) as writer:
+        writer.write_frame("AAPL", compact_frame(paid))
+        writer.write_frame("MSFT", compact_frame(plain))
+
+    result = pd.read_parquet(path)
+    assert list(result.columns) == ["ticker", "Date", "Close", "Volume", "RSI", "Dividends", "Stock Splits", "Capital Gains"]
+    assert result["Dividends"].dtype == np.float64
+    assert result["Dividends"].iloc[:10].tolist() == pytest.approx([0, 0, 0, 0.24, 0, 0, 0, 0, 0, 0])
+    assert (result[["Dividends", "Stock Splits", "Capital Gains"]].iloc[10:] == 0).all().all()
+
+    with pytest.raises(ValueError, match="extra"):
+        with TableWriter(str(tmp_path / "bad.parquet")) as writer:
+            writer.write_frame("AAPL", make_frame(10))
+            writer.write_frame("MSFT", make_frame(10).assign(SMA=1.0))
@@ -0,0 +1,33 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from aerialview.core.figure_cache import FigureCache, estimate_bytes
+
+
+def make_figure(n):
+    return go.Figure(go.Scatter(x=np.arange(n), y=np.random.default_rng(0).normal(size=n)))
+
+
+def test_figures_are_built_once_per_key():
+    cache = FigureCache(max_entries=2)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return make_figure(10)
+
+    key = ("AAPL", "1y", "1d", "Dark")
+    assert cache.get_or_build(key, build) is cache.get_or_build(key, build)
+    assert len(builds) == 1
+    cache.get_or_build(("AAPL", "1y", "1d", "Light"), build)
+    assert len(builds) == 2
+
+
+def test_eviction_respects_memory_budget():
+    size = estimate_bytes(make_figure(10_000))
+    assert size >= 2 * 8 * 10_000
+    cache = FigureCache(max_entries=10, max_bytes=int(size * 2.5))
+    for ticker in ["AAPL", "MSFT", "TSLA"]:
+        cache.get_or_build(ticker, lambda: make_figure(10_000))
+    assert len(cache) == 2
+    assert cache.bytes <= cache.max_bytes
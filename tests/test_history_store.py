@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from aerialview.core.history_store import HistoryStore
+from aerialview.core.provider import slice_period
+
+
+def make_history(n=300):
+    index = pd.date_range("2023-01-02", periods=n, freq="B", tz="America/New_York", name="Date")
+    close = np.linspace(100, 130, n)
+    return pd.DataFrame({
+        "Open": close - 1, "High": close + 1, "Low": close - 2, "Close": close,
+        "Volume": np.arange(n) * 1000, "Dividends": 0.0, "Stock Splits": 0.0,
+    }, index=index)
+
+
+def test_read_is_a_view_over_the_mapped_file(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    store.write("aapl", make_history())
+
+    frame = HistoryStore(str(tmp_path)).read("AAPL")
+    assert list(frame.columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert frame.index.tz is None
+    close = frame["Close"].to_numpy()
+    assert isinstance(close.base, np.memmap) or isinstance(close.base.base, np.memmap)
+    assert not close.flags.writeable
+
+    frame["MA_20"] = frame["Close"].rolling(20).mean()
+    assert "MA_20" not in store.read("AAPL").columns
+
+
+def test_slice_period_keeps_views(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    store.write("AAPL", make_history())
+    frame = store.read("AAPL")
+
+    recent = slice_period(frame, "6mo")
+    assert recent.index[-1] == frame.index[-1]
+    assert recent.index[0] > frame.index[-1] - pd.DateOffset(months=6)
+    assert np.shares_memory(recent["Close"].to_numpy(), frame["Close"].to_numpy())
+    assert len(slice_period(frame, start="2023-02-01", end="2023-03-01")) == 20
@@ -0,0 +1,201 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import yfinance as yf
+
+from aerialview.core import http_session
+from aerialview.core.http_session import CurlSession, ResponseCache, cache_directives, fresh_until, new_session
+
+BACKENDS = ["requests", pytest.param("curl", marks=pytest.mark.skipif(CurlSession is None, reason="curl_cffi missing"))]
+BODY = json.dumps({"chart": list(range(2000))}).encode()
+LAST_MODIFIED = formatdate(0, usegmt=True)
+# The stand-in server's paths are not provider endpoints.
+ANY_PATH = ("/",)
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Stand-in for the provider API; each path exercises one caching behaviour."""
+
+    protocol_version = "HTTP/1.1"
+    counts = {"connections": 0, "requests": 0, "not_modified": 0, "full": 0}
+    lock = threading.Lock()
+
+    def setup(self):
+        with self.lock:
+            self.counts["connections"] += 1
+        super().setup()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with self.lock:
+            self.counts["requests"] += 1
+        path = self.path.split("?")[0]
+        headers = {
+            "/etag": {"ETag": '"v1"', "Cache-Control": "no-cache"},
+            "/modified": {"Last-Modified": LAST_MODIFIED},
+            "/fresh": {"Cache-Control": "max-age=60"},
+            "/expired": {"Cache-Control": "max-age=60", "Age": "120", "ETag": '"v1"'},
+            "/cookie": {"Cache-Control": "max-age=60", "Set-Cookie": "B=1"},
+            "/nostore": {"Cache-Control": "no-store", "ETag": '"v1"'},
+            "/vary": {"Cache-Control": "max-age=60", "Vary": "Accept-Language"},
+        }[path]
+        validated = (self.headers.get("If-None-Match") == headers.get("ETag") is not None
+                     or self.headers.get("If-Modified-Since") == headers.get("Last-Modified") is not None)
+        body = BODY if path != "/vary" else self.headers.get("Accept-Language", "").encode()
+        with self.lock:
+            self.counts["not_modified" if validated else "full"] += 1
+        self.send_response(304 if validated else 200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "0" if validated else str(len(body)))
+        self.end_headers()
+        if not validated:
+            self.wfile.write(body)
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+@pytest.fixture
+def counts(server):
+    for key in Handler.counts:
+        Handler.counts[key] = 0
+    return Handler.counts
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_requests_reuse_one_keep_alive_connection(server, counts, backend):
+    session = new_session(backend)
+    for i in range(20):
+        assert session.get(f"{server}/etag", params={"i": i}).status_code == 200
+    assert counts["requests"] == 20
+    assert counts["connections"] == 1
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_fresh_responses_are_served_without_a_request(server, counts, backend):
+    session = new_session(backend, cache=ResponseCache(paths=ANY_PATH))
+    first = session.get(f"{server}/fresh", params={"symbol": "AAPL"})
+    again = session.get(f"{server}/fresh", params={"symbol": "AAPL"})
+    other = session.get(f"{server}/fresh", params={"symbol": "MSFT"})
+
+    assert counts["requests"] == 2
+    assert again.from_cache and not getattr(other, "from_cache", False)
+    assert again.json() == first.json() == json.loads(BODY)
+    assert session.response_cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("path", ["/etag", "/modified", "/expired"])
+def test_stale_responses_are_revalidated_and_cost_a_304(server, counts, backend, path):
+    session = new_session(backend, cache=ResponseCache(paths=ANY_PATH))
+    responses = [session.get(f"{server}{path}") for _ in range(4)]
+
+    assert counts["full"] == 1 and counts["not_modified"] == 3
+    assert all(r.status_code == 200 and r.content == BODY for r in responses)
+    assert all(r.from_cache for r in responses[1:])
+    assert session.response_cache.stats()["revalidated"] == 3
+
+
+@pytest.mark.parametrize("path", ["/cookie", "/nostore"])
+def test_cookie_setting_and_no_store_responses_are_not_cached(server, counts, path):
+    session = new_session("requests", cache=ResponseCache(paths=ANY_PATH))
+    for _ in range(3):
+        session.get(f"{server}{path}")
+    assert counts["full"] == 3 and len(session.response_cache) == 0
+
+
+def test_request_directives_and_vary(server, counts):
+    session = new_session("requests", cache=ResponseCache(paths=ANY_PATH))
+    session.get(f"{server}/fresh")
+    session.get(f"{server}/fresh", headers={"Cache-Control": "no-store"})
+    assert counts["requests"] == 2
+
+    english = session.get(f"{server}/vary", headers={"Accept-Language": "en"})
+    german = session.get(f"{server}/vary", headers={"Accept-Language": "de"})
+    assert (english.content, german.content) == (b"en", b"de")
+    assert session.get(f"{server}/vary", headers={"Accept-Language": "de"}).from_cache
+    assert counts["requests"] == 4
+
+
+def test_concurrent_callers_share_a_bounded_pool(server, counts):
+    session = new_session("requests", pool_size=8, cache=ResponseCache(paths=ANY_PATH))
+
+    def fetch(i):
+        return session.get(f"{server}/etag", params={"i": i % 10}).content
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        bodies = list(pool.map(fetch, range(200)))
+    assert all(body == BODY for body in bodies)
+    assert counts["full"] >= 10 and counts["full"] + counts["not_modified"] == 200
+    # At most one connection per worker thread, each kept alive for its later requests.
+    assert counts["connections"] <= 8
+
+
+def test_freshness_rules():
+    now = 1_000_000.0
+    assert cache_directives('max-age=30, No-Cache, private="x"') == {"max-age": "30", "no-cache": None, "private": "x"}
+    assert fresh_until({"Cache-Control": "max-age=30", "Age": "10"}, now) == now + 20
+    assert fresh_until({"Cache-Control": "max-age=30, no-cache"}, now) == now
+    assert fresh_until({"Expires": formatdate(5_000 + 60, usegmt=True), "Date": formatdate(5_000, usegmt=True)}, now) == now + 60
+    assert fresh_until({"Expires": "0"}, now) == now
+    assert fresh_until({}, now) == now
+
+
+def test_cache_is_bounded_by_body_bytes(server):
+    session = new_session("requests", cache=ResponseCache(max_bytes=int(len(BODY) * 2.5), paths=ANY_PATH))
+    for symbol in ["A", "B", "C"]:
+        session.get(f"{server}/fresh", params={"symbol": symbol})
+    assert len(session.response_cache) == 2
+    assert session.response_cache.bytes == 2 * len(BODY)
+
+
+def test_shared_session_is_accepted_by_yfinance(monkeypatch):
+    monkeypatch.setattr(http_session, "_default", None)
+    session = http_session.get_session()
+    assert http_session.get_session() is session
+    assert yf.Ticker("AAPL", session=session).session is session
+
+
+def test_only_chart_and_quote_endpoints_are_cached():
+    cache = ResponseCache()
+    assert cache.allows("https://query2.finance.yahoo.com/v8/finance/chart/AAPL?range=1d")
+    assert cache.allows("https://query1.finance.yahoo.com/v7/finance/quote?symbols=AAPL")
+    assert not cache.allows("https://query1.finance.yahoo.com/v1/test/getcrumb")
+    assert not cache.allows("https://fc.yahoo.com/")
+
+
+def test_ticker_pool_starts_over_in_a_forked_worker(monkeypatch):
+    from aerialview.core.provider import TickerPool
+
+    monkeypatch.setattr(http_session, "_default", None)
+    pool = TickerPool()
+    parent = pool.get("AAPL")
+    data = yf.data.YfData()
+    data._crumb = "parent-crumb"
+    monkeypatch.setattr(http_session.os, "getpid", lambda: -1)
+
+    child = pool.get("AAPL")
+    assert child is not parent and len(pool) == 1
+    assert data._session is http_session.get_session() is not parent.session
+    assert data._crumb is None
+
+
+def test_missing_yfinance_internals_are_logged_not_raised(monkeypatch, caplog):
+    from aerialview.core import provider
+
+    monkeypatch.setattr(provider.yf.data, "YfData", lambda session=None: object())
+    provider._forget_credentials()
+    assert "Could not reset yfinance's crumb" in caplog.text
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from aerialview.core.indicator_cache import IndicatorCache, fingerprint
+
+
+def closes(n=300, seed=0):
+    index = pd.date_range("2024-01-01", periods=n, freq="D")
+    return pd.Series(100 + np.random.default_rng(seed).normal(size=n).cumsum(), index=index)
+
+
+def rolling_mean(prices, window):
+    calls.append(window)
+    return prices.rolling(window).mean()
+
+
+def bands(prices, window):
+    middle = prices.rolling(window).mean()
+    return middle + 1, middle, middle - 1
+
+
+calls = []
+
+
+def test_fingerprint_depends_on_content_and_params():
+    a = np.arange(10.0)
+    assert fingerprint("sma", [a], {"window": 5}) == fingerprint("sma", [a.copy()], {"window": 5})
+    assert fingerprint("sma", [a], {"window": 5}) != fingerprint("sma", [a], {"window": 6})
+    assert fingerprint("sma", [a], {"window": 5}) != fingerprint("ema", [a], {"window": 5})
+    assert fingerprint("sma", [a], {}) != fingerprint("sma", [a.astype(np.float32)], {})
+    b = a.copy()
+    b[3] = np.nan
+    assert fingerprint("sma", [a], {}) != fingerprint("sma", [b], {})
+
+
+def test_repeated_computation_is_served_from_memory(tmp_path):
+    calls.clear()
+    cache = IndicatorCache(str(tmp_path))
+    prices = closes()
+
+    first = cache.compute("sma", rolling_mean, prices, window=14)
+    second = cache.compute("sma", rolling_mean, prices.copy(), window=14)
+    cache.compute("sma", rolling_mean, prices, window=20)
+
+    assert calls == [14, 20]
+    pd.testing.assert_series_equal(second, first)
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_results_spill_to_disk_for_other_processes(tmp_path):
+    prices = closes()
+    IndicatorCache(str(tmp_path)).compute("bands", bands, prices, window=20)
+
+    other = IndicatorCache(str(tmp_path))
+    upper, middle, lower = other.compute("bands", lambda *a, **k: 1 / 0, prices, window=20)
+
+    np.testing.assert_allclose(middle, prices.rolling(20).mean())
+    np.testing.assert_allclose((upper - lower).iloc[19:], 2.0)
+    assert other.stats()["disk_hits"] == 1
+
+
+def test_memory_lru_and_disk_budget(tmp_path):
+    # Each spill is 300 float64 values plus about 600 bytes of archive and metadata.
+    cache = IndicatorCache(str(tmp_path), max_entries=2, max_disk_bytes=3 * (300 * 8 + 600) + 500)
+    for seed in range(5):
+        cache.compute("sma", rolling_mean, closes(seed=seed), window=5)
+    cache.prune()
+
+    assert cache.stats()["entries"] == 2
+    assert len(list(tmp_path.glob("*.npz"))) == 3
+
+
+def test_hits_keep_the_computed_dtype_and_name(tmp_path):
+    import ta
+
+    prices = closes().astype(np.float32)
+    cache = IndicatorCache(str(tmp_path))
+    miss = cache.compute("ta.rsi", ta.momentum.rsi, prices, window=14)
+    hit = cache.compute("ta.rsi", ta.momentum.rsi, prices, window=14)
+    from_disk = IndicatorCache(str(tmp_path)).compute("ta.rsi", ta.momentum.rsi, prices, window=14)
+
+    assert miss.name == "rsi"
+    pd.testing.assert_series_equal(hit, miss)
+    pd.testing.assert_series_equal(from_disk, miss)
+
+    computed = bands(prices, 20)
+    cache.compute("bands", bands, prices, window=20)
+    for got, expected in zip(cache.compute("bands", bands, prices, window=20), computed):
+        pd.testing.assert_series_equal(got, expected)
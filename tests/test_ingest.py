@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from aerialview.core import ingest, provider
+from aerialview.core.history_store import HistoryStore
+
+
+def vendor_rows(ticker, n=10, start="2024-01-01"):
+    dates = pd.bdate_range(start, periods=n)
+    close = np.linspace(10, 20, n)
+    return pd.DataFrame({
+        "Symbol": ticker, "Date": dates.strftime("%Y-%m-%d"),
+        "Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1000,
+    })
+
+
+def test_normalize_validates_and_splits_by_ticker():
+    df = pd.concat([vendor_rows("msft"), vendor_rows("AAPL")], ignore_index=True).rename(columns=ingest._canonical)
+    df.loc[0, "date"] = "not a date"
+    df.loc[1, "High"] = 0.0
+    df.loc[12, "Close"] = -1.0
+    duplicate = df.iloc[[15]].assign(Close=99.0)
+
+    result = ingest.normalize(pd.concat([df, duplicate], ignore_index=True))
+
+    assert set(result["frames"]) == {"AAPL", "MSFT"}
+    assert result["rejected"] == 3
+    assert len(result["frames"]["MSFT"]) == 8
+    aapl = result["frames"]["AAPL"]
+    assert len(aapl) == 9 and aapl.index.is_monotonic_increasing
+    assert aapl.loc[pd.Timestamp(df.loc[15, "date"]), "Close"] == 99.0
+    assert list(aapl.columns) == ["Open", "High", "Low", "Close", "Volume"]
+
+
+def test_adjusted_close_scales_prices():
+    df = vendor_rows("AAPL", n=2).drop(columns="Symbol").rename(columns=ingest._canonical)
+    df["Adj Close"] = df["Close"] / 2
+    frame = ingest.normalize(df, "AAPL")["frames"]["AAPL"]
+
+    np.testing.assert_allclose(frame["Open"], df["Open"] / 2)
+    np.testing.assert_allclose(frame["Volume"], 1000)
+    with pytest.raises(ValueError):
+        ingest.normalize(df.drop(columns="Close"), "AAPL")
+
+
+def test_ingest_per_ticker_and_multi_ticker_files(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    for ticker in ["AAPL", "MSFT", "GOOGL"]:
+        vendor_rows(ticker).drop(columns="Symbol").to_csv(src / f"{ticker.lower()}.us.csv", index=False)
+    pd.concat([vendor_rows("TSLA"), vendor_rows("NVDA")]).to_csv(src / "bulk.csv", index=False)
+    (src / "broken.csv").write_text("foo,bar\n1,2\n")
+    root = str(tmp_path / "store")
+
+    totals = ingest.ingest([str(src)], root=root, max_workers=2)
+
+    assert totals["tickers"] == 5 and totals["rows"] == 50
+    assert list(totals["errors"]) == [str(src / "broken.csv")]
+    store = HistoryStore(root)
+    assert store.tickers() == ["AAPL", "GOOGL", "MSFT", "NVDA", "TSLA"]
+    assert store.meta("TSLA")["source"] == "import"
+
+
+def test_merge_and_local_serving(tmp_path, monkeypatch):
+    root = str(tmp_path / "store")
+    first, second = tmp_path / "a.csv", tmp_path / "b.csv"
+    vendor_rows("AAPL", n=10).to_csv(first, index=False)
+    vendor_rows("AAPL", n=10, start="2024-01-08").assign(Close=50.0, High=60.0).to_csv(second, index=False)
+    ingest.ingest([str(first)], root=root)
+    ingest.ingest([str(second)], root=root, merge=True)
+
+    store = HistoryStore(root)
+    monkeypatch.setattr(provider, "get_store", lambda: store)
+    monkeypatch.setattr(provider, "_refresh_store", lambda *a: pytest.fail("imported data was refreshed"))
+    data = provider.get_history("AAPL", period="max")
+
+    assert len(data) == 15
+    assert (data["Close"].iloc[:5] < 50).all() and (data["Close"].iloc[5:] == 50).all()
+
+
+def test_ticker_split_across_files_is_combined_before_writing(tmp_path):
+    root = str(tmp_path / "store")
+    src = tmp_path / "src"
+    src.mkdir()
+    vendor_rows("AAPL", n=10).to_csv(src / "part1.csv", index=False)
+    vendor_rows("AAPL", n=10, start="2024-01-08").assign(Close=50.0, High=60.0).to_csv(src / "part2.csv", index=False)
+
+    totals = ingest.ingest([str(src)], root=root, max_workers=2)
+
+    assert totals["tickers"] == 1 and totals["rows"] == 20
+    stored = HistoryStore(root).read("AAPL")
+    assert len(stored) == 15 and (stored["Close"].iloc[5:] == 50).all()
+
+
+def test_merge_into_a_provider_history_is_refused(tmp_path):
+    root = str(tmp_path / "store")
+    store = HistoryStore(root)
+    bars = ingest.normalize(vendor_rows("AAPL").rename(columns=ingest._canonical))["frames"]["AAPL"]
+    store.write("AAPL", bars, events={"splits": [], "dividends": []})
+    version = store.meta("AAPL")["version"]
+    path = tmp_path / "aapl.csv"
+    vendor_rows("AAPL", start="2024-02-01").to_csv(path, index=False)
+
+    totals = ingest.ingest([str(path)], root=root, merge=True)
+
+    assert "as traded" in totals["errors"]["AAPL"] and totals["tickers"] == 0
+    assert store.meta("AAPL")["version"] == version
+
+
+def test_tickers_are_partitioned_and_spills_removed(tmp_path):
+    root = tmp_path / "store"
+    src = tmp_path / "src"
+    src.mkdir()
+    tickers = [f"T{i}" for i in range(12)]
+    for i in range(3):
+        pd.concat([vendor_rows(t, start=f"2024-0{i + 1}-01") for t in tickers]).to_csv(src / f"day{i}.csv", index=False)
+    reports = []
+
+    totals = ingest.ingest([str(src)], root=str(root), max_workers=1, progress=reports.append)
+
+    assert totals["tickers"] == 12 and not totals["errors"]
+    assert len(reports) == 3 and all("frames" not in report for report in reports)
+    assert not [name for name in root.iterdir() if name.name.startswith(".ingest-")]
+    assert len(HistoryStore(str(root)).read("T5")) == 30
+    assert {ingest.partition_of(t, 3) for t in tickers} == {0, 1, 2}
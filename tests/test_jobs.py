@@ -0,0 +1,139 @@
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from aerialview.core import analyses
+from aerialview.core.jobs import CANCELLED, DONE, FAILED, RUNNING, JobCancelled, JobManager, JobStore, Progress
+
+
+def slow_sum(n, delay=0.0, progress=None):
+    total = 0
+    for i in range(n):
+        progress(i / n, f"step {i}")
+        time.sleep(delay)
+        total += i
+    return total
+
+
+def broken(progress=None):
+    raise ValueError("bad input")
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = JobManager(str(tmp_path / "jobs.sqlite"), max_workers=1)
+    yield manager
+    manager.shutdown()
+
+
+def test_job_runs_in_pool_and_stores_result(manager):
+    job_id = manager.submit(slow_sum, 10)
+    state = manager.wait(job_id)
+
+    assert state["status"] == DONE and state["progress"] == 1
+    assert manager.result(job_id) == 45
+
+
+def test_identical_jobs_are_deduplicated(manager):
+    first = manager.submit(slow_sum, 10)
+    assert manager.submit(slow_sum, 10) == first
+    manager.wait(first)
+    assert manager.submit(slow_sum, 10) == first
+    assert manager.submit(slow_sum, 11) != first
+
+
+def test_new_job_in_group_cancels_previous(manager):
+    first = manager.submit(slow_sum, 1000, delay=0.01, group="session")
+    second = manager.submit(slow_sum, 5, group="session")
+
+    assert manager.wait(first)["status"] == CANCELLED
+    assert manager.wait(second)["status"] == DONE
+    # A cancelled job is not reused for an identical resubmission.
+    assert manager.submit(slow_sum, 1000, delay=0.01, group="other") != first
+
+
+def test_shared_job_is_only_cancelled_once_no_group_waits_on_it(manager):
+    shared = manager.submit(slow_sum, 200, delay=0.01, group="session-a")
+    assert manager.submit(slow_sum, 200, delay=0.01, group="session-b") == shared
+
+    # Session A moves on to a different analysis, then cancels that one too.
+    other = manager.submit(slow_sum, 5, group="session-a")
+    manager.cancel(other, group="session-a")
+    assert not manager.store.cancel_requested(shared)
+    assert manager.wait(shared)["status"] == DONE
+
+    again = manager.submit(slow_sum, 300, delay=0.01, group="session-b")
+    manager.cancel(again, group="session-b")
+    assert manager.wait(again)["status"] == CANCELLED
+
+
+def test_failures_are_recorded(manager):
+    state = manager.wait(manager.submit(broken))
+
+    assert state["status"] == FAILED
+    assert "bad input" in state["error"]
+
+
+def test_progress_raises_once_cancelled(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    store.create("job", "key", "name", None)
+    progress = Progress(store, "job", min_interval=0)
+
+    progress(0.5, "half")
+    assert store.get("job")["progress"] == 0.5
+    store.request_cancel("job")
+    with pytest.raises(JobCancelled):
+        progress(0.6)
+
+
+def test_monte_carlo_runs_inline(monkeypatch):
+    index = pd.date_range("2024-01-01", periods=100, freq="D")
+    close = pd.Series(100 * np.exp(np.linspace(0, 0.1, 100)), index=index)
+    monkeypatch.setattr(analyses, "get_history", lambda ticker, period=None: pd.DataFrame({"Close": close}))
+    reports = []
+
+    result = analyses.monte_carlo("AAPL", horizon=20, paths=250, chunk=100, progress=lambda f, m="": reports.append(f))
+
+    assert result["quantiles"].shape == (5, 21)
+    assert len(result["final"]) == 250
+    assert np.all(result["quantiles"][:, 0] == close.iloc[-1])
+    assert reports == [0.0, 0.4, 0.8, 1.0]
+
+    # Per-day sketches stay within their relative error of the exact quantiles.
+    close = pd.Series(100 * np.exp(np.cumsum(np.random.default_rng(1).normal(0, 0.02, 100))), index=index)
+    result = analyses.monte_carlo("AAPL", horizon=20, paths=2000, chunk=300)
+    rng = np.random.default_rng(0)
+    returns = np.diff(np.log(close.to_numpy()))
+    growth = np.concatenate([np.exp(np.cumsum(rng.choice(returns, size=(min(300, 2000 - done), 20)), axis=1))
+                             for done in range(0, 2000, 300)])
+    exact = close.iloc[-1] * np.percentile(growth, [5, 25, 50, 75, 95], axis=0)
+    assert np.allclose(result["quantiles"][:, 1:], exact, rtol=0.01)
+    assert np.allclose(result["final"], close.iloc[-1] * growth[:, -1])
+
+
+def test_stale_and_orphaned_jobs_are_failed_not_reused(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    key = JobManager.make_key(slow_sum, (10,), {})
+    store = JobStore(path)
+    store.create("silent", key, "slow_sum", None)
+    store.update("silent", status=RUNNING)
+    store._execute("UPDATE jobs SET updated = ? WHERE id = ?", (time.time() - 3600, "silent"))
+
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    store.create("orphan", "other", "slow_sum", None)
+    store._execute("UPDATE jobs SET owner = ? WHERE id = ?", (exited.pid, "orphan"))
+
+    manager = JobManager(path, max_workers=1, heartbeat_timeout=60)
+    try:
+        job_id = manager.submit(slow_sum, 10)
+        assert job_id != "silent"
+        assert manager.status("silent")["status"] == FAILED
+        assert manager.status("orphan")["status"] == FAILED
+        assert manager.wait(job_id)["status"] == DONE
+    finally:
+        manager.shutdown()
@@ -0,0 +1,92 @@
+import threading
+
+from aerialview.core.metadata_cache import MetadataCache
+
+
+def test_stale_entries_are_served_while_refreshing(tmp_path):
+    calls = []
+
+    def fetch_info(ticker):
+        calls.append(ticker)
+        return {"symbol": ticker, "version": len(calls)}
+
+    path = str(tmp_path / "metadata.sqlite")
+    cache = MetadataCache(path=path, ttls={"info": 0}, fetchers={"info": fetch_info})
+    assert cache.get_info("aapl") == {"symbol": "AAPL", "version": 1}
+
+    # Stale: the old value comes back immediately and a refresh is scheduled.
+    assert cache.get_info("AAPL")["version"] == 1
+    cache._executor().shutdown(wait=True)
+    assert len(calls) == 2
+
+    # A fresh entry on disk is served without another provider call.
+    reopened = MetadataCache(path=path, fetchers={"info": fetch_info})
+    assert reopened.get_info("AAPL")["version"] == 2
+    assert len(calls) == 2
+
+
+def test_callers_get_copies_and_memory_is_bounded(tmp_path):
+    cache = MetadataCache(path=str(tmp_path / "metadata.sqlite"), max_memory=2,
+                          fetchers={"info": lambda t: {"symbol": t, "officers": [{"name": "x"}]}})
+    info = cache.get_info("AAPL")
+    info["symbol"] = "changed"
+    info["officers"].append({"name": "y"})
+    assert cache.get_info("AAPL") == {"symbol": "AAPL", "officers": [{"name": "x"}]}
+
+    for ticker in ["MSFT", "TSLA", "GOOGL"]:
+        cache.get_info(ticker)
+    assert len(cache._memory) == 2
+    # Evicted entries are reloaded from disk.
+    assert cache.get_info("AAPL")["symbol"] == "AAPL"
+
+
+def test_cold_miss_waits_for_an_in_flight_refresh(tmp_path):
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch_info(ticker):
+        calls.append(ticker)
+        started.set()
+        release.wait(5)
+        return {"symbol": ticker}
+
+    cache = MetadataCache(path=str(tmp_path / "metadata.sqlite"), fetchers={"info": fetch_info})
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.get_info("AAPL")))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=lambda: results.append(cache.get_info("AAPL")))
+    second.start()
+    second.join(0.2)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert results == [{"symbol": "AAPL"}, {"symbol": "AAPL"}]
+    assert calls == ["AAPL"]
+
+
+def test_warm_fetches_missing_entries(tmp_path):
+    cache = MetadataCache(
+        path=str(tmp_path / "metadata.sqlite"),
+        fetchers={"info": lambda t: {"symbol": t}},
+    )
+    assert cache.warm(["AAPL", "MSFT"], fields=["info"]) == 2
+    assert cache.warm(["AAPL", "MSFT"], fields=["info"]) == 0
+
+
+def test_connection_and_refresh_pool_are_per_process(tmp_path, monkeypatch):
+    import os
+
+    cache = MetadataCache(path=str(tmp_path / "metadata.sqlite"), fetchers={"info": lambda t: {"symbol": t}})
+    assert cache._db is None and cache._pool is None
+    cache.get_info("AAPL")
+    parent_db, parent_pool = cache._db, cache._executor()
+    cache._refreshing[("MSFT", "info")] = threading.Event()
+
+    # A forked worker gets its own handle and pool, and the parent's in-flight claims are dropped.
+    monkeypatch.setattr(os, "getpid", lambda: -1)
+    assert cache.get_info("MSFT") == {"symbol": "MSFT"}
+    assert cache._db is not parent_db and cache._executor() is not parent_pool
+    assert cache._refreshing == {}
+    parent_pool.shutdown(wait=True)
@@ -0,0 +1,45 @@
+from flask import Flask
+
+from aerialview.core.metrics import Registry, instrument_server
+
+
+def test_histogram_and_counter_exposition():
+    reg = Registry()
+    latency = reg.histogram("req_seconds", "Latency.", ["call"], buckets=(0.1, 1.0))
+    errors = reg.counter("errors_total", "Errors.", ["call"])
+    latency.observe(0.05, call="info")
+    latency.observe(0.5, call="info")
+    errors.inc(call="info")
+
+    text = reg.render()
+    assert 'req_seconds_bucket{call="info",le="0.1"} 1' in text
+    assert 'req_seconds_bucket{call="info",le="+Inf"} 2' in text
+    assert 'req_seconds_count{call="info"} 2' in text
+    assert 'errors_total{call="info"} 1.0' in text
+
+
+def test_instrumented_server_exposes_callback_latency():
+    server = Flask(__name__)
+
+    @server.route("/_dash-update-component", methods=["POST"])
+    def update():
+        return {"response": {}}
+
+    instrument_server(server)
+    client = server.test_client()
+    client.post("/_dash-update-component", json={"output": "line-graph.figure"})
+
+    text = client.get("/metrics").get_data(as_text=True)
+    assert 'aerialview_callback_duration_seconds_count{callback="line-graph.figure"} 1' in text
+    assert 'aerialview_inflight_requests{kind="callback"} 0.0' in text
+
+
+def test_label_values_are_escaped():
+    reg = Registry()
+    errors = reg.counter("errors_total", "Errors.", ["callback"])
+    errors.inc(callback='{"index":1,"type":"card"}.figure')
+    errors.inc(callback="C:\\path\nnext")
+
+    text = reg.render()
+    assert 'errors_total{callback="{\\"index\\":1,\\"type\\":\\"card\\"}.figure"} 1.0' in text
+    assert 'errors_total{callback="C:\\\\path\\nnext"} 1.0' in text
@@ -0,0 +1,75 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from aerialview.core.news import LexiconScorer, NewsPipeline, NewsStore, ProviderSource, ReplaySource, article_hash
+
+
+def test_lexicon_scorer_batches_with_negation():
+    scores = LexiconScorer().score([
+        "Apple beats estimates as shares surge",
+        "Tesla is not profitable",
+        "Quarterly meeting scheduled",
+        "",
+        None,
+    ])
+
+    assert scores[0] > 0.5 and scores[1] < 0
+    np.testing.assert_array_equal(scores[2:], 0.0)
+    assert np.all(np.abs(scores) < 1)
+
+
+def test_article_hash_ignores_case_and_whitespace():
+    assert article_hash("Apple  beats ") == article_hash("apple beats")
+    assert article_hash("Apple beats") != article_hash("Apple misses")
+
+
+def replay_feed(path):
+    rows = [
+        {"ticker": "AAPL", "title": "Apple beats estimates", "published": "2024-03-01T14:00:00Z"},
+        {"ticker": "AAPL", "title": "Apple shares plunge on probe", "published": "2024-03-01T18:00:00Z"},
+        {"ticker": "AAPL", "title": "Apple wins approval", "published": "2024-03-02T09:00:00Z"},
+        {"ticker": "MSFT", "title": "Apple beats estimates", "published": "2024-03-01T14:00:00Z"},
+        {"ticker": "TSLA", "title": "Tesla recall", "published": "2024-03-01T10:00:00Z"},
+    ]
+    path.write_text("\n".join(json.dumps(row) for row in rows))
+    return str(path)
+
+
+class CountingScorer(LexiconScorer):
+    batches = []
+
+    def score(self, texts):
+        self.batches.append(len(texts))
+        return super().score(texts)
+
+
+def test_pipeline_caches_scores_and_aggregates_daily(tmp_path):
+    scorer = CountingScorer()
+    pipeline = NewsPipeline(ReplaySource(replay_feed(tmp_path / "feed.jsonl")), scorer,
+                            NewsStore(str(tmp_path / "news.sqlite")))
+
+    assert pipeline.refresh(["AAPL", "MSFT"]) == 4
+    pipeline.refresh(["AAPL", "MSFT"])
+
+    # One batch of the three distinct texts; the rerun is served from the score cache.
+    assert scorer.batches == [3, 0]
+    assert pipeline.stats() == {"scored": 3, "cached": 3}
+
+    daily = pipeline.daily_sentiment("AAPL")
+    assert daily["articles"].tolist() == [2, 1]
+    assert daily.index.tolist() == [pd.Timestamp("2024-03-01"), pd.Timestamp("2024-03-02")]
+    assert daily["sentiment"].iloc[1] > 0
+    assert [h["sentiment"] for h in pipeline.headlines("MSFT")] == ["Positive"]
+    assert pipeline.daily_sentiment("TSLA").empty
+
+
+def test_provider_items_are_parsed():
+    nested = {"content": {"title": "Apple beats", "pubDate": "2024-03-01T14:00:00Z",
+                          "provider": {"displayName": "Wire"}, "canonicalUrl": {"url": "https://x"}}}
+    flat = {"title": "Apple misses", "providerPublishTime": 1709301600, "publisher": "Desk", "link": "https://y"}
+
+    assert ProviderSource.parse("AAPL", nested)["source"] == "Wire"
+    assert ProviderSource.parse("AAPL", flat)["published"] == pd.Timestamp("2024-03-01 14:00:00")
+    assert ProviderSource.parse("AAPL", {"content": {}}) is None
@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from aerialview.core import analyses
+from aerialview.core.portfolio import (
+    efficient_frontier,
+    ledoit_wolf,
+    min_variance,
+    optimize,
+    project_simplex,
+    risk_contributions,
+    risk_parity,
+    solve_mean_variance,
+)
+
+
+def factor_returns(assets=60, days=250, seed=0):
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0004, 0.01, (days, 1))
+    betas = rng.uniform(0.5, 1.5, assets)
+    drift = rng.normal(0.0003, 0.0004, assets)
+    return pd.DataFrame(market * betas + drift + rng.normal(0, 0.015, (days, assets)),
+                        columns=[f"T{i}" for i in range(assets)])
+
+
+def test_ledoit_wolf_shrinks_a_noisy_sample_covariance():
+    returns = factor_returns(assets=100, days=120).to_numpy(copy=True)
+    covariance, shrinkage = ledoit_wolf(returns)
+
+    assert 0 < shrinkage < 1
+    assert np.allclose(covariance, covariance.T)
+    sample = np.cov(returns, rowvar=False, bias=True)
+    assert np.linalg.cond(covariance) < np.linalg.cond(sample)
+    assert np.isclose(np.trace(covariance), np.trace(sample))
+
+    # Missing values do not poison the estimate.
+    returns[:40, :10] = np.nan
+    assert np.isfinite(ledoit_wolf(returns)[0]).all()
+
+
+def test_simplex_projection_matches_bisection():
+    rng = np.random.default_rng(1)
+    for _ in range(100):
+        n = int(rng.integers(2, 30))
+        v = rng.normal(0, 1, n)
+        cap = float(rng.choice([1.0, rng.uniform(1 / n, 1)]))
+        low, high = v.min() - cap - 1, v.max() + 1
+        for _ in range(100):
+            mid = (low + high) / 2
+            low, high = (mid, high) if np.clip(v - mid, 0, cap).sum() > 1 else (low, mid)
+        assert np.allclose(project_simplex(v, cap), np.clip(v - mid, 0, cap), atol=1e-9)
+    with pytest.raises(ValueError):
+        project_simplex(np.zeros(4), 0.2)
+
+
+def test_min_variance_of_uncorrelated_assets_is_inverse_variance():
+    variances = np.array([0.01, 0.04, 0.09, 0.16])
+    weights = min_variance(np.diag(variances))
+    expected = (1 / variances) / (1 / variances).sum()
+    assert np.allclose(weights, expected, atol=1e-8)
+    # A cap redistributes the excess.
+    capped = min_variance(np.diag(variances), max_weight=0.4)
+    assert np.isclose(capped.max(), 0.4) and np.isclose(capped.sum(), 1)
+
+
+def test_active_set_polish_matches_plain_gradient_solution():
+    returns = factor_returns(assets=40)
+    covariance, _ = ledoit_wolf(returns.to_numpy())
+    expected = returns.mean().to_numpy()
+    polished, polished_iterations = solve_mean_variance(covariance, expected, 0.01, max_weight=0.2)
+    plain, plain_iterations = solve_mean_variance(covariance, expected, 0.01, max_weight=0.2, tol=1e-12, polish_every=0)
+
+    assert np.allclose(polished, plain, atol=1e-6)
+    assert polished_iterations < plain_iterations
+
+
+def test_frontier_is_feasible_monotone_and_warm_started():
+    returns = factor_returns(assets=80)
+    covariance, _ = ledoit_wolf(returns.to_numpy())
+    expected = returns.mean().to_numpy() * 252
+    frontier = efficient_frontier(covariance * 252, expected, points=25, max_weight=0.1)
+
+    weights = frontier["weights"]
+    assert weights.shape == (25, 80)
+    assert np.allclose(weights.sum(axis=1), 1) and weights.min() >= 0 and weights.max() <= 0.1 + 1e-12
+    assert np.all(np.diff(frontier["return"]) > -1e-9)
+    assert np.all(np.diff(frontier["volatility"]) > -1e-9)
+    assert np.allclose(weights[0], min_variance(covariance * 252, 0.1), atol=1e-6)
+    # Points after the first start next to their optimum.
+    assert frontier["iterations"][1:].mean() < frontier["iterations"][0] * 2
+
+
+def test_risk_parity_equalizes_risk_contributions():
+    covariance, _ = ledoit_wolf(factor_returns(assets=50).to_numpy())
+    weights = risk_parity(covariance)
+    assert np.isclose(weights.sum(), 1) and weights.min() > 0
+    assert np.allclose(risk_contributions(weights, covariance), 1 / 50, atol=1e-8)
+
+    budget = np.r_[np.full(25, 2.0), np.full(25, 1.0)]
+    contributions = risk_contributions(risk_parity(covariance, budget), covariance)
+    assert np.allclose(contributions, budget / budget.sum(), atol=1e-8)
+
+
+def test_optimize_reports_named_portfolios():
+    result = optimize(factor_returns(assets=30), points=10, max_weight=0.25)
+    portfolios = result["portfolios"]
+    assert list(portfolios) == ["Minimum variance", "Maximum Sharpe", "Risk parity"]
+    assert portfolios["Maximum Sharpe"]["sharpe"] == pytest.approx(np.nanmax(result["frontier"]["sharpe"]))
+    assert portfolios["Minimum variance"]["volatility"] <= portfolios["Risk parity"]["volatility"]
+    assert len(result["tickers"]) == 30
+
+
+def test_optimize_portfolio_job_drops_tickers_without_data(monkeypatch):
+    returns = factor_returns(assets=5)
+    closes = (1 + returns).cumprod() * 100
+    closes.index = pd.bdate_range("2024-01-01", periods=len(closes))
+
+    def history(ticker, period="1y"):
+        if ticker == "NONE":
+            return pd.DataFrame()
+        return pd.DataFrame({"Close": closes[ticker]})
+
+    monkeypatch.setattr(analyses, "get_history", history)
+    reports = []
+    result = analyses.optimize_portfolio(["t0", "t1", "t2", "t3", "t4", "none"], points=5,
+                                         progress=lambda f, m="": reports.append(f))
+    assert result["tickers"] == ["T0", "T1", "T2", "T3", "T4"]
+    assert result["frontier"]["weights"].shape == (5, 5)
+    assert reports[-1] == 1.0
+
+    with pytest.raises(ValueError):
+        analyses.optimize_portfolio(["T0", "NONE"])
+
+
+def test_ledoit_wolf_uses_pairwise_complete_observations():
+    rng = np.random.default_rng(3)
+    base = rng.normal(0, 0.01, (500, 1))
+    returns = base + rng.normal(0, 0.001, (500, 4))
+    # The last asset only listed halfway through; zero-filling would halve its covariances.
+    returns[:250, -1] = np.nan
+    covariance, _ = ledoit_wolf(returns)
+
+    observed = returns[250:]
+    pairwise = np.cov(observed[:, [0, -1]], rowvar=False, bias=True)[0, 1]
+    assert covariance[0, -1] == pytest.approx(pairwise, rel=0.1)
+    assert np.linalg.eigvalsh(covariance)[0] > 0
+
+
+def test_risk_parity_respects_the_weight_cap():
+    variances = np.array([0.0001, 0.04, 0.04, 0.04, 0.04])
+    assert risk_parity(np.diag(variances))[0] > 0.5
+    weights = risk_parity(np.diag(variances), max_weight=0.3)
+
+    assert np.isclose(weights.sum(), 1) and weights.max() <= 0.3 + 1e-12
+    assert weights[0] == pytest.approx(0.3) and np.allclose(weights[1:], 0.175)
+    with pytest.raises(ValueError):
+        risk_parity(np.diag(variances), max_weight=0.1)
@@ -0,0 +1,71 @@
+import json
+import threading
+
+from aerialview.core import profiling
+
+
+def test_spans_are_recorded_and_exported(tmp_path):
+    profiling.reset()
+    profiling.enable()
+    try:
+        @profiling.profiled("indicators")
+        def compute():
+            return [0] * 100_000
+
+        with profiling.span("fetch", ticker="AAPL"):
+            compute()
+    finally:
+        profiling.disable()
+
+    events = {e["name"]: e for e in profiling.events()}
+    assert set(events) == {"fetch", "indicators"}
+    assert events["fetch"]["ticker"] == "AAPL"
+    assert events["indicators"]["peak_bytes"] >= 800_000
+    assert events["fetch"]["peak_bytes"] >= events["indicators"]["peak_bytes"]
+
+    rows = {r["stage"]: r for r in profiling.summary(budgets={"fetch": 0})}
+    assert rows["fetch"]["over_budget"]
+
+    trace = json.loads(open(profiling.export_chrome_trace(str(tmp_path / "trace.json"))).read())
+    assert {e["ph"] for e in trace["traceEvents"]} == {"X"}
+    profiling.reset()
+
+
+def test_disabled_spans_record_nothing():
+    profiling.reset()
+    with profiling.span("fetch"):
+        pass
+    assert profiling.events() == []
+
+
+def test_only_one_thread_measures_peaks_at_a_time():
+    profiling.reset()
+    profiling.enable()
+    inside, done = threading.Event(), threading.Event()
+
+    def owner():
+        with profiling.span("owner"):
+            data = [0] * 100_000
+            inside.set()
+            done.wait(5)
+            del data
+
+    try:
+        thread = threading.Thread(target=owner)
+        thread.start()
+        inside.wait(5)
+        with profiling.span("other"):
+            [0] * 1000
+        done.set()
+        thread.join(5)
+        with profiling.span("after"):
+            [0] * 1000
+    finally:
+        profiling.disable()
+
+    events = {e["name"]: e for e in profiling.events()}
+    assert events["other"]["peak_bytes"] is None
+    assert events["owner"]["peak_bytes"] >= 800_000
+    assert events["after"]["peak_bytes"] is not None
+    assert {r["stage"] for r in profiling.summary()} == {"owner", "other", "after"}
+    profiling.reset()
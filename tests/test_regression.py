@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from aerialview.core.regression import benchmark_stats, ols, returns_panel, rolling_ols
+
+
+def panel(tickers=8, days=300, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2023-01-02", periods=days)
+    market = pd.Series(rng.normal(0.0004, 0.01, days), index=index, name="SPY")
+    betas = np.linspace(0.2, 1.8, tickers)
+    returns = pd.DataFrame(market.to_numpy()[:, None] * betas + 0.0002 + rng.normal(0, 0.01, (days, tickers)),
+                           index=index, columns=[f"T{i}" for i in range(tickers)])
+    return returns, market, betas
+
+
+def reference(y, x):
+    ok = y.notna() & x.notna()
+    design = np.c_[np.ones(ok.sum()), x[ok]]
+    coef, *_ = np.linalg.lstsq(design, y[ok], rcond=None)
+    resid = y[ok] - design @ coef
+    return coef, 1 - resid @ resid / ((y[ok] - y[ok].mean()) ** 2).sum(), int(ok.sum())
+
+
+def test_batched_ols_matches_per_ticker_least_squares_with_missing_days():
+    returns, market, betas = panel()
+    returns.iloc[:50, 2] = np.nan
+    returns.iloc[np.random.default_rng(1).random(returns.shape) < 0.05] = np.nan
+    market.iloc[10:15] = np.nan
+
+    table = ols(returns, market)
+    assert list(table.columns) == ["alpha", "beta", "r2", "resid_vol", "nobs"]
+    for ticker in returns.columns:
+        coef, r2, nobs = reference(returns[ticker], market)
+        row = table.loc[ticker]
+        assert np.isclose(row["alpha"], coef[0] * 252)
+        assert np.isclose(row["beta"], coef[1])
+        assert np.isclose(row["r2"], r2)
+        assert row["nobs"] == nobs
+    assert np.allclose(table["beta"], betas, atol=0.15)
+
+
+def test_multiple_factors_and_too_little_data():
+    returns, market, _ = panel(tickers=4)
+    sector = pd.Series(np.random.default_rng(2).normal(0, 0.01, len(market)), index=market.index)
+    returns["T3"] = returns["T3"] + 0.7 * sector
+    returns.iloc[5:, 0] = np.nan
+
+    table = ols(returns, pd.DataFrame({"mkt": market, "xlk": sector}))
+    assert {"beta_mkt", "beta_xlk"} <= set(table.columns)
+    assert np.isnan(table.loc["T0", "beta_mkt"])
+    assert abs(table.loc["T3", "beta_xlk"] - 0.7) < 0.15
+    assert abs(table.loc["T1", "beta_xlk"]) < 0.15
+
+
+def test_rolling_ols_matches_refits_of_each_window():
+    returns, market, _ = panel(tickers=5, days=200)
+    returns.iloc[60:75, 1] = np.nan
+    result = rolling_ols(returns, market, window=40, block=16)
+
+    assert set(result) == {"alpha", "beta", "r2"}
+    assert result["beta"].shape == returns.shape
+    assert result["beta"].iloc[:19].isna().all().all()
+    for row in [19, 39, 70, 120, 199]:
+        for ticker in ["T0", "T1"]:
+            window = slice(max(0, row - 39), row + 1)
+            coef, r2, nobs = reference(returns[ticker].iloc[window], market.iloc[window])
+            if nobs < 20:
+                assert np.isnan(result["beta"][ticker].iloc[row])
+                continue
+            assert np.isclose(result["beta"][ticker].iloc[row], coef[1])
+            assert np.isclose(result["alpha"][ticker].iloc[row], coef[0] * 252)
+            assert np.isclose(result["r2"][ticker].iloc[row], r2)
+
+
+def test_benchmark_stats_from_prices():
+    returns, market, betas = panel(tickers=1)
+    close = 100 * (1 + returns["T0"]).cumprod()
+    spy = 400 * (1 + market).cumprod()
+    stats = benchmark_stats(close, spy)
+    assert abs(stats["beta"] - betas[0]) < 0.15
+    assert stats["nobs"] == len(returns) - 1
+    assert set(returns_panel({"a": close, "b": spy}).columns) == {"a", "b"}
+
+
+def test_cli_benchmark_alpha_matches_the_dashboard():
+    from aerialview.cli.main import AerialViewCLI
+    from aerialview.core.regression import RISK_FREE_RATE
+
+    returns, market, _ = panel(tickers=1)
+    close = 100 * (1 + returns["T0"]).cumprod()
+    spy = 400 * (1 + market).cumprod()
+    comparison = {"T0": {}, "SPY": {}}
+    AerialViewCLI().add_benchmark_metrics(comparison, {"T0": close, "SPY": spy}, "SPY", "1y")
+
+    dashboard = benchmark_stats(close, spy, RISK_FREE_RATE)
+    assert np.isclose(comparison["T0"]["Alpha %"], dashboard["alpha"] * 100)
@@ -0,0 +1,171 @@
+import time
+
+import pandas as pd
+import pytest
+import yfinance as yf
+
+from aerialview.core import provider
+from aerialview.core.resilience import CircuitBreaker, CircuitOpenError, ProviderGuard, TokenBucket, is_transient
+from aerialview.core.singleflight import SingleFlight
+
+
+def test_token_bucket_limits_rate_after_burst():
+    bucket = TokenBucket(rate=50, burst=5)
+    start = time.monotonic()
+    for _ in range(10):
+        assert bucket.acquire()
+    # Five tokens are free, the other five arrive at 50/s.
+    assert time.monotonic() - start >= 0.09
+    empty = TokenBucket(rate=1, burst=1)
+    empty.acquire()
+    assert not empty.acquire(timeout=0.01)
+
+
+def test_transient_failures_are_retried():
+    guard = ProviderGuard(rate=1000, burst=100, base_delay=0.001, max_delay=0.001)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("connection reset by peer")
+        return "ok"
+
+    assert guard.call(flaky) == "ok"
+    assert len(attempts) == 3
+    assert guard.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_permanent_failures_are_not_retried():
+    guard = ProviderGuard(rate=1000, burst=100, base_delay=0.001)
+    attempts = []
+
+    def bad_ticker():
+        attempts.append(1)
+        raise KeyError("no such symbol")
+
+    with pytest.raises(KeyError):
+        guard.call(bad_ticker)
+    assert len(attempts) == 1
+
+
+def test_breaker_opens_then_recovers():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    guard = ProviderGuard(rate=1000, burst=100, attempts=1, breaker=breaker)
+
+    def down():
+        raise TimeoutError("read timed out")
+
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            guard.call(down)
+    with pytest.raises(CircuitOpenError):
+        guard.call(lambda: "never called")
+
+    time.sleep(0.06)
+    assert guard.call(lambda: "ok") == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_provider_serves_last_good_history_when_upstream_fails(monkeypatch):
+    frame = pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.date_range("2024-01-01", periods=2))
+    responses = [frame]
+
+    class Handle:
+        def history(self, **kwargs):
+            result = responses.pop(0) if responses else None
+            if result is None:
+                raise ConnectionError("503 Service Unavailable")
+            return result
+
+    monkeypatch.setattr(provider.pool, "get", lambda ticker: Handle())
+    monkeypatch.setattr(provider, "guard", ProviderGuard(rate=1000, burst=100, attempts=2, base_delay=0.001))
+    monkeypatch.setattr(provider.flight, "window", 0)
+
+    first = provider.get_history("ZZZT", period="1mo", interval="1h")
+    second = provider.get_history("ZZZT", period="1mo", interval="1h")
+    pd.testing.assert_frame_equal(first, second)
+
+
+class Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = Response(status_code)
+
+
+def test_transient_is_decided_by_type_and_status():
+    import requests
+    from curl_cffi.requests.exceptions import DNSError
+
+    assert is_transient(DNSError("Could not resolve host"))
+    assert is_transient(requests.exceptions.ReadTimeout())
+    assert is_transient(HTTPError(503)) and is_transient(HTTPError(429))
+    assert not is_transient(HTTPError(404))
+    # Messages that merely contain a status code or "connection" are not transient.
+    assert not is_transient(ValueError("row 500 of connection table is invalid"))
+    try:
+        try:
+            raise HTTPError(502)
+        except HTTPError as cause:
+            raise RuntimeError("history failed") from cause
+    except RuntimeError as wrapped:
+        assert is_transient(wrapped)
+
+
+def test_breaker_counts_one_failure_per_logical_call():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    guard = ProviderGuard(rate=1000, burst=100, attempts=3, base_delay=0.001, max_delay=0.001, breaker=breaker)
+    attempts = []
+
+    def down():
+        attempts.append(1)
+        raise TimeoutError("read timed out")
+
+    with pytest.raises(TimeoutError):
+        guard.call(down)
+    assert len(attempts) == 3
+    assert breaker.failures == 1 and breaker.state == CircuitBreaker.CLOSED
+
+
+def test_fetch_stock_data_retries_provider_failures(monkeypatch):
+    from aerialview.core import data_fetch
+
+    index = pd.date_range("2023-01-03", periods=3, tz="America/New_York", name="Date")
+    frame = pd.DataFrame({"Open": 1.0, "High": 1.0, "Low": 1.0, "Close": 1.0, "Volume": 1}, index=index)
+    calls = []
+
+    class Handle:
+        def history(self, **kwargs):
+            calls.append(kwargs)
+            assert yf.config.debug.hide_exceptions is False
+            if len(calls) == 1:
+                raise ConnectionError("connection reset by peer")
+            return frame
+
+    monkeypatch.setattr(provider.pool, "get", lambda ticker: Handle())
+    monkeypatch.setattr(provider, "USE_HISTORY_STORE", False)
+    monkeypatch.setattr(provider, "flight", SingleFlight(window=0))
+    monkeypatch.setattr(provider, "_last_good", type(provider._last_good)())
+    guard = ProviderGuard(rate=1000, burst=100, base_delay=0.001, max_delay=0.001,
+                          breaker=CircuitBreaker(failure_threshold=1))
+    monkeypatch.setattr(provider, "guard", guard)
+    errors = provider.provider_errors._values.get(("history",), 0)
+    hidden = yf.config.debug.hide_exceptions
+    df = data_fetch.fetch_stock_data("AAPL", "2023-01-01", "2023-02-01")
+
+    # yfinance only raises instead of hiding failures while provider calls run.
+    assert len(calls) == 2 and yf.config.debug.hide_exceptions is hidden
+    assert list(df.columns) == ["date", "open", "high", "low", "close", "volume"]
+    assert df["date"].dt.tz is None
+
+    # With the breaker open, the same request is served from the provider's last good response.
+    guard.breaker.record_failure()
+    assert guard.breaker.state == CircuitBreaker.OPEN
+    pd.testing.assert_frame_equal(data_fetch.fetch_stock_data("AAPL", "2023-01-01", "2023-02-01"), df)
+    assert len(calls) == 2
+    assert provider.provider_errors._values.get(("history",), 0) == errors + 1
@@ -0,0 +1,43 @@
+import threading
+import time
+
+import pytest
+
+from aerialview.core.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_upstream_request():
+    flight = SingleFlight(window=60)
+    calls = []
+
+    def upstream():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"symbol": "AAPL"}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("AAPL", upstream)))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"symbol": "AAPL"}] * 8
+    assert flight.do("AAPL", upstream) == {"symbol": "AAPL"}
+    assert len(calls) == 1
+
+
+def test_errors_are_not_cached():
+    flight = SingleFlight(window=60)
+
+    def failing():
+        raise RuntimeError("provider down")
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            flight.do("AAPL", failing)
+    assert flight.calls == 2
@@ -0,0 +1,101 @@
+import struct
+import zlib
+
+import numpy as np
+
+from aerialview.core import sparkline
+from aerialview.core.sparkline import DOWN, UP, SparklineRenderer, downsample_minmax, rasterize, render_sparkline
+
+
+def decode_png(data):
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    width, height = struct.unpack(">II", data[16:24])
+    idat_length = struct.unpack(">I", data[33:37])[0]
+    assert data[37:41] == b"IDAT"
+    raw = np.frombuffer(zlib.decompress(data[41:41 + idat_length]), dtype=np.uint8).reshape(height, -1)
+    assert (raw[:, 0] == 0).all()
+    return raw[:, 1:].reshape(height, width, 4)
+
+
+def test_downsample_keeps_extremes():
+    values = np.zeros(1000)
+    values[500] = 10.0
+    values[10] = np.nan
+    low, high = downsample_minmax(values, 100)
+
+    assert len(low) == len(high) == 100
+    assert high.max() == 10.0 and low.min() == 0.0
+    assert len(downsample_minmax(np.arange(5.0), 20)[0]) == 20
+
+
+def test_rasterized_line_is_continuous_and_colored():
+    image = rasterize(np.linspace(1, 2, 300), width=60, height=20)
+
+    assert image.shape == (20, 60, 4)
+    line = image[..., 3] == 255
+    # Every column is drawn and a rising series ends at the top.
+    assert line.any(axis=0).all()
+    assert line[:, -1].argmax() < line[:, 0].argmax()
+    assert tuple(image[0, 0, :3]) == UP
+    assert tuple(rasterize(np.linspace(2, 1, 10))[0, 0, :3]) == DOWN
+    assert (rasterize(np.zeros(0))[..., 3] == 0).all()
+
+
+def test_png_round_trips():
+    values = np.cumsum(np.random.default_rng(0).normal(size=500))
+    data = render_sparkline(values, width=40, height=16)
+
+    np.testing.assert_array_equal(decode_png(data), rasterize(values, 40, 16))
+
+
+def test_renderer_caches_tiles(monkeypatch):
+    import pandas as pd
+
+    calls = []
+
+    def get_history(ticker, period=None):
+        calls.append((ticker, period))
+        return pd.DataFrame({"Close": np.arange(50.0)})
+
+    monkeypatch.setattr(sparkline.provider, "get_history", get_history)
+    renderer = SparklineRenderer()
+
+    assert renderer.tile("aapl") == renderer.tile("AAPL")
+    renderer.tile("AAPL", period="1y")
+    assert calls == [("AAPL", "6mo"), ("AAPL", "1y")]
+    assert renderer.stats()["hits"] == 1
+
+
+def test_failed_renders_are_not_cached(monkeypatch):
+    calls = []
+
+    def get_history(ticker, period=None):
+        calls.append(ticker)
+        raise ConnectionError("provider down")
+
+    monkeypatch.setattr(sparkline.provider, "get_history", get_history)
+    renderer = SparklineRenderer()
+
+    png, ok = renderer.render("AAPL")
+    assert not ok and (decode_png(png)[..., 3] == 0).all()
+    renderer.render("AAPL")
+    assert calls == ["AAPL", "AAPL"] and renderer.stats()["tiles"] == 0
+
+
+def test_sparkline_route_validates_tickers_and_does_not_cache_failures(monkeypatch):
+    from dash import html
+
+    from aerialview.app import app as app_module
+    from aerialview.app.app import app, server
+
+    # The first request would otherwise start the background warm-up.
+    monkeypatch.setattr(app_module, "get_warmup", lambda: type("W", (), {"start": lambda self: None})())
+    if app.layout is None:
+        app.layout = html.Div()
+    monkeypatch.setattr(sparkline, "_default", SparklineRenderer())
+    monkeypatch.setattr(sparkline.provider, "get_history", lambda ticker, period=None: (_ for _ in ()).throw(OSError()))
+    client = server.test_client()
+
+    assert client.get("/sparkline/%3Cscript%3E.png").status_code == 400
+    response = client.get("/sparkline/BRK-B.png")
+    assert response.status_code == 200 and response.headers["Cache-Control"] == "no-store"
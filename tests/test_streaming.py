@@ -0,0 +1,157 @@
+import tracemalloc
+import zlib
+
+import numpy as np
+import pandas as pd
+import pytest
+import ta
+
+from aerialview.core import provider
+from aerialview.core.streaming import (
+    QuantileSketch,
+    RunningDrawdown,
+    StreamingRSI,
+    TickerMetrics,
+    Welford,
+    iter_chunks,
+    stream_metrics,
+)
+
+
+def history(ticker="AAPL", rows=3000):
+    rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, rows)))
+    index = pd.bdate_range("1990-01-01", periods=rows, name="Date")
+    return pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+                         "Volume": rng.integers(1e5, 1e6, rows).astype(float)}, index=index)
+
+
+def chunks(values, size):
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+
+def test_welford_and_drawdown_match_full_array_results():
+    data = history()["Close"].to_numpy()
+    returns = np.diff(data) / data[:-1]
+    welford, drawdown = Welford(), RunningDrawdown()
+    for part in chunks(returns, 317):
+        welford.update(part)
+    for part in chunks(data, 317):
+        drawdown.update(part)
+
+    assert welford.count == len(returns)
+    assert np.isclose(welford.mean, returns.mean())
+    assert np.isclose(welford.std(), returns.std(ddof=1))
+    assert np.isclose(drawdown.max_drawdown, (data / np.maximum.accumulate(data) - 1).min())
+
+
+def test_quantile_sketch_has_bounded_relative_error_and_merges():
+    values = np.random.default_rng(0).standard_t(3, 50_000) * 0.01
+    sketch, left, right = QuantileSketch(0.01), QuantileSketch(0.01), QuantileSketch(0.01)
+    for part in chunks(values, 1000):
+        sketch.update(part)
+    left.update(values[:20_000])
+    right.update(values[20_000:])
+    left.merge(right)
+
+    for q in [0.01, 0.05, 0.25, 0.75, 0.95, 0.99]:
+        exact = np.quantile(values, q)
+        assert abs(sketch.quantile(q) - exact) <= 0.02 * abs(exact) + 1e-4
+        assert left.quantile(q) == sketch.quantile(q)
+    assert np.isnan(QuantileSketch().quantile(0.5))
+
+
+def test_streaming_rsi_is_exactly_ta_rsi_across_chunks():
+    close = history()["Close"]
+    expected = ta.momentum.rsi(close, window=14).to_numpy()
+    rsi = StreamingRSI(14)
+    got = np.concatenate([rsi.update(part) for part in chunks(close.to_numpy(), 5)])
+    assert np.allclose(got, expected, equal_nan=True)
+
+
+def test_chunking_does_not_change_ticker_metrics():
+    data = history()
+    whole, parts = TickerMetrics(), TickerMetrics()
+    whole.update(data)
+    for lo in range(0, len(data), 250):
+        parts.update(data.iloc[lo:lo + 250])
+
+    a, b = whole.result(), parts.result()
+    assert a.keys() == b.keys()
+    for key in a:
+        assert a[key] == pytest.approx(b[key], rel=1e-9)
+    returns = data["Close"].pct_change().dropna()
+    assert a["Volatility (Annual)"] == pytest.approx(returns.std() * np.sqrt(252) * 100)
+    assert a["VaR (95%)"] == pytest.approx(np.percentile(returns, 5) * 100, rel=0.02)
+    assert a["Current RSI"] == pytest.approx(ta.momentum.rsi(data["Close"]).iloc[-1])
+    assert TickerMetrics().result() is None
+
+
+def test_stream_metrics_yields_per_ticker_and_skips_failures(monkeypatch):
+    def get_history(ticker, period=None, start=None, end=None, interval="1d", cache=True):
+        if ticker == "BAD":
+            raise RuntimeError("boom")
+        return history(ticker, 500)
+
+    monkeypatch.setattr(provider, "get_history", get_history)
+    results = dict(stream_metrics(iter(["aapl", "BAD", "MSFT"]), chunk_rows=64))
+    assert list(results) == ["AAPL", "BAD", "MSFT"]
+    assert results["BAD"] is None
+    assert results["AAPL"]["Rows"] == 500
+
+
+def test_intraday_histories_are_requested_in_date_windows(monkeypatch):
+    requests = []
+
+    def get_history(ticker, period=None, start=None, end=None, interval="1d"):
+        requests.append((start, end))
+        index = pd.date_range(start, end, freq="1h", inclusive="left")
+        return pd.DataFrame({"Close": 1.0, "High": 1.0, "Low": 1.0, "Volume": 1.0}, index=index)
+
+    monkeypatch.setattr(provider, "get_history", get_history)
+    parts = list(iter_chunks("AAPL", start="2024-01-01", end="2024-03-01", interval="5m", chunk_rows=100))
+    assert len(requests) == 2
+    assert requests[0][1] == requests[1][0]
+    assert sum(len(part) for part in parts) == 60 * 24
+    assert max(len(part) for part in parts) <= 100
+
+
+def test_peak_memory_does_not_grow_with_universe(monkeypatch):
+    monkeypatch.setattr(provider, "get_history", lambda ticker, **kwargs: history(ticker, 2000))
+
+    def peak(count):
+        tracemalloc.start()
+        for _ in stream_metrics((f"T{i}" for i in range(count)), chunk_rows=256):
+            pass
+        result = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return result
+
+    peak(2)
+    assert peak(40) < 1.5 * peak(4)
+
+
+def test_streaming_a_universe_larger_than_the_adjusted_cache_stays_flat(tmp_path, monkeypatch):
+    from aerialview.core.history_store import HistoryStore
+
+    store = HistoryStore(str(tmp_path))
+    count = provider.ADJUSTED_SIZE + 44
+    for i in range(count):
+        store.write(f"T{i}", history(f"T{i}", 1000), events={"splits": [], "dividends": []})
+    monkeypatch.setattr(provider, "get_store", lambda: store)
+    monkeypatch.setattr(provider, "_store_is_current", lambda meta: True)
+    monkeypatch.setattr(provider, "_adjusted", type(provider._adjusted)())
+
+    def peak(tickers):
+        tracemalloc.start()
+        for _ in stream_metrics(iter(tickers), chunk_rows=256):
+            pass
+        result = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return result
+
+    peak(["T0", "T1"])
+    small, large = peak([f"T{i}" for i in range(16)]), peak([f"T{i}" for i in range(count)])
+    assert len(provider._adjusted) == 0 and len(store._frames) == 0
+    # Caching every adjusted history would hold about `count` x 56 KB; allow a few histories' worth.
+    assert large < small + 20 * 1000 * 7 * 8
@@ -0,0 +1,49 @@
+import pandas as pd
+
+from aerialview.core.trading_calendar import TradingCalendar, nyse_early_closes, nyse_holidays
+
+calendar = TradingCalendar(2020, 2026)
+
+
+def test_holiday_rules_match_published_nyse_schedule():
+    assert [str(d) for d in nyse_holidays(2024)] == [
+        "2024-01-01", "2024-01-15", "2024-02-19", "2024-03-29", "2024-05-27",
+        "2024-06-19", "2024-07-04", "2024-09-02", "2024-11-28", "2024-12-25",
+    ]
+    # July 4th 2026 is a Saturday, so Friday the 3rd is the holiday and not an early close.
+    assert "2026-07-03" in [str(d) for d in nyse_holidays(2026)]
+    assert [str(d) for d in nyse_early_closes(2026)] == ["2026-11-27", "2026-12-24"]
+
+
+def test_expected_bars_daily_and_intraday():
+    assert calendar.expected_bars("2024-01-01", "2024-12-31") == 252
+    assert calendar.expected_bars("2023-01-01", "2023-12-31") == 250
+    # 09:30-13:00 early close on the day after Thanksgiving.
+    assert calendar.expected_bars("2024-11-29", "2024-11-29", "5m") == 42
+    assert calendar.expected_bars("2024-11-27", "2024-11-27", "1h") == 7
+    assert list(calendar.session_grid("2024-03-01", "2024-05-31", "1mo").strftime("%m")) == ["03", "04", "05"]
+
+
+def test_gap_detection_against_held_series():
+    held = calendar.sessions_in_range("2024-01-01", "2024-02-01").delete([3, 4, 10])
+
+    assert list(calendar.missing(held).strftime("%Y-%m-%d")) == ["2024-01-05", "2024-01-08", "2024-01-17"]
+    assert calendar.gaps(held) == [
+        (pd.Timestamp("2024-01-05"), pd.Timestamp("2024-01-08")),
+        (pd.Timestamp("2024-01-17"), pd.Timestamp("2024-01-17")),
+    ]
+    intraday = calendar.session_grid("2024-01-02", "2024-01-02", "30m").tz_localize("America/New_York")
+    assert len(calendar.missing(intraday[1:], "2024-01-02", "2024-01-02", "30m")) == 1
+
+
+def test_completeness_is_decided_locally():
+    friday_evening = pd.Timestamp("2024-07-05 18:00", tz="America/New_York")
+    fetched_after_close = pd.Timestamp("2024-07-05 17:00", tz="America/New_York").timestamp()
+    fetched_midday = pd.Timestamp("2024-07-05 12:00", tz="America/New_York").timestamp()
+
+    assert calendar.last_closed_session(friday_evening) == pd.Timestamp("2024-07-05")
+    assert calendar.is_complete("2024-07-05", fetched_after_close, friday_evening)
+    assert not calendar.is_complete("2024-07-05", fetched_midday, friday_evening)
+    assert not calendar.is_complete("2024-07-03", fetched_after_close, friday_evening)
+    assert calendar.is_open(pd.Timestamp("2024-07-05 10:00", tz="America/New_York"))
+    assert not calendar.is_open(pd.Timestamp("2024-07-04 10:00", tz="America/New_York"))
@@ -0,0 +1,65 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from aerialview.core import warmup as warmup_module
+from aerialview.core.bars import Bars
+from aerialview.core.warmup import FAILED, READY, Warmup
+
+
+def fake_bars(ticker, period="1y"):
+    if ticker == "BAD":
+        return None
+    index = pd.date_range("2024-01-01", periods=50, freq="D")
+    close = np.linspace(100, 120, 50)
+    return Bars(index, close, close + 1, close - 1, close, np.full(50, 1e6), ticker=ticker)
+
+
+def test_start_does_not_block_and_fills_caches(monkeypatch):
+    gate = threading.Event()
+
+    def slow_fetch(ticker, period="1y"):
+        gate.wait(5)
+        return fake_bars(ticker, period)
+
+    monkeypatch.setattr(warmup_module, "fetch_bars", slow_fetch)
+    monkeypatch.setattr(warmup_module, "get_cache", lambda: type("C", (), {"warm": lambda *a, **k: 0})())
+    job = Warmup(["AAPL", "MSFT"])
+
+    job.start()
+    assert not job.ready(["AAPL", "MSFT"])
+    gate.set()
+    assert job.wait(["AAPL", "MSFT"], timeout=5)
+    assert job.status == {"AAPL": READY, "MSFT": READY}
+
+    figure = job.comparison_figure(["AAPL", "MSFT"])
+    assert [trace.name for trace in figure.data] == ["AAPL", "MSFT"]
+    assert job.comparison_figure(["AAPL", "MSFT"]) is figure
+
+
+def test_unknown_tickers_are_loaded_on_demand_and_failures_settle(monkeypatch):
+    monkeypatch.setattr(warmup_module, "fetch_bars", fake_bars)
+    monkeypatch.setattr(warmup_module, "get_cache", lambda: type("C", (), {"warm": lambda *a, **k: 0})())
+    job = Warmup(["AAPL"])
+
+    job.request(["TSLA", "BAD"])
+    assert job.wait(["TSLA", "BAD"], timeout=5)
+    assert job.status["BAD"] == FAILED
+    assert job.bars("TSLA") is not None
+    # A failure is not retried on every poll.
+    assert job.request(["BAD"]) and job.status["BAD"] == FAILED
+
+
+def test_loaded_histories_are_bounded(monkeypatch):
+    monkeypatch.setattr(warmup_module, "fetch_bars", fake_bars)
+    monkeypatch.setattr(warmup_module, "get_cache", lambda: type("C", (), {"warm": lambda *a, **k: 0})())
+    job = Warmup(["AAPL"], max_workers=1, max_tickers=3)
+    job.request(["AAPL"])
+    assert job.wait(["AAPL"], timeout=5)
+
+    for ticker in ["T1", "T2", "T3"]:
+        job.request([ticker])
+        assert job.wait([ticker], timeout=5)
+    assert list(job._bars) == ["T1", "T2", "T3"]
+    assert job.bars("AAPL") is None and "AAPL" not in job.status